@@ -12,6 +12,8 @@ from app.domain.models.event import AgentEvent
 from typing import Type
 from app.domain.models.agent import Agent
 from app.domain.external.sandbox import Sandbox
+from app.domain.external.sandbox_pool import SandboxPool
+from app.domain.external.screenshot import ScreenshotService
 from app.domain.external.search import SearchEngine
 from app.domain.external.llm import LLM
 from app.domain.external.file import FileStorage
@@ -37,6 +39,8 @@ class AgentService:
         file_storage: FileStorage,
         mcp_repository: MCPRepository,
         search_engine: Optional[SearchEngine] = None,
+        sandbox_pool: Optional[SandboxPool] = None,
+        screenshot_service: Optional[ScreenshotService] = None,
     ):
         logger.info("Initializing AgentService")
         self._agent_repository = agent_repository
@@ -52,6 +56,8 @@ class AgentService:
             file_storage,
             mcp_repository,
             search_engine,
+            sandbox_pool,
+            screenshot_service,
         )
         self._llm = llm
         self._search_engine = search_engine
@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     model_name: str = "deepseek-chat"
     temperature: float = 0.7
     max_tokens: int = 2000
+    parallel_tool_calls: bool = False  # Let the model call several tools per turn, concurrency-safe ones run together
     
     # MongoDB configuration
     mongodb_uri: str = "mongodb://mongodb:27017"
@@ -40,17 +41,43 @@ class Settings(BaseSettings):
     sandbox_https_proxy: str | None = None
     sandbox_http_proxy: str | None = None
     sandbox_no_proxy: str | None = None
+    sandbox_pool_target_size: int = 0  # Warm sandboxes kept ready, 0 disables the pool
+    sandbox_pool_max_size: int = 4  # Upper bound on warm + warming sandboxes
+    sandbox_pool_idle_ttl_seconds: int = 600  # Keep below sandbox_ttl_minutes
+    sandbox_docker_hosts: str | None = None  # Comma-separated Docker endpoints (unix:// or tcp://), default DOCKER_HOST
+    sandbox_cpu_limit: float = 1.0  # CPUs per sandbox container
+    sandbox_memory_limit_mb: int = 2048  # Memory per sandbox container, swap included
+    sandbox_pids_limit: int = 1024  # Max processes per sandbox container
+    sandbox_cpu_overcommit: float = 1.0  # Schedulable sandbox CPUs per host CPU
     
     # Cloud Run Jobs Sandbox configuration
     use_cloudrun_jobs_sandbox: bool = False  # Feature flag (default: False for safety)
     sandbox_gcp_project: str = ""  # GCP project ID for Cloud Run Jobs
     sandbox_gcp_region: str = "us-central1"  # GCP region for job execution
     sandbox_gcs_bucket: str = "manus-sandbox-state"  # Cloud Storage bucket for session state
+    sandbox_executor_mode: str = "job"  # "job" (one job per command), "warm" (one long-lived job per sandbox, fed over Redis), "local" (executor subprocess, no GCP)
+    sandbox_executor_redis_url: str | None = None  # Redis URL as reachable from executor jobs, default built from redis_* settings
+    sandbox_executor_idle_timeout: int = 900  # Seconds a warm executor waits for a command before exiting
+    
+    # Browser configuration
+    browser_extraction_mode: str = "local"  # "local" (in-page Markdown conversion) or "llm" (LLM rewrite of the visible content)
+    browser_extraction_max_chars: int = 20000  # Character budget of a local extraction
+    browser_extraction_llm_fallback: bool = False  # Use the LLM when local extraction finds no content
+    browser_extraction_cache_size: int = 256  # Cached LLM page extractions, 0 disables the cache
+    browser_extraction_cache_ttl_seconds: int = 600
+    browser_screenshot_format: str = "jpeg"  # "png", "jpeg" or "webp"
+    browser_screenshot_quality: int = 75  # JPEG/WebP quality, 1-100
+    browser_screenshot_max_width: int = 1280  # Downscale wider screenshots, 0 keeps the original size
+    browser_screenshot_dedup_distance: int = 0  # Perceptual hash bits two frames may differ by and still be identical, -1 disables dedup
+    browser_screenshot_retention: int = 50  # Screenshots kept per session, older ones are deleted, 0 keeps all
+    browser_context_pool_size: int = 1  # Spare browser contexts kept open per sandbox browser, 0 opens them on demand
+    browser_block_resources: str = "font,media,ads"  # Comma separated resource categories the browser doesn't load: font, media, image, ads
     
     # Search engine configuration
     search_provider: str | None = "bing"  # "baidu", "google", "bing"
     google_search_api_key: str | None = None
     google_search_engine_id: str | None = None
+    search_cache_ttl_seconds: int = 3600  # Seconds identical searches are answered from Redis, 0 disables the cache
     
     # Auth configuration
     auth_provider: str = "password"  # "password", "none", "local"
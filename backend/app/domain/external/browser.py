@@ -84,3 +84,7 @@ class Browser(Protocol):
     async def console_view(self, max_lines: Optional[int] = None) -> ToolResult:
         """View console output"""
         ...
+    
+    async def cleanup(self) -> None:
+        """Release the browser resources held for the session"""
+        ...
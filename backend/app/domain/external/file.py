@@ -1,4 +1,4 @@
-from typing import Protocol, BinaryIO, Optional, Dict, Any, Tuple
+from typing import Protocol, BinaryIO, Optional, Dict, Any, Tuple, AsyncIterator
 from app.domain.models.file import FileInfo
 
 class FileStorage(Protocol):
@@ -42,7 +42,82 @@ class FileStorage(Protocol):
         """
         ...
     
-
+    async def upload_file_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        user_id: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> FileInfo:
+        """Upload file to storage from an async stream of chunks
+        
+        Only one chunk is held in memory at a time.
+        
+        Args:
+            chunks: Async iterator yielding the file content
+            filename: Name of the file to be stored
+            user_id: ID of the user uploading the file
+            content_type: MIME type of the file (optional)
+            metadata: Additional metadata to store with the file (optional)
+            
+        Returns:
+            FileInfo of the stored file
+        """
+        ...
+    
+    async def download_file_stream(
+        self,
+        file_id: str,
+        user_id: Optional[str] = None
+    ) -> Tuple[AsyncIterator[bytes], FileInfo]:
+        """Download file from storage as an async stream of chunks
+        
+        Args:
+            file_id: File ID
+            user_id: ID of the user downloading the file (optional, if None skips access control)
+            
+        Returns:
+            Async iterator over the file content and the file metadata
+        """
+        ...
+    
+    async def find_file_by_hash(
+        self,
+        sha256: str,
+        user_id: str,
+        filename: str
+    ) -> Optional[FileInfo]:
+        """Find a stored file of the user with identical content and name
+        
+        Args:
+            sha256: Hex encoded SHA-256 of the file content
+            user_id: ID of the user owning the file
+            filename: Name the file is stored under
+            
+        Returns:
+            FileInfo of a matching file if found, otherwise None
+        """
+        ...
+    
+    async def share_file(
+        self,
+        file_id: str,
+        user_id: str
+    ) -> bool:
+        """Add a reference to a stored file of the user
+        
+        A shared file is only removed from storage once delete_file has been
+        called for every reference.
+        
+        Args:
+            file_id: File ID
+            user_id: ID of the user owning the file
+            
+        Returns:
+            True if the reference was added, False if the file no longer exists
+        """
+        ...
     
     async def delete_file(
         self,
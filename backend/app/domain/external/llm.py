@@ -47,4 +47,9 @@ class LLM(Protocol):
     @property
     def max_tokens(self) -> int:
         """Get the max tokens"""
+        ...
+
+    @property
+    def parallel_tool_calls(self) -> bool:
+        """Whether several tool calls may be returned in one response"""
         ...
\ No newline at end of file
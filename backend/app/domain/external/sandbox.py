@@ -1,4 +1,4 @@
-from typing import Any, Optional, Protocol, BinaryIO, Dict, List
+from typing import Any, Optional, Protocol, BinaryIO, Dict, List, AsyncIterator
 from app.domain.models.tool_result import ToolResult
 from app.domain.external.browser import Browser
 from app.domain.external.llm import LLM
@@ -85,6 +85,48 @@ class Sandbox(Protocol):
         """
         ...
     
+    async def start_mcp_server(
+        self,
+        name: str,
+        command: str,
+        args: List[str],
+        env: Optional[Dict[str, str]] = None
+    ) -> ToolResult:
+        """Start an MCP server as a stdio process
+        
+        Args:
+            name: Server name
+            command: Executable starting the server
+            args: Command arguments
+            env: Extra environment variables
+            
+        Returns:
+            Start result, with the server's server_id and pid in data
+        """
+        ...
+    
+    def mcp_server_url(self, server_id: str) -> str:
+        """WebSocket URL exchanging JSON-RPC messages with an MCP server
+        
+        Args:
+            server_id: Server ID returned by start_mcp_server
+            
+        Returns:
+            URL where each message is one line of the server's stdio
+        """
+        ...
+    
+    async def stop_mcp_server(self, server_id: str) -> ToolResult:
+        """Stop an MCP server
+        
+        Args:
+            server_id: Server ID returned by start_mcp_server
+            
+        Returns:
+            Stop result
+        """
+        ...
+    
     async def file_write(
         self, 
         file: str, 
@@ -140,6 +182,17 @@ class Sandbox(Protocol):
         """
         ...
     
+    async def file_hash(self, path: str) -> ToolResult:
+        """Compute the SHA-256 of a file's content inside the sandbox
+        
+        Args:
+            path: File path
+            
+        Returns:
+            Hash result with ``sha256`` and ``size`` in data
+        """
+        ...
+    
     async def file_delete(self, path: str) -> ToolResult:
         """Delete file
         
@@ -200,6 +253,30 @@ class Sandbox(Protocol):
         """
         ...
     
+    async def file_grep(
+        self,
+        path: str,
+        regex: str,
+        glob_pattern: Optional[str] = None,
+        case_sensitive: bool = True,
+        max_results: int = 200
+    ) -> ToolResult:
+        """Search file contents across a directory tree
+        
+        Skips binary, hidden and .gitignore'd files.
+        
+        Args:
+            path: File or directory path to search
+            regex: Regular expression
+            glob_pattern: Only search files matching this glob
+            case_sensitive: Whether matching is case sensitive
+            max_results: Maximum number of matches to return
+            
+        Returns:
+            Search result with matches as {file, line_number, line}
+        """
+        ...
+    
     async def file_find(
         self, 
         path: str, 
@@ -216,6 +293,48 @@ class Sandbox(Protocol):
         """
         ...
     
+    async def file_batch(
+        self,
+        operations: List[Dict[str, Any]]
+    ) -> ToolResult:
+        """Run several file operations in one round trip
+        
+        Args:
+            operations: Operations as dicts with "op" (read, write, exists,
+                list or delete), "path" and the op specific fields
+                (content, append, start_line, end_line)
+            
+        Returns:
+            Batch result with per operation results in request order
+        """
+        ...
+    
+    async def file_editor(
+        self,
+        command: str,
+        path: str,
+        file_text: Optional[str] = None,
+        view_range: Optional[List[int]] = None,
+        old_str: Optional[str] = None,
+        new_str: Optional[str] = None,
+        insert_line: Optional[int] = None
+    ) -> ToolResult:
+        """Run an OpenHands file_editor command
+        
+        Args:
+            command: Editor command (view, create, str_replace, insert or undo_edit)
+            path: Absolute file or directory path
+            file_text: Content of the file to create
+            view_range: Line range [start, end] to view
+            old_str: String to replace
+            new_str: Replacement or inserted string
+            insert_line: Line after which new_str is inserted
+            
+        Returns:
+            Editor result with command, path and content in data
+        """
+        ...
+    
     async def file_upload(
         self,
         file_data: BinaryIO,
@@ -248,6 +367,40 @@ class Sandbox(Protocol):
         """
         ...
     
+    async def file_upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        path: str,
+        filename: str = None
+    ) -> ToolResult:
+        """Upload file to sandbox from an async stream of chunks
+        
+        Args:
+            chunks: Async iterator yielding the file content
+            path: Target file path in sandbox
+            filename: Original filename (optional)
+            
+        Returns:
+            Upload operation result
+        """
+        ...
+    
+    def file_download_stream(
+        self,
+        path: str,
+        chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Download file from sandbox as an async stream of chunks
+        
+        Args:
+            path: File path in sandbox
+            chunk_size: Preferred chunk size in bytes
+            
+        Returns:
+            Async iterator yielding the file content
+        """
+        ...
+    
     async def destroy(self) -> bool:
         """Destroy current sandbox instance
         
@@ -256,9 +409,13 @@ class Sandbox(Protocol):
         """
         ...
     
-    async def get_browser(self) -> Browser:
+    async def get_browser(self, session_id: Optional[str] = None) -> Browser:
         """Get browser instance
         
+        Args:
+            session_id: Session using the browser, sessions sharing a
+                sandbox don't share cookies or storage
+        
         Returns:
             Browser: Returns a configured browser instance for web automation
         """
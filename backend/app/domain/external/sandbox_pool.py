@@ -0,0 +1,27 @@
+from typing import Any, Dict, Optional, Protocol
+from app.domain.external.sandbox import Sandbox
+
+
+class SandboxPool(Protocol):
+    """Pool of pre-started sandboxes that sessions can claim instantly"""
+
+    async def start(self) -> None:
+        """Start warming sandboxes in the background"""
+        ...
+
+    async def stop(self) -> None:
+        """Stop warming and destroy all idle sandboxes"""
+        ...
+
+    async def claim(self) -> Optional[Sandbox]:
+        """Take a ready sandbox out of the pool
+
+        Returns:
+            A started, health-checked sandbox, or None if none is ready,
+            in which case the caller creates one itself
+        """
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool size, hit rate and claim latency statistics"""
+        ...
@@ -0,0 +1,27 @@
+from typing import Any, Dict, Protocol
+
+
+class ScreenshotService(Protocol):
+    """Encodes, deduplicates and stores the browser screenshots of sessions"""
+
+    async def save(self, session_id: str, user_id: str, image: bytes) -> str:
+        """Store a screenshot taken in a session
+
+        Args:
+            session_id: Session the screenshot was taken in
+            user_id: ID of the user owning the session
+            image: Screenshot as returned by Browser.screenshot
+
+        Returns:
+            File ID of the stored screenshot, the previous one of the session
+            if both frames are identical
+        """
+        ...
+
+    async def release(self, session_id: str) -> None:
+        """Forget the screenshot history of a finished session"""
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        """Get dedup, upload and size statistics"""
+        ...
@@ -35,6 +35,10 @@ class SessionRepository(Protocol):
         """Add an event to a session"""
         ...
     
+    async def update_event(self, session_id: str, event: BaseEvent) -> None:
+        """Replace an event of a session, matched by event ID"""
+        ...
+    
     async def add_file(self, session_id: str, file_info: FileInfo) -> None:
         """Add a file to a session"""
         ...
@@ -43,6 +47,10 @@ class SessionRepository(Protocol):
         """Remove a file from a session"""
         ...
 
+    async def remove_file_by_path(self, session_id: str, file_path: str) -> None:
+        """Remove a file from a session by its sandbox path"""
+        ...
+
     async def get_file_by_path(self, session_id: str, file_path: str) -> Optional[FileInfo]:
         """Get file by path from a session"""
         ...
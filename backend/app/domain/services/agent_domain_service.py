@@ -5,6 +5,8 @@ from datetime import datetime
 from app.domain.models.session import Session, SessionStatus
 from app.domain.external.llm import LLM
 from app.domain.external.sandbox import Sandbox
+from app.domain.external.sandbox_pool import SandboxPool
+from app.domain.external.screenshot import ScreenshotService
 from app.domain.external.search import SearchEngine
 from app.domain.models.event import BaseEvent, ErrorEvent, DoneEvent, MessageEvent, WaitEvent, AgentEvent
 from pydantic import TypeAdapter
@@ -37,16 +39,20 @@ class AgentDomainService:
         file_storage: FileStorage,
         mcp_repository: MCPRepository,
         search_engine: Optional[SearchEngine] = None,
+        sandbox_pool: Optional[SandboxPool] = None,
+        screenshot_service: Optional[ScreenshotService] = None,
     ):
         self._repository = agent_repository
         self._session_repository =session_repository
         self._llm = llm
         self._sandbox_cls = sandbox_cls
+        self._sandbox_pool = sandbox_pool
         self._search_engine = search_engine
         self._task_cls = task_cls
         self._json_parser = json_parser
         self._file_storage = file_storage
         self._mcp_repository = mcp_repository
+        self._screenshot_service = screenshot_service
         logger.info("AgentDomainService initialization completed")
             
     async def shutdown(self) -> None:
@@ -62,14 +68,19 @@ class AgentDomainService:
         if sandbox_id:
             sandbox = await self._sandbox_cls.get(sandbox_id)
         if not sandbox:
-            sandbox = await self._sandbox_cls.create()
+            start = time.monotonic()
+            if self._sandbox_pool:
+                sandbox = await self._sandbox_pool.claim()
+            if not sandbox:
+                sandbox = await self._sandbox_cls.create()
+            logger.info(f"Acquired Sandbox {sandbox.id} for Session {session.id} in {time.monotonic() - start:.3f}s")
             session.sandbox_id = sandbox.id
             await self._session_repository.save(session)
         
         # Browser is optional - only available if sandbox supports it
         browser = None
         if sandbox.supports_browser():
-            browser = await sandbox.get_browser()
+            browser = await sandbox.get_browser(session.id)
             if not browser:
                 logger.error(f"Failed to get browser for Sandbox {sandbox_id}")
                 raise RuntimeError(f"Failed to get browser for Sandbox {sandbox_id}")
@@ -91,6 +102,7 @@ class AgentDomainService:
             json_parser=self._json_parser,
             agent_repository=self._repository,
             mcp_repository=self._mcp_repository,
+            screenshot_service=self._screenshot_service,
         )
 
         task = self._task_cls.create(task_runner)
@@ -1,5 +1,6 @@
-from typing import Optional, AsyncGenerator, List
+from typing import Optional, AsyncGenerator, Dict, List
 import asyncio
+import io
 import logging
 from pydantic import TypeAdapter
 from app.domain.models.message import Message
@@ -26,6 +27,7 @@ from app.domain.external.browser import Browser
 from app.domain.external.search import SearchEngine
 from app.domain.external.llm import LLM
 from app.domain.external.file import FileStorage
+from app.domain.external.screenshot import ScreenshotService
 from app.domain.repositories.agent_repository import AgentRepository
 from app.domain.external.task import TaskRunner, Task
 from app.domain.repositories.session_repository import SessionRepository
@@ -55,6 +57,7 @@ class AgentTaskRunner(TaskRunner):
         file_storage: FileStorage,
         mcp_repository: MCPRepository,
         search_engine: Optional[SearchEngine] = None,
+        screenshot_service: Optional[ScreenshotService] = None,
     ):
         self._session_id = session_id
         self._agent_id = agent_id
@@ -68,6 +71,12 @@ class AgentTaskRunner(TaskRunner):
         self._json_parser = json_parser
         self._file_storage = file_storage
         self._mcp_repository = mcp_repository
+        self._screenshot_service = screenshot_service
+        # Screenshots taken for tool calls, uploaded once their event is emitted
+        self._screenshots: Dict[str, bytes] = {}
+        self._screenshot_uploads: List[asyncio.Task] = []
+        # Set when the agent waits for the user, who may take over the browser
+        self._waiting = False
         self._mcp_tool = MCPTool()
         self._flow = PlanActFlow(
             self._agent_id,
@@ -83,9 +92,16 @@ class AgentTaskRunner(TaskRunner):
         )
 
     async def _put_and_add_event(self, task: Task, event: AgentEvent) -> None:
+        # Screenshot updates of earlier tool events go out before this event
+        await self._flush_screenshot_uploads()
         event_id = await task.output_stream.put(event.model_dump_json())
         event.id = event_id
         await self._session_repository.add_event(self._session_id, event)
+        if isinstance(event, ToolEvent) and event.tool_call_id in self._screenshots:
+            screenshot = self._screenshots.pop(event.tool_call_id)
+            self._screenshot_uploads.append(
+                asyncio.create_task(self._attach_browser_screenshot(task, event, screenshot))
+            )
     
     async def _pop_event(self, task: Task) -> AgentEvent:
         event_id, event_str = await task.input_stream.pop()
@@ -96,22 +112,69 @@ class AgentTaskRunner(TaskRunner):
         event.id = event_id
         return event
     
-    async def _get_browser_screenshot(self) -> str:
-        screenshot = await self._browser.screenshot()
-        result = await self._file_storage.upload_file(screenshot, "screenshot.png", self._user_id)
+    async def _store_browser_screenshot(self, screenshot: bytes) -> str:
+        if self._screenshot_service:
+            return await self._screenshot_service.save(self._session_id, self._user_id, screenshot)
+        result = await self._file_storage.upload_file(io.BytesIO(screenshot), "screenshot.png", self._user_id)
         return result.file_id
 
+    async def _attach_browser_screenshot(self, task: Task, event: ToolEvent, screenshot: bytes) -> None:
+        """Upload the screenshot of an emitted tool event, then update the stored event and re-emit it"""
+        try:
+            event.tool_content = BrowserToolContent(screenshot=await self._store_browser_screenshot(screenshot))
+            await self._session_repository.update_event(self._session_id, event)
+            # Clients merge tool events with the same tool_call_id
+            await task.output_stream.put(event.model_dump_json())
+        except Exception as e:
+            logger.exception(f"Agent {self._agent_id} failed to upload browser screenshot: {e}")
+
+    async def _flush_screenshot_uploads(self) -> None:
+        """Wait for screenshot uploads started for earlier events"""
+        uploads, self._screenshot_uploads = self._screenshot_uploads, []
+        if uploads:
+            await asyncio.gather(*uploads)
+
+    async def _get_sandbox_file_hash(self, file_path: str) -> Optional[str]:
+        """Get the SHA-256 of a sandbox file, or None if it cannot be computed"""
+        try:
+            result = await self._sandbox.file_hash(file_path)
+            if result.success and result.data:
+                return result.data.get("sha256")
+        except Exception as e:
+            logger.warning(f"Agent {self._agent_id} failed to hash file {file_path}: {e}")
+        return None
+    
     async def _sync_file_to_storage(self, file_path: str) -> Optional[FileInfo]:
         """Upload or update file and return FileInfo"""
         try:
-            file_info = await self._session_repository.get_file_by_path(self._session_id, file_path)
-            file_data = await self._sandbox.file_download(file_path)
-            if file_info:
-                await self._session_repository.remove_file(self._session_id, file_info.file_id)
+            old_file_info = await self._session_repository.get_file_by_path(self._session_id, file_path)
             file_name = file_path.split("/")[-1]
-            file_info = await self._file_storage.upload_file(file_data, file_name, self._user_id)
+            sha256 = await self._get_sandbox_file_hash(file_path)
+            if sha256 and old_file_info and (old_file_info.metadata or {}).get("sha256") == sha256:
+                # Content unchanged since the last sync
+                return old_file_info
+            
+            file_info = None
+            if sha256:
+                file_info = await self._file_storage.find_file_by_hash(sha256, self._user_id, file_name)
+            # Share the identical blob instead of uploading it again
+            if file_info and not await self._file_storage.share_file(file_info.file_id, self._user_id):
+                # Deleted since it was found
+                file_info = None
+            if not file_info:
+                # Pipe the sandbox download straight into storage, chunk by chunk
+                file_info = await self._file_storage.upload_file_stream(
+                    self._sandbox.file_download_stream(file_path), file_name, self._user_id
+                )
+            if old_file_info:
+                # Remove by path, the blob may be shared with other session files
+                await self._session_repository.remove_file_by_path(self._session_id, file_path)
             file_info.file_path = file_path
             await self._session_repository.add_file(self._session_id, file_info)
+            if old_file_info:
+                # Give back the replaced entry's reference. The same blob may
+                # have just been shared again, which leaves it one reference.
+                await self._file_storage.delete_file(old_file_info.file_id, self._user_id)
             return file_info
         except Exception as e:
             logger.exception(f"Agent {self._agent_id} failed to sync file: {e}")
@@ -119,9 +182,9 @@ class AgentTaskRunner(TaskRunner):
     async def _sync_file_to_sandbox(self, file_id: str) -> Optional[FileInfo]:
         """Download file from storage to sandbox"""
         try:
-            file_data, file_info = await self._file_storage.download_file(file_id, self._user_id)
+            chunks, file_info = await self._file_storage.download_file_stream(file_id, self._user_id)
             file_path = "/home/ubuntu/upload/" + file_info.filename
-            result = await self._sandbox.file_upload(file_data, file_path)
+            result = await self._sandbox.file_upload_stream(chunks, file_path)
             if result.success:
                 file_info.file_path = file_path
                 return file_info
@@ -150,7 +213,10 @@ class AgentTaskRunner(TaskRunner):
                     file_info = await self._sync_file_to_sandbox(attachment.file_id)
                     if file_info:
                         attachments.append(file_info)
-                        await self._session_repository.add_file(self._session_id, file_info)
+                        # The session entry holds its own reference, given
+                        # back when a later sync replaces it
+                        if await self._file_storage.share_file(file_info.file_id, self._user_id):
+                            await self._session_repository.add_file(self._session_id, file_info)
             event.attachments = attachments
         except Exception as e:
             logger.exception(f"Agent {self._agent_id} failed to sync attachments to event: {e}")
@@ -162,7 +228,8 @@ class AgentTaskRunner(TaskRunner):
         try:
             if event.status == ToolStatus.CALLED:
                 if event.tool_name == "browser":
-                    event.tool_content = BrowserToolContent(screenshot=await self._get_browser_screenshot())
+                    # Uploaded in the background once the event is emitted
+                    self._screenshots[event.tool_call_id] = await self._browser.screenshot()
                 elif event.tool_name == "search":
                     search_results: ToolResult[SearchResults] = event.function_result
                     logger.debug(f"Search tool results: {search_results}")
@@ -234,10 +301,12 @@ class AgentTaskRunner(TaskRunner):
                         await self._session_repository.increment_unread_message_count(self._session_id)
                     elif isinstance(event, WaitEvent):
                         await self._session_repository.update_status(self._session_id, SessionStatus.WAITING)
+                        self._waiting = True
                         return
                     if not await task.input_stream.is_empty():
                         break
 
+            await self._flush_screenshot_uploads()
             await self._session_repository.update_status(self._session_id, SessionStatus.COMPLETED)
         except asyncio.CancelledError:
             logger.info(f"Agent {self._agent_id} task cancelled")
@@ -269,12 +338,31 @@ class AgentTaskRunner(TaskRunner):
     async def on_done(self, task: Task) -> None:
         """Called when the task is done"""
         logger.info(f"Agent {self._agent_id} task done")
+        # A waiting session keeps its browser for the user and the next task,
+        # which releases it once the session has ended
+        if self._waiting:
+            return
+        try:
+            await self._release_session_resources()
+        except Exception as e:
+            logger.exception(f"Agent {self._agent_id} failed to release session resources: {e}")
 
+    async def _release_session_resources(self) -> None:
+        """Release what the session holds in resources shared with other sessions"""
+        # Close the session's browser context, the sandbox's browser may be shared
+        if self._browser:
+            logger.debug(f"Releasing Agent {self._agent_id}'s browser context")
+            await self._browser.cleanup()
+        
+        if self._screenshot_service:
+            await self._screenshot_service.release(self._session_id)
 
     async def destroy(self) -> None:
         """Destroy the task and release resources"""
         logger.info(f"Starting to destroy agent task")
         
+        await self._release_session_resources()
+        
         # Destroy sandbox environment
         if self._sandbox:
             logger.debug(f"Destroying Agent {self._agent_id}'s sandbox environment")
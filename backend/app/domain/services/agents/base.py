@@ -82,51 +82,103 @@ class BaseAgent(ABC):
         
         return ToolResult(success=False, message=last_error)
     
+    def _is_concurrency_safe(self, tool_call: Dict[str, Any]) -> bool:
+        function_name = tool_call.get("function", {}).get("name")
+        try:
+            return self.get_tool(function_name).is_concurrency_safe(function_name)
+        except ValueError:
+            return False
+
+    def _select_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Select the tool calls of a response to run
+        
+        Only the first call is kept, unless the LLM returns parallel tool
+        calls and it's concurrency safe, then the concurrency-safe calls up to
+        the first one that isn't are kept. The rest are asked for again in
+        the next turn.
+        """
+        if not self.llm.parallel_tool_calls or not self._is_concurrency_safe(tool_calls[0]):
+            return tool_calls[:1]
+        selected = []
+        for tool_call in tool_calls:
+            if not self._is_concurrency_safe(tool_call):
+                break
+            selected.append(tool_call)
+        return selected
+
+    def _batch_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group consecutive concurrency-safe calls, other calls run alone"""
+        batches = []
+        for tool_call in tool_calls:
+            if batches and tool_call["concurrency_safe"] and batches[-1][-1]["concurrency_safe"]:
+                batches[-1].append(tool_call)
+            else:
+                batches.append([tool_call])
+        return batches
+
     async def execute(self, request: str, format: Optional[str] = None) -> AsyncGenerator[BaseEvent, None]:
         format = format or self.format
         message = await self.ask(request, format)
         for _ in range(self.max_iterations):
             if not message.get("tool_calls"):
                 break
-            tool_responses = []
+            tool_calls = []
             for tool_call in message["tool_calls"]:
                 if not tool_call.get("function"):
                     continue
                 
                 function_name = tool_call["function"]["name"]
-                tool_call_id = tool_call["id"] or str(uuid.uuid4())
-                function_args = await self.json_parser.parse(tool_call["function"]["arguments"])
-                
                 tool = self.get_tool(function_name)
+                tool_calls.append({
+                    "tool_call_id": tool_call["id"] or str(uuid.uuid4()),
+                    "tool": tool,
+                    "function_name": function_name,
+                    "function_args": await self.json_parser.parse(tool_call["function"]["arguments"]),
+                    "concurrency_safe": tool.is_concurrency_safe(function_name),
+                })
 
-                # Generate event before tool call
-                yield ToolEvent(
-                    status=ToolStatus.CALLING,
-                    tool_call_id=tool_call_id,
-                    tool_name=tool.name,
-                    function_name=function_name,
-                    function_args=function_args
-                )
+            tool_responses = []
+            for batch in self._batch_tool_calls(tool_calls):
+                # Start every call of the batch, then report them one at a time,
+                # so each call's CALLING event is directly followed by its CALLED event
+                tasks = [
+                    asyncio.create_task(self.invoke_tool(call["tool"], call["function_name"], call["function_args"]))
+                    for call in batch
+                ]
+                try:
+                    for call, task in zip(batch, tasks):
+                        # Generate event before tool call
+                        yield ToolEvent(
+                            status=ToolStatus.CALLING,
+                            tool_call_id=call["tool_call_id"],
+                            tool_name=call["tool"].name,
+                            function_name=call["function_name"],
+                            function_args=call["function_args"]
+                        )
 
-                result = await self.invoke_tool(tool, function_name, function_args)
-                
-                # Generate event after tool call
-                yield ToolEvent(
-                    status=ToolStatus.CALLED,
-                    tool_call_id=tool_call_id,
-                    tool_name=tool.name,
-                    function_name=function_name,
-                    function_args=function_args,
-                    function_result=result
-                )
-
-                tool_response = {
-                    "role": "tool",
-                    "function_name": function_name,
-                    "tool_call_id": tool_call_id,
-                    "content": result.model_dump_json()
-                }
-                tool_responses.append(tool_response)
+                        result = await task
+
+                        # Generate event after tool call
+                        yield ToolEvent(
+                            status=ToolStatus.CALLED,
+                            tool_call_id=call["tool_call_id"],
+                            tool_name=call["tool"].name,
+                            function_name=call["function_name"],
+                            function_args=call["function_args"],
+                            function_result=result
+                        )
+
+                        tool_response = {
+                            "role": "tool",
+                            "function_name": call["function_name"],
+                            "tool_call_id": call["tool_call_id"],
+                            "content": result.model_dump_json()
+                        }
+                        tool_responses.append(tool_response)
+                finally:
+                    # The consumer stopped early, don't leave calls running
+                    for task in tasks:
+                        task.cancel()
 
             message = await self.ask_with_messages(tool_responses)
         else:
@@ -180,7 +232,7 @@ class BaseAgent(ABC):
                     "content": message.get("content"),
                 }
                 if message.get("tool_calls"):
-                    filtered_message["tool_calls"] = message.get("tool_calls")[:1]
+                    filtered_message["tool_calls"] = self._select_tool_calls(message.get("tool_calls"))
             else:
                 logger.warning(f"Unknown message role: {message.get('role')}")
                 filtered_message = message
@@ -6,7 +6,8 @@ def tool(
     name: str, 
     description: str,
     parameters: Dict[str, Dict[str, Any]],
-    required: List[str]
+    required: List[str],
+    concurrency_safe: bool = False
 ) -> Callable:
     """Tool registration decorator
     
@@ -15,6 +16,8 @@ def tool(
         description: Tool description
         parameters: Tool parameter definitions
         required: List of required parameters
+        concurrency_safe: Whether the tool has no side effects, so calls to it
+            can run concurrently with each other
         
     Returns:
         Decorator function
@@ -38,6 +41,7 @@ def tool(
         func._function_name = name
         func._tool_description = description
         func._tool_schema = schema
+        func._concurrency_safe = concurrency_safe
         
         return func
     
@@ -83,6 +87,20 @@ class BaseTool:
                 return True
         return False
     
+    def is_concurrency_safe(self, function_name: str) -> bool:
+        """Check if calls to specified function can run concurrently
+        
+        Args:
+            function_name: Function name
+            
+        Returns:
+            Whether the function is registered as concurrency safe
+        """
+        for _, method in inspect.getmembers(self, inspect.ismethod):
+            if hasattr(method, '_function_name') and method._function_name == function_name:
+                return method._concurrency_safe
+        return False
+    
     def _filter_parameters(self, method: Callable, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Filter parameters to match method signature
         
@@ -4,7 +4,9 @@ from app.domain.services.tools.base import tool, BaseTool
 from app.domain.models.tool_result import ToolResult
 from app.infrastructure.loggers import logger
 import os
-import json
+
+# Maximum matches returned by a single content search
+MAX_SEARCH_RESULTS = 200
 
 class FileTool(BaseTool):
     """File tool class using OpenHands SDK file_editor
@@ -42,7 +44,8 @@ class FileTool(BaseTool):
                 "items": {"type": "integer"}
             }
         },
-        required=["path"]
+        required=["path"],
+        concurrency_safe=True
     )
     async def file_view(
         self,
@@ -67,14 +70,8 @@ class FileTool(BaseTool):
             if view_range:
                 args["view_range"] = view_range
             
-            # Execute file_editor inside sandbox
-            cmd = f"python3 /openhands/tools/file_editor_cli.py '{json.dumps(args)}'"
-            result = await self.sandbox.exec_command_stateful(
-                command=cmd,
-                session_id="default"
-            )
-            
-            return result
+            # Execute in the sandbox's resident file_editor
+            return await self.sandbox.file_editor(**args)
             
         except Exception as e:
             logger.error(f"file_view failed: {str(e)}")
@@ -119,13 +116,8 @@ class FileTool(BaseTool):
                 "file_text": file_text
             }
             
-            cmd = f"python3 /openhands/tools/file_editor_cli.py '{json.dumps(args)}'"
-            result = await self.sandbox.exec_command_stateful(
-                command=cmd,
-                session_id="default"
-            )
-            
-            return result
+            # Execute in the sandbox's resident file_editor
+            return await self.sandbox.file_editor(**args)
             
         except Exception as e:
             logger.error(f"file_create failed: {str(e)}")
@@ -177,13 +169,8 @@ class FileTool(BaseTool):
                 "new_str": new_str
             }
             
-            cmd = f"python3 /openhands/tools/file_editor_cli.py '{json.dumps(args)}'"
-            result = await self.sandbox.exec_command_stateful(
-                command=cmd,
-                session_id="default"
-            )
-            
-            return result
+            # Execute in the sandbox's resident file_editor
+            return await self.sandbox.file_editor(**args)
             
         except Exception as e:
             logger.error(f"file_str_replace failed: {str(e)}")
@@ -194,44 +181,66 @@ class FileTool(BaseTool):
     
     @tool(
         name="file_find_in_content",
-        description="Search for matching text within file content. Use for finding specific content or patterns in files.",
+        description="Search for matching text within a file or across all files under a directory. Skips binary, hidden and .gitignore'd files. Use for finding specific content, definitions or usages in files and code repositories.",
         parameters={
             "file": {
                 "type": "string",
-                "description": "Absolute path of the file to search within"
+                "description": "Absolute path of the file or directory to search within"
             },
             "regex": {
                 "type": "string",
                 "description": "Regular expression pattern to match"
             },
+            "glob": {
+                "type": "string",
+                "description": "(Optional) Only search files matching this glob when searching a directory, e.g. *.py"
+            },
+            "case_sensitive": {
+                "type": "boolean",
+                "description": "(Optional) Whether matching is case sensitive. Default is True."
+            },
             "sudo": {
                 "type": "boolean",
-                "description": "(Optional) Whether to use sudo privileges"
+                "description": "(Optional) Whether to use sudo privileges, only supported for a single file"
             }
         },
-        required=["file", "regex"]
+        required=["file", "regex"],
+        concurrency_safe=True
     )
     async def file_find_in_content(
         self,
         file: str,
         regex: str,
+        glob: Optional[str] = None,
+        case_sensitive: Optional[bool] = True,
         sudo: Optional[bool] = False
     ) -> ToolResult:
-        """Search for matching text in file content
+        """Search for matching text in a file or directory tree
         
         Args:
-            file: Absolute path of the file to search
+            file: Absolute path of the file or directory to search
             regex: Regular expression pattern for matching
+            glob: (Optional) Filename glob filter for directory searches
+            case_sensitive: (Optional) Whether matching is case sensitive
             sudo: (Optional) Whether to use sudo privileges
             
         Returns:
             Search results
         """
-        # Directly call sandbox's file_search method
-        return await self.sandbox.file_search(
-            file=file,
+        if sudo:
+            # Privileged reads are only supported by the single file search
+            return await self.sandbox.file_search(
+                file=file,
+                regex=regex,
+                sudo=sudo
+            )
+        
+        return await self.sandbox.file_grep(
+            path=file,
             regex=regex,
-            sudo=sudo
+            glob_pattern=glob,
+            case_sensitive=case_sensitive if case_sensitive is not None else True,
+            max_results=MAX_SEARCH_RESULTS
         )
     
     @tool(
@@ -247,7 +256,8 @@ class FileTool(BaseTool):
                 "description": "Filename pattern using glob syntax wildcards"
             }
         },
-        required=["path", "glob"]
+        required=["path", "glob"],
+        concurrency_safe=True
     )
     async def file_find_by_name(
         self,
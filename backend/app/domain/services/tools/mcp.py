@@ -1,13 +1,18 @@
 import os
+import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from contextlib import AsyncExitStack
 
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
-from mcp.types import Tool as MCPTool
+from mcp.types import Tool as MCPTool, ServerNotification, ToolListChangedNotification
 
 from app.domain.services.tools.base import BaseTool, tool
 from app.domain.models.tool_result import ToolResult
@@ -15,16 +20,278 @@ from app.domain.models.mcp_config import MCPConfig, MCPServerConfig
 
 logger = logging.getLogger(__name__)
 
+# 单个服务器连接和初始化的超时（秒），慢或不可用的服务器最多拖慢会话启动这么久
+CONNECT_TIMEOUT = 30
+# 连接失败后在此时间内直接报错而不再重试（秒）
+FAILURE_BACKOFF = 60
+# 工具列表缓存有效期（秒），收到 tools/list_changed 通知时立即失效
+TOOLS_CACHE_TTL = 300
+# 没有会话使用后连接保持打开的时间（秒）
+IDLE_TIMEOUT = 300
+
+
+def server_config_key(server_config: MCPServerConfig) -> str:
+    """根据连接相关的配置生成服务器哈希，配置相同的服务器共享一个连接"""
+    data = server_config.model_dump(mode="json", exclude={"enabled", "description"})
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+class MCPServerConnection:
+    """共享的 MCP 服务器连接
+    
+    连接由一个后台任务打开并持有：MCP SDK 的传输基于 anyio 任务组，
+    必须在进入它的同一个任务中退出，而使用它的会话来来去去。
+    """
+    
+    def __init__(self, server_name: str, server_config: MCPServerConfig):
+        self.key = server_config_key(server_config)
+        self.name = server_name
+        self.refs = 0
+        self.session: Optional[ClientSession] = None
+        self.closed = False
+        self.failed_at: Optional[float] = None
+        self._config = server_config
+        self._ready: Optional[asyncio.Future] = None
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._idle_timer: Optional[asyncio.TimerHandle] = None
+        self._tools: Optional[List[MCPTool]] = None
+        self._tools_fetched_at = 0.0
+        self._tools_lock = asyncio.Lock()
+        self.tools_fetches = 0
+    
+    def start(self):
+        """在后台开始连接"""
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run())
+    
+    async def wait_ready(self, timeout: float):
+        """等待连接完成，连接失败时抛出其异常"""
+        await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+    
+    def close(self):
+        """关闭连接，由后台任务退出传输"""
+        self._stop.set()
+    
+    async def _run(self):
+        try:
+            async with AsyncExitStack() as stack:
+                read_stream, write_stream = await self._open_transport(stack)
+                session = await stack.enter_async_context(
+                    ClientSession(read_stream, write_stream, message_handler=self._handle_message)
+                )
+                try:
+                    with anyio.fail_after(CONNECT_TIMEOUT):
+                        await session.initialize()
+                except Exception as e:
+                    # 在关闭传输之前报告失败，关闭进程可能还需要几秒
+                    self._fail(e)
+                    raise
+                self.session = session
+                self._ready.set_result(None)
+                logger.info(f"成功连接到 {self._config.transport.value} MCP 服务器: {self.name}")
+                await self._stop.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._fail(e)
+            elif self.failed_at is None and not self._stop.is_set():
+                logger.warning(f"MCP 服务器 {self.name} 连接已断开: {e}")
+        finally:
+            if not self._ready.done():
+                self._fail(ConnectionError(f"连接 MCP 服务器 {self.name} 已取消"))
+            self.session = None
+            self.closed = True
+    
+    def _fail(self, error: Exception):
+        # anyio 任务组把单个异常包装为异常组
+        while len(getattr(error, "exceptions", ())) == 1:
+            error = error.exceptions[0]
+        self.failed_at = time.monotonic()
+        self._ready.set_exception(error)
+        # 没有等待者时也不报告未取得的异常
+        self._ready.exception()
+    
+    async def _open_transport(self, stack: AsyncExitStack) -> Tuple[Any, Any]:
+        """按传输类型打开连接，返回读写流"""
+        server_name = self.name
+        server_config = self._config
+        transport_type = server_config.transport
+        
+        if transport_type == 'stdio':
+            command = server_config.command
+            if not command:
+                raise ValueError(f"服务器 {server_name} 缺少 command 配置")
+            
+            # 创建服务器参数（路径处理已在配置提供者中完成）
+            server_params = StdioServerParameters(
+                command=command,
+                args=server_config.args or [],
+                env={**os.environ, **(server_config.env or {})}
+            )
+            return await stack.enter_async_context(stdio_client(server_params))
+        
+        url = server_config.url
+        if not url:
+            raise ValueError(f"服务器 {server_name} 缺少 url 配置")
+        
+        if transport_type == 'http' or transport_type == 'sse':
+            return await stack.enter_async_context(sse_client(url))
+        
+        if transport_type == 'streamable-http':
+            # 添加自定义 headers
+            client_params = {"url": url}
+            if server_config.headers:
+                client_params["headers"] = server_config.headers
+            streamable_transport = await stack.enter_async_context(
+                streamablehttp_client(**client_params)
+            )
+            # 解包返回的流和可选的第三个参数
+            return streamable_transport[0], streamable_transport[1]
+        
+        raise ValueError(f"不支持的传输类型: {transport_type}")
+    
+    async def _handle_message(self, message: Any):
+        """处理服务器主动发来的消息"""
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            logger.info(f"MCP 服务器 {self.name} 的工具列表已变更")
+            self._tools = None
+    
+    async def list_tools(self) -> List[MCPTool]:
+        """获取工具列表，在缓存有效期内不重复请求"""
+        async with self._tools_lock:
+            expired = time.monotonic() - self._tools_fetched_at > TOOLS_CACHE_TTL
+            if self._tools is None or expired:
+                if self.session is None:
+                    raise ConnectionError(f"MCP 服务器 {self.name} 未连接")
+                tools_response = await self.session.list_tools()
+                self._tools = tools_response.tools if tools_response else []
+                self._tools_fetched_at = time.monotonic()
+                self.tools_fetches += 1
+            return self._tools
+    
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """调用服务器上的工具"""
+        if self.session is None:
+            raise ConnectionError(f"MCP 服务器 {self.name} 未连接")
+        return await self.session.call_tool(tool_name, arguments)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "server": self.name,
+            "transport": self._config.transport.value,
+            "connected": self.session is not None,
+            "failed": self.failed_at is not None,
+            "sessions": self.refs,
+            "tools": len(self._tools) if self._tools is not None else None,
+            "tools_fetches": self.tools_fetches,
+        }
+
+
+class MCPConnectionPool:
+    """进程内共享的 MCP 服务器连接池
+    
+    按服务器配置哈希复用连接，会话开始时不必再启动服务器、初始化和获取
+    工具列表。连接失败的服务器在 FAILURE_BACKOFF 内直接报错，不再让每个
+    会话都等待它超时。
+    """
+    
+    def __init__(self):
+        self._connections: Dict[str, MCPServerConnection] = {}
+        self._hits = 0
+        self._misses = 0
+        self._failed_fast = 0
+    
+    async def acquire(
+        self,
+        server_name: str,
+        server_config: MCPServerConfig,
+        timeout: Optional[float] = None
+    ) -> MCPServerConnection:
+        """获取服务器连接，必要时在后台建立连接并等待最多 timeout 秒"""
+        key = server_config_key(server_config)
+        connection = self._connections.get(key)
+        if connection is not None and connection.failed_at is not None:
+            if time.monotonic() - connection.failed_at < FAILURE_BACKOFF:
+                self._failed_fast += 1
+            else:
+                connection = None
+        elif connection is not None and connection.closed:
+            # 连接断开，重新连接
+            connection = None
+        
+        if connection is None:
+            connection = MCPServerConnection(server_name, server_config)
+            connection.start()
+            self._connections[key] = connection
+            self._misses += 1
+        elif connection.failed_at is None:
+            self._hits += 1
+        
+        connection.refs += 1
+        if connection._idle_timer is not None:
+            connection._idle_timer.cancel()
+            connection._idle_timer = None
+        try:
+            await connection.wait_ready(CONNECT_TIMEOUT if timeout is None else timeout)
+        except BaseException:
+            self.release(connection)
+            raise
+        return connection
+    
+    def release(self, connection: MCPServerConnection):
+        """会话不再使用连接，空闲超过 IDLE_TIMEOUT 后关闭"""
+        connection.refs -= 1
+        if connection.refs > 0 or connection.closed:
+            return
+        connection._idle_timer = asyncio.get_running_loop().call_later(
+            IDLE_TIMEOUT, self._close_idle, connection
+        )
+    
+    def _close_idle(self, connection: MCPServerConnection):
+        connection._idle_timer = None
+        if connection.refs > 0:
+            return
+        if self._connections.get(connection.key) is connection:
+            del self._connections[connection.key]
+        connection.close()
+    
+    async def close_all(self):
+        """关闭所有连接"""
+        connections = list(self._connections.values())
+        self._connections.clear()
+        for connection in connections:
+            if connection._idle_timer is not None:
+                connection._idle_timer.cancel()
+            connection.close()
+        await asyncio.gather(
+            *(c._task for c in connections if c._task is not None),
+            return_exceptions=True
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取连接复用和工具列表缓存统计"""
+        acquired = self._hits + self._misses
+        return {
+            "connections": [c.stats() for c in self._connections.values()],
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / acquired if acquired else None,
+            "failed_fast": self._failed_fast,
+        }
+
+
+mcp_connection_pool = MCPConnectionPool()
+
 
 class MCPClientManager:
     """MCP 客户端管理器"""
     
-    def __init__(self, config: Optional[MCPConfig] = None):
-        self._clients: Dict[str, ClientSession] = {}
-        self._exit_stack = AsyncExitStack()
+    def __init__(self, config: Optional[MCPConfig] = None, pool: Optional[MCPConnectionPool] = None):
+        self._clients: Dict[str, MCPServerConnection] = {}
         self._tools_cache: Dict[str, List[MCPTool]] = {}
         self._initialized = False
         self._config = config
+        self._pool = pool or mcp_connection_pool
     
     async def initialize(self):
         """初始化 MCP 客户端管理器"""
@@ -46,171 +313,35 @@ class MCPClientManager:
 
     
     async def _connect_servers(self):
-        """连接到所有启用的 MCP 服务器"""
-        for server_name, server_config in self._config.mcpServers.items():
-            if not server_config.enabled:
-                continue
-                
-            try:
-                await self._connect_server(server_name, server_config)
-            except Exception as e:
-                logger.error(f"连接到 MCP 服务器 {server_name} 失败: {e}")
-                # 继续连接其他服务器
-                continue
-    
-    async def _connect_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到单个 MCP 服务器"""
-        try:
-            transport_type = server_config.transport
-            
-            if transport_type == 'stdio':
-                await self._connect_stdio_server(server_name, server_config)
-            elif transport_type == 'http' or transport_type == 'sse':
-                await self._connect_http_server(server_name, server_config)
-            elif transport_type == 'streamable-http':
-                await self._connect_streamable_http_server(server_name, server_config)
-            else:
-                logger.error(f"不支持的传输类型: {transport_type}")
-                
-        except Exception as e:
-            logger.error(f"连接 MCP 服务器 {server_name} 失败: {e}")
-            raise
-    
-    async def _connect_stdio_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到 stdio MCP 服务器"""
-        command = server_config.command
-        args = server_config.args or []
-        env = server_config.env or {}
-        
-        if not command:
-            raise ValueError(f"服务器 {server_name} 缺少 command 配置")
-        
-
-        # 创建服务器参数（路径处理已在配置提供者中完成）
-        server_params = StdioServerParameters(
-            command=command,
-            args=args,
-            env={**os.environ, **env}
+        """并发连接到所有启用的 MCP 服务器，每个服务器单独超时"""
+        servers = [
+            (server_name, server_config)
+            for server_name, server_config in self._config.mcpServers.items()
+            if server_config.enabled
+        ]
+        results = await asyncio.gather(
+            *(self._connect_server(server_name, server_config) for server_name, server_config in servers),
+            return_exceptions=True
         )
-        
-        try:
-            # 建立连接
-            stdio_transport = await self._exit_stack.enter_async_context(
-                stdio_client(server_params)
-            )
-            read_stream, write_stream = stdio_transport
-            
-            # 创建会话
-            session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            
-            # 初始化会话
-            await session.initialize()
-            
-            # 缓存客户端
-            self._clients[server_name] = session
-            
-            # 获取并缓存工具列表
-            await self._cache_server_tools(server_name, session)
-            
-            logger.info(f"成功连接到 stdio MCP 服务器: {server_name}")
-            
-        except Exception as e:
-            logger.error(f"连接到 stdio MCP 服务器 {server_name} 失败: {e}")
-            raise
+        for (server_name, _), result in zip(servers, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.error(f"连接到 MCP 服务器 {server_name} 超时")
+            elif isinstance(result, Exception):
+                # 继续使用其他服务器
+                logger.error(f"连接到 MCP 服务器 {server_name} 失败: {result}")
     
-    async def _connect_http_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到 HTTP MCP 服务器"""
-        url = server_config.url
-        if not url:
-            raise ValueError(f"服务器 {server_name} 缺少 url 配置")
-        
-        try:
-            # 建立 SSE 连接
-            sse_transport = await self._exit_stack.enter_async_context(
-                sse_client(url)
-            )
-            read_stream, write_stream = sse_transport
-            
-            # 创建会话
-            session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            
-            # 初始化会话
-            await session.initialize()
-            
-            # 缓存客户端
-            self._clients[server_name] = session
-            
-            # 获取并缓存工具列表
-            await self._cache_server_tools(server_name, session)
-            
-            logger.info(f"成功连接到 HTTP MCP 服务器: {server_name}")
-            
-        except Exception as e:
-            logger.error(f"连接到 HTTP MCP 服务器 {server_name} 失败: {e}")
-            raise
-    
-    async def _connect_streamable_http_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到 streamable-http MCP 服务器
-        
-        配置选项：
-        - url: 服务器 URL (必需)
-        - headers: 自定义 HTTP 头 (可选)
-        """
-        url = server_config.url
-        if not url:
-            raise ValueError(f"服务器 {server_name} 缺少 url 配置")
-        
-        # 获取可选配置
-        headers = server_config.headers or {}
+    async def _connect_server(self, server_name: str, server_config: MCPServerConfig):
+        """从连接池获取单个 MCP 服务器的连接"""
+        connection = await self._pool.acquire(server_name, server_config)
+        self._clients[server_name] = connection
         
-        try:
-            # 准备连接参数
-            client_params = {"url": url}
-            
-            # 添加自定义 headers
-            if headers:
-                client_params["headers"] = headers
-            
-            # 建立 streamable-http 连接
-            streamable_transport = await self._exit_stack.enter_async_context(
-                streamablehttp_client(**client_params)
-            )
-            
-            # 解包返回的流和可选的第三个参数
-            if len(streamable_transport) == 3:
-                read_stream, write_stream, _ = streamable_transport
-            else:
-                read_stream, write_stream = streamable_transport
-            
-            # 创建 MCP 会话
-            session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            
-            # 初始化会话
-            await session.initialize()
-            
-            # 缓存客户端
-            self._clients[server_name] = session
-            
-            # 获取并缓存工具列表
-            await self._cache_server_tools(server_name, session)
-            
-            logger.info(f"成功连接到 streamable-http MCP 服务器: {server_name} ({url})")
-            
-        except Exception as e:
-            logger.error(f"连接到 streamable-http MCP 服务器 {server_name} 失败: {e}")
-            raise
+        # 获取并缓存工具列表
+        await self._cache_server_tools(server_name, connection)
     
-    async def _cache_server_tools(self, server_name: str, session: ClientSession):
+    async def _cache_server_tools(self, server_name: str, connection: MCPServerConnection):
         """缓存服务器工具列表"""
         try:
-            tools_response = await session.list_tools()
-            tools = tools_response.tools if tools_response else []
+            tools = await connection.list_tools()
             self._tools_cache[server_name] = tools
             logger.info(f"服务器 {server_name} 提供 {len(tools)} 个工具")
             
@@ -218,6 +349,24 @@ class MCPClientManager:
             logger.error(f"获取服务器 {server_name} 工具列表失败: {e}")
             self._tools_cache[server_name] = []
     
+    async def refresh_tools(self):
+        """刷新工具列表，只有缓存过期或服务器通知变更时才会重新请求"""
+        for server_name, connection in list(self._clients.items()):
+            if connection.closed:
+                await self._reconnect_server(server_name)
+            else:
+                await self._cache_server_tools(server_name, connection)
+    
+    async def _reconnect_server(self, server_name: str) -> Optional[MCPServerConnection]:
+        """连接断开后重新获取连接"""
+        self._pool.release(self._clients.pop(server_name))
+        self._tools_cache.pop(server_name, None)
+        try:
+            await self._connect_server(server_name, self._config.mcpServers[server_name])
+        except Exception as e:
+            logger.error(f"重新连接 MCP 服务器 {server_name} 失败: {e}")
+        return self._clients.get(server_name)
+    
     async def get_all_tools(self) -> List[Dict[str, Any]]:
         """获取所有 MCP 工具"""
         all_tools = []
@@ -261,16 +410,18 @@ class MCPClientManager:
             if not server_name or not original_tool_name:
                 raise ValueError(f"无法解析 MCP 工具名称: {tool_name}")
             
-            # 获取客户端会话
-            session = self._clients.get(server_name)
-            if not session:
+            # 获取服务器连接，断开时重新连接
+            connection = self._clients.get(server_name)
+            if connection and connection.closed:
+                connection = await self._reconnect_server(server_name)
+            if not connection:
                 return ToolResult(
                     success=False,
                     message=f"MCP 服务器 {server_name} 未连接"
                 )
             
             # 调用工具
-            result = await session.call_tool(original_tool_name, arguments)
+            result = await connection.call_tool(original_tool_name, arguments)
             
             # 处理结果
             if result:
@@ -302,7 +453,9 @@ class MCPClientManager:
     async def cleanup(self):
         """清理资源"""
         try:
-            await self._exit_stack.aclose()
+            # 连接留在连接池中供其他会话使用
+            for connection in self._clients.values():
+                self._pool.release(connection)
             self._clients.clear()
             self._tools_cache.clear()
             self._initialized = False
@@ -321,14 +474,17 @@ class MCPTool(BaseTool):
         super().__init__()
         self._initialized = False
         self._tools = []
+        self.manager: Optional[MCPClientManager] = None
     
     async def initialized(self, config: Optional[MCPConfig] = None):
-        """确保管理器已初始化"""
+        """确保管理器已初始化，之后每次调用按缓存刷新工具列表"""
         if not self._initialized:
             self.manager = MCPClientManager(config)
             await self.manager.initialize()
-            self._tools = await self.manager.get_all_tools()
             self._initialized = True
+        else:
+            await self.manager.refresh_tools()
+        self._tools = await self.manager.get_all_tools()
 
     def get_tools(self) -> List[Dict[str, Any]]:
         """获取同步工具定义（基础工具）"""
@@ -31,7 +31,8 @@ class SearchTool(BaseTool):
                 "description": "(Optional) Time range filter for search results."
             }
         },
-        required=["query"]
+        required=["query"],
+        concurrency_safe=True
     )
     async def info_search_web(
         self,
@@ -115,7 +115,8 @@ class ShellTool(BaseTool):
                 "description": "Unique identifier of the target shell session"
             }
         },
-        required=["id"]
+        required=["id"],
+        concurrency_safe=True
     )
     async def shell_view(self, id: str) -> ToolResult:
         """View Shell session content
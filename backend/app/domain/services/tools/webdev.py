@@ -908,7 +908,8 @@ class WebDevTool(BaseTool):
                 "description": "Optional session filter. If not provided, lists from all sessions."
             }
         },
-        required=[]
+        required=[],
+        concurrency_safe=True
     )
     async def list_servers(self, session_id: Optional[str] = None) -> ToolResult:
         """
@@ -975,7 +976,8 @@ class WebDevTool(BaseTool):
                 "description": "Number of last lines to return (default: 50). Use -1 for all logs."
             }
         },
-        required=["pid"]
+        required=["pid"],
+        concurrency_safe=True
     )
     async def get_server_logs(
         self,
@@ -30,7 +30,8 @@ class WebSearchTool(BaseTool):
                 "description": "The search query. Be specific and clear about what information you need."
             }
         },
-        required=["query"]
+        required=["query"],
+        concurrency_safe=True
     )
     async def web_search(self, query: str) -> ToolResult:
         """Search the web for information
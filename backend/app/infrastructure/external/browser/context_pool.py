@@ -0,0 +1,250 @@
+"""
+Browser context pool
+
+One CDP connection per sandbox browser, shared by every PlaywrightBrowser
+using it, instead of a new Playwright driver and connection per task. Each
+session gets its own browser context, so cookies, storage and cache don't
+leak between sessions sharing a sandbox. A few spare contexts are kept
+open with a blank page, so a new session starts browsing without waiting
+for one, and browser_restart swaps in a fresh context instead of
+reconnecting.
+
+Requests for blocked resource categories (fonts, media, ad and tracking
+hosts) are refused inside Chrome with Network.setBlockedURLs, so blocking
+costs no round trip to the backend.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CONNECT_RETRIES = 5
+BLOCKED_URL_PATTERNS = {
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m4v*", "*.mov*", "*.mp3*", "*.m4a*", "*.wav*", "*.ogg*", "*.m3u8*"],
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "ads": [
+        "*doubleclick.net/*",
+        "*googlesyndication.com/*",
+        "*googleadservices.com/*",
+        "*google-analytics.com/*",
+        "*googletagmanager.com/*",
+        "*adservice.google.*",
+        "*amazon-adsystem.com/*",
+        "*adnxs.com/*",
+        "*criteo.com/*",
+        "*criteo.net/*",
+        "*taboola.com/*",
+        "*outbrain.com/*",
+        "*scorecardresearch.com/*",
+        "*hotjar.com/*",
+        "*connect.facebook.net/*",
+    ],
+}
+
+
+def blocked_url_patterns(categories: Iterable[str]) -> List[str]:
+    """Get the URL patterns blocking the given resource categories"""
+    patterns = []
+    for category in categories:
+        category = category.strip()
+        if not category:
+            continue
+        if category not in BLOCKED_URL_PATTERNS:
+            logger.warning(f"Ignoring unknown resource category to block: {category}")
+            continue
+        patterns.extend(BLOCKED_URL_PATTERNS[category])
+    return patterns
+
+
+class BrowserContextPool:
+    """Shared CDP connection to a sandbox browser with one context per session"""
+
+    def __init__(self, cdp_url: str, size: int = 1, blocked_urls: Iterable[str] = ()):
+        self._cdp_url = cdp_url
+        self._size = size
+        self._blocked_urls = list(blocked_urls)
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        self._spare: List[BrowserContext] = []
+        self._sessions: Dict[str, BrowserContext] = {}
+        self._refill_task: Optional[asyncio.Task] = None
+        self._connects = 0
+        self._hits = 0
+        self._misses = 0
+        self._resets = 0
+
+    async def _connect(self) -> Browser:
+        """Get the CDP connection, connecting again if it was lost"""
+        async with self._connect_lock:
+            if self._browser and self._browser.is_connected():
+                return self._browser
+            await self._disconnect()
+            return await self._open_connection()
+
+    async def _open_connection(self) -> Browser:
+        """Connect over CDP, retrying with exponential backoff while the browser starts"""
+        retry_delay = 1
+        for attempt in range(CONNECT_RETRIES):
+            try:
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.connect_over_cdp(self._cdp_url)
+                self._connects += 1
+                return self._browser
+            except Exception as e:
+                await self._disconnect()
+                if attempt == CONNECT_RETRIES - 1:
+                    raise
+                retry_delay = min(retry_delay * 2, 10)
+                logger.warning(f"Connecting to {self._cdp_url} failed, will retry in {retry_delay} seconds: {e}")
+                await asyncio.sleep(retry_delay)
+
+    async def _disconnect(self) -> None:
+        # Contexts of a lost connection can't be used again
+        self._spare.clear()
+        self._sessions.clear()
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = None
+        try:
+            if browser:
+                # Only disconnects, the sandbox's Chrome keeps running
+                await browser.close()
+            if playwright:
+                await playwright.stop()
+        except Exception as e:
+            logger.warning(f"Error disconnecting from {self._cdp_url}: {e}")
+
+    async def _block_resources(self, context: BrowserContext, page: Page) -> None:
+        try:
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.setBlockedURLs", {"urls": self._blocked_urls})
+        except Exception as e:
+            logger.warning(f"Failed to block resources in {page.url}: {e}")
+
+    async def _new_context(self) -> BrowserContext:
+        """Open an isolated context with a blank page"""
+        browser = await self._connect()
+        # Pages follow the sandbox's window size, like its default context
+        context = await browser.new_context(no_viewport=True)
+        page = await context.new_page()
+        if self._blocked_urls:
+            await self._block_resources(context, page)
+            # Tabs and popups opened later
+            context.on("page", lambda page: asyncio.create_task(self._block_resources(context, page)))
+        return context
+
+    def warm(self) -> None:
+        """Open spare contexts in the background, up to the pool size"""
+        if len(self._spare) >= self._size or (self._refill_task and not self._refill_task.done()):
+            return
+        self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        try:
+            while len(self._spare) < self._size:
+                context = await self._new_context()
+                async with self._lock:
+                    # Dropped if the connection was lost in the meantime
+                    if context.browser is self._browser:
+                        self._spare.append(context)
+        except Exception as e:
+            logger.warning(f"Failed to warm browser contexts for {self._cdp_url}: {e}")
+
+    async def acquire(self, session_id: str) -> BrowserContext:
+        """Get the context of a session, taking a spare one for a new session"""
+        async with self._lock:
+            await self._connect()
+            context = self._sessions.get(session_id)
+            if context is None:
+                if self._spare:
+                    context = self._spare.pop()
+                    self._hits += 1
+                else:
+                    context = await self._new_context()
+                    self._misses += 1
+                self._sessions[session_id] = context
+        self.warm()
+        return context
+
+    async def reset(self, session_id: str) -> BrowserContext:
+        """Replace the context of a session with a fresh one, dropping its storage"""
+        await self.release(session_id)
+        self._resets += 1
+        return await self.acquire(session_id)
+
+    async def release(self, session_id: str) -> None:
+        """Close the context of a session"""
+        async with self._lock:
+            context = self._sessions.pop(session_id, None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(f"Failed to close browser context of Session {session_id}: {e}")
+
+    async def close(self) -> None:
+        """Disconnect, dropping all contexts"""
+        if self._refill_task:
+            self._refill_task.cancel()
+        async with self._lock:
+            await self._disconnect()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get connection, spare context and hit rate statistics"""
+        acquired = self._hits + self._misses
+        return {
+            "connected": bool(self._browser and self._browser.is_connected()),
+            "connects": self._connects,
+            "sessions": len(self._sessions),
+            "spare": len(self._spare),
+            "target_size": self._size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / acquired if acquired else None,
+            "resets": self._resets,
+            "blocked_url_patterns": len(self._blocked_urls),
+        }
+
+
+class _BrowserContextPools:
+    """Context pools by CDP URL, one per sandbox browser"""
+
+    def __init__(self):
+        self._pools: Dict[str, BrowserContextPool] = {}
+
+    def get(self, cdp_url: str) -> BrowserContextPool:
+        pool = self._pools.get(cdp_url)
+        if pool is None:
+            settings = get_settings()
+            pool = BrowserContextPool(
+                cdp_url,
+                size=settings.browser_context_pool_size,
+                blocked_urls=blocked_url_patterns(settings.browser_block_resources.split(",")),
+            )
+            self._pools[cdp_url] = pool
+        return pool
+
+    async def close(self, cdp_url: str) -> None:
+        pool = self._pools.pop(cdp_url, None)
+        if pool is not None:
+            await pool.close()
+
+    async def close_all(self) -> None:
+        pools = list(self._pools.values())
+        self._pools.clear()
+        await asyncio.gather(*(pool.close() for pool in pools), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {cdp_url: pool.stats() for cdp_url, pool in self._pools.items()}
+
+
+browser_context_pools = _BrowserContextPools()
@@ -0,0 +1,84 @@
+"""
+Page extraction cache
+
+Keeps the LLM extraction of a page's visible content, keyed by the page URL
+and a hash of the Markdown sent to the LLM, so viewing an unchanged page
+again (a repeated view_page, a scroll that didn't move the viewport) skips
+the LLM call. Shared by all PlaywrightBrowser instances, since a new one is
+created for each browser tool call.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+
+
+class PageExtractionCache:
+    """LRU cache of page extractions with a time to live"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        # (url, content hash) -> (stored at, extracted content)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(url: str, markdown: str) -> Tuple[str, str]:
+        return url, hashlib.sha256(markdown.encode()).hexdigest()
+
+    def get(self, url: str, markdown: str) -> Optional[str]:
+        """Get the extraction of this content at this URL, counting the hit or miss"""
+        key = self.key(url, markdown)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self._ttl_seconds:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def put(self, url: str, markdown: str, content: str) -> None:
+        key = self.key(url, markdown)
+        self._entries[key] = (time.monotonic(), content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit rate statistics"""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else None,
+            "evictions": self._evictions,
+        }
+
+
+@lru_cache()
+def get_page_extraction_cache() -> Optional[PageExtractionCache]:
+    """Get the shared page extraction cache, None if disabled"""
+    settings = get_settings()
+    if settings.browser_extraction_cache_size <= 0:
+        return None
+    return PageExtractionCache(
+        max_entries=settings.browser_extraction_cache_size,
+        ttl_seconds=settings.browser_extraction_cache_ttl_seconds,
+    )
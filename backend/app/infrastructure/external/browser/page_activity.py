@@ -0,0 +1,123 @@
+"""
+Page activity
+
+Tells when a page has settled after a navigation, click or scroll, instead
+of sleeping for a fixed time:
+- network idle: at most NETWORK_IDLE_MAX_INFLIGHT requests in flight for
+  NETWORK_QUIET_SECONDS, counted from Playwright's request events, so
+  long-polling and analytics beacons don't hold it up
+- DOM quiescence: no mutations for DOM_QUIET_MS, seen by a
+  MutationObserver in the page
+
+Both are waited for together and bounded by a timeout, so a page that
+never settles costs at most that long.
+"""
+
+import asyncio
+import time
+from typing import Optional, Set
+
+from playwright.async_api import Page, Request
+
+NETWORK_IDLE_MAX_INFLIGHT = 2
+NETWORK_QUIET_SECONDS = 0.5
+DOM_QUIET_MS = 300
+
+DOM_QUIET_JS = r"""([quietMs, timeoutMs]) => new Promise((resolve) => {
+    let timer = null;
+    let deadline = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(deadline);
+        resolve(quiet);
+    };
+    observer.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    timer = setTimeout(() => done(true), quietMs);
+    deadline = setTimeout(() => done(false), timeoutMs);
+})"""
+
+
+class NetworkActivity:
+    """In-flight request counter of a page, fed by Playwright request events"""
+
+    def __init__(self, page: Page):
+        self._inflight: Set[Request] = set()
+        self._idle_since: Optional[float] = time.monotonic()
+        self._changed = asyncio.Event()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    @classmethod
+    def of(cls, page: Page) -> "NetworkActivity":
+        """Get the counter of a page, attaching one on first use"""
+        activity = getattr(page, "network_activity", None)
+        if activity is None:
+            activity = page.network_activity = cls(page)
+        return activity
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def _started(self, request: Request) -> None:
+        self._inflight.add(request)
+        if len(self._inflight) > NETWORK_IDLE_MAX_INFLIGHT:
+            self._idle_since = None
+        self._changed.set()
+
+    def _finished(self, request: Request) -> None:
+        self._inflight.discard(request)
+        if self._idle_since is None and len(self._inflight) <= NETWORK_IDLE_MAX_INFLIGHT:
+            self._idle_since = time.monotonic()
+        self._changed.set()
+
+    async def wait_for_idle(self, timeout: float, quiet: float = NETWORK_QUIET_SECONDS) -> bool:
+        """Wait until the network has been idle for the quiet period
+
+        Returns:
+            Whether the network became idle within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if self._idle_since is not None and now - self._idle_since >= quiet:
+                return True
+            remaining = deadline - now
+            if remaining <= 0:
+                return False
+            wait = remaining if self._idle_since is None else min(remaining, quiet - (now - self._idle_since))
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def wait_for_dom_quiet(page: Page, timeout: float, quiet_ms: int = DOM_QUIET_MS) -> bool:
+    """Wait until the page's DOM has not changed for quiet_ms"""
+    try:
+        return await page.evaluate(DOM_QUIET_JS, [quiet_ms, int(timeout * 1000)])
+    except Exception:
+        # Navigated away while waiting, the new document is waited for by the caller
+        return False
+
+
+async def wait_for_settle(page: Page, timeout: float) -> bool:
+    """Wait until the page's network is idle and its DOM quiet
+
+    Returns:
+        Whether the page settled within the timeout
+    """
+    if timeout <= 0:
+        return False
+    network_idle, dom_quiet = await asyncio.gather(
+        NetworkActivity.of(page).wait_for_idle(timeout),
+        wait_for_dom_quiet(page, timeout),
+    )
+    return network_idle and dom_quiet
@@ -0,0 +1,330 @@
+"""
+In-page view extraction
+
+VIEW_PAGE_JS walks the DOM once per page.evaluate and returns both the page
+content as Markdown and the indexed interactive elements in the viewport,
+without an LLM call.
+
+Content:
+- Main content detection: <main>, [role=main] or <article> when they hold
+  the text, otherwise the container with the highest paragraph score,
+  discounted by link density (readability style)
+- Boilerplate removal: scripts, navigation, forms, ARIA landmarks like
+  banner/contentinfo and nav/footer/sidebar/cookie/ads class or id names
+- Headings, paragraphs, lists, links (absolute URLs), images with alt
+  text, tables, code blocks and quotes are kept as Markdown
+- Content the page has been scrolled past is skipped, so scrolling moves
+  through long pages, and conversion stops at the character budget
+
+Interactive elements are tagged with data-manus-id for click/input.
+
+Cost:
+- Subtrees not rendered (display: none, content-visibility, opacity: 0)
+  are pruned with checkVisibility, instead of a getComputedStyle call per
+  element; bounding boxes are only read for interactive candidates and
+  content blocks
+- The result is kept in the page and returned again until a
+  MutationObserver sees a change, or the page is scrolled, resized or
+  typed into
+"""
+
+VIEW_PAGE_JS = r"""(maxChars) => {
+    let state = window.__manusViewState;
+    if (!state) {
+        state = window.__manusViewState = { dirty: true, maxChars: null, result: null, tagged: [] };
+        const invalidate = () => { state.dirty = true; };
+        new MutationObserver((records) => {
+            // Tagging interactive elements is not a change of the page
+            if (records.some(r => r.attributeName !== 'data-manus-id')) invalidate();
+        }).observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+        for (const type of ['scroll', 'resize', 'input', 'change']) {
+            window.addEventListener(type, invalidate, { capture: true, passive: true });
+        }
+    }
+    if (!state.dirty && state.result && state.maxChars === maxChars) {
+        return { ...state.result, cached: true };
+    }
+
+    const SKIP_TAGS = new Set([
+        'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'object',
+        'nav', 'footer', 'aside', 'form', 'button', 'select', 'input', 'textarea', 'dialog'
+    ]);
+    const PRUNE_TAGS = new Set(['script', 'style', 'noscript', 'template', 'head']);
+    const SKIP_ROLES = new Set([
+        'navigation', 'banner', 'contentinfo', 'complementary', 'menu', 'menubar',
+        'dialog', 'alertdialog', 'search', 'toolbar'
+    ]);
+    const BLOCK_TAGS = new Set([
+        'address', 'article', 'details', 'div', 'dl', 'dd', 'dt', 'fieldset', 'figure',
+        'figcaption', 'header', 'main', 'p', 'section', 'summary'
+    ]);
+    const BOILERPLATE = /(^|[-_\s])(nav|navbar|menu|footer|header|sidebar|breadcrumbs?|cookies?|consent|banner|advert|ads?|promo|social|share|newsletter|subscribe|related|comments?|popup|modal)([-_\s]|$)/i;
+    const CONTENT_HINT = /article|content|main|body|post|entry|text|story/i;
+    const INTERACTIVE = 'button, a, input, textarea, select, [role="button"], [tabindex]:not([tabindex="-1"])';
+    const viewportWidth = window.innerWidth;
+    const viewportHeight = window.innerHeight;
+
+    const linkDensity = (el) => {
+        const total = el.textContent.length;
+        if (!total) return 1;
+        let links = 0;
+        for (const a of el.querySelectorAll('a')) links += a.textContent.length;
+        return links / total;
+    };
+
+    const findRoot = () => {
+        let best = null;
+        for (const el of document.querySelectorAll('main, [role="main"], article')) {
+            const length = el.textContent.trim().length;
+            if (length > 200 && linkDensity(el) < 0.5 && (!best || length > best.textContent.length)) {
+                best = el;
+            }
+        }
+        if (best) return best;
+
+        const scores = new Map();
+        for (const p of document.body.querySelectorAll('p, pre, td, blockquote')) {
+            const text = p.textContent.trim();
+            if (text.length < 25) continue;
+            const score = 1 + text.split(',').length + Math.min(Math.floor(text.length / 100), 3);
+            const parent = p.parentElement;
+            const grandparent = parent && parent.parentElement;
+            if (parent) scores.set(parent, (scores.get(parent) || 0) + score);
+            if (grandparent) scores.set(grandparent, (scores.get(grandparent) || 0) + score / 2);
+        }
+        let bestScore = 0;
+        for (const [el, score] of scores) {
+            const adjusted = score * (1 - linkDensity(el));
+            if (adjusted > bestScore) {
+                best = el;
+                bestScore = adjusted;
+            }
+        }
+        // Not an article-like page, convert everything that isn't boilerplate
+        if (!best || best.textContent.trim().length < 500) return document.body;
+        return best;
+    };
+
+    const root = findRoot();
+    const elements = [];
+    for (const el of state.tagged) el.removeAttribute('data-manus-id');
+    state.tagged = [];
+    let used = 0;
+    const full = () => used >= maxChars;
+    const OUTSIDE = { content: false };
+
+    // Not rendered at all: nothing below can be content or clickable
+    const pruned = (el) => {
+        if (PRUNE_TAGS.has(el.localName)) return true;
+        const rendered = el.checkVisibility
+            ? el.checkVisibility({ opacityProperty: true })
+            : el.getClientRects().length > 0;
+        // display: contents has no box of its own, but its children do
+        return !rendered && getComputedStyle(el).display !== 'contents';
+    };
+
+    const boilerplate = (el) => {
+        const tag = el.localName;
+        if (SKIP_TAGS.has(tag)) return true;
+        if (tag === 'header' && root === document.body) return true;
+        if (el.getAttribute('aria-hidden') === 'true') return true;
+        const role = el.getAttribute('role');
+        if (role && SKIP_ROLES.has(role)) return true;
+        if (el !== root) {
+            const names = (typeof el.className === 'string' ? el.className : '') + ' ' + el.id;
+            if (BOILERPLATE.test(names) && !CONTENT_HINT.test(names)) return true;
+        }
+        // Already scrolled past
+        return BLOCK_TAGS.has(tag) && el !== root && el.getBoundingClientRect().bottom < 0;
+    };
+
+    const labelOf = (el) => {
+        if (el.id) {
+            const label = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+            if (label) return label.innerText.trim();
+        }
+        const parentLabel = el.closest('label');
+        return parentLabel ? parentLabel.innerText.trim() : '';
+    };
+
+    const describe = (el, tag) => {
+        let text;
+        if (el.value && ['input', 'textarea', 'select'].includes(tag)) {
+            text = el.value;
+            if (tag === 'input') {
+                const label = labelOf(el).replace(el.value, '').trim();
+                if (label) text = `[Label: ${label}] ${text}`;
+                if (el.placeholder) text = `${text} [Placeholder: ${el.placeholder}]`;
+            }
+        } else if (el.innerText) {
+            text = el.innerText.trim().replace(/\s+/g, ' ');
+        } else if (el.alt) {
+            text = el.alt;
+        } else if (el.title) {
+            text = el.title;
+        } else if (el.placeholder) {
+            text = `[Placeholder: ${el.placeholder}]`;
+        } else if (el.type) {
+            text = `[${el.type}]`;
+            if (tag === 'input') {
+                const label = labelOf(el);
+                if (label) text = `[Label: ${label}] ${text}`;
+                if (el.placeholder) text = `${text} [Placeholder: ${el.placeholder}]`;
+            }
+        } else {
+            text = '[No text]';
+        }
+        return text.length > 100 ? text.substring(0, 97) + '...' : text;
+    };
+
+    const collect = (el) => {
+        if (el.checkVisibility && !el.checkVisibility({ visibilityProperty: true })) return;
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 || rect.height === 0) return;
+        if (rect.bottom < 0 || rect.top > viewportHeight || rect.right < 0 || rect.left > viewportWidth) return;
+        const index = elements.length;
+        const tag = el.localName;
+        el.setAttribute('data-manus-id', `manus-element-${index}`);
+        state.tagged.push(el);
+        elements.push({ index, tag, text: describe(el, tag), selector: `[data-manus-id="manus-element-${index}"]` });
+    };
+
+    const children = (el, ctx) => {
+        let out = '';
+        for (const child of el.childNodes) {
+            // Past the budget, keep walking for interactive elements only
+            out += convert(child, full() ? OUTSIDE : ctx);
+        }
+        return out;
+    };
+
+    const list = (el, ctx) => {
+        const depth = ctx.depth || 0;
+        const indent = '  '.repeat(depth);
+        let out = '\n';
+        let number = 1;
+        for (const item of el.children) {
+            if (item.localName !== 'li') {
+                convert(item, OUTSIDE);
+                continue;
+            }
+            if (pruned(item)) continue;
+            if (item.matches(INTERACTIVE)) collect(item);
+            if (full() || boilerplate(item)) {
+                children(item, OUTSIDE);
+                continue;
+            }
+            const marker = el.localName === 'ol' ? `${number++}.` : '-';
+            const body = children(item, { ...ctx, depth: depth + 1 }).trim().replace(/\n\s*\n/g, '\n');
+            if (body) out += `${indent}${marker} ${body}\n`;
+        }
+        return out + '\n';
+    };
+
+    // Wrap inline text in a marker, keeping the surrounding whitespace outside it
+    const wrap = (raw, open, close) => {
+        const [, before, text, after] = raw.match(/^(\s*)([\s\S]*?)(\s*)$/);
+        return text ? before + open + text.replace(/\s+/g, ' ') + close + after : raw;
+    };
+
+    const cell = (el, ctx) => children(el, ctx).replace(/\s+/g, ' ').replace(/\|/g, '\\|').trim();
+
+    const table = (el, ctx) => {
+        const rows = [];
+        for (const row of el.rows) {
+            if (pruned(row)) continue;
+            if (full() || boilerplate(row)) {
+                children(row, OUTSIDE);
+                continue;
+            }
+            rows.push([...row.cells].map(c => pruned(c) ? '' : cell(c, ctx)));
+        }
+        if (!rows.length) return '';
+        const width = Math.max(...rows.map(r => r.length));
+        // Layout tables are converted as plain text
+        if (width < 2) return '\n\n' + rows.map(r => r.join(' ')).join('\n') + '\n\n';
+        const line = (r) => '| ' + [...r, ...Array(width - r.length).fill('')].join(' | ') + ' |';
+        const separator = '|' + ' --- |'.repeat(width);
+        return '\n\n' + [line(rows[0]), separator, ...rows.slice(1).map(line)].join('\n') + '\n\n';
+    };
+
+    const convert = (node, ctx) => {
+        if (node.nodeType === Node.TEXT_NODE) {
+            if (!ctx.content) return '';
+            const text = node.nodeValue.replace(/\s+/g, ' ');
+            used += text.length;
+            return text;
+        }
+        if (node.nodeType !== Node.ELEMENT_NODE || pruned(node)) return '';
+        const el = node;
+        const tag = el.localName;
+        if (el.matches(INTERACTIVE)) collect(el);
+
+        if (el === root) ctx = { content: true };
+        if (!ctx.content || boilerplate(el)) {
+            for (const child of el.children) convert(child, OUTSIDE);
+            return '';
+        }
+
+        switch (tag) {
+            case 'h1': case 'h2': case 'h3': case 'h4': case 'h5': case 'h6': {
+                const text = children(el, ctx).replace(/\s+/g, ' ').trim();
+                return text ? `\n\n${'#'.repeat(Number(tag[1]))} ${text}\n\n` : '';
+            }
+            case 'br':
+                return '\n';
+            case 'hr':
+                return '\n\n---\n\n';
+            case 'a': {
+                const text = children(el, ctx);
+                const href = el.getAttribute('href');
+                if (!href || href.startsWith('#') || href.startsWith('javascript:')) return text;
+                return wrap(text, '[', `](${el.href})`);
+            }
+            case 'img': {
+                const alt = (el.getAttribute('alt') || '').trim();
+                if (!alt) return '';
+                used += alt.length;
+                return `![${alt}](${el.src})`;
+            }
+            case 'strong': case 'b':
+                return wrap(children(el, ctx), '**', '**');
+            case 'em': case 'i':
+                return wrap(children(el, ctx), '_', '_');
+            case 'code': {
+                const text = el.textContent;
+                used += text.length;
+                return text.includes('\n') ? `\n\`\`\`\n${text}\n\`\`\`\n` : `\`${text}\``;
+            }
+            case 'pre': {
+                const text = el.textContent.replace(/\n$/, '');
+                used += text.length;
+                return `\n\n\`\`\`\n${text}\n\`\`\`\n\n`;
+            }
+            case 'blockquote': {
+                const text = children(el, ctx).trim();
+                return text ? '\n\n' + text.split('\n').map(l => `> ${l}`).join('\n') + '\n\n' : '';
+            }
+            case 'ul': case 'ol':
+                return list(el, ctx);
+            case 'table':
+                return table(el, ctx);
+            default: {
+                const text = children(el, ctx);
+                return BLOCK_TAGS.has(tag) ? `\n\n${text.trim()}\n\n` : text;
+            }
+        }
+    };
+
+    let content = convert(document.body, root === document.body ? { content: true } : OUTSIDE)
+        .replace(/[ \t]+\n/g, '\n')
+        .replace(/\n{3,}/g, '\n\n')
+        .trim();
+    const truncated = full();
+    if (content.length > maxChars) content = content.slice(0, maxChars);
+
+    state.result = { title: document.title, url: location.href, content, truncated, elements };
+    state.maxChars = maxChars;
+    state.dirty = false;
+    return { ...state.result, cached: false };
+}"""
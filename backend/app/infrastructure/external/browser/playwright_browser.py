@@ -1,9 +1,13 @@
 from typing import Dict, Any, Optional, List
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
 import asyncio
 import time
 from markdownify import markdownify
 from app.infrastructure.external.llm.openai_llm import OpenAILLM
+from app.infrastructure.external.browser.context_pool import browser_context_pools
+from app.infrastructure.external.browser.extraction_cache import get_page_extraction_cache
+from app.infrastructure.external.browser.page_activity import NetworkActivity, wait_for_settle
+from app.infrastructure.external.browser.page_extraction import VIEW_PAGE_JS
 from app.core.config import get_settings
 from app.domain.models.tool_result import ToolResult
 import logging
@@ -11,6 +15,8 @@ import logging
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+SETTLE_TIMEOUT = 3  # Seconds to wait for network and DOM to settle after the load event
+
 class PlaywrightBrowser:
     """Playwright client that provides specific implementation of browser operations
     
@@ -20,128 +26,69 @@ class PlaywrightBrowser:
     - Automatic error handling (popups, cookie banners, timeouts)
     """
     
-    def __init__(self, cdp_url: str):
+    def __init__(self, cdp_url: str, session_id: Optional[str] = None):
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self.playwright = None
         self.llm = OpenAILLM()
         self.settings = get_settings()
         self.cdp_url = cdp_url
+        # Sessions sharing a sandbox browser get isolated contexts
+        self.session_id = session_id or "default"
+        self.context_pool = browser_context_pools.get(cdp_url)
         
     async def initialize(self):
-        """Initialize and ensure resources are available"""
-        # Add retry logic
-        max_retries = 5
-        retry_delay = 1  # Initial wait 1 second
-        for attempt in range(max_retries):
-            try:
-                self.playwright = await async_playwright().start()
-                # Connect to existing Chrome instance
-                self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_url)
-                # Get all contexts
-                contexts = self.browser.contexts
-                if contexts and len(contexts[0].pages) == 1:
-                    # Check if it's the initial page (by URL)
-                    page = contexts[0].pages[0]
-                    page_url = await page.evaluate("window.location.href")
-                    if (
-                        page_url == "about:blank" or 
-                        page_url == "chrome://newtab/" or 
-                        page_url == "chrome://new-tab-page/" or 
-                        not page_url
-                    ):
-                        # Only use it when it's the initial page and only one tab
-                        self.page = page
-                    else:
-                        # Not the initial page, create a new page
-                        self.page = await contexts[0].new_page()
-                else:
-                    # Create a new page in other cases
-                    context = contexts[0] if contexts else await self.browser.new_context()
-                    self.page = await context.new_page()
-                return True
-            except Exception as e:
-                # Clean up failed resources
-                await self.cleanup()
-                
-                # Return error if maximum retry count is reached
-                if attempt == max_retries - 1:
-                    logger.error(f"Initialization failed (retried {max_retries} times): {e}")
-                    return False
-                
-                # Otherwise increase waiting time (exponential backoff strategy)
-                retry_delay = min(retry_delay * 2, 10)  # Maximum wait 10 seconds
-                logger.warning(f"Initialization failed, will retry in {retry_delay} seconds: {e}")
-                await asyncio.sleep(retry_delay)
-
-    async def cleanup(self):
-        """Clean up Playwright resources, first close all tabs, then close the browser"""
+        """Initialize and ensure resources are available
+        
+        Takes the session's context from the sandbox's context pool, over
+        the pool's shared CDP connection, and uses its rightmost tab.
+        """
         try:
-            # If browser exists, first close all tabs
-            if self.browser:
-                # Get all contexts
-                contexts = self.browser.contexts
-                if contexts:
-                    for context in contexts:
-                        # Get all pages in the context
-                        pages = context.pages
-                        # Close all pages
-                        for page in pages:
-                            # Avoid closing self.page multiple times
-                            if page != self.page or (self.page and not self.page.is_closed()):
-                                await page.close()
-            
-            # Ensure the current page is closed (if it exists and is not closed)
-            if self.page and not self.page.is_closed():
-                await self.page.close()
-                
-            # Close the browser
-            if self.browser:
-                await self.browser.close()
-                
-            # Stop playwright
-            if self.playwright:
-                await self.playwright.stop()
-                
+            self.context = await self.context_pool.acquire(self.session_id)
+            self.browser = self.context.browser
+            pages = self.context.pages
+            self.page = pages[-1] if pages else await self.context.new_page()
+            return True
         except Exception as e:
-            logger.error(f"Error occurred when cleaning up resources: {e}")
-        finally:
-            # Reset references
-            self.page = None
-            self.browser = None
-            self.playwright = None
+            logger.error(f"Initialization failed: {e}")
+            await self.cleanup()
+            return False
+
+    async def cleanup(self):
+        """Close the session's context when the session's task ends
+        
+        The CDP connection stays open for other sessions.
+        """
+        self.page = None
+        self.context = None
+        self.browser = None
+        await self.context_pool.release(self.session_id)
     
     async def _ensure_browser(self):
         """Ensure the browser is started"""
-        if not self.browser or not self.page:
+        if not self.browser or not self.page or not self.browser.is_connected():
             if not await self.initialize():
                 raise Exception("Unable to initialize browser resources")
     
     async def _ensure_page(self):
         """Ensure the page is created and update to the current active tab (rightmost tab)"""
         await self._ensure_browser()
-        if not self.page:
-            self.page = await self.browser.new_page()
-        else:
-            # Get all contexts
-            contexts = self.browser.contexts
-            if contexts:
-                # Get all pages in the current context
-                current_context = contexts[0]
-                pages = current_context.pages
-                
-                if pages:
-                    # Get the rightmost tab (usually the most recently opened page)
-                    rightmost_page = pages[-1]
-                    
-                    # Update if the current page is not the rightmost tab
-                    if self.page != rightmost_page:
-                        # Update to the rightmost tab
-                        self.page = rightmost_page
+        pages = self.context.pages
+        if not pages:
+            self.page = await self.context.new_page()
+        elif self.page != pages[-1]:
+            # Get the rightmost tab (usually the most recently opened page)
+            self.page = pages[-1]
+        # Count the page's requests from now on, for network idle detection
+        NetworkActivity.of(self.page)
     
     async def wait_for_page_load(self, timeout: int = 15) -> bool:
         """Wait for the page to finish loading, waiting up to the specified timeout
         
+        Waits for the load event, then up to SETTLE_TIMEOUT for the network to
+        go idle and the DOM to stop changing, so content rendered by scripts
+        after load is there too.
+        
         Args:
             timeout: Maximum wait time (seconds), default is 15 seconds
             
@@ -150,26 +97,51 @@ class PlaywrightBrowser:
         """
         await self._ensure_page()
         
-        start_time = time.monotonic()  # ✅ Fixed: using time.monotonic()
-        check_interval = 5  # Check every 5 seconds
+        deadline = time.monotonic() + timeout
+        try:
+            # Returns at once if the page has already loaded
+            await self.page.wait_for_load_state("load", timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
+            return False
+        
+        # Best effort, the page has loaded either way
+        await wait_for_settle(self.page, min(SETTLE_TIMEOUT, deadline - time.monotonic()))
+        return True
+    
+    async def _snapshot(self) -> Dict[str, Any]:
+        """Walk the page once for its Markdown content and interactive elements
         
-        while time.monotonic() - start_time < timeout:
-            # Check if the page has completely loaded
-            is_loaded = await self.page.evaluate("""() => {
-                return document.readyState === 'complete';
-            }""")
-            
-            if is_loaded:
-                return True
-                
-            # Wait for a while before checking again
-            await asyncio.sleep(check_interval)
+        The result is kept in the page until the DOM changes or the page is
+        scrolled, so repeated views of an unchanged page skip the walk.
+        Updates the interactive elements cache used by click and input.
+        """
+        snapshot = await self.page.evaluate(VIEW_PAGE_JS, self.settings.browser_extraction_max_chars)
+        self.page.interactive_elements_cache = snapshot["elements"]
+        return snapshot
+    
+    async def _extract_content(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """Extract content from the current page as Markdown
         
-        # Timeout, page loading not completed
-        return False
+        Converts the page's main content locally, reusing the snapshot when
+        given, or has the LLM rewrite the visible content when
+        browser_extraction_mode is "llm".
+        """
+        if self.settings.browser_extraction_mode == "llm":
+            return await self._extract_content_llm()
+        
+        if snapshot is None:
+            snapshot = await self._snapshot()
+        content = snapshot["content"]
+        if not content and self.settings.browser_extraction_llm_fallback:
+            logger.info(f"No content extracted locally, falling back to LLM: {snapshot['url']}")
+            return await self._extract_content_llm()
+        if snapshot["truncated"]:
+            max_chars = self.settings.browser_extraction_max_chars
+            content += f"\n\n[Content truncated at {max_chars} characters, scroll down to read more]"
+        return content
     
-    async def _extract_content(self) -> Dict[str, Any]:
-        """Extract content from the current page"""
+    async def _extract_content_llm(self) -> str:
+        """Extract content from the current page's viewport with the LLM"""
 
         # Execute JavaScript to get elements in the viewport    
         visible_content = await self.page.evaluate("""() => {
@@ -223,17 +195,31 @@ class PlaywrightBrowser:
         markdown_content = markdownify(visible_content)
 
         max_content_length = min(50000, len(markdown_content))
+        markdown_content = markdown_content[:max_content_length]
+
+        # Same visible content at the same URL extracts to the same result
+        cache = get_page_extraction_cache()
+        url = self.page.url
+        if cache is not None:
+            cached = cache.get(url, markdown_content)
+            if cached is not None:
+                logger.debug(f"Page extraction cache hit: {url}")
+                return cached
+
         response = await self.llm.ask([{
             "role": "system",
             "content": "You are a professional web page information extraction assistant. Please extract all information from the current page content and convert it to Markdown format."
         },
         {
             "role": "user",
-            "content": markdown_content[:max_content_length]
+            "content": markdown_content
         }
         ])
         
-        return response.get("content", "")
+        content = response.get("content", "")
+        if cache is not None and content:
+            cache.put(url, markdown_content, content)
+        return content
     
     async def view_page(self) -> ToolResult:
         """View visible elements within the current page's viewport and convert to Markdown format"""
@@ -242,14 +228,14 @@ class PlaywrightBrowser:
         # Wait for the page to load completely, maximum wait 15 seconds
         await self.wait_for_page_load()
         
-        # First update the interactive elements cache
-        interactive_elements = await self._extract_interactive_elements()
+        # Content and interactive elements come from the same walk of the page
+        snapshot = await self._snapshot()
         
         return ToolResult(
             success=True,
             data={
-                "interactive_elements": interactive_elements,
-                "content": await self._extract_content(),
+                "interactive_elements": self._format_elements(snapshot["elements"]),
+                "content": await self._extract_content(snapshot),
             }
         )
     
@@ -260,156 +246,16 @@ class PlaywrightBrowser:
         # Clear the current page's cache to ensure we always get the latest list of elements
         self.page.interactive_elements_cache = []
         
-        # Execute JavaScript to get interactive elements in the viewport
-        interactive_elements = await self.page.evaluate("""() => {
-            const interactiveElements = [];
-            const viewportHeight = window.innerHeight;
-            const viewportWidth = window.innerWidth;
-            
-            // Get all potentially relevant interactive elements
-            const elements = document.querySelectorAll('button, a, input, textarea, select, [role="button"], [tabindex]:not([tabindex="-1"])');
-            
-            let validElementIndex = 0; // For generating consecutive indices
-            
-            for (let i = 0; i < elements.length; i++) {
-                const element = elements[i];
-                // Check if the element is in the viewport and visible
-                const rect = element.getBoundingClientRect();
-                
-                // Element must have some dimensions
-                if (rect.width === 0 || rect.height === 0) continue;
-                
-                // Element must be within the viewport
-                if (
-                    rect.bottom < 0 || 
-                    rect.top > viewportHeight ||
-                    rect.right < 0 || 
-                    rect.left > viewportWidth
-                ) continue;
-                
-                // Check if the element is visible (not hidden by CSS)
-                const style = window.getComputedStyle(element);
-                if (
-                    style.display === 'none' || 
-                    style.visibility === 'hidden' || 
-                    style.opacity === '0'
-                ) continue;
-                
-                
-                // Get element type and text
-                let tagName = element.tagName.toLowerCase();
-                let text = '';
-                
-                if (element.value && ['input', 'textarea', 'select'].includes(tagName)) {
-                    text = element.value;
-                    
-                    // Add label and placeholder information for input elements
-                    if (tagName === 'input') {
-                        // Get associated label text
-                        let labelText = '';
-                        if (element.id) {
-                            const label = document.querySelector(`label[for="${element.id}"]`);
-                            if (label) {
-                                labelText = label.innerText.trim();
-                            }
-                        }
-                        
-                        // Look for parent or sibling label
-                        if (!labelText) {
-                            const parentLabel = element.closest('label');
-                            if (parentLabel) {
-                                labelText = parentLabel.innerText.trim().replace(element.value, '').trim();
-                            }
-                        }
-                        
-                        // Add label information
-                        if (labelText) {
-                            text = `[Label: ${labelText}] ${text}`;
-                        }
-                        
-                        // Add placeholder information
-                        if (element.placeholder) {
-                            text = `${text} [Placeholder: ${element.placeholder}]`;
-                        }
-                    }
-                } else if (element.innerText) {
-                    text = element.innerText.trim().replace(/\\s+/g, ' ');
-                } else if (element.alt) { // For image buttons
-                    text = element.alt;
-                } else if (element.title) { // For elements with title
-                    text = element.title;
-                } else if (element.placeholder) { // For placeholder text
-                    text = `[Placeholder: ${element.placeholder}]`;
-                } else if (element.type) { // For input type
-                    text = `[${element.type}]`;
-                    
-                    // Add label and placeholder information for text-less input elements
-                    if (tagName === 'input') {
-                        // Get associated label text
-                        let labelText = '';
-                        if (element.id) {
-                            const label = document.querySelector(`label[for="${element.id}"]`);
-                            if (label) {
-                                labelText = label.innerText.trim();
-                            }
-                        }
-                        
-                        // Look for parent or sibling label
-                        if (!labelText) {
-                            const parentLabel = element.closest('label');
-                            if (parentLabel) {
-                                labelText = parentLabel.innerText.trim();
-                            }
-                        }
-                        
-                        // Add label information
-                        if (labelText) {
-                            text = `[Label: ${labelText}] ${text}`;
-                        }
-                        
-                        // Add placeholder information
-                        if (element.placeholder) {
-                            text = `${text} [Placeholder: ${element.placeholder}]`;
-                        }
-                    }
-                } else {
-                    text = '[No text]';
-                }
-                
-                // Maximum limit on text length to keep it clear
-                if (text.length > 100) {
-                    text = text.substring(0, 97) + '...';
-                }
-                
-                // Only add data-manus-id attribute to elements that meet the conditions
-                element.setAttribute('data-manus-id', `manus-element-${validElementIndex}`);
-                                                        
-                // Build selector - using only data-manus-id
-                const selector = `[data-manus-id="manus-element-${validElementIndex}"]`;
-                
-                // Add element information to the array
-                interactiveElements.push({
-                    index: validElementIndex,  // Use consecutive index
-                    tag: tagName,
-                    text: text,
-                    selector: selector
-                });
-                
-                validElementIndex++; // Increment valid element counter
-            }
-            
-            return interactiveElements;
-        }""")
-        
-        # Update cache
-        self.page.interactive_elements_cache = interactive_elements
-        
-        # Format element information in specified format
-        formatted_elements = []
-        for el in interactive_elements:
-            formatted_elements.append(f"{el['index']}:<{el['tag']}>{el['text']}</{el['tag']}>")
-        
-        return formatted_elements
+        snapshot = await self._snapshot()
+        return self._format_elements(snapshot["elements"])
+    
+    @staticmethod
+    def _format_elements(interactive_elements: List[Dict[str, Any]]) -> List[str]:
+        """Format element information as index:<tag>text</tag>"""
+        return [
+            f"{el['index']}:<{el['tag']}>{el['text']}</{el['tag']}>"
+            for el in interactive_elements
+        ]
     
     async def navigate(self, url: str, timeout: Optional[int] = 15000) -> ToolResult:
         """Navigate to the specified URL
@@ -436,8 +282,17 @@ class PlaywrightBrowser:
             return ToolResult(success=False, message=f"Failed to navigate to {url}: {str(e)}")
     
     async def restart(self, url: str) -> ToolResult:
-        """Restart the browser and navigate to the specified URL"""
-        await self.cleanup()
+        """Restart the browser and navigate to the specified URL
+        
+        Swaps the session's context for a fresh one from the pool, dropping
+        its tabs, cookies and storage, without reconnecting.
+        """
+        try:
+            self.context = await self.context_pool.reset(self.session_id)
+        except Exception as e:
+            return ToolResult(success=False, message=f"Failed to restart browser: {str(e)}")
+        self.browser = self.context.browser
+        self.page = self.context.pages[-1] if self.context.pages else await self.context.new_page()
         return await self.navigate(url)
 
     
@@ -489,14 +344,8 @@ class PlaywrightBrowser:
                 }""", element)
                 
                 if not is_visible:
-                    # Try to scroll to the element position
-                    await self.page.evaluate("""(element) => {
-                        if (element) {
-                            element.scrollIntoView({behavior: 'smooth', block: 'center'});
-                        }
-                    }""", element)
-                    # Wait for the element to become visible
-                    await asyncio.sleep(1)
+                    # Scroll to the element, returns once it is in view and stable
+                    await element.scroll_into_view_if_needed(timeout=5000)
                 
                 # Try to click the element
                 await element.click(timeout=5000)
@@ -675,7 +524,7 @@ class PlaywrightBrowser:
                     if is_visible:
                         await element.click(timeout=2000)
                         logger.info(f"Closed cookie banner using selector: {selector}")
-                        await asyncio.sleep(0.5)
+                        await self._wait_until_hidden(element)
                         break
             except Exception:
                 continue
@@ -700,10 +549,18 @@ class PlaywrightBrowser:
                     if is_visible:
                         await element.click(timeout=2000)
                         logger.info(f"Closed modal using selector: {selector}")
-                        await asyncio.sleep(0.3)
+                        await self._wait_until_hidden(element)
             except Exception:
                 continue
     
+    async def _wait_until_hidden(self, element, timeout: int = 1000) -> None:
+        """Wait for a closed popup to finish its closing animation"""
+        try:
+            await element.wait_for_element_state("hidden", timeout=timeout)
+        except Exception:
+            # Still visible or already detached, either way don't wait longer
+            pass
+    
     async def smart_scroll(
         self,
         direction: str = "down",
@@ -734,7 +591,7 @@ class PlaywrightBrowser:
         initial_height = await self.page.evaluate("document.body.scrollHeight")
         stats["content_height_start"] = initial_height
         
-        scroll_pause_time = 1.5  # Wait for content to load
+        scroll_settle_timeout = 1.5  # Maximum wait for content to load
         last_height = initial_height
         scrolls_without_change = 0
         max_scrolls_without_change = 3
@@ -748,8 +605,8 @@ class PlaywrightBrowser:
             
             stats["scrolls_performed"] += 1
             
-            # Wait for new content to load
-            await asyncio.sleep(scroll_pause_time)
+            # Wait for new content to load, returns early once nothing is loading
+            await wait_for_settle(self.page, scroll_settle_timeout)
             
             if check_for_new_content and direction == "down":
                 # Check if new content loaded
@@ -819,8 +676,8 @@ class PlaywrightBrowser:
                     wait_until="domcontentloaded"  # More forgiving than "load"
                 )
                 
-                # Wait a bit for JavaScript to initialize
-                await asyncio.sleep(1)
+                # Wait for JavaScript to render the page
+                await wait_for_settle(self.page, SETTLE_TIMEOUT)
                 
                 # Handle popups if requested
                 if handle_popups:
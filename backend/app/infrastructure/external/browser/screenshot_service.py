@@ -0,0 +1,170 @@
+"""
+Screenshot service
+
+Browser screenshots are taken as PNG for every browser tool call. Before
+they are stored they are:
+- downscaled to a maximum width
+- re-encoded as JPEG or WebP at a configured quality
+- compared with the session's previous screenshot by a perceptual hash
+  (dHash), identical frames reuse the stored file instead of a new upload
+- limited per session, the oldest screenshots are deleted from storage
+
+Image work runs in a worker thread. The history of each session is kept in
+memory, so retention only applies to screenshots stored by this process.
+"""
+
+import asyncio
+import io
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from PIL import Image
+
+from app.core.config import get_settings
+from app.domain.external.file import FileStorage
+from app.domain.external.screenshot import ScreenshotService
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+}
+HASH_SIZE = 16  # 256 bit hash, fine enough to tell apart small page changes
+
+
+def perceptual_hash(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair of a grayscale thumbnail"""
+    thumbnail = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = thumbnail.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+@dataclass
+class _SessionScreenshots:
+    """Screenshot history of one session"""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_hash: Optional[int] = None
+    last_file_id: Optional[str] = None
+    file_ids: Deque[str] = field(default_factory=deque)
+
+
+class PillowScreenshotService(ScreenshotService):
+    """ScreenshotService encoding with Pillow and storing in FileStorage"""
+
+    def __init__(
+        self,
+        file_storage: FileStorage,
+        format: str = "jpeg",
+        quality: int = 75,
+        max_width: int = 1280,
+        dedup_distance: int = 0,
+        retention: int = 50,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {format}")
+        self._file_storage = file_storage
+        self._format = format
+        self._quality = quality
+        self._max_width = max_width
+        self._dedup_distance = dedup_distance
+        self._retention = retention
+        self._sessions: Dict[str, _SessionScreenshots] = {}
+        self._saved = 0
+        self._deduplicated = 0
+        self._deleted = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def _prepare(self, image: bytes) -> Tuple[Image.Image, int]:
+        """Decode and downscale a screenshot and hash it"""
+        with Image.open(io.BytesIO(image)) as decoded:
+            frame = decoded.convert("RGB")
+        if self._max_width and frame.width > self._max_width:
+            height = max(1, round(frame.height * self._max_width / frame.width))
+            frame = frame.resize((self._max_width, height), Image.Resampling.LANCZOS)
+        return frame, perceptual_hash(frame)
+
+    def _encode(self, frame: Image.Image) -> bytes:
+        output = io.BytesIO()
+        if self._format == "png":
+            frame.save(output, format="PNG", optimize=True)
+        else:
+            frame.save(output, format=FORMATS[self._format][0], quality=self._quality)
+        return output.getvalue()
+
+    async def save(self, session_id: str, user_id: str, image: bytes) -> str:
+        frame, frame_hash = await asyncio.to_thread(self._prepare, image)
+        session = self._sessions.setdefault(session_id, _SessionScreenshots())
+        async with session.lock:
+            if (
+                self._dedup_distance >= 0
+                and session.last_file_id
+                and (frame_hash ^ session.last_hash).bit_count() <= self._dedup_distance
+            ):
+                self._deduplicated += 1
+                return session.last_file_id
+
+            data = await asyncio.to_thread(self._encode, frame)
+            file_info = await self._file_storage.upload_file(
+                io.BytesIO(data),
+                f"screenshot.{self._format}",
+                user_id,
+                content_type=FORMATS[self._format][1],
+                metadata={"session_id": session_id, "screenshot": True},
+            )
+            self._saved += 1
+            self._bytes_in += len(image)
+            self._bytes_out += len(data)
+            session.last_hash = frame_hash
+            session.last_file_id = file_info.file_id
+            session.file_ids.append(file_info.file_id)
+
+            while self._retention and len(session.file_ids) > self._retention:
+                expired = session.file_ids.popleft()
+                if await self._file_storage.delete_file(expired, user_id):
+                    self._deleted += 1
+                else:
+                    logger.warning(f"Failed to delete expired screenshot {expired} of Session {session_id}")
+            return file_info.file_id
+
+    async def release(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        captured = self._saved + self._deduplicated
+        return {
+            "format": self._format,
+            "sessions": len(self._sessions),
+            "saved": self._saved,
+            "deduplicated": self._deduplicated,
+            "dedup_rate": self._deduplicated / captured if captured else None,
+            "deleted": self._deleted,
+            "bytes_in": self._bytes_in,
+            "bytes_out": self._bytes_out,
+            "compression_ratio": self._bytes_out / self._bytes_in if self._bytes_in else None,
+        }
+
+
+@lru_cache()
+def get_screenshot_service() -> ScreenshotService:
+    """Get the shared screenshot service"""
+    from app.infrastructure.external.file.gridfsfile import get_file_storage
+    settings = get_settings()
+    return PillowScreenshotService(
+        get_file_storage(),
+        format=settings.browser_screenshot_format,
+        quality=settings.browser_screenshot_quality,
+        max_width=settings.browser_screenshot_max_width,
+        dedup_distance=settings.browser_screenshot_dedup_distance,
+        retention=settings.browser_screenshot_retention,
+    )
@@ -1,6 +1,7 @@
 import logging
 import io
-from typing import BinaryIO, Optional, Dict, Any, Tuple
+import hashlib
+from typing import BinaryIO, Optional, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorGridFSBucket
@@ -14,6 +15,19 @@ from functools import lru_cache
 logger = logging.getLogger(__name__)
 
 
+class _HashingReader:
+    """File-like wrapper that computes the SHA-256 of everything read through it"""
+    
+    def __init__(self, source: BinaryIO):
+        self._source = source
+        self.sha256 = hashlib.sha256()
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._source.read(size)
+        self.sha256.update(data)
+        return data
+
+
 class GridFSFileStorage(FileStorage):
     """MongoDB GridFS-based file storage implementation"""
     
@@ -28,6 +42,7 @@ class GridFSFileStorage(FileStorage):
         self.mongodb = mongodb
         self.bucket_name = bucket_name
         self.settings = get_settings()
+        self._hash_index_ready = False
     
     def _get_gridfs_bucket(self) -> AsyncIOMotorGridFSBucket:
         """Get async GridFS Bucket instance"""
@@ -46,6 +61,33 @@ class GridFSFileStorage(FileStorage):
         database = self.mongodb._client[self.settings.mongodb_database]
         return database[f"{self.bucket_name}.files"]
     
+    def _get_chunks_collection(self):
+        """Get chunks collection holding the file content"""
+        if not self.mongodb._client:
+            raise RuntimeError("MongoDB client not initialized. Call initialize() first.")
+        
+        database = self.mongodb._client[self.settings.mongodb_database]
+        return database[f"{self.bucket_name}.chunks"]
+    
+    async def _ensure_hash_index(self) -> None:
+        """Create the (user_id, sha256) index used for content deduplication"""
+        if self._hash_index_ready:
+            return
+        await self._get_files_collection().create_index(
+            [("metadata.user_id", 1), ("metadata.sha256", 1)],
+            name="user_id_sha256"
+        )
+        self._hash_index_ready = True
+    
+    async def _set_sha256(self, file_id: ObjectId, sha256: str, file_metadata: Dict[str, Any]) -> None:
+        """Record the content hash once the upload is complete"""
+        await self._ensure_hash_index()
+        await self._get_files_collection().update_one(
+            {"_id": file_id},
+            {"$set": {"metadata.sha256": sha256}}
+        )
+        file_metadata['sha256'] = sha256
+    
     def _create_file_info(self, file_info: Dict[str, Any], file_id: str) -> FileInfo:
         """Create FileInfo object from GridFS file metadata"""
         metadata = file_info.get('metadata', {})
@@ -83,11 +125,13 @@ class GridFSFileStorage(FileStorage):
                 file_metadata['contentType'] = content_type
             
             # Upload directly from file stream to avoid loading entire file into memory
+            reader = _HashingReader(file_data)
             file_id = await bucket.upload_from_stream(
                 filename,
-                file_data,
+                reader,
                 metadata=file_metadata
             )
+            await self._set_sha256(file_id, reader.sha256.hexdigest(), file_metadata)
             
             # Get file size (can be retrieved from GridFS if needed)
             files_collection = self._get_files_collection()
@@ -145,12 +189,143 @@ class GridFSFileStorage(FileStorage):
             logger.error(f"Failed to download file {file_id} for user {user_id}: {str(e)}")
             raise
     
-    async def delete_file(self, file_id: str, user_id: str) -> bool:
-        """Delete file"""
+    async def upload_file_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        user_id: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> FileInfo:
+        """Upload file to GridFS chunk by chunk from an async stream"""
+        grid_in = None
+        try:
+            bucket = self._get_gridfs_bucket()
+            
+            # Prepare metadata
+            file_metadata = {
+                'filename': filename,
+                'uploadDate': datetime.utcnow(),
+                'user_id': user_id,  # Store user_id in metadata
+                **(metadata or {})
+            }
+            
+            if content_type:
+                file_metadata['contentType'] = content_type
+            
+            grid_in = bucket.open_upload_stream(filename, metadata=file_metadata)
+            sha256 = hashlib.sha256()
+            file_size = 0
+            async for chunk in chunks:
+                if chunk:
+                    await grid_in.write(chunk)
+                    sha256.update(chunk)
+                    file_size += len(chunk)
+            await grid_in.close()
+            await self._set_sha256(grid_in._id, sha256.hexdigest(), file_metadata)
+            
+            logger.info(f"File streamed successfully: {filename} (ID: {grid_in._id}, {file_size} bytes) for user {user_id}")
+            
+            return FileInfo(
+                file_id=str(grid_in._id),
+                filename=filename,
+                size=file_size,
+                content_type=content_type,
+                upload_date=file_metadata['uploadDate'],
+                metadata=file_metadata,
+                user_id=user_id
+            )
+            
+        except Exception as e:
+            # Drop the chunks written so far
+            if grid_in is not None and not grid_in.closed:
+                try:
+                    await grid_in.abort()
+                except Exception:
+                    pass
+            logger.error(f"Failed to stream upload file {filename} for user {user_id}: {str(e)}")
+            raise
+    
+    async def download_file_stream(
+        self,
+        file_id: str,
+        user_id: Optional[str] = None
+    ) -> Tuple[AsyncIterator[bytes], FileInfo]:
+        """Download file by file ID as a stream of GridFS chunks"""
         try:
             bucket = self._get_gridfs_bucket()
             files_collection = self._get_files_collection()
             
+            # Convert ObjectId
+            try:
+                obj_id = ObjectId(file_id)
+            except Exception:
+                raise ValueError(f"Invalid file ID format: {file_id}")
+            
+            # Get file information and check user ownership
+            file_info = await files_collection.find_one({"_id": obj_id})
+            if not file_info:
+                raise FileNotFoundError(f"File not found with ID: {file_id}")
+            
+            # Check if file belongs to the user (skip check if user_id is None)
+            if user_id is not None:
+                file_user_id = file_info.get('metadata', {}).get('user_id')
+                if file_user_id != user_id:
+                    raise PermissionError(f"Access denied: file {file_id} does not belong to user {user_id}")
+            
+            grid_out = await bucket.open_download_stream(obj_id)
+            
+            async def iter_chunks() -> AsyncIterator[bytes]:
+                while True:
+                    chunk = await grid_out.readchunk()
+                    if not chunk:
+                        break
+                    yield chunk
+            
+            return iter_chunks(), self._create_file_info(file_info, file_id)
+            
+        except (FileNotFoundError, PermissionError):
+            raise
+        except Exception as e:
+            logger.error(f"Failed to stream download file {file_id} for user {user_id}: {str(e)}")
+            raise
+    
+    async def find_file_by_hash(self, sha256: str, user_id: str, filename: str) -> Optional[FileInfo]:
+        """Find a file of the user with the given content hash and name"""
+        try:
+            await self._ensure_hash_index()
+            # The name is stored with the blob and used by downloads and
+            # sandbox syncs, so only a file stored under the same name is reused
+            file_info = await self._get_files_collection().find_one(
+                {"metadata.user_id": user_id, "metadata.sha256": sha256, "filename": filename},
+                sort=[("uploadDate", -1)]
+            )
+            if not file_info:
+                return None
+            return self._create_file_info(file_info, str(file_info['_id']))
+            
+        except Exception as e:
+            logger.error(f"Failed to find file by hash {sha256} for user {user_id}: {str(e)}")
+            return None
+    
+    async def share_file(self, file_id: str, user_id: str) -> bool:
+        """Add a reference to a file, counted in metadata.ref_count (1 when missing)"""
+        try:
+            result = await self._get_files_collection().update_one(
+                {"_id": ObjectId(file_id), "metadata.user_id": user_id},
+                [{"$set": {"metadata.ref_count": {"$add": [{"$ifNull": ["$metadata.ref_count", 1]}, 1]}}}]
+            )
+            return result.matched_count == 1
+            
+        except Exception as e:
+            logger.error(f"Failed to share file {file_id} for user {user_id}: {str(e)}")
+            return False
+    
+    async def delete_file(self, file_id: str, user_id: str) -> bool:
+        """Delete file, or one reference to it while it is shared"""
+        try:
+            files_collection = self._get_files_collection()
+            
             # Convert ObjectId
             try:
                 obj_id = ObjectId(file_id)
@@ -168,10 +343,27 @@ class GridFSFileStorage(FileStorage):
                 logger.warning(f"Delete access denied: file {file_id} does not belong to user {user_id}")
                 return False
             
-            # Delete file
-            await bucket.delete(obj_id)
-            logger.info(f"File deleted successfully: {file_id} by user {user_id}")
-            return True
+            while True:
+                # Drop one reference while other files share the content
+                result = await files_collection.update_one(
+                    {"_id": obj_id, "metadata.ref_count": {"$gt": 1}},
+                    {"$inc": {"metadata.ref_count": -1}}
+                )
+                if result.modified_count:
+                    logger.info(f"File reference deleted: {file_id} by user {user_id}")
+                    return True
+                
+                # Last reference, delete the file unless it was shared in the meantime
+                result = await files_collection.delete_one(
+                    {"_id": obj_id, "metadata.ref_count": {"$not": {"$gt": 1}}}
+                )
+                if result.deleted_count:
+                    await self._get_chunks_collection().delete_many({"files_id": obj_id})
+                    logger.info(f"File deleted successfully: {file_id} by user {user_id}")
+                    return True
+                if not await files_collection.find_one({"_id": obj_id}, {"_id": 1}):
+                    # Deleted by a concurrent request
+                    return False
             
         except Exception as e:
             logger.error(f"Failed to delete file {file_id} for user {user_id}: {str(e)}")
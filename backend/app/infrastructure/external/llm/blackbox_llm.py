@@ -429,3 +429,8 @@ class BlackboxLLM(LLM):
     def max_tokens(self, value: int) -> None:
         """Set the max tokens"""
         self._max_tokens = value
+    
+    @property
+    def parallel_tool_calls(self) -> bool:
+        """Tool calls are not requested from Blackbox"""
+        return False
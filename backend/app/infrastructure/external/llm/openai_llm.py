@@ -20,6 +20,7 @@ class OpenAILLM(LLM):
         self._model_name = settings.model_name
         self._temperature = settings.temperature
         self._max_tokens = settings.max_tokens
+        self._parallel_tool_calls = settings.parallel_tool_calls
         logger.info(f"Initialized OpenAI LLM with model: {self._model_name}")
     
     @property
@@ -34,6 +35,10 @@ class OpenAILLM(LLM):
     def max_tokens(self) -> int:
         return self._max_tokens
     
+    @property
+    def parallel_tool_calls(self) -> bool:
+        return self._parallel_tool_calls
+    
     async def ask(self, messages: List[Dict[str, str]],
                 tools: Optional[List[Dict[str, Any]]] = None,
                 response_format: Optional[Dict[str, Any]] = None,
@@ -60,7 +65,7 @@ class OpenAILLM(LLM):
                         tools=tools,
                         response_format=response_format,
                         tool_choice=tool_choice,
-                        parallel_tool_calls=False,
+                        parallel_tool_calls=self._parallel_tool_calls,
                     )
                 else:
                     logger.debug(f"Sending request to OpenAI without tools, model: {self._model_name}, attempt: {attempt + 1}")
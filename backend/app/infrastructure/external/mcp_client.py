@@ -6,7 +6,9 @@ running inside the StatefulSandbox using stdio transport.
 
 Architecture:
 - MCP servers run as processes inside Docker sandbox
-- Communication via stdin/stdout using JSON-RPC 2.0
+- Communication via stdin/stdout using JSON-RPC 2.0, relayed over a
+  WebSocket by the sandbox's MCP bridge
+- Responses are matched to requests by id, so calls can run concurrently
 - Each server connection is isolated and stateful
 - Supports multiple concurrent server connections
 
@@ -24,11 +26,18 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+import websockets
+
 from app.domain.external.sandbox import Sandbox
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a response, servers started with npx/uvx may install first
+INITIALIZE_TIMEOUT = 120
+REQUEST_TIMEOUT = 30
+TOOL_CALL_TIMEOUT = 300
+
 
 class MCPMessageType(Enum):
     """MCP JSON-RPC 2.0 message types"""
@@ -62,7 +71,13 @@ class MCPTool:
 
 
 class MCPConnection:
-    """Represents an active connection to an MCP server"""
+    """Represents an active connection to an MCP server
+    
+    The server runs as a stdio process in the sandbox, whose MCP bridge
+    relays its JSON-RPC stream over a WebSocket. A reader task resolves the
+    future of each pending request when the response with its id arrives,
+    so several requests can be in flight at once.
+    """
     
     def __init__(
         self,
@@ -74,10 +89,13 @@ class MCPConnection:
         self.sandbox = sandbox
         self.session_id = session_id
         self.process_id: Optional[int] = None
+        self.server_id: Optional[str] = None
         self.is_connected = False
         self.pending_requests: Dict[str, asyncio.Future] = {}
         self.tools: List[MCPTool] = []
         self.logger = logging.getLogger(f"MCPConnection.{server_config.name}")
+        self._websocket = None
+        self._reader_task: Optional[asyncio.Task] = None
         
     async def connect(self) -> bool:
         """
@@ -88,30 +106,30 @@ class MCPConnection:
         """
         try:
             self.logger.info(f"Starting MCP server: {self.config.name}")
+            self.logger.debug(f"Command: {self.config.command} {' '.join(self.config.args)}")
             
-            # Build command with environment variables
-            env_prefix = " ".join([f"{k}={v}" for k, v in self.config.env.items()])
-            full_command = f"{env_prefix} {self.config.command} {' '.join(self.config.args)}"
-            
-            self.logger.debug(f"Command: {full_command}")
-            
-            # Start server process in background
-            result = await self.sandbox.run_in_background(
-                command=full_command,
-                session_id=self.session_id
+            result = await self.sandbox.start_mcp_server(
+                name=self.config.name,
+                command=self.config.command,
+                args=self.config.args,
+                env=self.config.env
             )
             
-            if result.get('exit_code') != 0:
-                self.logger.error(f"Failed to start server: {result.get('stderr')}")
+            if not result.success:
+                self.logger.error(f"Failed to start server: {result.message}")
                 return False
                 
-            self.process_id = result.get('pid')
+            self.server_id = result.data["server_id"]
+            self.process_id = result.data.get("pid")
             self.logger.info(f"Server started with PID: {self.process_id}")
             
-            # Wait for server to initialize
-            await asyncio.sleep(1)
+            self._websocket = await websockets.connect(
+                self.sandbox.mcp_server_url(self.server_id),
+                max_size=None
+            )
+            self._reader_task = asyncio.create_task(self._read_messages())
             
-            # Send initialize request
+            # Send initialize request, answered once the server is up
             init_response = await self._send_request("initialize", {
                 "protocolVersion": "2024-11-05",
                 "capabilities": {
@@ -121,12 +139,14 @@ class MCPConnection:
                     "name": "ai-manus",
                     "version": "1.0.0"
                 }
-            })
+            }, timeout=INITIALIZE_TIMEOUT)
             
             if not init_response or "error" in init_response:
                 self.logger.error(f"Initialize failed: {init_response}")
+                await self._close()
                 return False
-                
+            
+            await self._send_notification("notifications/initialized")
             self.is_connected = True
             self.logger.info(f"Successfully connected to {self.config.name}")
             
@@ -137,12 +157,70 @@ class MCPConnection:
             
         except Exception as e:
             self.logger.error(f"Connection error: {e}", exc_info=True)
+            await self._close()
             return False
     
-    async def _send_request(
+    async def _read_messages(self):
+        """Dispatch messages from the server until the connection closes"""
+        try:
+            async for raw in self._websocket:
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    self.logger.warning(f"Ignoring non JSON-RPC output: {raw[:200]}")
+                    continue
+                
+                if "method" in message:
+                    await self._handle_server_message(message)
+                    continue
+                
+                future = self.pending_requests.get(str(message.get("id")))
+                if future is None:
+                    self.logger.warning(f"Response to unknown request: {message.get('id')}")
+                elif not future.done():
+                    future.set_result(message)
+        except websockets.ConnectionClosed as e:
+            self.logger.warning(f"Connection to {self.config.name} closed: {e}")
+        except Exception as e:
+            self.logger.error(f"Reader error: {e}", exc_info=True)
+        finally:
+            self.is_connected = False
+            for future in self.pending_requests.values():
+                if not future.done():
+                    future.set_result({"error": "Connection closed"})
+    
+    async def _handle_server_message(self, message: Dict[str, Any]):
+        """Handle a notification or request sent by the server"""
+        if "id" not in message:
+            self.logger.debug(f"Notification: {message['method']}")
+            return
+        
+        if message["method"] == "ping":
+            response = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            response = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": f"Method not found: {message['method']}"}
+            }
+        await self._websocket.send(json.dumps(response))
+    
+    async def _send_notification(
         self,
         method: str,
         params: Optional[Dict[str, Any]] = None
+    ):
+        """Send a JSON-RPC 2.0 notification, which gets no response"""
+        notification = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            notification["params"] = params
+        await self._websocket.send(json.dumps(notification))
+    
+    async def _send_request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = REQUEST_TIMEOUT
     ) -> Dict[str, Any]:
         """
         Send a JSON-RPC 2.0 request to the MCP server
@@ -150,10 +228,14 @@ class MCPConnection:
         Args:
             method: The method name (e.g., "tools/list", "tools/call")
             params: Method parameters
+            timeout: Seconds to wait for the response
             
         Returns:
             Response from server
         """
+        if self._websocket is None:
+            return {"error": "Not connected to server"}
+        
         request_id = str(uuid.uuid4())
         
         request = {
@@ -163,49 +245,34 @@ class MCPConnection:
             "params": params or {}
         }
         
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[request_id] = future
         try:
-            # Write request to stdin
-            request_json = json.dumps(request) + "\n"
             self.logger.debug(f"Sending request: {method} (ID: {request_id[:8]})")
+            await self._websocket.send(json.dumps(request))
             
-            # Use sandbox to send to process stdin
-            write_result = await self.sandbox.execute_command(
-                f'echo \'{request_json}\' > /proc/{self.process_id}/fd/0',
-                session_id=self.session_id
-            )
-            
-            if write_result.get('exit_code') != 0:
-                self.logger.error(f"Failed to write to stdin: {write_result}")
-                return {"error": "Failed to send request"}
-            
-            # Read response from stdout
-            # Note: In production, we'd have a persistent reader task
-            # For now, read from the background process output file
-            await asyncio.sleep(0.5)  # Give server time to respond
-            
-            read_result = await self.sandbox.execute_command(
-                f'tail -1 /tmp/bg_{self.process_id}.out',
-                session_id=self.session_id
-            )
-            
-            if read_result.get('exit_code') != 0:
-                self.logger.error(f"Failed to read response: {read_result}")
-                return {"error": "Failed to read response"}
-            
-            response_text = read_result.get('stdout', '').strip()
-            if not response_text:
-                return {"error": "Empty response"}
-                
-            response = json.loads(response_text)
+            response = await asyncio.wait_for(future, timeout=timeout)
             
             if "error" in response:
                 self.logger.error(f"Server error: {response['error']}")
                 
             return response
             
+        except asyncio.TimeoutError:
+            self.logger.error(f"Request {method} timed out after {timeout}s")
+            try:
+                await self._send_notification("notifications/cancelled", {
+                    "requestId": request_id,
+                    "reason": "Timed out"
+                })
+            except Exception:
+                pass
+            return {"error": f"Request timed out after {timeout}s"}
         except Exception as e:
             self.logger.error(f"Request error: {e}", exc_info=True)
             return {"error": str(e)}
+        finally:
+            self.pending_requests.pop(request_id, None)
     
     async def _list_tools(self) -> bool:
         """
@@ -268,7 +335,7 @@ class MCPConnection:
             response = await self._send_request("tools/call", {
                 "name": tool_name,
                 "arguments": arguments
-            })
+            }, timeout=TOOL_CALL_TIMEOUT)
             
             if "error" in response:
                 self.logger.error(f"Tool call error: {response['error']}")
@@ -283,25 +350,33 @@ class MCPConnection:
             self.logger.error(f"Tool call exception: {e}", exc_info=True)
             return {"error": str(e)}
     
+    async def _close(self):
+        """Close the WebSocket and stop the server process"""
+        self.is_connected = False
+        websocket, self._websocket = self._websocket, None
+        reader_task, self._reader_task = self._reader_task, None
+        server_id, self.server_id = self.server_id, None
+        try:
+            if websocket is not None:
+                await websocket.close()
+            if reader_task is not None:
+                await asyncio.gather(reader_task, return_exceptions=True)
+            if server_id is not None:
+                await self.sandbox.stop_mcp_server(server_id)
+        except Exception as e:
+            self.logger.warning(f"Error stopping {self.config.name}: {e}")
+    
     async def disconnect(self):
         """Disconnect from the MCP server"""
-        if not self.is_connected:
+        if self.server_id is None:
             return
         
         try:
             self.logger.info(f"Disconnecting from {self.config.name}")
             
-            # Send shutdown notification
-            await self._send_request("shutdown")
+            # Stdio servers exit when their stdin is closed
+            await self._close()
             
-            # Kill the process
-            if self.process_id:
-                await self.sandbox.execute_command(
-                    f'kill -TERM {self.process_id}',
-                    session_id=self.session_id
-                )
-            
-            self.is_connected = False
             self.logger.info("Disconnected successfully")
             
         except Exception as e:
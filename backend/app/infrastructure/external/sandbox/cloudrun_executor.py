@@ -0,0 +1,255 @@
+"""
+Warm executors for CloudRunJobsSandbox
+
+Keeps one executor loop (sandbox-executor/executor.py in serve mode) per
+sandbox and sends it commands, instead of creating, running, polling and
+deleting a Cloud Run job for every command. Session cwd, env and background
+processes live in the executor's memory.
+
+- CloudRunExecutorBackend: a long-lived Cloud Run job, with requests and
+  results passed through Redis lists
+- LocalExecutorBackend: the executor as a local subprocess speaking JSON
+  lines on stdin/stdout, for development and tests without GCP
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_SCRIPT = Path(__file__).resolve().parents[4] / "sandbox-executor" / "executor.py"
+# Redis keys of an executor queue, shared with executor.py
+REQUESTS_KEY = "{queue}:requests"
+RESULT_KEY = "{queue}:results:{id}"
+# Seconds allowed on top of a command's timeout for its result to arrive
+RESPONSE_GRACE = 30
+# Seconds allowed for a Cloud Run executor to boot before its first result
+STARTUP_TIMEOUT = 180
+# Longest single BLPOP, kept below the Redis client's socket timeout
+POLL_INTERVAL = 10
+# Line limit for local executor results, which carry whole command output
+STREAM_LIMIT = 64 * 2**20
+
+
+class ExecutorError(Exception):
+    """The executor failed to answer a request"""
+
+
+class ExecutorBackend(Protocol):
+    """Transport to one running executor loop"""
+
+    async def start(self) -> None:
+        """Launch the executor"""
+        ...
+
+    async def request(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a request and wait for its result
+
+        Raises:
+            ExecutorError: No result within timeout or the executor is gone
+        """
+        ...
+
+    async def stop(self) -> None:
+        """Shut the executor down and release its resources"""
+        ...
+
+
+class LocalExecutorBackend:
+    """Executor loop as a local subprocess, talking JSON lines over its pipes"""
+
+    def __init__(self, workdir: Optional[str] = None, script: Path = EXECUTOR_SCRIPT):
+        self._workdir = workdir
+        self._script = script
+        self._process: Optional[asyncio.subprocess.Process] = None
+        # One request in flight, results come back in order
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        workdir = self._workdir or tempfile.mkdtemp(prefix="sandbox-")
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable, str(self._script), "--serve",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env={**os.environ, "EXECUTOR_WORKDIR": workdir},
+            limit=STREAM_LIMIT,
+        )
+        logger.info(f"Started local executor (pid={self._process.pid}, workdir={workdir})")
+
+    async def request(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        async with self._lock:
+            process = self._process
+            if process is None or process.returncode is not None:
+                raise ExecutorError("Executor process is not running")
+            process.stdin.write((json.dumps(request) + "\n").encode())
+            await process.stdin.drain()
+            try:
+                line = await asyncio.wait_for(process.stdout.readline(), timeout)
+            except asyncio.TimeoutError:
+                raise ExecutorError(f"No result from executor within {timeout}s")
+            if not line:
+                raise ExecutorError("Executor process exited")
+            return json.loads(line)
+
+    async def stop(self) -> None:
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        # End of input stops the loop after the current command
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+
+class CloudRunExecutorBackend:
+    """Executor loop in a long-lived Cloud Run job, fed through Redis lists"""
+
+    def __init__(
+        self,
+        job_manager,
+        redis: Redis,
+        redis_url: str,
+        lifetime: int,
+        idle_timeout: int,
+    ):
+        """
+        Args:
+            job_manager: CloudRunJobManager creating and running the job
+            redis: Client used to queue requests and receive results
+            redis_url: Redis URL as reachable from the executor job
+            lifetime: Maximum run time of the job in seconds
+            idle_timeout: Seconds the executor waits for a request before exiting
+        """
+        self._job_manager = job_manager
+        self._redis = redis
+        self._redis_url = redis_url
+        self._lifetime = lifetime
+        self._idle_timeout = idle_timeout
+        self._executor_id = uuid.uuid4().hex
+        self._queue = f"sandbox-executor:{self._executor_id}"
+        self._job_name: Optional[str] = None
+        self._execution_name: Optional[str] = None
+        self._ready = False
+
+    async def start(self) -> None:
+        self._job_name = await self._job_manager.create_executor_job(
+            self._executor_id,
+            env={
+                "EXECUTOR_QUEUE": self._queue,
+                "REDIS_URL": self._redis_url,
+                "EXECUTOR_IDLE_TIMEOUT": str(self._idle_timeout),
+            },
+            timeout=self._lifetime,
+        )
+        # Requests queue up in Redis while the execution boots
+        self._execution_name = await self._job_manager.execute_job(self._job_name)
+
+    async def request(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        await self._redis.rpush(REQUESTS_KEY.format(queue=self._queue), json.dumps(request))
+        if not self._ready:
+            timeout += STARTUP_TIMEOUT
+        key = RESULT_KEY.format(queue=self._queue, id=request["id"])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ExecutorError(f"No result from executor {self._executor_id} within {timeout}s")
+            item = await self._redis.blpop([key], timeout=min(POLL_INTERVAL, math.ceil(remaining)))
+            if item is not None:
+                self._ready = True
+                return json.loads(item[1])
+
+    async def stop(self) -> None:
+        requests_key = REQUESTS_KEY.format(queue=self._queue)
+        try:
+            await self._redis.rpush(requests_key, json.dumps({"type": "shutdown"}))
+        except Exception as e:
+            logger.warning(f"Failed to send shutdown to executor {self._executor_id}: {e}")
+        if self._execution_name:
+            await self._job_manager.cancel_execution(self._execution_name)
+        if self._job_name:
+            await self._job_manager.delete_job(self._job_name)
+        try:
+            await self._redis.delete(requests_key)
+        except Exception as e:
+            logger.warning(f"Failed to delete queue of executor {self._executor_id}: {e}")
+
+
+class WarmExecutor:
+    """Runs commands on an executor loop started on first use
+
+    A backend that fails to answer is stopped and replaced by a fresh one
+    on the next request, losing the in-memory session state.
+    """
+
+    def __init__(self, backend_factory: Callable[[], ExecutorBackend]):
+        self._backend_factory = backend_factory
+        self._backend: Optional[ExecutorBackend] = None
+        self._start_lock = asyncio.Lock()
+
+    async def execute(self, command: str, session_id: str, timeout: int) -> Dict[str, Any]:
+        """Run a command, returning exit_code, stdout, stderr, cwd and session_id"""
+        request = {"type": "exec", "session_id": session_id, "command": command, "timeout": timeout}
+        return await self._request(request, timeout + RESPONSE_GRACE)
+
+    async def execute_batch(self, commands: List[Dict[str, Any]], session_id: str) -> List[Dict[str, Any]]:
+        """Run commands (each with id, command, timeout) in order, returning their results"""
+        request = {"type": "batch", "session_id": session_id, "commands": commands}
+        timeout = sum(entry["timeout"] for entry in commands) + RESPONSE_GRACE
+        result = await self._request(request, timeout)
+        return [{**entry, "session_id": session_id} for entry in result["results"]]
+
+    async def get_state(self, session_id: str) -> Dict[str, Any]:
+        """Get the session state: cwd, env_vars and background_pids"""
+        result = await self._request({"type": "get_state", "session_id": session_id}, RESPONSE_GRACE)
+        return result["state"]
+
+    async def set_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        await self._request({"type": "set_state", "session_id": session_id, "state": state}, RESPONSE_GRACE)
+
+    async def stop(self) -> None:
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            await backend.stop()
+
+    async def _request(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        backend = await self._get_backend()
+        request["id"] = uuid.uuid4().hex
+        try:
+            result = await backend.request(request, timeout)
+        except ExecutorError:
+            await self._discard(backend)
+            raise
+        if "error" in result:
+            raise ExecutorError(result["error"])
+        return result
+
+    async def _get_backend(self) -> ExecutorBackend:
+        async with self._start_lock:
+            if self._backend is None:
+                backend = self._backend_factory()
+                await backend.start()
+                self._backend = backend
+            return self._backend
+
+    async def _discard(self, backend: ExecutorBackend) -> None:
+        if self._backend is backend:
+            self._backend = None
+        try:
+            await backend.stop()
+        except Exception as e:
+            logger.warning(f"Failed to stop executor: {e}")
@@ -15,15 +15,18 @@ Author: Kilo Code
 Date: 2025-12-28
 """
 
-from typing import Dict, Any, Optional, List, BinaryIO
+from typing import Dict, Any, Optional, List, BinaryIO, AsyncIterator
 import uuid
 import json
 import asyncio
 import logging
 import io
+import posixpath
 import re
+import shlex
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 
 from google.cloud import run_v2
 from google.cloud import storage
@@ -33,6 +36,14 @@ from app.core.config import get_settings
 from app.domain.models.tool_result import ToolResult
 from app.domain.external.sandbox import Sandbox
 from app.domain.external.browser import Browser
+from app.infrastructure.external.sandbox.command_batcher import CommandBatcher
+from app.infrastructure.external.sandbox.cloudrun_executor import (
+    CloudRunExecutorBackend,
+    ExecutorError,
+    LocalExecutorBackend,
+    WarmExecutor,
+)
+from app.infrastructure.storage.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
@@ -253,7 +264,85 @@ class CloudRunJobManager:
             Job name for tracking
         """
         job_name = f"sandbox-{execution_id[:8]}"
+        env = {
+            "EXECUTION_ID": execution_id,
+            "SESSION_ID": session_id,
+            "COMMAND": command,
+            "PROJECT_ID": self.project_id,
+            "STATE_BUCKET": self.state_bucket,
+            "TIMEOUT": str(timeout),
+        }
+        return await self._create_job(job_name, env, timeout, memory, cpu)
+    
+    async def create_batch_job(
+        self,
+        execution_id: str,
+        session_id: str,
+        commands: List[Dict[str, Any]],
+        memory: str = "512Mi",
+        cpu: str = "1"
+    ) -> str:
+        """
+        Create a Cloud Run Job running several commands in one session context.
         
+        Args:
+            execution_id: Unique execution identifier of the batch
+            session_id: Session identifier
+            commands: Commands to run in order, each with id, command and timeout
+            memory: Memory limit (e.g., "512Mi")
+            cpu: CPU limit (e.g., "1")
+            
+        Returns:
+            Job name for tracking
+        """
+        timeout = sum(entry["timeout"] for entry in commands)
+        env = {
+            "EXECUTION_ID": execution_id,
+            "SESSION_ID": session_id,
+            "COMMANDS": json.dumps(commands),
+            "PROJECT_ID": self.project_id,
+            "STATE_BUCKET": self.state_bucket,
+            "TIMEOUT": str(timeout),
+        }
+        return await self._create_job(f"sandbox-{execution_id[:8]}", env, timeout, memory, cpu)
+    
+    async def create_executor_job(
+        self,
+        executor_id: str,
+        env: Dict[str, str],
+        timeout: int,
+        memory: str = "512Mi",
+        cpu: str = "1"
+    ) -> str:
+        """
+        Create a Cloud Run Job running the executor in serve mode.
+        
+        Args:
+            executor_id: Unique executor identifier
+            env: Queue settings for the executor (EXECUTOR_QUEUE, REDIS_URL, ...)
+            timeout: Maximum lifetime of the executor in seconds
+            memory: Memory limit (e.g., "512Mi")
+            cpu: CPU limit (e.g., "1")
+            
+        Returns:
+            Job name for tracking
+        """
+        env = {
+            **env,
+            "EXECUTOR_MODE": "serve",
+            "PROJECT_ID": self.project_id,
+            "STATE_BUCKET": self.state_bucket,
+        }
+        return await self._create_job(f"executor-{executor_id[:8]}", env, timeout, memory, cpu)
+    
+    async def _create_job(
+        self,
+        job_name: str,
+        env: Dict[str, str],
+        timeout: int,
+        memory: str,
+        cpu: str
+    ) -> str:
         try:
             # Create job definition
             job = run_v2.Job(
@@ -262,12 +351,8 @@ class CloudRunJobManager:
                         containers=[run_v2.Container(
                             image=self.executor_image,
                             env=[
-                                run_v2.EnvVar(name="EXECUTION_ID", value=execution_id),
-                                run_v2.EnvVar(name="SESSION_ID", value=session_id),
-                                run_v2.EnvVar(name="COMMAND", value=command),
-                                run_v2.EnvVar(name="PROJECT_ID", value=self.project_id),
-                                run_v2.EnvVar(name="STATE_BUCKET", value=self.state_bucket),
-                                run_v2.EnvVar(name="TIMEOUT", value=str(timeout)),
+                                run_v2.EnvVar(name=name, value=value)
+                                for name, value in env.items()
                             ],
                             resources=run_v2.ResourceRequirements(
                                 limits={"memory": memory, "cpu": cpu}
@@ -378,6 +463,26 @@ class CloudRunJobManager:
                 logger.error(f"Error polling execution {execution_name}: {e}")
                 await asyncio.sleep(poll_interval)
     
+    async def cancel_execution(self, execution_name: str) -> None:
+        """
+        Cancel a running execution.
+        
+        Args:
+            execution_name: Execution resource name
+        """
+        try:
+            logger.info(f"Cancelling execution: {execution_name}")
+            operation = await asyncio.to_thread(
+                self.executions_client.cancel_execution,
+                name=execution_name
+            )
+            await asyncio.to_thread(operation.result, timeout=30)
+            
+        except gcp_exceptions.NotFound:
+            logger.debug(f"Execution not found (already finished): {execution_name}")
+        except Exception as e:
+            logger.warning(f"Failed to cancel execution {execution_name}: {e}")
+    
     async def delete_job(self, job_name: str) -> None:
         """
         Delete job after execution.
@@ -429,12 +534,17 @@ class CloudRunJobsSandbox(Sandbox):
     - Full Sandbox protocol compatibility
     """
     
+    # Sandboxes with a warm executor, returned by get() so every lookup of a
+    # session's sandbox reaches the same executor and its session state
+    _instances: Dict[str, "CloudRunJobsSandbox"] = {}
+    
     def __init__(
         self,
         project_id: str,
         region: str = "us-central1",
         executor_image: Optional[str] = None,
-        state_bucket: Optional[str] = None
+        state_bucket: Optional[str] = None,
+        executor_mode: str = "job"
     ):
         """
         Initialize Cloud Run Jobs sandbox.
@@ -444,24 +554,44 @@ class CloudRunJobsSandbox(Sandbox):
             region: GCP region for job execution
             executor_image: Container image for executor
             state_bucket: Cloud Storage bucket for state
+            executor_mode: "job" for one Cloud Run job per command, "warm"
+                for one long-lived job per sandbox, "local" for an executor
+                subprocess without GCP
         """
         self.project_id = project_id
         self.region = region
         self.executor_image = executor_image or f"gcr.io/{project_id}/sandbox-executor:latest"
         self.state_bucket = state_bucket or f"{project_id}-sandbox-sessions"
+        self.executor_mode = executor_mode
         
         # Initialize components
-        self.storage_client = storage.Client(project=project_id)
-        self.state_manager = SessionStateManager(
-            self.storage_client,
-            self.state_bucket
-        )
-        self.job_manager = CloudRunJobManager(
-            project_id=project_id,
-            region=region,
-            executor_image=self.executor_image,
-            state_bucket=self.state_bucket
-        )
+        if executor_mode == "local":
+            # Commands run in a local executor process, no GCP clients needed
+            self.storage_client = None
+            self.state_manager = None
+            self.job_manager = None
+        else:
+            self.storage_client = storage.Client(project=project_id)
+            self.state_manager = SessionStateManager(
+                self.storage_client,
+                self.state_bucket
+            )
+            self.job_manager = CloudRunJobManager(
+                project_id=project_id,
+                region=region,
+                executor_image=self.executor_image,
+                state_bucket=self.state_bucket
+            )
+        
+        # Long-lived executor loop, started on the first command
+        self.warm_executor: Optional[WarmExecutor] = None
+        if executor_mode == "local":
+            self.warm_executor = WarmExecutor(LocalExecutorBackend)
+        elif executor_mode == "warm":
+            self.warm_executor = WarmExecutor(self._create_cloudrun_executor)
+        
+        # Read-only commands issued together run as one execution
+        self._batcher = CommandBatcher(self._exec_batch)
         
         # Sandbox ID
         self._sandbox_id = str(uuid.uuid4())
@@ -536,6 +666,15 @@ class CloudRunJobsSandbox(Sandbox):
         if session_id is None:
             session_id = self._default_session_id
         
+        # Batched reads issued earlier run first, so they don't see this command's effects
+        await self._batcher.flush(session_id)
+        return await self._exec_single(command, session_id, timeout)
+    
+    async def _exec_single(self, command: str, session_id: str, timeout: int) -> Dict[str, Any]:
+        """Execute one command on the warm executor or in its own job"""
+        if self.warm_executor is not None:
+            return await self._exec_warm(command, session_id, timeout)
+        
         execution_id = str(uuid.uuid4())
         
         logger.info(f"Executing command (session={session_id}, exec={execution_id}): {command[:100]}")
@@ -601,6 +740,138 @@ class CloudRunJobsSandbox(Sandbox):
                 "session_id": session_id
             }
     
+    async def exec_command_batched(
+        self,
+        command: str,
+        session_id: Optional[str] = None,
+        timeout: int = 120
+    ) -> Dict[str, Any]:
+        """
+        Execute a read-only command as part of a batch.
+        
+        Commands submitted for the same session within a short window run
+        together in one executor invocation. Only use this for commands
+        that don't change files or session state.
+        
+        Args:
+            command: Shell command to execute
+            session_id: Session identifier (default: "default")
+            timeout: Command timeout in seconds
+            
+        Returns:
+            Same dict as exec_command_stateful
+        """
+        if session_id is None:
+            session_id = self._default_session_id
+        return await self._batcher.submit(command, session_id, timeout)
+    
+    async def _exec_batch(self, session_id: str, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run a batch of commands in one executor invocation"""
+        if len(commands) == 1:
+            entry = commands[0]
+            return [await self._exec_single(entry["command"], session_id, entry["timeout"])]
+        
+        logger.info(f"Executing batch of {len(commands)} commands (session={session_id})")
+        try:
+            if self.warm_executor is not None:
+                return await self.warm_executor.execute_batch(commands, session_id)
+            return await self._exec_job_batch(commands, session_id)
+        except Exception as e:
+            logger.error(f"Batch execution failed: {e}")
+            return [
+                {
+                    "exit_code": -1,
+                    "stdout": "",
+                    "stderr": f"Execution error: {str(e)}",
+                    "cwd": "/workspace",
+                    "session_id": session_id
+                }
+                for _ in commands
+            ]
+    
+    async def _exec_job_batch(self, commands: List[Dict[str, Any]], session_id: str) -> List[Dict[str, Any]]:
+        """Run a batch of commands in a single Cloud Run job"""
+        execution_id = str(uuid.uuid4())
+        state = await self.state_manager.load_state(session_id)
+        
+        job_name = await self.job_manager.create_batch_job(execution_id, session_id, commands)
+        try:
+            execution_name = await self.job_manager.execute_job(job_name)
+            await self.job_manager.wait_for_completion(
+                execution_name,
+                timeout=sum(entry["timeout"] for entry in commands) + 30
+            )
+            result = await self.state_manager.load_execution_result(execution_id)
+        finally:
+            try:
+                await self.job_manager.delete_job(job_name)
+            except Exception as e:
+                logger.warning(f"Job cleanup failed: {e}")
+        
+        if result is None:
+            logger.error(f"No result found for batch execution: {execution_id}")
+            return [
+                {
+                    "exit_code": -1,
+                    "stdout": "",
+                    "stderr": "Execution failed - no result found",
+                    "cwd": state["cwd"],
+                    "session_id": session_id
+                }
+                for _ in commands
+            ]
+        
+        if "new_state" in result:
+            await self.state_manager.save_state(session_id, result["new_state"])
+        
+        results = [{**entry, "session_id": session_id} for entry in result["results"]]
+        # Keep each command's result under its own execution id, like single jobs
+        await asyncio.gather(*(
+            self.state_manager.save_execution_result(entry["id"], entry)
+            for entry in results
+        ), return_exceptions=True)
+        logger.info(f"Batch completed ({len(results)} commands): {execution_id}")
+        return results
+    
+    async def _exec_warm(self, command: str, session_id: str, timeout: int) -> Dict[str, Any]:
+        """Execute command on the warm executor, session state stays in its memory"""
+        logger.info(f"Executing command on warm executor (session={session_id}): {command[:100]}")
+        try:
+            result = await self.warm_executor.execute(command, session_id, timeout)
+            logger.info(f"Command completed (exit_code={result.get('exit_code')})")
+            return result
+        except Exception as e:
+            logger.error(f"Command execution failed: {e}")
+            return {
+                "exit_code": -1,
+                "stdout": "",
+                "stderr": f"Execution error: {str(e)}",
+                "cwd": "/workspace",
+                "session_id": session_id
+            }
+    
+    def _create_cloudrun_executor(self) -> CloudRunExecutorBackend:
+        settings = get_settings()
+        return CloudRunExecutorBackend(
+            self.job_manager,
+            redis=get_redis().client,
+            redis_url=settings.sandbox_executor_redis_url or _redis_url(settings),
+            lifetime=(settings.sandbox_ttl_minutes or 60) * 60,
+            idle_timeout=settings.sandbox_executor_idle_timeout
+        )
+    
+    async def _load_state(self, session_id: str) -> Dict[str, Any]:
+        """Session state from the warm executor, or from Cloud Storage"""
+        if self.warm_executor is not None:
+            return await self.warm_executor.get_state(session_id)
+        return await self.state_manager.load_state(session_id)
+    
+    async def _save_state(self, session_id: str, state: Dict[str, Any]) -> None:
+        if self.warm_executor is not None:
+            await self.warm_executor.set_state(session_id, state)
+        else:
+            await self.state_manager.save_state(session_id, state)
+    
     async def exec_command(
         self,
         session_id: str,
@@ -652,7 +923,7 @@ class CloudRunJobsSandbox(Sandbox):
                 session_id = self._default_session_id
             
             # Load session state
-            state = await self.state_manager.load_state(session_id)
+            state = await self._load_state(session_id)
             background_pids = state.get("background_pids", {})
             
             processes = []
@@ -721,12 +992,12 @@ class CloudRunJobsSandbox(Sandbox):
                         logger.info(f"Killed process PID={proc_pid}")
             
             # Update session state to remove killed PIDs
-            state = await self.state_manager.load_state(session_id)
+            state = await self._load_state(session_id)
             background_pids = state.get("background_pids", {})
             for killed_pid in killed_pids:
                 background_pids.pop(str(killed_pid), None)
             state["background_pids"] = background_pids
-            await self.state_manager.save_state(session_id, state)
+            await self._save_state(session_id, state)
             
             return {
                 "killed_count": len(killed_pids),
@@ -837,7 +1108,7 @@ class CloudRunJobsSandbox(Sandbox):
             else:
                 command = f"{sudo_prefix}cat {file}"
             
-            result = await self.exec_command_stateful(command)
+            result = await self.exec_command_batched(command)
             
             if result["exit_code"] == 0:
                 return ToolResult(
@@ -858,7 +1129,7 @@ class CloudRunJobsSandbox(Sandbox):
     async def file_exists(self, path: str) -> ToolResult:
         """Check if file exists"""
         try:
-            result = await self.exec_command_stateful(f"test -e {path} && echo 'exists' || echo 'not found'")
+            result = await self.exec_command_batched(f"test -e {path} && echo 'exists' || echo 'not found'")
             
             exists = "exists" in result["stdout"]
             return ToolResult(
@@ -871,6 +1142,25 @@ class CloudRunJobsSandbox(Sandbox):
             logger.error(f"Failed to check file existence {path}: {e}")
             return ToolResult(success=False, message=str(e))
     
+    async def file_hash(self, path: str) -> ToolResult:
+        """Compute the SHA-256 of a file's content"""
+        try:
+            result = await self.exec_command_batched(f"sha256sum {path} && stat -c %s {path}")
+            
+            if result["exit_code"] != 0:
+                return ToolResult(success=False, message=f"Failed to hash file: {result['stderr']}")
+            
+            lines = result["stdout"].strip().splitlines()
+            return ToolResult(
+                success=True,
+                message="File hashed successfully",
+                data={"file": path, "sha256": lines[0].split()[0], "size": int(lines[1])}
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to hash file {path}: {e}")
+            return ToolResult(success=False, message=str(e))
+    
     async def file_delete(self, path: str, sudo: bool = False) -> ToolResult:
         """Delete file"""
         try:
@@ -897,7 +1187,7 @@ class CloudRunJobsSandbox(Sandbox):
         """List directory contents"""
         try:
             command = f"ls -la {path}" if not recursive else f"find {path} -ls"
-            result = await self.exec_command_stateful(command)
+            result = await self.exec_command_batched(command)
             
             if result["exit_code"] == 0:
                 return ToolResult(
@@ -960,7 +1250,7 @@ class CloudRunJobsSandbox(Sandbox):
             sudo_prefix = "sudo " if sudo else ""
             command = f"{sudo_prefix}grep -n '{regex}' {file}"
             
-            result = await self.exec_command_stateful(command)
+            result = await self.exec_command_batched(command)
             
             # grep returns exit code 1 if no matches (not an error)
             if result["exit_code"] in [0, 1]:
@@ -980,6 +1270,65 @@ class CloudRunJobsSandbox(Sandbox):
             logger.error(f"Failed to search file {file}: {e}")
             return ToolResult(success=False, message=str(e))
     
+    async def file_grep(
+        self,
+        path: str,
+        regex: str,
+        glob_pattern: Optional[str] = None,
+        case_sensitive: bool = True,
+        max_results: int = 200
+    ) -> ToolResult:
+        """Search file contents across a directory tree"""
+        try:
+            # -H prints the file name even when path is a single file
+            options = "-rnHIE" if case_sensitive else "-rnHIEi"
+            include = f" --include={shlex.quote(glob_pattern)}" if glob_pattern else ""
+            # head hides grep's exit status and the shell may not have
+            # pipefail, so grep's status is passed on through a file.
+            # A SIGPIPE from head stopping early (status > 128) is not an error.
+            command = (
+                f"status_file=$(mktemp); "
+                f"{{ grep {options}{include} --exclude-dir='.*' -e {shlex.quote(regex)} -- {shlex.quote(path)}; "
+                f"echo $? > \"$status_file\"; }} | head -n {max_results + 1}; "
+                f"status=$(cat \"$status_file\"); rm -f \"$status_file\"; "
+                f"[ \"$status\" -gt 128 ] && exit 0; exit \"$status\""
+            )
+            
+            result = await self.exec_command_batched(command)
+            
+            # 1 means no matches, 2 an error such as a missing path or an unreadable file
+            if result["exit_code"] not in (0, 1, 2) or (result["exit_code"] == 2 and not result["stdout"]):
+                return ToolResult(
+                    success=False,
+                    message=f"Failed to search files: {result['stderr']}"
+                )
+            
+            matches = []
+            for line in result["stdout"].splitlines():
+                file, sep, rest = line.partition(":")
+                line_number, sep2, content = rest.partition(":")
+                if not sep or not sep2 or not line_number.isdigit():
+                    continue
+                matches.append({"file": file, "line_number": int(line_number), "line": content})
+            
+            truncated = len(matches) > max_results
+            matches = matches[:max_results]
+            return ToolResult(
+                success=True,
+                message=f"Search completed, found {len(matches)} matches",
+                data={
+                    "path": path,
+                    "matches": matches,
+                    "files_matched": len({m["file"] for m in matches}),
+                    "truncated": truncated,
+                    "engine": "grep"
+                }
+            )
+                
+        except Exception as e:
+            logger.error(f"Failed to search files in {path}: {e}")
+            return ToolResult(success=False, message=str(e))
+    
     async def file_find(
         self,
         path: str,
@@ -987,8 +1336,8 @@ class CloudRunJobsSandbox(Sandbox):
     ) -> ToolResult:
         """Find files by name pattern"""
         try:
-            command = f"find {path} -name '{glob_pattern}'"
-            result = await self.exec_command_stateful(command)
+            command = f"find {shlex.quote(path)} -name {shlex.quote(glob_pattern)}"
+            result = await self.exec_command_batched(command)
             
             if result["exit_code"] == 0:
                 files = result["stdout"].strip().split("\n") if result["stdout"].strip() else []
@@ -1007,6 +1356,85 @@ class CloudRunJobsSandbox(Sandbox):
             logger.error(f"Failed to find files in {path}: {e}")
             return ToolResult(success=False, message=str(e))
     
+    async def file_batch(self, operations: List[Dict[str, Any]]) -> ToolResult:
+        """Run several file operations, each through its single file method
+        
+        Operations on different paths run concurrently, reads, existence
+        checks and listings issued together are coalesced into one execution
+        by the command batcher. Operations on the same path run in request
+        order, so a write followed by a read of the same file sees the
+        written content.
+        """
+        path_locks: Dict[str, asyncio.Lock] = {}
+        
+        async def run(operation: Dict[str, Any]) -> Dict[str, Any]:
+            # Locks are FIFO and tasks start in request order
+            lock = path_locks.setdefault(posixpath.normpath(operation.get("path", "")), asyncio.Lock())
+            async with lock:
+                return await run_operation(operation)
+        
+        async def run_operation(operation: Dict[str, Any]) -> Dict[str, Any]:
+            op = operation.get("op")
+            path = operation.get("path", "")
+            if op == "read":
+                result = await self.file_read(path, operation.get("start_line"), operation.get("end_line"))
+            elif op == "write":
+                result = await self.file_write(path, operation.get("content", ""), operation.get("append", False))
+            elif op == "exists":
+                result = await self.file_exists(path)
+            elif op == "list":
+                result = await self.file_list(path)
+            elif op == "delete":
+                result = await self.file_delete(path)
+            else:
+                result = ToolResult(success=False, message=f"Unknown batch operation: {op}")
+            return {
+                "op": op,
+                "path": path,
+                "success": result.success,
+                "message": None if result.success else result.message,
+                "data": result.data
+            }
+        
+        results = await asyncio.gather(*(run(operation) for operation in operations))
+        succeeded = sum(1 for result in results if result["success"])
+        return ToolResult(
+            success=True,
+            message=f"Batch completed, {succeeded} succeeded and {len(results) - succeeded} failed",
+            data={"results": list(results), "succeeded": succeeded, "failed": len(results) - succeeded}
+        )
+    
+    async def file_editor(
+        self,
+        command: str,
+        path: str,
+        file_text: Optional[str] = None,
+        view_range: Optional[List[int]] = None,
+        old_str: Optional[str] = None,
+        new_str: Optional[str] = None,
+        insert_line: Optional[int] = None
+    ) -> ToolResult:
+        """Run a file_editor command through the CLI (no resident process in Cloud Run Jobs)"""
+        params = {
+            "command": command,
+            "path": path,
+            "file_text": file_text,
+            "view_range": view_range,
+            "old_str": old_str,
+            "new_str": new_str,
+            "insert_line": insert_line
+        }
+        args = json.dumps({key: value for key, value in params.items() if value is not None})
+        try:
+            result = await self.exec_command_stateful(
+                f"python3 /openhands/tools/file_editor_cli.py {shlex.quote(args)}"
+            )
+            return ToolResult(**json.loads(result["stdout"]))
+            
+        except Exception as e:
+            logger.error(f"Failed to run file_editor {command} on {path}: {e}")
+            return ToolResult(success=False, message=str(e))
+    
     async def file_upload(
         self,
         file_data: BinaryIO,
@@ -1085,10 +1513,95 @@ class CloudRunJobsSandbox(Sandbox):
             logger.error(f"Failed to download file {path}: {e}")
             raise
     
+    async def file_upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        path: str,
+        filename: str = None
+    ) -> ToolResult:
+        """Upload file to sandbox via Cloud Storage from an async stream of chunks"""
+        try:
+            # Determine target file path
+            if filename:
+                target_path = f"{path}/{filename}"
+            else:
+                target_path = path
+            
+            # Stream into a Cloud Storage temporary location (resumable upload)
+            temp_blob_name = f"uploads/{self._sandbox_id}/{uuid.uuid4()}"
+            blob = self.storage_client.bucket(self.state_bucket).blob(temp_blob_name)
+            
+            writer = await asyncio.to_thread(blob.open, "wb")
+            file_size = 0
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(writer.write, chunk)
+                    file_size += len(chunk)
+            finally:
+                await asyncio.to_thread(writer.close)
+            
+            # Download from Cloud Storage to sandbox filesystem
+            gs_path = f"gs://{self.state_bucket}/{temp_blob_name}"
+            command = f"gsutil cp {gs_path} {target_path}"
+            result = await self.exec_command_stateful(command)
+            
+            # Cleanup temporary blob
+            try:
+                await asyncio.to_thread(blob.delete)
+            except Exception:
+                pass
+            
+            if result["exit_code"] == 0:
+                return ToolResult(
+                    success=True,
+                    message=f"File uploaded: {target_path}",
+                    data={"path": target_path, "size": file_size}
+                )
+            else:
+                return ToolResult(
+                    success=False,
+                    message=f"Failed to upload file: {result['stderr']}"
+                )
+                
+        except Exception as e:
+            logger.error(f"Failed to upload file to {path}: {e}")
+            return ToolResult(success=False, message=str(e))
+    
+    async def file_download_stream(self, path: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Download file from sandbox via Cloud Storage as an async stream of chunks"""
+        # Upload from sandbox filesystem to Cloud Storage
+        temp_blob_name = f"downloads/{self._sandbox_id}/{uuid.uuid4()}"
+        gs_path = f"gs://{self.state_bucket}/{temp_blob_name}"
+        command = f"gsutil cp {path} {gs_path}"
+        
+        result = await self.exec_command_stateful(command)
+        
+        if result["exit_code"] != 0:
+            logger.error(f"Failed to download file {path}: {result['stderr']}")
+            raise Exception(f"Failed to copy file to Cloud Storage: {result['stderr']}")
+        
+        blob = self.storage_client.bucket(self.state_bucket).blob(temp_blob_name)
+        try:
+            reader = await asyncio.to_thread(blob.open, "rb", chunk_size=chunk_size)
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(reader.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                await asyncio.to_thread(reader.close)
+        finally:
+            # Cleanup temporary blob
+            try:
+                await asyncio.to_thread(blob.delete)
+            except Exception:
+                pass
+    
     async def view_shell(self, session_id: str, console: bool = False) -> ToolResult:
         """View shell status"""
         # Return session info
-        state = await self.state_manager.load_state(session_id)
+        state = await self._load_state(session_id)
         return ToolResult(
             success=True,
             message=f"Session {session_id}",
@@ -1129,12 +1642,41 @@ class CloudRunJobsSandbox(Sandbox):
             message="kill_process not supported in Cloud Run Jobs sandbox"
         )
     
+    async def start_mcp_server(
+        self,
+        name: str,
+        command: str,
+        args: List[str],
+        env: Optional[Dict[str, str]] = None
+    ) -> ToolResult:
+        """Start MCP server - Not applicable for Cloud Run Jobs"""
+        # Jobs exit after each command, a stdio server can't outlive them
+        return ToolResult(
+            success=False,
+            message="MCP servers not supported in Cloud Run Jobs sandbox"
+        )
+    
+    def mcp_server_url(self, server_id: str) -> str:
+        """MCP server URL - Not applicable for Cloud Run Jobs"""
+        raise NotImplementedError("MCP servers not supported in Cloud Run Jobs sandbox")
+    
+    async def stop_mcp_server(self, server_id: str) -> ToolResult:
+        """Stop MCP server - Not applicable for Cloud Run Jobs"""
+        return ToolResult(
+            success=False,
+            message="MCP servers not supported in Cloud Run Jobs sandbox"
+        )
+    
     async def destroy(self) -> bool:
         """Destroy current sandbox instance"""
         try:
             # Cleanup all sessions
             # TODO: Implement session cleanup
             logger.info(f"Destroying sandbox: {self._sandbox_id}")
+            if CloudRunJobsSandbox._instances.get(self._sandbox_id) is self:
+                del CloudRunJobsSandbox._instances[self._sandbox_id]
+            if self.warm_executor is not None:
+                await self.warm_executor.stop()
             return True
         except Exception as e:
             logger.error(f"Failed to destroy sandbox: {e}")
@@ -1150,7 +1692,7 @@ class CloudRunJobsSandbox(Sandbox):
         """
         return False
     
-    async def get_browser(self) -> Browser:
+    async def get_browser(self, session_id: Optional[str] = None) -> Browser:
         """Get browser instance - Not supported in Cloud Run Jobs"""
         raise NotImplementedError(
             "Browser/CDP not available in Cloud Run Jobs sandbox. "
@@ -1172,19 +1714,25 @@ class CloudRunJobsSandbox(Sandbox):
         region = settings.sandbox_gcp_region
         executor_image = getattr(settings, 'sandbox_executor_image', None)
         state_bucket = settings.sandbox_gcs_bucket
+        executor_mode = settings.sandbox_executor_mode
         
-        if not project_id:
+        if not project_id and executor_mode != "local":
             raise ValueError("SANDBOX_GCP_PROJECT must be configured for CloudRunJobsSandbox")
         
         sandbox = cls(
             project_id=project_id,
             region=region,
             executor_image=executor_image,
-            state_bucket=state_bucket
+            state_bucket=state_bucket,
+            executor_mode=executor_mode
         )
         
         # Ensure sandbox is ready
-        await sandbox.ensure_sandbox()
+        if executor_mode != "local":
+            await sandbox.ensure_sandbox()
+        
+        if sandbox.warm_executor is not None:
+            cls._instances[sandbox.id] = sandbox
         
         return sandbox
     
@@ -1210,12 +1758,35 @@ class CloudRunJobsSandbox(Sandbox):
         """
         Get sandbox by ID.
         
+        Sandboxes with a warm executor are returned as created, so the
+        session keeps its executor, cwd, env and background processes.
+        
         Args:
             id: Sandbox ID
             
         Returns:
             Sandbox instance
         """
-        # For now, just create a new instance
+        sandbox = cls._instances.get(id)
+        if sandbox is not None:
+            return sandbox
+        # Job mode keeps no per-instance state, and a warm executor doesn't
+        # outlive the backend process that started it
         # TODO: Implement proper sandbox retrieval/reuse
-        return await cls.create()
\ No newline at end of file
+        return await cls.create()
+    
+    @classmethod
+    async def close_all(cls) -> None:
+        """Destroy every sandbox with a warm executor, stopping its job"""
+        sandboxes = list(cls._instances.values())
+        await asyncio.gather(*(sandbox.destroy() for sandbox in sandboxes))
+
+
+def _redis_url(settings) -> str:
+    """Redis URL from the backend's own redis_* settings"""
+    password = settings.redis_password
+    if password and password.lower() not in ["no-password", "none"]:
+        auth = f":{quote(password, safe='')}@"
+    else:
+        auth = ""
+    return f"redis://{auth}{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
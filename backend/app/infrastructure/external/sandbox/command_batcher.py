@@ -0,0 +1,115 @@
+"""
+Command batching for CloudRunJobsSandbox
+
+Read-only file operations issued close together, typically the tool calls
+of one agent step or a file_batch, are coalesced per session over a short
+window and run as one executor invocation, DataLoader style:
+
+- The first command of a session opens a window, commands arriving within
+  it join the same batch, and a full batch is sent right away
+- Identical commands in one window share a single execution
+- flush() sends the pending batch of a session and waits for its in-flight
+  batches, so a command that changes state never overtakes earlier reads
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Seconds a batch stays open for more commands
+BATCH_WINDOW = 0.01
+MAX_BATCH_SIZE = 32
+
+# Runs the commands of a batch in order for a session, returns their results
+BatchExecutor = Callable[[str, List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]
+
+
+class _Batch:
+    """Commands pending for one session"""
+
+    def __init__(self):
+        # Command -> entry sent to the executor (id, command, timeout)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.futures: Dict[str, asyncio.Future] = {}
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class CommandBatcher:
+    """Coalesces commands into batched executions"""
+
+    def __init__(
+        self,
+        execute_batch: BatchExecutor,
+        window: float = BATCH_WINDOW,
+        max_size: int = MAX_BATCH_SIZE,
+    ):
+        self._execute_batch = execute_batch
+        self._window = window
+        self._max_size = max_size
+        self._pending: Dict[str, _Batch] = {}
+        self._inflight: Dict[str, Set[asyncio.Task]] = {}
+
+    async def submit(self, command: str, session_id: str, timeout: int = 120) -> Dict[str, Any]:
+        """Queue a command for the next batch of its session and wait for its result"""
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(session_id)
+        if batch is None:
+            batch = self._pending[session_id] = _Batch()
+            batch.handle = loop.call_later(self._window, self._dispatch, session_id)
+
+        future = batch.futures.get(command)
+        if future is None:
+            future = batch.futures[command] = loop.create_future()
+            batch.entries[command] = {"id": str(uuid.uuid4()), "command": command, "timeout": timeout}
+            if len(batch.entries) >= self._max_size:
+                self._dispatch(session_id)
+        else:
+            entry = batch.entries[command]
+            entry["timeout"] = max(entry["timeout"], timeout)
+        # A cancelled caller must not cancel the result others share
+        return await asyncio.shield(future)
+
+    async def flush(self, session_id: str) -> None:
+        """Send the pending batch of a session and wait for all of its batches"""
+        if session_id in self._pending:
+            self._dispatch(session_id)
+        tasks = list(self._inflight.get(session_id, ()))
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _dispatch(self, session_id: str) -> None:
+        batch = self._pending.pop(session_id, None)
+        if batch is None:
+            return
+        batch.handle.cancel()
+        task = asyncio.create_task(self._run(session_id, batch))
+        tasks = self._inflight.setdefault(session_id, set())
+        tasks.add(task)
+
+        def done(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            if not tasks and self._inflight.get(session_id) is tasks:
+                del self._inflight[session_id]
+
+        task.add_done_callback(done)
+
+    async def _run(self, session_id: str, batch: _Batch) -> None:
+        entries = list(batch.entries.values())
+        logger.debug(f"Running batch of {len(entries)} commands (session={session_id})")
+        try:
+            results = await self._execute_batch(session_id, entries)
+        except Exception as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for entry, result in zip(entries, results):
+            future = batch.futures[entry["command"]]
+            if not future.done():
+                future.set_result(result)
+        for future in batch.futures.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Batch returned no result for command"))
@@ -0,0 +1,219 @@
+"""
+Async Docker Engine API client
+
+Minimal non-blocking client for the container lifecycle calls DockerSandbox
+needs (create, start, inspect, remove, image pull), talking to the Engine
+API over the Unix socket or TCP with one httpx connection pool per daemon.
+Replaces the blocking docker SDK so sandbox lifecycle operations neither
+stall the event loop nor tie up the default thread pool.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+# Lifecycle calls answer quickly; image pulls are streamed without a read timeout
+API_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+PULL_TIMEOUT = httpx.Timeout(None, connect=5.0)
+
+
+class DockerAPIError(Exception):
+    """Error response from the Docker Engine API"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Docker API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+class DockerNotFoundError(DockerAPIError):
+    """Container or image does not exist"""
+
+
+class AsyncDockerClient:
+    """Async client for the Docker Engine API"""
+
+    def __init__(self, docker_host: Optional[str] = None):
+        docker_host = docker_host or os.environ.get("DOCKER_HOST") or DEFAULT_DOCKER_HOST
+        if docker_host.startswith("unix://"):
+            transport = httpx.AsyncHTTPTransport(uds=docker_host[len("unix://"):])
+            base_url = "http://docker"
+        elif docker_host.startswith("tcp://"):
+            transport = httpx.AsyncHTTPTransport()
+            base_url = "http://" + docker_host[len("tcp://"):]
+        else:
+            raise ValueError(f"Unsupported DOCKER_HOST: {docker_host}")
+        self._client = httpx.AsyncClient(transport=transport, base_url=base_url, timeout=API_TIMEOUT)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        response = await self._client.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            error_cls = DockerNotFoundError if response.status_code == 404 else DockerAPIError
+            raise error_cls(response.status_code, message)
+        return response
+
+    async def info(self) -> Dict[str, Any]:
+        """Get daemon information, including NCPU and MemTotal"""
+        response = await self._request("GET", "/info")
+        return response.json()
+
+    async def list_containers(self, label: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List running containers, optionally only those with a label"""
+        params = {}
+        if label:
+            params["filters"] = json.dumps({"label": [label]})
+        response = await self._request("GET", "/containers/json", params=params)
+        return response.json()
+
+    async def create_container(self, name: str, config: Dict[str, Any]) -> str:
+        """Create a container
+
+        Args:
+            name: Container name
+            config: Engine API container config (Image, Env, HostConfig, ...)
+
+        Returns:
+            Container ID
+        """
+        response = await self._request("POST", "/containers/create", params={"name": name}, json=config)
+        return response.json()["Id"]
+
+    async def start_container(self, container_id: str) -> None:
+        await self._request("POST", f"/containers/{container_id}/start")
+
+    async def inspect_container(self, container_id: str) -> Dict[str, Any]:
+        """Get container details, the same as the docker SDK's ``container.attrs``"""
+        response = await self._request("GET", f"/containers/{container_id}/json")
+        return response.json()
+
+    async def remove_container(self, container_id: str, force: bool = True) -> None:
+        await self._request(
+            "DELETE",
+            f"/containers/{container_id}",
+            params={"force": "true" if force else "false"}
+        )
+
+    async def pull_image(self, image: str) -> None:
+        """Pull an image, waiting for the pull to finish"""
+        repository, tag = parse_image(image)
+        async with self._client.stream(
+            "POST",
+            "/images/create",
+            params={"fromImage": repository, "tag": tag},
+            timeout=PULL_TIMEOUT
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise DockerAPIError(response.status_code, response.text)
+            # Progress is streamed as JSON lines, failures arrive in-band
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    progress = json.loads(line)
+                except ValueError:
+                    continue
+                if "error" in progress:
+                    raise DockerAPIError(response.status_code, progress["error"])
+
+    async def run_container(
+        self,
+        image: str,
+        name: str,
+        environment: Optional[Dict[str, Any]] = None,
+        volumes: Optional[Dict[str, Dict[str, str]]] = None,
+        network: Optional[str] = None,
+        remove: bool = False,
+        labels: Optional[Dict[str, str]] = None,
+        nano_cpus: Optional[int] = None,
+        mem_limit: Optional[int] = None,
+        pids_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Create and start a container, pulling the image if it is missing
+
+        Takes the same arguments as the docker SDK's ``containers.run`` in
+        detached mode.
+
+        Returns:
+            Inspected container details
+        """
+        config = build_container_config(
+            image, environment, volumes, network, remove,
+            labels=labels, nano_cpus=nano_cpus, mem_limit=mem_limit, pids_limit=pids_limit
+        )
+        try:
+            container_id = await self.create_container(name, config)
+        except DockerNotFoundError:
+            logger.info(f"Image {image} not found locally, pulling")
+            await self.pull_image(image)
+            container_id = await self.create_container(name, config)
+        await self.start_container(container_id)
+        return await self.inspect_container(container_id)
+
+
+def parse_image(image: str) -> Tuple[str, str]:
+    """Split an image reference into repository and tag"""
+    if "@" in image:
+        repository, digest = image.split("@", 1)
+        return repository, digest
+    name, _, tag = image.rpartition(":")
+    if name and "/" not in tag:
+        return name, tag
+    return image, "latest"
+
+
+def build_container_config(
+    image: str,
+    environment: Optional[Dict[str, Any]] = None,
+    volumes: Optional[Dict[str, Dict[str, str]]] = None,
+    network: Optional[str] = None,
+    remove: bool = False,
+    labels: Optional[Dict[str, str]] = None,
+    nano_cpus: Optional[int] = None,
+    mem_limit: Optional[int] = None,
+    pids_limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Build an Engine API container config from docker SDK style arguments
+
+    mem_limit is in bytes and also caps swap, so the container can't use
+    more than mem_limit of memory and swap combined.
+    """
+    env: List[str] = [
+        # Like the docker SDK, a None value passes the bare name
+        key if value is None else f"{key}={value}"
+        for key, value in (environment or {}).items()
+    ]
+    binds = [
+        f"{host_path}:{bind['bind']}:{bind.get('mode', 'rw')}"
+        for host_path, bind in (volumes or {}).items()
+    ]
+    host_config: Dict[str, Any] = {"AutoRemove": remove}
+    if binds:
+        host_config["Binds"] = binds
+    if network:
+        host_config["NetworkMode"] = network
+    if nano_cpus:
+        host_config["NanoCpus"] = nano_cpus
+    if mem_limit:
+        host_config["Memory"] = mem_limit
+        host_config["MemorySwap"] = mem_limit
+    if pids_limit:
+        host_config["PidsLimit"] = pids_limit
+    config: Dict[str, Any] = {"Image": image, "Env": env, "HostConfig": host_config}
+    if labels:
+        config["Labels"] = labels
+    return config
+
@@ -1,23 +1,103 @@
-from typing import Dict, Any, Optional, List, BinaryIO, Tuple
+from typing import Dict, Any, Optional, List, BinaryIO, Tuple, AsyncIterator
 import uuid
 import httpx
-import docker
 import socket
 import logging
 import asyncio
 import io
 import re
+from collections import OrderedDict
 from pathlib import Path
 from async_lru import alru_cache
 from app.core.config import get_settings
+from app.infrastructure.external.sandbox.docker_api import DockerNotFoundError
+from app.infrastructure.external.sandbox.scheduler import get_sandbox_scheduler
 from app.domain.models.tool_result import ToolResult
 from app.domain.external.sandbox import Sandbox
 from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
+from app.infrastructure.external.browser.context_pool import browser_context_pools
 from app.domain.external.browser import Browser
 from app.domain.external.llm import LLM
 
 logger = logging.getLogger(__name__)
 
+# Security: Maximum file size to prevent DoS (500MB)
+MAX_FILE_SIZE = 500 * 1024 * 1024
+# Chunk size used when streaming files to and from the sandbox
+STREAM_CHUNK_SIZE = 64 * 1024
+# Connection pool limits of the shared client for each sandbox host
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=30.0)
+# Timeout for status and metadata calls that answer immediately
+QUICK_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+# Default timeout for calls that run commands or transfer data
+LONG_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+# Number of sandbox instances kept by DockerSandbox.get
+INSTANCE_CACHE_SIZE = 128
+
+
+class _HostClients:
+    """Shared httpx clients, one bounded connection pool per sandbox host
+    
+    Sandbox instances for the same host reuse one client instead of each
+    opening its own connections. A closed client is replaced on next use,
+    so closing a host's client is always safe.
+    """
+    
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+    
+    def get(self, base_url: str) -> httpx.AsyncClient:
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=LONG_TIMEOUT, limits=HTTP_POOL_LIMITS)
+            self._clients[base_url] = client
+        return client
+    
+    async def close(self, base_url: str) -> None:
+        client = self._clients.pop(base_url, None)
+        if client is not None:
+            await client.aclose()
+    
+    async def close_all(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+
+_host_clients = _HostClients()
+
+
+async def _multipart_stream(
+    boundary: str,
+    chunks: AsyncIterator[bytes],
+    path: str,
+    filename: str
+) -> AsyncIterator[bytes]:
+    """Encode an upload as multipart/form-data without buffering the file
+
+    Args:
+        boundary: Multipart boundary, must not occur in the form fields
+        chunks: Async iterator yielding the file content
+        path: Value of the ``path`` form field
+        filename: Filename reported for the ``file`` field
+
+    Yields:
+        Encoded multipart body
+    """
+    quoted_filename = filename.replace('\\', '\\\\').replace('"', '\\"')
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="path"\r\n\r\n'
+        f"{path}\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{quoted_filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8")
+    async for chunk in chunks:
+        if chunk:
+            yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode("utf-8")
+
 
 class StatefulSession:
     """
@@ -73,9 +153,12 @@ class DockerSandbox(Sandbox):
     - File editor integration
     """
     
+    # Instances returned by get(), least recently used first
+    _instances: "OrderedDict[str, DockerSandbox]" = OrderedDict()
+    
     def __init__(self, ip: str = None, container_name: str = None):
         """Initialize Docker sandbox and API interaction client"""
-        self.client = httpx.AsyncClient(timeout=600)
+        self._client: Optional[httpx.AsyncClient] = None
         self.ip = ip
         self.base_url = f"http://{self.ip}:8080"
         self._vnc_url = f"ws://{self.ip}:5901"
@@ -87,6 +170,17 @@ class DockerSandbox(Sandbox):
         self._default_session_id = "default"
         self._get_or_create_session(self._default_session_id)
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for the sandbox API, shared with other instances for the same host"""
+        if self._client is None or self._client.is_closed:
+            self._client = _host_clients.get(self.base_url)
+        return self._client
+    
+    @client.setter
+    def client(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+    
     def _get_or_create_session(self, session_id: str) -> StatefulSession:
         """Get existing session or create new one"""
         if session_id not in self._sessions:
@@ -380,18 +474,18 @@ class DockerSandbox(Sandbox):
         return self._vnc_url
 
     @staticmethod
-    def _get_container_ip(container) -> str:
+    def _get_container_ip(attrs: Dict[str, Any]) -> str:
         """Get container IP address from network settings
         
         Args:
-            container: Docker container instance
+            attrs: Inspected container details
             
         Returns:
             Container IP address
         """
         # Get container network settings
-        network_settings = container.attrs['NetworkSettings']
-        ip_address = network_settings['IPAddress']
+        network_settings = attrs['NetworkSettings']
+        ip_address = network_settings.get('IPAddress')
         
         # If default network has no IP, try to get IP from other networks
         if not ip_address and 'Networks' in network_settings:
@@ -405,13 +499,9 @@ class DockerSandbox(Sandbox):
         return ip_address
 
     @staticmethod
-    def _create_task() -> 'DockerSandbox':
-        """Create a new Docker sandbox (static method)
+    async def _create_container() -> 'DockerSandbox':
+        """Create and start a new sandbox container
         
-        Args:
-            image: Docker image name
-            name_prefix: Container name prefix
-            
         Returns:
             DockerSandbox instance
         """
@@ -423,9 +513,6 @@ class DockerSandbox(Sandbox):
         container_name = f"{name_prefix}-{str(uuid.uuid4())[:8]}"
         
         try:
-            # Create Docker client
-            docker_client = docker.from_env()
-            
             # Prepare plugins directory for volume mount
             plugins_dir = Path(__file__).parent / "plugins"
             plugins_dir.mkdir(parents=True, exist_ok=True)
@@ -433,13 +520,13 @@ class DockerSandbox(Sandbox):
             
             logger.info(f"Plugins directory: {plugins_dir_str}")
 
-            # Prepare container configuration
-            container_config = {
-                "image": image,
-                "name": container_name,
-                "detach": True,
-                "remove": True,
-                "environment": {
+            # Place the container on a Docker host with resource limits,
+            # returns its inspected details
+            attrs = await get_sandbox_scheduler().run_container(
+                image=image,
+                name=container_name,
+                remove=True,
+                environment={
                     "SERVICE_TIMEOUT_MINUTES": settings.sandbox_ttl_minutes,
                     "CHROME_ARGS": settings.sandbox_chrome_args,
                     "HTTPS_PROXY": settings.sandbox_https_proxy,
@@ -447,24 +534,15 @@ class DockerSandbox(Sandbox):
                     "NO_PROXY": settings.sandbox_no_proxy,
                     "PYTHONPATH": "/openhands/tools:$PYTHONPATH",  # Add tools to Python path
                 },
-                "volumes": {
+                volumes={
                     plugins_dir_str: {
                         "bind": "/openhands/tools",
                         "mode": "ro"  # Read-only mount
                     }
-                }
-            }
-            
-            # Add network to container config if configured
-            if settings.sandbox_network:
-                container_config["network"] = settings.sandbox_network
-            
-            # Create container
-            container = docker_client.containers.run(**container_config)
-            
-            # Get container IP address
-            container.reload()  # Refresh container info
-            ip_address = DockerSandbox._get_container_ip(container)
+                },
+                network=settings.sandbox_network or None,
+            )
+            ip_address = DockerSandbox._get_container_ip(attrs)
             
             # Create and return DockerSandbox instance
             return DockerSandbox(
@@ -487,7 +565,10 @@ class DockerSandbox(Sandbox):
         
         for attempt in range(max_retries):
             try:
-                response = await self.client.get(f"{self.base_url}/api/v1/supervisor/status")
+                response = await self.client.get(
+                    f"{self.base_url}/api/v1/supervisor/status",
+                    timeout=QUICK_TIMEOUT
+                )
                 response.raise_for_status()
                 
                 # Parse response as ToolResult
@@ -722,7 +803,8 @@ exit $EXIT_CODE
             json={
                 "id": session_id,
                 "console": console
-            }
+            },
+            timeout=QUICK_TIMEOUT
         )
         return ToolResult(**response.json())
 
@@ -743,14 +825,46 @@ exit $EXIT_CODE
                 "id": session_id,
                 "input": input_text,
                 "press_enter": press_enter
-            }
+            },
+            timeout=QUICK_TIMEOUT
         )
         return ToolResult(**response.json())
 
     async def kill_process(self, session_id: str) -> ToolResult:
         response = await self.client.post(
             f"{self.base_url}/api/v1/shell/kill",
-            json={"id": session_id}
+            json={"id": session_id},
+            timeout=QUICK_TIMEOUT
+        )
+        return ToolResult(**response.json())
+
+    async def start_mcp_server(
+        self,
+        name: str,
+        command: str,
+        args: List[str],
+        env: Optional[Dict[str, str]] = None
+    ) -> ToolResult:
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/mcp/start",
+            json={
+                "name": name,
+                "command": command,
+                "args": args,
+                "env": env
+            },
+            timeout=QUICK_TIMEOUT
+        )
+        return ToolResult(**response.json())
+
+    def mcp_server_url(self, server_id: str) -> str:
+        return f"ws://{self.ip}:8080/api/v1/mcp/{server_id}/ws"
+
+    async def stop_mcp_server(self, server_id: str) -> ToolResult:
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/mcp/stop",
+            json={"id": server_id},
+            timeout=QUICK_TIMEOUT
         )
         return ToolResult(**response.json())
 
@@ -818,6 +932,22 @@ exit $EXIT_CODE
         """
         response = await self.client.post(
             f"{self.base_url}/api/v1/file/exists",
+            json={"path": path},
+            timeout=QUICK_TIMEOUT
+        )
+        return ToolResult(**response.json())
+        
+    async def file_hash(self, path: str) -> ToolResult:
+        """Compute the SHA-256 of a file's content inside the sandbox
+        
+        Args:
+            path: File path
+            
+        Returns:
+            Hash result with ``sha256`` and ``size`` in data
+        """
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/file/hash",
             json={"path": path}
         )
         return ToolResult(**response.json())
@@ -833,7 +963,8 @@ exit $EXIT_CODE
         """
         response = await self.client.post(
             f"{self.base_url}/api/v1/file/delete",
-            json={"path": path}
+            json={"path": path},
+            timeout=QUICK_TIMEOUT
         )
         return ToolResult(**response.json())
         
@@ -848,7 +979,8 @@ exit $EXIT_CODE
         """
         response = await self.client.post(
             f"{self.base_url}/api/v1/file/list",
-            json={"path": path}
+            json={"path": path},
+            timeout=QUICK_TIMEOUT
         )
         return ToolResult(**response.json())
 
@@ -896,6 +1028,32 @@ exit $EXIT_CODE
         )
         return ToolResult(**response.json())
 
+    async def file_grep(self, path: str, regex: str, glob_pattern: Optional[str] = None,
+                        case_sensitive: bool = True, max_results: int = 200) -> ToolResult:
+        """Search file contents across a directory tree
+        
+        Args:
+            path: File or directory path to search
+            regex: Regular expression
+            glob_pattern: Only search files matching this glob
+            case_sensitive: Whether matching is case sensitive
+            max_results: Maximum number of matches to return
+            
+        Returns:
+            Search results
+        """
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/file/grep",
+            json={
+                "path": path,
+                "regex": regex,
+                "glob": glob_pattern,
+                "case_sensitive": case_sensitive,
+                "max_results": max_results
+            }
+        )
+        return ToolResult(**response.json())
+
     async def file_find(self, path: str, glob_pattern: str) -> ToolResult:
         """Find files by name pattern
         
@@ -915,6 +1073,55 @@ exit $EXIT_CODE
         )
         return ToolResult(**response.json())
 
+    async def file_batch(self, operations: List[Dict[str, Any]]) -> ToolResult:
+        """Run several file operations in one round trip
+        
+        Args:
+            operations: List of operation dicts (op, path and op specific fields)
+            
+        Returns:
+            Batch result with per operation results in request order
+        """
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/file/batch",
+            json={"operations": operations}
+        )
+        return ToolResult(**response.json())
+
+    async def file_editor(self, command: str, path: str, file_text: Optional[str] = None,
+                          view_range: Optional[List[int]] = None, old_str: Optional[str] = None,
+                          new_str: Optional[str] = None, insert_line: Optional[int] = None) -> ToolResult:
+        """Run a file_editor command in the sandbox's resident editor
+        
+        Args:
+            command: Editor command (view, create, str_replace, insert or undo_edit)
+            path: Absolute file or directory path
+            file_text: Content of the file to create
+            view_range: Line range [start, end] to view
+            old_str: String to replace
+            new_str: Replacement or inserted string
+            insert_line: Line after which new_str is inserted
+            
+        Returns:
+            Editor result with command, path and content in data
+        """
+        params = {
+            "file_text": file_text,
+            "view_range": view_range,
+            "old_str": old_str,
+            "new_str": new_str,
+            "insert_line": insert_line
+        }
+        response = await self.client.post(
+            f"{self.base_url}/api/v1/file/editor",
+            json={
+                "command": command,
+                "path": path,
+                **{key: value for key, value in params.items() if value is not None}
+            }
+        )
+        return ToolResult(**response.json())
+
     async def file_upload(self, file_data: BinaryIO, path: str, filename: str = None) -> ToolResult:
         """Upload file to sandbox with streaming support for large files
         
@@ -926,16 +1133,40 @@ exit $EXIT_CODE
         Returns:
             Upload operation result
         """
-        try:
-            # Prepare form data for upload
-            files = {"file": (filename or "upload", file_data, "application/octet-stream")}
-            data = {"path": path}
+        async def iter_file() -> AsyncIterator[bytes]:
+            while True:
+                chunk = file_data.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        
+        return await self.file_upload_stream(iter_file(), path, filename)
+
+    async def file_upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        path: str,
+        filename: str = None
+    ) -> ToolResult:
+        """Upload file to sandbox from an async stream of chunks
+        
+        The multipart body is generated on the fly, so only one chunk is held
+        in memory at a time.
+        
+        Args:
+            chunks: Async iterator yielding the file content
+            path: Target file path in sandbox
+            filename: Original filename (optional)
             
-            # Use streaming upload for better memory efficiency
+        Returns:
+            Upload operation result
+        """
+        boundary = uuid.uuid4().hex
+        try:
             response = await self.client.post(
                 f"{self.base_url}/api/v1/file/upload",
-                files=files,
-                data=data,
+                content=_multipart_stream(boundary, chunks, path, filename or "upload"),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
                 timeout=300.0  # 5 minutes for large files
             )
             response.raise_for_status()
@@ -965,9 +1196,25 @@ exit $EXIT_CODE
         Raises:
             Exception: If file exceeds maximum size limit (500MB) or download fails
         """
-        # Security: Maximum file size to prevent DoS (500MB)
-        MAX_FILE_SIZE = 500 * 1024 * 1024  # 500 MB
+        buffer = io.BytesIO()
+        async for chunk in self.file_download_stream(path):
+            buffer.write(chunk)
+        buffer.seek(0)  # Reset to beginning
+        return buffer
+
+    async def file_download_stream(self, path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Download file from sandbox as an async stream of chunks
         
+        Args:
+            path: File path in sandbox
+            chunk_size: Preferred chunk size in bytes
+            
+        Yields:
+            File content chunks
+            
+        Raises:
+            Exception: If file exceeds maximum size limit (500MB) or download fails
+        """
         try:
             # Use TRUE streaming download with client.stream() to handle large files efficiently
             async with self.client.stream(
@@ -999,11 +1246,9 @@ exit $EXIT_CODE
                 if file_size > 100 * 1024 * 1024:  # > 100MB
                     logger.warning(f"Large file download ({file_size / 1024 / 1024:.2f} MB) - using streaming")
                 
-                # Stream content to BytesIO chunk by chunk with size tracking
-                buffer = io.BytesIO()
                 bytes_downloaded = 0
                 
-                async for chunk in response.aiter_bytes(chunk_size=8192):
+                async for chunk in response.aiter_bytes(chunk_size=chunk_size):
                     bytes_downloaded += len(chunk)
                     
                     # Security: Enforce size limit even if Content-Length is missing/wrong
@@ -1013,10 +1258,7 @@ exit $EXIT_CODE
                             f"({MAX_FILE_SIZE / 1024 / 1024:.0f} MB)"
                         )
                     
-                    buffer.write(chunk)
-                
-                buffer.seek(0)  # Reset to beginning
-                return buffer
+                    yield chunk
             
         except httpx.TimeoutException:
             logger.error(f"Download timeout for file: {path}")
@@ -1064,11 +1306,21 @@ exit $EXIT_CODE
     async def destroy(self) -> bool:
         """Destroy Docker sandbox"""
         try:
-            if self.client:
-                await self.client.aclose()
+            if DockerSandbox._instances.get(self.id) is self:
+                del DockerSandbox._instances[self.id]
+            # With SANDBOX_ADDRESS every session talks to the same host, keep
+            # its client and browser while another cached instance uses them
+            host_in_use = DockerSandbox._host_in_use(self.base_url)
+            if not host_in_use:
+                await _host_clients.close(self.base_url)
             if self._container_name:
-                docker_client = docker.from_env()
-                docker_client.containers.get(self._container_name).remove(force=True)
+                try:
+                    await get_sandbox_scheduler().remove_container(self._container_name)
+                except DockerNotFoundError:
+                    # Already gone, e.g. auto-removed after the sandbox timed out
+                    pass
+                if not host_in_use:
+                    await browser_context_pools.close(self.cdp_url)
             return True
         except Exception as e:
             logger.error(f"Failed to destroy Docker sandbox: {str(e)}")
@@ -1082,17 +1334,20 @@ exit $EXIT_CODE
         """
         return True
     
-    async def get_browser(self) -> Browser:
+    async def get_browser(self, session_id: Optional[str] = None) -> Browser:
         """Get browser instance
         
         Args:
-            llm: LLM instance used for browser automation
+            session_id: Session using the browser, gets its own context
             
         Returns:
             Browser: Returns a configured PlaywrightBrowser instance
                     connected using the sandbox's CDP URL
         """
-        return PlaywrightBrowser(self.cdp_url)
+        browser = PlaywrightBrowser(self.cdp_url, session_id)
+        # Have a context ready by the first browser tool call
+        browser.context_pool.warm()
+        return browser
 
     @staticmethod
     @alru_cache(maxsize=128, typed=True)
@@ -1144,28 +1399,67 @@ exit $EXIT_CODE
             ip = await cls._resolve_hostname_to_ip(settings.sandbox_address)
             return DockerSandbox(ip=ip)
     
-        return await asyncio.to_thread(DockerSandbox._create_task)
+        sandbox = await DockerSandbox._create_container()
+        # Later get() calls for this container return the same instance
+        cls._cache_instance(sandbox)
+        return sandbox
     
     @classmethod
-    @alru_cache(maxsize=128, typed=True)
     async def get(cls, id: str) -> Sandbox:
         """Get sandbox by ID
         
+        Instances are cached (least recently used are evicted) so repeated
+        lookups keep their session state and share the host's HTTP client.
+        
         Args:
             id: Sandbox ID
             
         Returns:
             Sandbox instance
         """
+        sandbox = cls._instances.get(id)
+        if sandbox is not None:
+            cls._instances.move_to_end(id)
+            return sandbox
+        
         settings = get_settings()
         if settings.sandbox_address:
             ip = await cls._resolve_hostname_to_ip(settings.sandbox_address)
-            return DockerSandbox(ip=ip, container_name=id)
-
-        docker_client = docker.from_env()
-        container = docker_client.containers.get(id)
-        container.reload()
-        
-        ip_address = cls._get_container_ip(container)
-        logger.info(f"IP address: {ip_address}")
-        return DockerSandbox(ip=ip_address, container_name=id)
+            sandbox = DockerSandbox(ip=ip, container_name=id)
+        else:
+            attrs = await get_sandbox_scheduler().inspect_container(id)
+            ip_address = cls._get_container_ip(attrs)
+            logger.info(f"IP address: {ip_address}")
+            sandbox = DockerSandbox(ip=ip_address, container_name=id)
+        
+        # Another caller may have cached this sandbox while we were looking it up
+        if id in cls._instances:
+            return await cls.get(id)
+        cls._cache_instance(sandbox)
+        return sandbox
+    
+    @classmethod
+    def _cache_instance(cls, sandbox: "DockerSandbox") -> None:
+        """Add an instance to the get() cache, evicting the least recently used"""
+        cls._instances[sandbox.id] = sandbox
+        cls._instances.move_to_end(sandbox.id)
+        while len(cls._instances) > INSTANCE_CACHE_SIZE:
+            # Only drop the entry: the evicted sandbox's task may still be
+            # using its host client, which destroy() and close_all() close
+            _, evicted = cls._instances.popitem(last=False)
+            logger.debug(f"Evicted cached sandbox instance {evicted.id}")
+    
+    @classmethod
+    def _host_in_use(cls, base_url: str) -> bool:
+        """Whether a cached instance talks to this sandbox host"""
+        return any(other.base_url == base_url for other in cls._instances.values())
+    
+    @classmethod
+    async def close_all(cls) -> None:
+        """Drop all cached instances and close every sandbox and Docker API client"""
+        cls._instances.clear()
+        await _host_clients.close_all()
+        await browser_context_pools.close_all()
+        if get_sandbox_scheduler.cache_info().currsize:
+            await get_sandbox_scheduler().close()
+            get_sandbox_scheduler.cache_clear()
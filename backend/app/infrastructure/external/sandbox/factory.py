@@ -15,12 +15,15 @@ Date: 2025-12-28
 """
 
 import logging
-from typing import Type
+from functools import lru_cache
+from typing import Optional, Type
 
 from app.core.config import get_settings
 from app.domain.external.sandbox import Sandbox
+from app.domain.external.sandbox_pool import SandboxPool
 from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
 from app.infrastructure.external.sandbox.cloudrun_jobs_sandbox import CloudRunJobsSandbox
+from app.infrastructure.external.sandbox.pool import WarmSandboxPool
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +88,36 @@ def get_sandbox() -> Type[Sandbox]:
         return DockerSandbox
 
 
+@lru_cache()
+def get_sandbox_pool() -> Optional[SandboxPool]:
+    """
+    Get the warm sandbox pool, if enabled.
+    
+    The pool only applies to DockerSandbox containers: a fixed
+    SANDBOX_ADDRESS is shared by all sessions and CloudRun jobs are
+    started per command, so neither benefits from pre-started sandboxes.
+    
+    Returns:
+        Shared pool instance, or None when SANDBOX_POOL_TARGET_SIZE is 0
+        or the selected sandbox doesn't support pooling
+    """
+    settings = get_settings()
+    if settings.sandbox_pool_target_size <= 0:
+        return None
+    
+    sandbox_cls = get_sandbox()
+    if sandbox_cls is not DockerSandbox or settings.sandbox_address:
+        logger.info("Sandbox pool disabled: only supported for DockerSandbox containers")
+        return None
+    
+    return WarmSandboxPool(
+        sandbox_cls,
+        target_size=settings.sandbox_pool_target_size,
+        max_size=settings.sandbox_pool_max_size,
+        idle_ttl_seconds=settings.sandbox_pool_idle_ttl_seconds,
+    )
+
+
 def get_sandbox_info() -> dict:
     """
     Get information about the currently selected sandbox implementation.
@@ -34,6 +34,7 @@ from openhands.tools.file_editor.utils.encoding import (
     with_encoding,
 )
 from openhands.tools.file_editor.utils.history import FileHistoryManager
+from openhands.tools.file_editor.utils.line_index import LineIndexCache
 from openhands.tools.file_editor.utils.shell import run_shell_cmd
 
 
@@ -59,6 +60,7 @@ class FileEditor:
     _history_manager: FileHistoryManager
     _max_file_size: int
     _encoding_manager: EncodingManager
+    _line_indexes: LineIndexCache
     _cwd: str
 
     def __init__(
@@ -83,6 +85,9 @@ class FileEditor:
         # Initialize encoding manager
         self._encoding_manager = EncodingManager()
 
+        # Line offsets of recently viewed files, for reading line ranges
+        self._line_indexes = LineIndexCache()
+
         # Set cwd (current working directory) if workspace_root is provided
         if workspace_root is not None:
             workspace_path = Path(workspace_root)
@@ -161,6 +166,9 @@ class FileEditor:
         Returns:
             The number of lines in the file
         """
+        index = self._line_indexes.get(path, encoding)
+        if index is not None:
+            return index.num_lines
         with open(path, encoding=encoding) as f:
             return sum(1 for _ in f)
 
@@ -455,6 +463,8 @@ class FileEditor:
                 f.write(file_text)
         except Exception as e:
             raise ToolError(f"Ran into {e} while trying to write to {path}") from None
+        finally:
+            self._line_indexes.invalidate(path)
 
     @with_encoding
     def insert(
@@ -684,7 +694,11 @@ class FileEditor:
         self.validate_file(path)
         try:
             if start_line is not None and end_line is not None:
-                # Read only the specified line range
+                # Read only the specified line range, seeking straight to it
+                # when the file can be line-indexed
+                index = self._line_indexes.get(path, encoding)
+                if index is not None:
+                    return index.read_range(path, start_line, end_line, encoding)
                 lines = []
                 with open(path, encoding=encoding) as f:
                     for i, line in enumerate(f, 1):
@@ -24,11 +24,18 @@ def get_edit_groups(
         return []
     old_lines = old_content.split("\n")
     new_lines = new_content.split("\n")
+    # Only diff the region that changed (plus context), edits usually touch a
+    # few lines of a possibly huge file and SequenceMatcher is O(n*m)
+    start, old_end, new_end = _changed_window(old_lines, new_lines, n_context_lines)
     # Borrowed from difflib.unified_diff to directly parse into structured format
     edit_groups: list[EditGroup] = []
-    for group in SequenceMatcher(None, old_lines, new_lines).get_grouped_opcodes(
-        n_context_lines
-    ):
+    for window_group in SequenceMatcher(
+        None, old_lines[start:old_end], new_lines[start:new_end]
+    ).get_grouped_opcodes(n_context_lines):
+        group = [
+            (tag, i1 + start, i2 + start, j1 + start, j2 + start)
+            for tag, i1, i2, j1, j2 in window_group
+        ]
         # Take the max line number in the group
         _indent_pad_size = len(str(group[-1][3])) + 1  # +1 for "*" prefix
         cur_group: EditGroup = EditGroup(
@@ -64,6 +71,29 @@ def get_edit_groups(
     return edit_groups
 
 
+def _changed_window(
+    old_lines: list[str], new_lines: list[str], n_context_lines: int
+) -> tuple[int, int, int]:
+    """Find the line window both sides differ in, widened by the context size.
+
+    Returns:
+        The window start (same for both sides) and its end in old and new lines.
+    """
+    max_common = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < max_common and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < max_common - prefix
+        and old_lines[-1 - suffix] == new_lines[-1 - suffix]
+    ):
+        suffix += 1
+    start = max(prefix - n_context_lines, 0)
+    tail = max(suffix - n_context_lines, 0)
+    return start, len(old_lines) - tail, len(new_lines) - tail
+
+
 def visualize_diff(
     path: str,
     old_content: str | None,
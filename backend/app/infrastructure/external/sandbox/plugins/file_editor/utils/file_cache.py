@@ -1,7 +1,7 @@
 import hashlib
 import json
 import os
-import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -10,146 +10,251 @@ from openhands.sdk.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Append-only log of index changes, not matched by the "*.json" entry glob
+MANIFEST_NAME = "manifest.log"
+# Compact the manifest once it holds this many records per live entry...
+MANIFEST_COMPACT_RATIO = 4
+# ...but never for fewer records than this
+MANIFEST_COMPACT_MIN_RECORDS = 1024
+
 
 class FileCache:
+    """Disk-backed key/value cache with size-limited LRU eviction.
+
+    Entry sizes and recency live in an in-memory index (least recently used
+    first), so set, get, eviction and len never scan the cache directory.
+    The index is persisted as an append-only manifest of ``+ <name> <size>``
+    and ``- <name>`` records, compacted as it grows, and is rebuilt lazily on
+    first use.
+    """
+
     directory: Path
     size_limit: int | None
-    current_size: int
 
     def __init__(self, directory: str, size_limit: int | None = None):
         self.directory = Path(directory)
         self.directory.mkdir(parents=True, exist_ok=True)
         self.size_limit = size_limit
-        self.current_size = 0
-        self._update_current_size()
+        self._manifest_path = self.directory / MANIFEST_NAME
+        self._index: OrderedDict[str, int] | None = None
+        self._current_size = 0
+        self._manifest_records = 0
         logger.debug(
             f"FileCache initialized with directory: {self.directory}, "
-            f"size_limit: {self.size_limit}, current_size: {self.current_size}"
+            f"size_limit: {self.size_limit}"
         )
 
+    @property
+    def current_size(self) -> int:
+        self._ensure_index()
+        return self._current_size
+
     def _get_file_path(self, key: str) -> Path:
         hashed_key = hashlib.sha256(key.encode()).hexdigest()
         return self.directory / f"{hashed_key}.json"
 
-    def _update_current_size(self):
-        self.current_size = sum(
-            f.stat().st_size for f in self.directory.glob("*.json") if f.is_file()
+    def _ensure_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            self._load_index()
+        assert self._index is not None
+        return self._index
+
+    def _load_index(self) -> None:
+        """Replay the manifest and reconcile it with the entries on disk."""
+        index: OrderedDict[str, int] = OrderedDict()
+        records = 0
+        try:
+            with open(self._manifest_path) as f:
+                for line in f:
+                    records += 1
+                    parts = line.split()
+                    if len(parts) == 3 and parts[0] == "+" and parts[2].isdigit():
+                        index[parts[1]] = int(parts[2])
+                        index.move_to_end(parts[1])
+                    elif len(parts) == 2 and parts[0] == "-":
+                        index.pop(parts[1], None)
+        except FileNotFoundError:
+            pass
+
+        with os.scandir(self.directory) as it:
+            on_disk = {
+                entry.name
+                for entry in it
+                if entry.name.endswith(".json") and entry.is_file()
+            }
+
+        stale = [name for name in index if name not in on_disk]
+        for name in stale:
+            del index[name]
+
+        # Entries the manifest doesn't know about (e.g. a cache written before
+        # manifests existed) are treated as oldest, ordered by mtime.
+        unknown = []
+        for name in on_disk - index.keys():
+            try:
+                stat = (self.directory / name).stat()
+            except FileNotFoundError:
+                continue
+            unknown.append((stat.st_mtime, name, stat.st_size))
+        if unknown:
+            unknown.sort()
+            rebuilt: OrderedDict[str, int] = OrderedDict(
+                (name, size) for _, name, size in unknown
+            )
+            rebuilt.update(index)
+            index = rebuilt
+
+        self._index = index
+        self._current_size = sum(index.values())
+        self._manifest_records = records
+        if stale or unknown or self._should_compact():
+            self._compact_manifest()
+        logger.debug(
+            f"Index loaded: {len(index)} entries, current_size: {self._current_size}"
         )
-        logger.debug(f"Current size updated: {self.current_size}")
+
+    def _should_compact(self) -> bool:
+        assert self._index is not None
+        return self._manifest_records > max(
+            MANIFEST_COMPACT_MIN_RECORDS, MANIFEST_COMPACT_RATIO * len(self._index)
+        )
+
+    def _compact_manifest(self) -> None:
+        assert self._index is not None
+        tmp_path = self._manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            f.writelines(f"+ {name} {size}\n" for name, size in self._index.items())
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest_records = len(self._index)
+        logger.debug(f"Manifest compacted to {self._manifest_records} records")
+
+    def _record(self, line: str) -> None:
+        with open(self._manifest_path, "a") as f:
+            f.write(line + "\n")
+        self._manifest_records += 1
+        if self._should_compact():
+            self._compact_manifest()
+
+    def _touch(self, name: str) -> None:
+        index = self._ensure_index()
+        index.move_to_end(name)
+        self._record(f"+ {name} {index[name]}")
+
+    def _forget(self, name: str) -> int:
+        size = self._ensure_index().pop(name)
+        self._current_size -= size
+        self._record(f"- {name}")
+        return size
 
     def set(self, key: str, value: Any) -> None:
+        index = self._ensure_index()
         file_path = self._get_file_path(key)
+        name = file_path.name
         content = json.dumps({"key": key, "value": value})
         content_size = len(content.encode("utf-8"))
+        old_size = index.get(name)
         logger.debug(f"Setting key: {key}, content_size: {content_size}")
 
         if self.size_limit is not None:
-            if file_path.exists():
-                old_size = file_path.stat().st_size
-                size_diff = content_size - old_size
+            size_diff = content_size - (old_size or 0)
+            while (
+                size_diff > 0
+                and self._current_size + size_diff > self.size_limit
+                and len(index) > 1
+            ):
                 logger.debug(
-                    f"Existing file: old_size: {old_size}, size_diff: {size_diff}"
+                    f"Evicting oldest: current_size: {self._current_size}, "
+                    f"size_limit: {self.size_limit}"
                 )
-                if size_diff > 0:
-                    while (
-                        self.current_size + size_diff > self.size_limit
-                        and len(self) > 1
-                    ):
-                        logger.debug(
-                            f"Evicting oldest (existing file case): "
-                            f"current_size: {self.current_size}, "
-                            f"size_limit: {self.size_limit}"
-                        )
-                        self._evict_oldest(file_path)
-            else:
-                while (
-                    self.current_size + content_size > self.size_limit and len(self) > 1
-                ):
-                    logger.debug(
-                        f"Evicting oldest (new file case): "
-                        f"current_size: {self.current_size}, "
-                        f"size_limit: {self.size_limit}"
-                    )
-                    self._evict_oldest(file_path)
-
-        if file_path.exists():
-            self.current_size -= file_path.stat().st_size
-            logger.debug(
-                f"Existing file removed from current_size: {self.current_size}"
-            )
+                self._evict_oldest(file_path)
 
         with open(file_path, "w") as f:
             f.write(content)
 
-        self.current_size += content_size
-        logger.debug(f"File written, new current_size: {self.current_size}")
-        os.utime(
-            file_path, (time.time(), time.time())
-        )  # Update access and modification time
+        self._current_size += content_size - (old_size or 0)
+        index[name] = content_size
+        self._touch(name)
+        logger.debug(f"File written, new current_size: {self._current_size}")
 
     def _evict_oldest(self, exclude_path: Path | None = None):
-        oldest_file = min(
-            (
-                f
-                for f in self.directory.glob("*.json")
-                if f.is_file() and f != exclude_path
-            ),
-            key=os.path.getmtime,
+        exclude_name = exclude_path.name if exclude_path is not None else None
+        oldest = next(
+            (name for name in self._ensure_index() if name != exclude_name), None
         )
-        evicted_size = oldest_file.stat().st_size
-        self.current_size -= evicted_size
-        os.remove(oldest_file)
+        if oldest is None:
+            return
+        evicted_size = self._forget(oldest)
+        try:
+            os.remove(self.directory / oldest)
+        except FileNotFoundError:
+            pass
         logger.debug(
-            f"Evicted file: {oldest_file}, size: {evicted_size}, "
-            f"new current_size: {self.current_size}"
+            f"Evicted file: {oldest}, size: {evicted_size}, "
+            f"new current_size: {self._current_size}"
         )
 
     def get(self, key: str, default: Any = None) -> Any:
         file_path = self._get_file_path(key)
-        if not file_path.exists():
+        if file_path.name not in self._ensure_index():
+            logger.debug(f"Get: Key not found: {key}")
+            return default
+        try:
+            with open(file_path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            # Removed behind our back, e.g. by another process
+            self._forget(file_path.name)
             logger.debug(f"Get: Key not found: {key}")
             return default
-        with open(file_path) as f:
-            data = json.load(f)
-            os.utime(file_path, (time.time(), time.time()))  # Update access time
-            logger.debug(f"Get: Key found: {key}")
-            return data["value"]
+        self._touch(file_path.name)
+        logger.debug(f"Get: Key found: {key}")
+        return data["value"]
 
     def delete(self, key: str) -> None:
         file_path = self._get_file_path(key)
-        if file_path.exists():
-            deleted_size = file_path.stat().st_size
-            self.current_size -= deleted_size
-            os.remove(file_path)
+        if file_path.name in self._ensure_index():
+            deleted_size = self._forget(file_path.name)
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
             logger.debug(
                 f"Deleted key: {key}, size: {deleted_size}, "
-                f"new current_size: {self.current_size}"
+                f"new current_size: {self._current_size}"
             )
 
     def clear(self) -> None:
         for item in self.directory.glob("*.json"):
             if item.is_file():
                 os.remove(item)
-        self.current_size = 0
+        try:
+            os.remove(self._manifest_path)
+        except FileNotFoundError:
+            pass
+        self._index = OrderedDict()
+        self._current_size = 0
+        self._manifest_records = 0
         logger.debug("Cache cleared")
 
     def __contains__(self, key: str) -> bool:
-        exists = self._get_file_path(key).exists()
+        exists = self._get_file_path(key).name in self._ensure_index()
         logger.debug(f"Contains check: {key}, result: {exists}")
         return exists
 
     def __len__(self) -> int:
-        length = sum(1 for _ in self.directory.glob("*.json") if _.is_file())
+        length = len(self._ensure_index())
         logger.debug(f"Cache length: {length}")
         return length
 
     def __iter__(self):
-        for file in self.directory.glob("*.json"):
-            if file.is_file():
-                with open(file) as f:
+        for name in list(self._ensure_index()):
+            try:
+                with open(self.directory / name) as f:
                     data = json.load(f)
-                    logger.debug(f"Yielding key: {data['key']}")
-                    yield data["key"]
+            except FileNotFoundError:
+                continue
+            logger.debug(f"Yielding key: {data['key']}")
+            yield data["key"]
 
     def __getitem__(self, key: str) -> Any:
         return self.get(key)
@@ -1,12 +1,62 @@
 """History management for file edits with disk-based storage and memory constraints."""
 
+import base64
 import logging
 import tempfile
+import zlib
 from pathlib import Path
+from typing import Any
 
 from openhands.tools.file_editor.utils.file_cache import FileCache
 
 
+# Keep every Nth history entry as a full snapshot to bound delta chains
+SNAPSHOT_INTERVAL = 8
+# Snapshots are compressed for size rather than ratio, undo should stay fast
+SNAPSHOT_COMPRESSION_LEVEL = 1
+# Characters compared at a time when looking for the edited span
+COMPARE_BLOCK_SIZE = 64 * 1024
+
+
+def _common_prefix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common prefix of a and b, at most ``limit`` characters."""
+    length = 0
+    while length < limit:
+        block_end = min(length + COMPARE_BLOCK_SIZE, limit)
+        if a[length:block_end] != b[length:block_end]:
+            # Bisect inside the first mismatching block
+            low, high = length, block_end - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if a[length:mid] == b[length:mid]:
+                    low = mid
+                else:
+                    high = mid - 1
+            return low
+        length = block_end
+    return limit
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of a and b, at most ``limit`` characters."""
+    len_a, len_b = len(a), len(b)
+    length = 0
+    while length < limit:
+        block_end = min(length + COMPARE_BLOCK_SIZE, limit)
+        if a[len_a - block_end : len_a - length] != b[len_b - block_end : len_b - length]:
+            # Bisect inside the first mismatching block
+            low, high = length, block_end - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if a[len_a - mid : len_a - length] == b[len_b - mid : len_b - length]:
+                    low = mid
+                else:
+                    high = mid - 1
+            return low
+        length = block_end
+    return limit
+
+
 class FileHistoryManager:
     """Manages file edit history with disk-based storage and memory constraints."""
 
@@ -28,6 +78,9 @@ class FileHistoryManager:
               memory
             - The file cache is limited to prevent excessive disk usage
             - Older entries are automatically removed when limits are exceeded
+            - The most recent entry is stored as a compressed snapshot and
+              older ones as reverse deltas against the next newer entry, so an
+              undo is one decompression plus one delta application
         """
         self.max_history_per_file = max_history_per_file
         if history_dir is None:
@@ -41,15 +94,60 @@ class FileHistoryManager:
     def _get_history_key(self, file_path: Path, counter: int) -> str:
         return f"{file_path}.{counter}"
 
+    @staticmethod
+    def _make_snapshot(content: str) -> dict[str, Any]:
+        compressed = zlib.compress(content.encode("utf-8"), SNAPSHOT_COMPRESSION_LEVEL)
+        return {"snapshot": base64.b64encode(compressed).decode("ascii")}
+
+    @staticmethod
+    def _make_delta(content: str, newer: str) -> dict[str, Any]:
+        """Encode ``content`` as the span where it differs from ``newer``."""
+        prefix = _common_prefix_length(content, newer, min(len(content), len(newer)))
+        suffix = _common_suffix_length(
+            content, newer, min(len(content), len(newer)) - prefix
+        )
+        return {
+            "prefix": prefix,
+            "suffix": suffix,
+            "middle": content[prefix : len(content) - suffix],
+        }
+
+    @staticmethod
+    def _restore(entry: Any, newer: str | None) -> str | None:
+        """Reconstruct an entry's content, deltas need the next newer content."""
+        if entry is None or isinstance(entry, str):
+            # Missing, or a plain content entry written before deltas existed
+            return entry
+        if "snapshot" in entry:
+            return zlib.decompress(base64.b64decode(entry["snapshot"])).decode(
+                "utf-8"
+            )
+        if newer is None:
+            return None
+        return (
+            newer[: entry["prefix"]]
+            + entry["middle"]
+            + newer[len(newer) - entry["suffix"] :]
+        )
+
     def add_history(self, file_path: Path, content: str):
         """Add a new history entry for a file."""
         metadata_key = self._get_metadata_key(file_path)
         metadata = self.cache.get(metadata_key, {"entries": [], "counter": 0})
         counter = metadata["counter"]
 
+        # The previous newest entry becomes a delta against the new one
+        if metadata["entries"]:
+            previous_counter = metadata["entries"][-1]
+            if previous_counter % SNAPSHOT_INTERVAL != 0:
+                previous_key = self._get_history_key(file_path, previous_counter)
+                previous = self._restore(self.cache.get(previous_key), None)
+                if previous is not None:
+                    self.cache.set(previous_key, self._make_delta(previous, content))
+
         # Add new entry
         history_key = self._get_history_key(file_path, counter)
-        self.cache.set(history_key, content)
+        self.cache.set(history_key, self._make_snapshot(content))
 
         metadata["entries"].append(counter)
         metadata["counter"] += 1
@@ -74,7 +172,7 @@ class FileHistoryManager:
         # Pop and remove the last entry
         last_counter = entries.pop()
         history_key = self._get_history_key(file_path, last_counter)
-        content = self.cache.get(history_key)
+        content = self._restore(self.cache.get(history_key), None)
 
         if content is None:
             self.logger.warning(f"History entry not found for {file_path}")
@@ -82,6 +180,15 @@ class FileHistoryManager:
             # Remove the entry from the cache
             self.cache.delete(history_key)
 
+            # The entry below becomes the newest one, store it in full
+            if entries:
+                below_key = self._get_history_key(file_path, entries[-1])
+                below = self.cache.get(below_key)
+                if isinstance(below, dict) and "snapshot" not in below:
+                    self.cache.set(
+                        below_key, self._make_snapshot(self._restore(below, content))
+                    )
+
         # Update metadata
         metadata["entries"] = entries
         self.cache.set(metadata_key, metadata)
@@ -113,11 +220,15 @@ class FileHistoryManager:
         metadata = self.cache.get(metadata_key, {"entries": [], "counter": 0})
         entries = metadata["entries"]
 
+        # Walk from the newest entry down, each delta needs the newer content
         history = []
-        for counter in entries:
+        newer: str | None = None
+        for counter in reversed(entries):
             history_key = self._get_history_key(file_path, counter)
-            content = self.cache.get(history_key)
+            content = self._restore(self.cache.get(history_key), newer)
             if content is not None:
                 history.append(content)
+            newer = content
 
+        history.reverse()
         return history
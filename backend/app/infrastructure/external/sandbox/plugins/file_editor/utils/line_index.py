@@ -0,0 +1,113 @@
+"""Line offset index for reading line ranges of large files."""
+
+import codecs
+import functools
+import os
+from array import array
+from pathlib import Path
+
+from cachetools import LRUCache
+
+
+@functools.lru_cache(maxsize=64)
+def supports_encoding(encoding: str) -> bool:
+    """Whether line breaks in ``encoding`` are the plain ASCII bytes.
+
+    Holds for UTF-8, Latin-1 and the common single and multi-byte codecs,
+    but not for UTF-16/32.
+    """
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return False
+    return "\r\n".encode(encoding) == b"\r\n"
+
+
+class LineIndex:
+    """Byte offsets of the start of every line in a file.
+
+    Only ``\\n`` and ``\\r\\n`` line endings are indexed, which is what
+    text-mode iteration yields for them. Files with bare ``\\r`` line
+    breaks are not indexed.
+    """
+
+    offsets: array
+    size: int
+
+    def __init__(self, offsets: array, size: int):
+        self.offsets = offsets
+        self.size = size
+
+    @property
+    def num_lines(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def build(cls, path: Path) -> "LineIndex | None":
+        offsets = array("q")
+        position = 0
+        with open(path, "rb") as f:
+            for line in f:
+                offsets.append(position)
+                position += len(line)
+                carriage_return = line.find(b"\r")
+                if carriage_return != -1 and (
+                    carriage_return != len(line) - 2 or not line.endswith(b"\r\n")
+                ):
+                    return None
+        return cls(offsets, position)
+
+    def read_range(
+        self, path: Path, start_line: int, end_line: int, encoding: str
+    ) -> str:
+        """Read lines ``start_line`` to ``end_line`` (1-based, inclusive).
+
+        Only the bytes of the requested lines are read from disk.
+        """
+        start_line = max(start_line, 1)
+        end_line = min(end_line, self.num_lines)
+        if start_line > end_line:
+            return ""
+        start = self.offsets[start_line - 1]
+        end = self.offsets[end_line] if end_line < self.num_lines else self.size
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        return data.decode(encoding).replace("\r\n", "\n")
+
+
+class LineIndexCache:
+    """Line indexes of recently viewed files, keyed by (path, mtime, size)."""
+
+    DEFAULT_MAX_CACHE_SIZE: int = 32
+
+    def __init__(self, max_cache_size: int | None = None):
+        # Format: {path_str: (mtime_ns, size, index)}, index is None for files
+        # that cannot be indexed
+        self._cache: LRUCache[str, tuple[int, int, LineIndex | None]] = LRUCache(
+            maxsize=max_cache_size or self.DEFAULT_MAX_CACHE_SIZE
+        )
+
+    def get(self, path: Path, encoding: str) -> LineIndex | None:
+        """Get the line index of a file, building it if the file changed.
+
+        Returns None when the file cannot be indexed, in which case callers
+        fall back to reading it in text mode.
+        """
+        if not supports_encoding(encoding):
+            return None
+        path_str = str(path)
+        stat = os.stat(path)
+        cached = self._cache.get(path_str)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        index = LineIndex.build(path)
+        if index is not None and index.size != stat.st_size:
+            # Modified while indexing, don't cache a torn index
+            return None
+        self._cache[path_str] = (stat.st_mtime_ns, stat.st_size, index)
+        return index
+
+    def invalidate(self, path: Path) -> None:
+        self._cache.pop(str(path), None)
@@ -15,29 +15,21 @@ from file_editor.impl import file_editor
 from file_editor.definition import FileEditorObservation
 
 
-def main():
-    """Main entry point for CLI"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+def run_file_editor(args: dict) -> dict:
+    """Run a file_editor command and return the JSON response
+    
+    Kept importable so a resident process can reuse the global editor
+    (and its encoding cache and undo history) across calls.
+    """
+    # Extract command and parameters
+    command = args.get("command")
+    if not command:
+        return {
             "success": False,
-            "message": "Usage: file_editor_cli.py '<json_args>'"
-        }))
-        sys.exit(1)
+            "message": "Missing 'command' in arguments"
+        }
     
     try:
-        # Parse JSON arguments
-        args_json = sys.argv[1]
-        args = json.loads(args_json)
-        
-        # Extract command and parameters
-        command = args.get("command")
-        if not command:
-            print(json.dumps({
-                "success": False,
-                "message": "Missing 'command' in arguments"
-            }))
-            sys.exit(1)
-        
         # Call file_editor with appropriate parameters
         result: FileEditorObservation = file_editor(
             command=command,
@@ -50,7 +42,7 @@ def main():
         )
         
         # Convert observation to JSON response
-        response = {
+        return {
             "success": not result.is_error if hasattr(result, 'is_error') else True,
             "message": _format_observation(result),
             "data": {
@@ -60,15 +52,35 @@ def main():
             }
         }
         
-        print(json.dumps(response))
-        sys.exit(0 if response["success"] else 1)
-        
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error executing file_editor: {str(e)}"
+        }
+
+
+def main():
+    """Main entry point for CLI"""
+    if len(sys.argv) < 2:
+        print(json.dumps({
+            "success": False,
+            "message": "Usage: file_editor_cli.py '<json_args>'"
+        }))
+        sys.exit(1)
+    
+    try:
+        # Parse JSON arguments
+        args = json.loads(sys.argv[1])
     except Exception as e:
         print(json.dumps({
             "success": False,
             "message": f"Error executing file_editor: {str(e)}"
         }))
         sys.exit(1)
+    
+    response = run_file_editor(args)
+    print(json.dumps(response))
+    sys.exit(0 if response["success"] else 1)
 
 
 def _format_observation(obs: FileEditorObservation) -> str:
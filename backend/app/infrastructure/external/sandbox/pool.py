@@ -0,0 +1,207 @@
+"""
+Warm sandbox pool
+
+Keeps a number of started, health-checked sandboxes ready so a new session
+can claim one instead of waiting for a container to boot and for Chrome/CDP
+to come up.
+
+- target_size: idle sandboxes kept ready
+- max_size: upper bound on idle plus warming sandboxes; after a miss the
+  pool grows towards it to absorb bursts, and shrinks back to target_size
+  as idle sandboxes expire
+- idle_ttl_seconds: idle sandboxes older than this are destroyed and
+  replaced, keeping them well inside the sandbox's own inactivity timeout
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple, Type
+
+from app.domain.external.sandbox import Sandbox
+
+logger = logging.getLogger(__name__)
+
+# Seconds between expiry checks, also the retry delay after a failed warm-up
+REPLENISH_INTERVAL = 5.0
+
+
+class WarmSandboxPool:
+    """Pool of pre-started sandboxes, replenished in the background"""
+
+    def __init__(
+        self,
+        sandbox_cls: Type[Sandbox],
+        target_size: int,
+        max_size: int,
+        idle_ttl_seconds: float,
+    ):
+        self._sandbox_cls = sandbox_cls
+        self._target_size = target_size
+        self._max_size = max(max_size, target_size)
+        self._idle_ttl = idle_ttl_seconds
+        # Size the pool currently replenishes to, between target and max size
+        self._desired_size = target_size
+
+        # Ready sandboxes with the monotonic time they became ready, oldest first
+        self._idle: Deque[Tuple[Sandbox, float]] = deque()
+        self._warming = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._closed = False
+
+        self._claims = 0
+        self._hits = 0
+        self._claim_time_total = 0.0
+        self._claim_time_max = 0.0
+        self._warmed = 0
+        self._warm_failures = 0
+        self._expired = 0
+
+    async def start(self) -> None:
+        """Start warming sandboxes in the background"""
+        if self._loop_task is not None:
+            return
+        self._closed = False
+        self._loop_task = asyncio.create_task(self._run())
+        logger.info(
+            f"Sandbox pool started: target={self._target_size}, max={self._max_size}, "
+            f"idle_ttl={self._idle_ttl}s"
+        )
+
+    async def stop(self) -> None:
+        """Stop warming, wait for in-flight warm-ups and destroy all idle sandboxes"""
+        self._closed = True
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        # Warm-ups destroy their own sandbox once they see the pool is closed
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        idle = [sandbox for sandbox, _ in self._idle]
+        self._idle.clear()
+        await asyncio.gather(*(self._destroy(sandbox) for sandbox in idle))
+        logger.info(f"Sandbox pool stopped, destroyed {len(idle)} idle sandboxes")
+
+    async def claim(self) -> Optional[Sandbox]:
+        """Take the oldest ready sandbox out of the pool
+
+        Returns:
+            A ready sandbox, or None if the pool is empty
+        """
+        start = time.monotonic()
+        sandbox = None
+        while self._idle:
+            candidate, ready_at = self._idle.popleft()
+            if start - ready_at > self._idle_ttl:
+                self._expire(candidate)
+                continue
+            sandbox = candidate
+            break
+
+        self._claims += 1
+        if sandbox is not None:
+            self._hits += 1
+        else:
+            # Demand outpaces the pool, keep more sandboxes warm for a while
+            self._desired_size = min(self._desired_size + 1, self._max_size)
+        elapsed = time.monotonic() - start
+        self._claim_time_total += elapsed
+        self._claim_time_max = max(self._claim_time_max, elapsed)
+        self._wakeup.set()
+
+        if sandbox is not None:
+            logger.info(f"Claimed warm sandbox {sandbox.id} from pool ({len(self._idle)} left)")
+        else:
+            logger.info("Sandbox pool empty, caller will create a sandbox")
+        return sandbox
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool size, hit rate and claim latency statistics"""
+        return {
+            "idle": len(self._idle),
+            "warming": self._warming,
+            "target_size": self._target_size,
+            "desired_size": self._desired_size,
+            "max_size": self._max_size,
+            "claims": self._claims,
+            "hits": self._hits,
+            "misses": self._claims - self._hits,
+            "hit_rate": self._hits / self._claims if self._claims else None,
+            "claim_latency_avg_ms": (
+                self._claim_time_total / self._claims * 1000 if self._claims else None
+            ),
+            "claim_latency_max_ms": self._claim_time_max * 1000,
+            "warmed": self._warmed,
+            "warm_failures": self._warm_failures,
+            "expired": self._expired,
+        }
+
+    async def _run(self) -> None:
+        """Expire old sandboxes and start warm-ups until the pool is full"""
+        while not self._closed:
+            self._expire_idle()
+            self._replenish()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=REPLENISH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def _replenish(self) -> None:
+        while len(self._idle) + self._warming < self._desired_size:
+            self._warming += 1
+            self._spawn(self._warm_one())
+
+    def _expire_idle(self) -> None:
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self._idle_ttl:
+            sandbox, _ = self._idle.popleft()
+            self._expire(sandbox)
+
+    def _expire(self, sandbox: Sandbox) -> None:
+        logger.info(f"Warm sandbox {sandbox.id} idle for over {self._idle_ttl}s, destroying")
+        self._expired += 1
+        self._desired_size = max(self._desired_size - 1, self._target_size)
+        self._spawn(self._destroy(sandbox))
+
+    async def _warm_one(self) -> None:
+        """Create a sandbox and wait until its services are healthy"""
+        sandbox = None
+        try:
+            sandbox = await self._sandbox_cls.create()
+            await sandbox.ensure_sandbox()
+        except Exception as e:
+            self._warm_failures += 1
+            logger.warning(f"Failed to warm sandbox for pool: {e}")
+            if sandbox is not None:
+                await self._destroy(sandbox)
+            return
+        finally:
+            self._warming -= 1
+
+        if self._closed:
+            await self._destroy(sandbox)
+            return
+        self._warmed += 1
+        self._idle.append((sandbox, time.monotonic()))
+        logger.debug(f"Warm sandbox {sandbox.id} ready ({len(self._idle)} idle)")
+
+    async def _destroy(self, sandbox: Sandbox) -> None:
+        try:
+            await sandbox.destroy()
+        except Exception as e:
+            logger.warning(f"Failed to destroy pooled sandbox {sandbox.id}: {e}")
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
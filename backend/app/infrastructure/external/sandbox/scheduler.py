@@ -0,0 +1,288 @@
+"""
+Sandbox scheduler across Docker hosts
+
+Places sandbox containers on one of several Docker endpoints and applies
+cgroup CPU, memory and pids limits to each of them.
+
+- Host capacity is read from the daemon (NCPU, MemTotal), CPUs scaled by
+  sandbox_cpu_overcommit
+- Placement is best fit: the fullest host that still has room, by its
+  dominant (CPU or memory) share, which keeps whole hosts free for bursts
+- Every sandbox container carries labels with its reservation, so
+  allocations are rebuilt from the daemons after a restart and stay in
+  sync with containers that auto-remove themselves
+
+Remote hosts must put sandboxes on a network the backend can reach
+(SANDBOX_NETWORK), since the backend talks to them by container IP, and
+provide the plugins directory at the same path as the backend.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import get_settings
+from app.infrastructure.external.sandbox.docker_api import (
+    AsyncDockerClient,
+    DockerAPIError,
+    DockerNotFoundError,
+)
+
+logger = logging.getLogger(__name__)
+
+SANDBOX_LABEL = "manus.sandbox"
+CPUS_LABEL = "manus.sandbox.cpus"
+MEMORY_LABEL = "manus.sandbox.memory"
+# Seconds before a host's allocations are re-read from its daemon
+RESYNC_INTERVAL = 60.0
+
+
+class SandboxCapacityError(Exception):
+    """No Docker host has room for another sandbox"""
+
+
+@dataclass(frozen=True)
+class SandboxResources:
+    """Resources reserved for, and enforced on, one sandbox container"""
+    cpus: float
+    memory: int  # Bytes
+    pids: int
+
+    def labels(self) -> Dict[str, str]:
+        return {SANDBOX_LABEL: "true", CPUS_LABEL: str(self.cpus), MEMORY_LABEL: str(self.memory)}
+
+    @classmethod
+    def from_labels(cls, labels: Dict[str, str], default: "SandboxResources") -> "SandboxResources":
+        try:
+            return cls(float(labels[CPUS_LABEL]), int(labels[MEMORY_LABEL]), default.pids)
+        except (KeyError, ValueError):
+            return default
+
+
+class DockerHost:
+    """Capacity and sandbox allocations of one Docker endpoint"""
+
+    def __init__(self, url: str, client: AsyncDockerClient):
+        self.url = url
+        self.client = client
+        self.cpus = 0.0
+        self.memory = 0
+        # Container name -> reserved resources
+        self.allocations: Dict[str, SandboxResources] = {}
+        self.available = False
+        self.synced_at: Optional[float] = None
+
+    @property
+    def allocated_cpus(self) -> float:
+        return sum(resources.cpus for resources in self.allocations.values())
+
+    @property
+    def allocated_memory(self) -> int:
+        return sum(resources.memory for resources in self.allocations.values())
+
+    def fits(self, resources: SandboxResources) -> bool:
+        return (
+            self.available
+            and self.allocated_cpus + resources.cpus <= self.cpus
+            and self.allocated_memory + resources.memory <= self.memory
+        )
+
+    def load_after(self, resources: SandboxResources) -> float:
+        """Dominant resource share if the sandbox were placed here"""
+        return max(
+            (self.allocated_cpus + resources.cpus) / self.cpus,
+            (self.allocated_memory + resources.memory) / self.memory,
+        )
+
+    def utilization(self) -> Dict[str, Any]:
+        return {
+            "host": self.url,
+            "available": self.available,
+            "sandboxes": len(self.allocations),
+            "cpus": self.cpus,
+            "cpus_allocated": self.allocated_cpus,
+            "cpu_utilization": self.allocated_cpus / self.cpus if self.cpus else None,
+            "memory": self.memory,
+            "memory_allocated": self.allocated_memory,
+            "memory_utilization": self.allocated_memory / self.memory if self.memory else None,
+        }
+
+
+class SandboxScheduler:
+    """Places sandbox containers across Docker hosts by bin-packing"""
+
+    def __init__(
+        self,
+        hosts: List[DockerHost],
+        resources: SandboxResources,
+        cpu_overcommit: float = 1.0,
+    ):
+        self._hosts = hosts
+        self._resources = resources
+        self._cpu_overcommit = cpu_overcommit
+        # Containers reserved but not yet running, kept across resyncs
+        self._pending: Set[str] = set()
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def hosts(self) -> List[DockerHost]:
+        return self._hosts
+
+    async def run_container(self, name: str, image: str, **kwargs) -> Dict[str, Any]:
+        """Place and start a sandbox container with resource limits
+
+        Takes the arguments of AsyncDockerClient.run_container.
+
+        Returns:
+            Inspected container details
+
+        Raises:
+            SandboxCapacityError: No host has room for the sandbox
+        """
+        host = await self._place(name)
+        resources = self._resources
+        try:
+            attrs = await host.client.run_container(
+                image=image,
+                name=name,
+                labels=resources.labels(),
+                nano_cpus=int(resources.cpus * 1e9),
+                mem_limit=resources.memory,
+                pids_limit=resources.pids,
+                **kwargs
+            )
+        except Exception:
+            host.allocations.pop(name, None)
+            raise
+        finally:
+            self._pending.discard(name)
+        logger.info(f"Started sandbox {name} on {host.url} ({len(host.allocations)} sandboxes)")
+        return attrs
+
+    async def inspect_container(self, name: str) -> Dict[str, Any]:
+        """Inspect a sandbox container on whichever host runs it"""
+        _, attrs = await self._locate(name)
+        return attrs
+
+    async def remove_container(self, name: str) -> None:
+        """Remove a sandbox container and release its reservation
+
+        Raises:
+            DockerNotFoundError: The container doesn't exist on any host
+        """
+        host, _ = await self._locate(name)
+        try:
+            await host.client.remove_container(name, force=True)
+        finally:
+            host.allocations.pop(name, None)
+
+    async def utilization(self) -> Dict[str, Any]:
+        """Per-host capacity and allocation, refreshed from the daemons"""
+        await self._sync()
+        return {
+            "resources": {
+                "cpus": self._resources.cpus,
+                "memory": self._resources.memory,
+                "pids": self._resources.pids,
+            },
+            "hosts": [host.utilization() for host in self._hosts],
+        }
+
+    async def close(self) -> None:
+        await asyncio.gather(*(host.client.close() for host in self._hosts), return_exceptions=True)
+
+    async def _place(self, name: str) -> DockerHost:
+        """Reserve resources for a container on the best fitting host"""
+        await self._sync()
+        host = self._best_fit()
+        if host is None:
+            # Reservations of auto-removed containers may be stale
+            await self._sync(force=True)
+            host = self._best_fit()
+        if host is None:
+            raise SandboxCapacityError(
+                f"No Docker host has room for a sandbox "
+                f"({self._resources.cpus} CPUs, {self._resources.memory // 2**20} MB)"
+            )
+        host.allocations[name] = self._resources
+        self._pending.add(name)
+        return host
+
+    def _best_fit(self) -> Optional[DockerHost]:
+        candidates = [host for host in self._hosts if host.fits(self._resources)]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda host: host.load_after(self._resources))
+
+    async def _sync(self, force: bool = False) -> None:
+        """Refresh capacity and allocations of hosts not synced recently"""
+        async with self._sync_lock:
+            now = time.monotonic()
+            stale = [
+                host for host in self._hosts
+                if force or host.synced_at is None or now - host.synced_at > RESYNC_INTERVAL
+            ]
+            await asyncio.gather(*(self._sync_host(host) for host in stale))
+
+    async def _sync_host(self, host: DockerHost) -> None:
+        try:
+            info = await host.client.info()
+            containers = await host.client.list_containers(label=SANDBOX_LABEL)
+        except (DockerAPIError, httpx.HTTPError) as e:
+            logger.warning(f"Docker host {host.url} unavailable: {e}")
+            host.available = False
+            host.synced_at = time.monotonic()
+            return
+
+        allocations = {
+            name: resources for name, resources in host.allocations.items() if name in self._pending
+        }
+        for container in containers:
+            name = container["Names"][0].lstrip("/")
+            allocations[name] = SandboxResources.from_labels(container.get("Labels") or {}, self._resources)
+        host.cpus = info["NCPU"] * self._cpu_overcommit
+        host.memory = info["MemTotal"]
+        host.allocations = allocations
+        host.available = True
+        host.synced_at = time.monotonic()
+
+    async def _locate(self, name: str) -> Tuple[DockerHost, Dict[str, Any]]:
+        """Find the host running a container, checking its known host first"""
+        known = [host for host in self._hosts if name in host.allocations]
+        others = [host for host in self._hosts if name not in host.allocations]
+        for host in known + others:
+            try:
+                attrs = await host.client.inspect_container(name)
+            except DockerNotFoundError:
+                host.allocations.pop(name, None)
+                continue
+            except (DockerAPIError, httpx.HTTPError) as e:
+                logger.warning(f"Failed to look up sandbox {name} on {host.url}: {e}")
+                continue
+            labels = attrs.get("Config", {}).get("Labels") or {}
+            if labels.get(SANDBOX_LABEL) and name not in host.allocations:
+                host.allocations[name] = SandboxResources.from_labels(labels, self._resources)
+            return host, attrs
+        raise DockerNotFoundError(404, f"No such sandbox container: {name}")
+
+
+@lru_cache()
+def get_sandbox_scheduler() -> SandboxScheduler:
+    """Get the sandbox scheduler for the configured Docker hosts"""
+    settings = get_settings()
+    urls = [url.strip() for url in (settings.sandbox_docker_hosts or "").split(",") if url.strip()]
+    hosts = [
+        DockerHost(url, AsyncDockerClient(url))
+        for url in urls
+    ] or [DockerHost("local", AsyncDockerClient())]
+    resources = SandboxResources(
+        cpus=settings.sandbox_cpu_limit,
+        memory=settings.sandbox_memory_limit_mb * 2**20,
+        pids=settings.sandbox_pids_limit,
+    )
+    return SandboxScheduler(hosts, resources, cpu_overcommit=settings.sandbox_cpu_overcommit)
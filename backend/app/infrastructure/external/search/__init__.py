@@ -10,11 +10,26 @@ logger = logging.getLogger(__name__)
 @lru_cache()
 def get_search_engine() -> Optional[SearchEngine]:
     """Get search engine instance based on configuration"""
+    settings = get_settings()
+    engine = _create_search_engine(settings)
+    if engine is not None and settings.search_cache_ttl_seconds > 0:
+        from app.infrastructure.external.cache import get_cache
+        from app.infrastructure.external.search.search_cache import CachedSearchEngine
+        logger.info(f"Caching search results for {settings.search_cache_ttl_seconds}s")
+        engine = CachedSearchEngine(
+            engine,
+            name=settings.search_provider,
+            cache=get_cache(),
+            ttl_seconds=settings.search_cache_ttl_seconds
+        )
+    return engine
+
+
+def _create_search_engine(settings) -> Optional[SearchEngine]:
     from app.infrastructure.external.search.google_search import GoogleSearchEngine
     from app.infrastructure.external.search.baidu_search import BaiduSearchEngine
     from app.infrastructure.external.search.bing_search import BingSearchEngine
     
-    settings = get_settings()
     if settings.search_provider == "google":
         if settings.google_search_api_key and settings.google_search_engine_id:
             logger.info("Initializing Google Search Engine")
@@ -33,4 +48,14 @@ def get_search_engine() -> Optional[SearchEngine]:
     else:
         logger.warning(f"Unknown search provider: {settings.search_provider}")
     
-    return None 
\ No newline at end of file
+    return None
+
+
+async def close_search_engine() -> None:
+    """Close the search engine's HTTP connections if it was created"""
+    if get_search_engine.cache_info().currsize == 0:
+        return
+    engine = get_search_engine()
+    close = getattr(engine, "close", None)
+    if close is not None:
+        await close()
@@ -1,4 +1,5 @@
 from typing import Optional
+import asyncio
 import logging
 import httpx
 import re
@@ -10,6 +11,9 @@ from app.domain.external.search import SearchEngine
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open to the search engine between searches
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
 class BingSearchEngine(SearchEngine):
     """Bing web search engine implementation using web scraping"""
     
@@ -26,6 +30,22 @@ class BingSearchEngine(SearchEngine):
         }
         # Initialize cookies to maintain session state
         self.cookies = httpx.Cookies()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by all searches, reusing connections and cookies"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(headers=self.headers, cookies=self.cookies, timeout=30.0, follow_redirects=True, limits=HTTP_LIMITS)
+            # Cookies set by Bing are kept in the client's jar
+            self.cookies = self._client.cookies
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def search(
         self, 
@@ -61,130 +81,13 @@ class BingSearchEngine(SearchEngine):
                 params["filters"] = date_mapping[date_range]
         
         try:
-            async with httpx.AsyncClient(headers=self.headers, cookies=self.cookies, timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                
-                # Update cookies with response cookies in memory
-                self.cookies.update(response.cookies)
-                
-                # Parse HTML content
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract search results
-                search_results = []
-                
-                # Bing search results are in li elements with class 'b_algo'
-                result_items = soup.find_all('li', class_='b_algo')
-                
-                for item in result_items:
-                    try:
-                        # Extract title and link
-                        title = ""
-                        link = ""
-                        
-                        # Title is usually in h2 > a
-                        title_tag = item.find('h2')
-                        if title_tag:
-                            title_a = title_tag.find('a')
-                            if title_a:
-                                title = title_a.get_text(strip=True)
-                                link = title_a.get('href', '')
-                        
-                        # If not found, try other structures
-                        if not title:
-                            title_links = item.find_all('a')
-                            for a in title_links:
-                                text = a.get_text(strip=True)
-                                if len(text) > 10 and not text.startswith('http'):
-                                    title = text
-                                    link = a.get('href', '')
-                                    break
-                        
-                        if not title:
-                            continue
-                        
-                        # Extract snippet
-                        snippet = ""
-                        
-                        # Look for description in p tag with class 'b_lineclamp*' or 'b_descript'
-                        snippet_tags = item.find_all(['p', 'div'], class_=re.compile(r'b_lineclamp|b_descript|b_caption'))
-                        if snippet_tags:
-                            snippet = snippet_tags[0].get_text(strip=True)
-                        
-                        # If not found, look for any p tag with substantial text
-                        if not snippet:
-                            all_p_tags = item.find_all('p')
-                            for p in all_p_tags:
-                                text = p.get_text(strip=True)
-                                if len(text) > 20:
-                                    snippet = text
-                                    break
-                        
-                        # If still not found, get any substantial text from the item
-                        if not snippet:
-                            all_text = item.get_text(strip=True)
-                            # Extract first sentence-like text that's not the title
-                            sentences = re.split(r'[.!?\n]', all_text)
-                            for sentence in sentences:
-                                clean_sentence = sentence.strip()
-                                if len(clean_sentence) > 20 and clean_sentence != title:
-                                    snippet = clean_sentence
-                                    break
-                        
-                        # Clean up link if needed
-                        if link and not link.startswith('http'):
-                            if link.startswith('//'):
-                                link = 'https:' + link
-                            elif link.startswith('/'):
-                                link = 'https://www.bing.com' + link
-                        
-                        if title and link:
-                            search_results.append(SearchResultItem(
-                                title=title,
-                                link=link,
-                                snippet=snippet
-                            ))
-                    except Exception as e:
-                        logger.warning(f"Failed to parse Bing search result: {e}")
-                        continue
-                
-                # Extract total results count
-                total_results = 0
-                # Bing shows result count in various places, try to find it
-                result_stats = soup.find_all(string=re.compile(r'\d+[,\d]*\s*results?'))
-                if result_stats:
-                    for stat in result_stats:
-                        match = re.search(r'([\d,]+)\s*results?', stat)
-                        if match:
-                            try:
-                                total_results = int(match.group(1).replace(',', ''))
-                                break
-                            except ValueError:
-                                continue
-                
-                # Also try looking in the search results count area
-                if total_results == 0:
-                    count_elements = soup.find_all(['span', 'div'], class_=re.compile(r'sb_count|b_focusTextMedium'))
-                    for elem in count_elements:
-                        text = elem.get_text()
-                        match = re.search(r'([\d,]+)\s*results?', text)
-                        if match:
-                            try:
-                                total_results = int(match.group(1).replace(',', ''))
-                                break
-                            except ValueError:
-                                continue
-                
-                # Build return result
-                results = SearchResults(
-                    query=query,
-                    date_range=date_range,
-                    total_results=total_results,
-                    results=search_results
-                )
-                
-                return ToolResult(success=True, data=results)
+            response = await self.client.get(self.base_url, params=params)
+            response.raise_for_status()
+            
+            # Parsing a result page takes tens of milliseconds, keep it off the event loop
+            results = await asyncio.to_thread(self._parse_results, response.text, query, date_range)
+            
+            return ToolResult(success=True, data=results)
                 
         except Exception as e:
             logger.error(f"Bing Search failed: {e}")
@@ -201,6 +104,124 @@ class BingSearchEngine(SearchEngine):
                 data=error_results
             )
 
+    def _parse_results(self, html: str, query: str, date_range: Optional[str]) -> SearchResults:
+        """Extract the results from a Bing result page"""
+        # Parse HTML content
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract search results
+        search_results = []
+        
+        # Bing search results are in li elements with class 'b_algo'
+        result_items = soup.find_all('li', class_='b_algo')
+        
+        for item in result_items:
+            try:
+                # Extract title and link
+                title = ""
+                link = ""
+                
+                # Title is usually in h2 > a
+                title_tag = item.find('h2')
+                if title_tag:
+                    title_a = title_tag.find('a')
+                    if title_a:
+                        title = title_a.get_text(strip=True)
+                        link = title_a.get('href', '')
+                
+                # If not found, try other structures
+                if not title:
+                    title_links = item.find_all('a')
+                    for a in title_links:
+                        text = a.get_text(strip=True)
+                        if len(text) > 10 and not text.startswith('http'):
+                            title = text
+                            link = a.get('href', '')
+                            break
+                
+                if not title:
+                    continue
+                
+                # Extract snippet
+                snippet = ""
+                
+                # Look for description in p tag with class 'b_lineclamp*' or 'b_descript'
+                snippet_tags = item.find_all(['p', 'div'], class_=re.compile(r'b_lineclamp|b_descript|b_caption'))
+                if snippet_tags:
+                    snippet = snippet_tags[0].get_text(strip=True)
+                
+                # If not found, look for any p tag with substantial text
+                if not snippet:
+                    all_p_tags = item.find_all('p')
+                    for p in all_p_tags:
+                        text = p.get_text(strip=True)
+                        if len(text) > 20:
+                            snippet = text
+                            break
+                
+                # If still not found, get any substantial text from the item
+                if not snippet:
+                    all_text = item.get_text(strip=True)
+                    # Extract first sentence-like text that's not the title
+                    sentences = re.split(r'[.!?\n]', all_text)
+                    for sentence in sentences:
+                        clean_sentence = sentence.strip()
+                        if len(clean_sentence) > 20 and clean_sentence != title:
+                            snippet = clean_sentence
+                            break
+                
+                # Clean up link if needed
+                if link and not link.startswith('http'):
+                    if link.startswith('//'):
+                        link = 'https:' + link
+                    elif link.startswith('/'):
+                        link = 'https://www.bing.com' + link
+                
+                if title and link:
+                    search_results.append(SearchResultItem(
+                        title=title,
+                        link=link,
+                        snippet=snippet
+                    ))
+            except Exception as e:
+                logger.warning(f"Failed to parse Bing search result: {e}")
+                continue
+        
+        # Extract total results count
+        total_results = 0
+        # Bing shows result count in various places, try to find it
+        result_stats = soup.find_all(string=re.compile(r'\d+[,\d]*\s*results?'))
+        if result_stats:
+            for stat in result_stats:
+                match = re.search(r'([\d,]+)\s*results?', stat)
+                if match:
+                    try:
+                        total_results = int(match.group(1).replace(',', ''))
+                        break
+                    except ValueError:
+                        continue
+        
+        # Also try looking in the search results count area
+        if total_results == 0:
+            count_elements = soup.find_all(['span', 'div'], class_=re.compile(r'sb_count|b_focusTextMedium'))
+            for elem in count_elements:
+                text = elem.get_text()
+                match = re.search(r'([\d,]+)\s*results?', text)
+                if match:
+                    try:
+                        total_results = int(match.group(1).replace(',', ''))
+                        break
+                    except ValueError:
+                        continue
+        
+        # Build return result
+        return SearchResults(
+            query=query,
+            date_range=date_range,
+            total_results=total_results,
+            results=search_results
+        )
+
 
 # Simple test
 if __name__ == "__main__":
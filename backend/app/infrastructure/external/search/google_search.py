@@ -7,6 +7,9 @@ from app.domain.external.search import SearchEngine
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open to the search API between searches
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
 class GoogleSearchEngine(SearchEngine):
     """Google API based search engine implementation"""
     
@@ -20,6 +23,20 @@ class GoogleSearchEngine(SearchEngine):
         self.api_key = api_key
         self.cx = cx
         self.base_url = "https://www.googleapis.com/customsearch/v1"
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client shared by all searches, reusing connections"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=30.0, limits=HTTP_LIMITS)
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def search(
         self, 
@@ -56,39 +73,38 @@ class GoogleSearchEngine(SearchEngine):
                 params["dateRestrict"] = date_mapping[date_range]
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                # Process search results
-                search_results = []
-                if "items" in data:
-                    for item in data["items"]:
-                        search_results.append(SearchResultItem(
-                            title=item.get("title", ""),
-                            link=item.get("link", ""),
-                            snippet=item.get("snippet", "")
-                        ))
-                
-                # Build return result
-                search_info_data = data.get("searchInformation", {})
-                
-                # Convert total_results to int
-                total_results_str = search_info_data.get("totalResults", "0")
-                try:
-                    total_results = int(total_results_str)
-                except (ValueError, TypeError):
-                    total_results = 0
-                
-                results = SearchResults(
-                    query=query,
-                    date_range=date_range,
-                    total_results=total_results,
-                    results=search_results
-                )
-                
-                return ToolResult(success=True, data=results)
+            response = await self.client.get(self.base_url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            
+            # Process search results
+            search_results = []
+            if "items" in data:
+                for item in data["items"]:
+                    search_results.append(SearchResultItem(
+                        title=item.get("title", ""),
+                        link=item.get("link", ""),
+                        snippet=item.get("snippet", "")
+                    ))
+            
+            # Build return result
+            search_info_data = data.get("searchInformation", {})
+            
+            # Convert total_results to int
+            total_results_str = search_info_data.get("totalResults", "0")
+            try:
+                total_results = int(total_results_str)
+            except (ValueError, TypeError):
+                total_results = 0
+            
+            results = SearchResults(
+                query=query,
+                date_range=date_range,
+                total_results=total_results,
+                results=search_results
+            )
+            
+            return ToolResult(success=True, data=results)
                 
         except Exception as e:
             logger.error(f"Google Search API call failed: {e}")
@@ -0,0 +1,88 @@
+"""
+Search result cache
+
+Keeps search results in Redis, keyed by the engine, the normalized query
+and the date range, so the same search made again, in this session or
+another one, is answered without going back out to the network. Only
+successful searches with results are cached. A failed or empty one, which
+may be a captcha or consent page the scraper couldn't parse, is retried the
+next time.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from app.domain.external.cache import Cache
+from app.domain.external.search import SearchEngine
+from app.domain.models.search import SearchResults
+from app.domain.models.tool_result import ToolResult
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "search"
+
+
+def normalize_query(query: str) -> str:
+    """Fold case and whitespace, which don't change what engines return"""
+    return " ".join(query.lower().split())
+
+
+class CachedSearchEngine:
+    """Search engine answering repeated searches from a cache"""
+
+    def __init__(self, engine: SearchEngine, name: str, cache: Cache, ttl_seconds: int = 3600):
+        self._engine = engine
+        self._name = name
+        self._cache = cache
+        self._ttl_seconds = ttl_seconds
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def key(self, query: str, date_range: Optional[str] = None) -> str:
+        digest = hashlib.sha256(f"{normalize_query(query)}\n{date_range or 'all'}".encode()).hexdigest()
+        return f"{KEY_PREFIX}:{self._name}:{digest}"
+
+    async def search(
+        self,
+        query: str,
+        date_range: Optional[str] = None
+    ) -> ToolResult[SearchResults]:
+        """Search web pages, from the cache if this search was made recently"""
+        key = self.key(query, date_range)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            try:
+                results = SearchResults.model_validate(cached)
+            except Exception as e:
+                logger.warning(f"Discarding invalid cached search results for '{query}': {e}")
+            else:
+                self._hits += 1
+                # Answer with the query as asked, the cached one may differ in case or spacing
+                results.query = query
+                return ToolResult(success=True, data=results)
+        self._misses += 1
+
+        result = await self._engine.search(query, date_range)
+        if result.success and result.data is not None and result.data.results:
+            if await self._cache.set(key, result.data.model_dump(mode="json"), ttl=self._ttl_seconds):
+                self._stores += 1
+        return result
+
+    async def close(self) -> None:
+        close = getattr(self._engine, "close", None)
+        if close is not None:
+            await close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit rate statistics"""
+        lookups = self._hits + self._misses
+        return {
+            "engine": self._name,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else None,
+            "stores": self._stores,
+        }
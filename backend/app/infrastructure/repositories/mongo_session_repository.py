@@ -79,6 +79,16 @@ class MongoSessionRepository(SessionRepository):
         )
         if not result:
             raise ValueError(f"Session {session_id} not found")
+
+    async def update_event(self, session_id: str, event: BaseEvent) -> None:
+        """Replace an event of a session, matched by event ID"""
+        result = await SessionDocument.find_one(
+            {"session_id": session_id, "events.id": event.id}
+        ).update(
+            {"$set": {"events.$": event.model_dump(), "updated_at": datetime.now(UTC)}}
+        )
+        if not result:
+            raise ValueError(f"Event {event.id} of Session {session_id} not found")
     
     async def add_file(self, session_id: str, file_info: FileInfo) -> None:
         """Add a file to a session"""
@@ -100,6 +110,16 @@ class MongoSessionRepository(SessionRepository):
         if not result:
             raise ValueError(f"Session {session_id} not found")
 
+    async def remove_file_by_path(self, session_id: str, file_path: str) -> None:
+        """Remove a file from a session by its sandbox path"""
+        result = await SessionDocument.find_one(
+            SessionDocument.session_id == session_id
+        ).update(
+            {"$pull": {"files": {"file_path": file_path}}, "$set": {"updated_at": datetime.now(UTC)}}
+        )
+        if not result:
+            raise ValueError(f"Session {session_id} not found")
+
     async def get_file_by_path(self, session_id: str, file_path: str) -> Optional[FileInfo]:
         """Get file by path from a session"""
         mongo_session = await SessionDocument.find_one(
@@ -142,6 +142,130 @@ async def liveness_check():
     }
 
 
+@router.get("/sandbox/pool", status_code=status.HTTP_200_OK)
+async def sandbox_pool_stats():
+    """
+    Warm sandbox pool statistics
+    
+    Returns pool size, hit rate and claim latency
+    Useful for: Sizing SANDBOX_POOL_TARGET_SIZE / SANDBOX_POOL_MAX_SIZE
+    """
+    from app.infrastructure.external.sandbox.factory import get_sandbox_pool
+    sandbox_pool = get_sandbox_pool()
+    return {
+        "enabled": sandbox_pool is not None,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stats": sandbox_pool.stats() if sandbox_pool else None
+    }
+
+
+@router.get("/browser/extraction-cache", status_code=status.HTTP_200_OK)
+async def browser_extraction_cache_stats():
+    """
+    Browser page extraction cache statistics
+    
+    Returns cache size and hit rate of LLM page extractions
+    Useful for: Sizing BROWSER_EXTRACTION_CACHE_SIZE / BROWSER_EXTRACTION_CACHE_TTL_SECONDS
+    """
+    from app.infrastructure.external.browser.extraction_cache import get_page_extraction_cache
+    cache = get_page_extraction_cache()
+    return {
+        "enabled": cache is not None,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stats": cache.stats() if cache else None
+    }
+
+
+@router.get("/search/cache", status_code=status.HTTP_200_OK)
+async def search_cache_stats():
+    """
+    Search result cache statistics
+    
+    Returns hit rate of searches answered from Redis
+    Useful for: Tuning SEARCH_CACHE_TTL_SECONDS
+    """
+    from app.infrastructure.external.search import get_search_engine
+    from app.infrastructure.external.search.search_cache import CachedSearchEngine
+    search_engine = get_search_engine()
+    cached = isinstance(search_engine, CachedSearchEngine)
+    return {
+        "enabled": cached,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stats": search_engine.stats() if cached else None
+    }
+
+
+@router.get("/browser/contexts", status_code=status.HTTP_200_OK)
+async def browser_context_pool_stats():
+    """
+    Browser context pool statistics
+    
+    Returns per sandbox browser the connection state, session and spare
+    contexts and hit rate
+    Useful for: Sizing BROWSER_CONTEXT_POOL_SIZE
+    """
+    from app.infrastructure.external.browser.context_pool import browser_context_pools
+    return {
+        "enabled": True,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stats": browser_context_pools.stats()
+    }
+
+
+@router.get("/browser/screenshots", status_code=status.HTTP_200_OK)
+async def browser_screenshot_stats():
+    """
+    Browser screenshot statistics
+    
+    Returns dedup rate, compression ratio and deleted screenshots
+    Useful for: Tuning BROWSER_SCREENSHOT_QUALITY / BROWSER_SCREENSHOT_RETENTION
+    """
+    from app.infrastructure.external.browser.screenshot_service import get_screenshot_service
+    screenshot_service = get_screenshot_service()
+    return {
+        "enabled": screenshot_service is not None,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stats": screenshot_service.stats() if screenshot_service else None
+    }
+
+
+@router.get("/mcp/connections", status_code=status.HTTP_200_OK)
+async def mcp_connection_pool_stats():
+    """
+    Shared MCP server connection statistics
+    
+    Returns the pooled MCP server connections with their session count and
+    cached tool catalog, and how often sessions reused them
+    Useful for: Spotting slow or failing MCP servers
+    """
+    from app.domain.services.tools.mcp import mcp_connection_pool
+    return {
+        "enabled": True,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "stats": mcp_connection_pool.stats()
+    }
+
+
+@router.get("/sandbox/hosts", status_code=status.HTTP_200_OK)
+async def sandbox_host_utilization():
+    """
+    Sandbox Docker host utilization
+    
+    Returns per-host capacity and reserved CPU/memory of sandbox containers
+    Useful for: Capacity planning across SANDBOX_DOCKER_HOSTS
+    """
+    from app.core.config import get_settings
+    from app.infrastructure.external.sandbox.factory import get_sandbox
+    from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+    from app.infrastructure.external.sandbox.scheduler import get_sandbox_scheduler
+    enabled = get_sandbox() is DockerSandbox and not get_settings().sandbox_address
+    return {
+        "enabled": enabled,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "utilization": await get_sandbox_scheduler().utilization() if enabled else None
+    }
+
+
 @router.get("/version", status_code=status.HTTP_200_OK)
 async def version_info():
     """
@@ -20,7 +20,8 @@ from app.infrastructure.external.cache import get_cache
 
 # Import all required dependencies for agent service
 from app.infrastructure.external.llm.factory import get_llm_client
-from app.infrastructure.external.sandbox.factory import get_sandbox
+from app.infrastructure.external.sandbox.factory import get_sandbox, get_sandbox_pool
+from app.infrastructure.external.browser.screenshot_service import get_screenshot_service
 from app.infrastructure.external.task.redis_task import RedisStreamTask
 from app.infrastructure.utils.llm_json_parser import LLMJsonParser
 from app.infrastructure.repositories.mongo_agent_repository import MongoAgentRepository
@@ -73,6 +74,8 @@ def get_agent_service() -> AgentService:
         file_storage=file_storage,
         search_engine=search_engine,
         mcp_repository=mcp_repository,
+        sandbox_pool=get_sandbox_pool(),
+        screenshot_service=get_screenshot_service(),
     )
 
 
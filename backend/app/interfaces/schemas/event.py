@@ -94,7 +94,11 @@ class ToolSSEEvent(BaseSSEEvent):
         content = event.tool_content
         if isinstance(content, BrowserToolContent):
             from app.interfaces.dependencies import get_file_service
-            content = BrowserToolContent(screenshot=await get_file_service().create_signed_url(content.screenshot))
+            try:
+                content = BrowserToolContent(screenshot=await get_file_service().create_signed_url(content.screenshot))
+            except FileNotFoundError:
+                # Deleted by the session's screenshot retention limit
+                content = None
         return cls(
             data=ToolEventData(
                 **BaseEventData.base_event_data(event),
@@ -12,6 +12,11 @@ from app.core.config import get_settings
 from app.infrastructure.storage.mongodb import get_mongodb
 from app.infrastructure.storage.redis import get_redis
 from app.interfaces.dependencies import get_agent_service
+from app.infrastructure.external.sandbox.factory import get_sandbox_pool
+from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+from app.infrastructure.external.sandbox.cloudrun_jobs_sandbox import CloudRunJobsSandbox
+from app.infrastructure.external.search import close_search_engine
+from app.domain.services.tools.mcp import mcp_connection_pool
 from app.interfaces.api.routes import router
 from app.infrastructure.logging import setup_logging
 from app.interfaces.errors.exception_handlers import register_exception_handlers
@@ -90,6 +95,11 @@ async def lifespan(app: FastAPI):
     app.state.redis_initialized = False
     app.state.startup_complete = True  # Mark as complete immediately
     
+    # Start warming sandboxes in the background (no-op unless configured)
+    sandbox_pool = get_sandbox_pool()
+    if sandbox_pool:
+        await sandbox_pool.start()
+    
     try:
         yield
     finally:
@@ -126,6 +136,39 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠️ AgentService shutdown issue: {e}")
         
+        # Destroy idle warm sandboxes
+        if sandbox_pool:
+            try:
+                logger.info("Stopping sandbox pool...")
+                await asyncio.wait_for(sandbox_pool.stop(), timeout=120.0)
+                logger.info("✅ Sandbox pool stopped")
+            except Exception as e:
+                logger.warning(f"⚠️ Sandbox pool shutdown issue: {e}")
+        
+        # Close pooled sandbox HTTP connections
+        try:
+            await DockerSandbox.close_all()
+        except Exception as e:
+            logger.warning(f"⚠️ Sandbox client shutdown issue: {e}")
+        
+        # Stop the warm Cloud Run executors of sessions still running
+        try:
+            await asyncio.wait_for(CloudRunJobsSandbox.close_all(), timeout=30.0)
+        except Exception as e:
+            logger.warning(f"⚠️ Cloud Run executor shutdown issue: {e}")
+        
+        # Close search engine HTTP connections
+        try:
+            await close_search_engine()
+        except Exception as e:
+            logger.warning(f"⚠️ Search engine shutdown issue: {e}")
+        
+        # Stop shared MCP server connections
+        try:
+            await asyncio.wait_for(mcp_connection_pool.close_all(), timeout=10.0)
+        except Exception as e:
+            logger.warning(f"⚠️ MCP connection pool shutdown issue: {e}")
+        
         logger.info("="*80)
         logger.info("👋 Shutdown complete")
         logger.info("="*80)
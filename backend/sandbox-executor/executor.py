@@ -4,17 +4,27 @@ Cloud Run Jobs Sandbox Executor
 
 This script runs inside Cloud Run Jobs to execute commands in a sandboxed environment
 with state persistence across executions.
+
+Two modes:
+- One-shot (default): run the command from COMMAND, or the batch of
+  commands in COMMANDS, with session state loaded from and saved to Cloud
+  Storage
+- Serve (--serve or EXECUTOR_MODE=serve): stay up and run commands from a
+  queue, keeping each session's cwd, env and background processes in
+  memory. The queue is a pair of Redis lists when EXECUTOR_QUEUE is set,
+  otherwise JSON lines on stdin/stdout.
 """
 
 import os
 import sys
 import json
+import signal
 import subprocess
 import logging
+import tempfile
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-from google.cloud import storage
 
 # Configure logging
 logging.basicConfig(
@@ -40,11 +50,23 @@ class ExecutionContext:
             "background_processes": self.background_processes
         }
 
+    def to_session_state(self, session_id: str) -> Dict[str, Any]:
+        """Convert context to the session state layout the backend stores."""
+        return {
+            "session_id": session_id,
+            "cwd": self.cwd,
+            "env_vars": self.env,
+            "background_pids": self.background_processes,
+            "last_updated": datetime.utcnow().isoformat()
+        }
+
 
 class StateManager:
     """Manages session state persistence in Cloud Storage."""
     
     def __init__(self, project_id: str, bucket_name: str, session_id: str):
+        # Imported here so serve mode runs without the GCS client
+        from google.cloud import storage
         self.client = storage.Client(project=project_id)
         self.bucket = self.client.bucket(bucket_name)
         self.session_id = session_id
@@ -92,13 +114,31 @@ class StateManager:
         }
 
 
+# Writes the shell's final cwd and environment to a file on exit, so
+# `cd` and `export` carry over to the next command of the session
+STATE_TRAP = "trap '__status=$?; {{ pwd; env -0; }} > \"{path}\"; exit $__status' EXIT\n"
+# Shell bookkeeping variables not carried between commands
+TRANSIENT_ENV = {"_", "SHLVL"}
+# Serve-mode settings, REDIS_URL holds the backend's Redis credentials, so
+# they are taken out of the environment commands run with
+EXECUTOR_ENV = ("REDIS_URL", "EXECUTOR_QUEUE", "EXECUTOR_IDLE_TIMEOUT", "EXECUTOR_WORKDIR", "EXECUTOR_MODE")
+
+
+def command_env(env: Dict[str, str]) -> Dict[str, str]:
+    """The executor's environment with a session's env on top, without executor settings."""
+    merged = {**os.environ, **env}
+    for name in EXECUTOR_ENV:
+        merged.pop(name, None)
+    return merged
+
+
 class CommandExecutor:
     """Executes commands with state preservation."""
     
     def __init__(self, context: ExecutionContext):
         self.context = context
     
-    def execute(self, command: str) -> Dict[str, Any]:
+    def execute(self, command: str, timeout: int = 120) -> Dict[str, Any]:
         """Execute command and return result."""
         logger.info(f"Executing command: {command}")
         
@@ -109,38 +149,53 @@ class CommandExecutor:
             return self._execute_background(command)
         
         # Execute regular command
-        return self._execute_regular(command)
+        return self._execute_regular(command, timeout)
+    
+    def execute_batch(self, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute commands in order, each dict with id, command and timeout."""
+        results = []
+        for entry in commands:
+            result = self.execute(entry["command"], entry.get("timeout", 120))
+            result.update(id=entry["id"], cwd=self.context.cwd)
+            results.append(result)
+        return results
     
-    def _execute_regular(self, command: str) -> Dict[str, Any]:
+    def _execute_regular(self, command: str, timeout: int = 120) -> Dict[str, Any]:
         """Execute regular (foreground) command."""
+        fd, state_file = tempfile.mkstemp(prefix="executor-state-")
+        os.close(fd)
         try:
             # Prepare environment
-            env = os.environ.copy()
-            env.update(self.context.env)
+            env = command_env(self.context.env)
             
-            # Execute command
+            # Execute command in its own process group so a timeout
+            # kills everything it started
             process = subprocess.Popen(
-                command,
+                STATE_TRAP.format(path=state_file) + command,
                 shell=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 cwd=self.context.cwd,
                 env=env,
-                text=True
+                text=True,
+                start_new_session=True
             )
             
-            stdout, stderr = process.communicate(timeout=120)
+            try:
+                stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+                logger.error("Command timed out")
+                return {
+                    "exit_code": -1,
+                    "stdout": "",
+                    "stderr": f"Command timed out after {timeout} seconds",
+                    "execution_time": datetime.utcnow().isoformat()
+                }
             exit_code = process.returncode
             
-            # Update CWD if command was 'cd'
-            if command.strip().startswith("cd "):
-                new_cwd = command.strip()[3:].strip()
-                if new_cwd.startswith("/"):
-                    self.context.cwd = new_cwd
-                else:
-                    self.context.cwd = os.path.normpath(
-                        os.path.join(self.context.cwd, new_cwd)
-                    )
+            self._update_context(state_file)
             
             result = {
                 "exit_code": exit_code,
@@ -152,14 +207,6 @@ class CommandExecutor:
             logger.info(f"Command completed with exit code: {exit_code}")
             return result
             
-        except subprocess.TimeoutExpired:
-            logger.error("Command timed out")
-            return {
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": "Command timed out after 120 seconds",
-                "execution_time": datetime.utcnow().isoformat()
-            }
         except Exception as e:
             logger.error(f"Error executing command: {e}")
             return {
@@ -168,13 +215,30 @@ class CommandExecutor:
                 "stderr": str(e),
                 "execution_time": datetime.utcnow().isoformat()
             }
+        finally:
+            os.unlink(state_file)
+    
+    def _update_context(self, state_file: str) -> None:
+        """Take over cwd and env the shell left in the state file."""
+        with open(state_file) as f:
+            content = f.read()
+        if not content:
+            # The command replaced the EXIT trap or the shell was killed
+            return
+        cwd, _, env_block = content.partition("\n")
+        env = {}
+        for entry in env_block.split("\0"):
+            name, sep, value = entry.partition("=")
+            if sep and name not in TRANSIENT_ENV:
+                env[name] = value
+        self.context.cwd = cwd
+        self.context.env = env
     
     def _execute_background(self, command: str) -> Dict[str, Any]:
         """Execute background process with output redirection."""
         try:
             # Prepare environment
-            env = os.environ.copy()
-            env.update(self.context.env)
+            env = command_env(self.context.env)
             
             # Create a wrapper script to redirect output
             # This ensures output is captured even after the executor exits
@@ -231,6 +295,122 @@ class CommandExecutor:
             }
 
 
+# Redis keys of a serve-mode queue, shared with the backend
+REQUESTS_KEY = "{queue}:requests"
+RESULT_KEY = "{queue}:results:{id}"
+# Seconds an unclaimed result is kept in Redis
+RESULT_TTL = 600
+
+
+class StdioQueue:
+    """Requests and results as JSON lines on stdin/stdout."""
+    
+    def receive(self) -> Optional[Dict[str, Any]]:
+        line = sys.stdin.readline()
+        if not line:
+            return None
+        return json.loads(line)
+    
+    def send(self, message: Dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+class RedisQueue:
+    """Requests and results as Redis lists."""
+    
+    def __init__(self, redis_url: str, queue: str, idle_timeout: int):
+        import redis
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.queue = queue
+        self.idle_timeout = idle_timeout
+    
+    def receive(self) -> Optional[Dict[str, Any]]:
+        item = self.client.blpop([REQUESTS_KEY.format(queue=self.queue)], timeout=self.idle_timeout)
+        if item is None:
+            logger.info(f"No request for {self.idle_timeout}s, shutting down")
+            return None
+        return json.loads(item[1])
+    
+    def send(self, message: Dict[str, Any]) -> None:
+        key = RESULT_KEY.format(queue=self.queue, id=message["id"])
+        pipeline = self.client.pipeline()
+        pipeline.rpush(key, json.dumps(message))
+        pipeline.expire(key, RESULT_TTL)
+        pipeline.execute()
+
+
+def serve(queue, workdir: str) -> None:
+    """Run requests from a queue until shutdown, keeping session state in memory.
+    
+    Requests are JSON objects with an ``id`` and a ``type``:
+    - exec: run ``command`` in ``session_id`` with ``timeout``
+    - batch: run ``commands`` (each with id, command, timeout) in order
+    - get_state: return the session state
+    - set_state: replace the session state with ``state``
+    - shutdown: stop serving
+    Each gets a result with the same ``id``.
+    """
+    contexts: Dict[str, ExecutionContext] = {}
+    
+    def context_for(session_id: str) -> ExecutionContext:
+        if session_id not in contexts:
+            contexts[session_id] = ExecutionContext({"cwd": workdir, "env": command_env({})})
+        return contexts[session_id]
+    
+    logger.info(f"Serving commands (workdir={workdir})")
+    while True:
+        request = queue.receive()
+        if request is None or request.get("type") == "shutdown":
+            break
+        
+        session_id = request.get("session_id", "default")
+        context = context_for(session_id)
+        try:
+            if request["type"] == "exec":
+                result = CommandExecutor(context).execute(
+                    request["command"], request.get("timeout", 120)
+                )
+                result.update(cwd=context.cwd, session_id=session_id)
+            elif request["type"] == "batch":
+                result = {"results": CommandExecutor(context).execute_batch(request["commands"])}
+            elif request["type"] == "get_state":
+                result = {"state": context.to_session_state(session_id)}
+            elif request["type"] == "set_state":
+                state = request["state"]
+                context.cwd = state.get("cwd", context.cwd)
+                context.env = state.get("env_vars", context.env)
+                context.background_processes = state.get("background_pids", context.background_processes)
+                result = {}
+            else:
+                result = {"error": f"Unknown request type: {request['type']}"}
+        except Exception as e:
+            logger.error(f"Error handling request {request.get('id')}: {e}", exc_info=True)
+            result = {"error": str(e)}
+        
+        result["id"] = request.get("id")
+        queue.send(result)
+    
+    logger.info("Executor stopped")
+
+
+def serve_main():
+    """Serve mode entry point."""
+    # Taken out of os.environ, commands and their child processes never see them
+    settings = {name: os.environ.pop(name, None) for name in EXECUTOR_ENV}
+    workdir = settings["EXECUTOR_WORKDIR"] or "/workspace"
+    queue_name = settings["EXECUTOR_QUEUE"]
+    if queue_name:
+        queue = RedisQueue(
+            settings["REDIS_URL"],
+            queue_name,
+            int(settings["EXECUTOR_IDLE_TIMEOUT"] or "900")
+        )
+    else:
+        queue = StdioQueue()
+    serve(queue, workdir)
+
+
 def main():
     """Main execution entry point."""
     try:
@@ -238,10 +418,12 @@ def main():
         execution_id = os.environ.get("EXECUTION_ID")
         session_id = os.environ.get("SESSION_ID")
         command = os.environ.get("COMMAND")
+        commands = os.environ.get("COMMANDS")
         project_id = os.environ.get("PROJECT_ID")
+        timeout = int(os.environ.get("TIMEOUT", "120"))
         bucket_name = os.environ.get("BUCKET_NAME", "manus-sandbox-state")
         
-        if not all([execution_id, session_id, command, project_id]):
+        if not all([execution_id, session_id, command or commands, project_id]):
             logger.error("Missing required environment variables")
             sys.exit(1)
         
@@ -254,9 +436,13 @@ def main():
         state = state_manager.load_state()
         context = ExecutionContext(state)
         
-        # Execute command
+        # Execute command, or every command of a batch in one shell context
         executor = CommandExecutor(context)
-        result = executor.execute(command)
+        if commands:
+            results = executor.execute_batch(json.loads(commands))
+            result = {"exit_code": 0, "results": results}
+        else:
+            result = executor.execute(command, timeout)
         
         # Update state with new context
         state.update(context.to_dict())
@@ -267,13 +453,7 @@ def main():
         result_with_state = {
             **result,
             "cwd": context.cwd,
-            "new_state": {
-                "session_id": session_id,
-                "cwd": context.cwd,
-                "env_vars": context.env,
-                "background_pids": context.background_processes,
-                "last_updated": datetime.utcnow().isoformat()
-            }
+            "new_state": context.to_session_state(session_id)
         }
         
         # Save execution result to the path CloudRunJobsSandbox expects
@@ -307,4 +487,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--serve" in sys.argv or os.environ.get("EXECUTOR_MODE") == "serve":
+        serve_main()
+    else:
+        main()
\ No newline at end of file
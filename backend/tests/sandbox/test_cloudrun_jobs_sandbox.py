@@ -609,7 +609,29 @@ class TestCloudRunJobsSandbox:
         assert "killed_count" in result
         assert "killed_pids" in result
         # Currently returns 0 (not yet implemented)
-    
+
+    @pytest.mark.asyncio
+    async def test_kill_background_process_job_mode(self, sandbox):
+        """Test killing a background process saves the pruned state to Cloud Storage"""
+        sandbox.state_manager.load_state.return_value = {
+            "cwd": "/workspace",
+            "env_vars": {},
+            "background_pids": {
+                "12345": {"command": "sleep 100"},
+                "67890": {"command": "python server.py"}
+            }
+        }
+        sandbox.exec_command_stateful = AsyncMock(return_value={"exit_code": 0})
+
+        result = await sandbox.kill_background_process(pid=12345)
+
+        assert sandbox.warm_executor is None
+        assert result == {"killed_count": 1, "killed_pids": [12345]}
+        sandbox.state_manager.save_state.assert_awaited_once()
+        session_id, state = sandbox.state_manager.save_state.await_args.args
+        assert session_id == "default"
+        assert state["background_pids"] == {"67890": {"command": "python server.py"}}
+
     @pytest.mark.asyncio
     async def test_get_background_logs(self, sandbox):
         """Test getting background logs"""
@@ -0,0 +1,143 @@
+"""
+Tests for the file_editor plugin's FileCache
+
+The plugin runs inside the sandbox against the OpenHands SDK, so these tests
+are skipped when it is not installed.
+"""
+import importlib.util
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openhands.sdk")
+
+FILE_CACHE_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "app/infrastructure/external/sandbox/plugins/file_editor/utils/file_cache.py"
+)
+_spec = importlib.util.spec_from_file_location("file_editor_file_cache", FILE_CACHE_PATH)
+file_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(file_cache)
+FileCache = file_cache.FileCache
+
+
+def entry_size(key, value):
+    return len(file_cache.json.dumps({"key": key, "value": value}).encode("utf-8"))
+
+
+class TestFileCache:
+    """Test FileCache behaviour"""
+
+    def test_set_get_delete(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set("a", {"x": 1})
+        cache["b"] = "hello"
+
+        assert cache.get("a") == {"x": 1}
+        assert cache["b"] == "hello"
+        assert "a" in cache and len(cache) == 2
+        assert cache.current_size == entry_size("a", {"x": 1}) + entry_size("b", "hello")
+        assert sorted(cache) == ["a", "b"]
+
+        cache.delete("a")
+        assert "a" not in cache
+        assert cache.get("a", "missing") == "missing"
+        assert cache.current_size == entry_size("b", "hello")
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        size = entry_size("k0", "v" * 10)
+        cache = FileCache(str(tmp_path), size_limit=size * 3)
+        for i in range(3):
+            cache.set(f"k{i}", "v" * 10)
+
+        # Reading k0 makes k1 the least recently used entry
+        cache.get("k0")
+        cache.set("k3", "v" * 10)
+
+        assert "k1" not in cache
+        assert all(key in cache for key in ("k0", "k2", "k3"))
+        assert cache.current_size <= size * 3
+        assert len(list(tmp_path.glob("*.json"))) == 3
+
+    def test_index_survives_restart(self, tmp_path):
+        size = entry_size("k0", "v")
+        cache = FileCache(str(tmp_path), size_limit=size * 2)
+        cache.set("k0", "v")
+        cache.set("k1", "v")
+        cache.get("k0")
+
+        reopened = FileCache(str(tmp_path), size_limit=size * 2)
+        assert reopened.current_size == size * 2
+        reopened.set("k2", "v")
+
+        assert "k1" not in reopened
+        assert "k0" in reopened and "k2" in reopened
+
+    def test_rebuilds_without_manifest(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set("old", "v")
+        cache.set("new", "v")
+        old_path = cache._get_file_path("old")
+        os.utime(old_path, (time.time() - 100, time.time() - 100))
+        os.remove(tmp_path / file_cache.MANIFEST_NAME)
+        # A file deleted behind the cache's back is dropped from the index
+        os.remove(cache._get_file_path("new"))
+        cache.set("another", "v")
+
+        rebuilt = FileCache(str(tmp_path), size_limit=entry_size("old", "v") * 2)
+        assert len(rebuilt) == 2
+        assert rebuilt.current_size == entry_size("old", "v") + entry_size("another", "v")
+        assert next(iter(rebuilt._ensure_index())) == old_path.name
+
+    def test_manifest_is_compacted(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set("key", "value")
+        for _ in range(3 * file_cache.MANIFEST_COMPACT_MIN_RECORDS):
+            cache.get("key")
+
+        manifest_lines = (tmp_path / file_cache.MANIFEST_NAME).read_text().splitlines()
+        assert len(manifest_lines) <= file_cache.MANIFEST_COMPACT_MIN_RECORDS + 1
+
+    def test_clear(self, tmp_path):
+        cache = FileCache(str(tmp_path))
+        cache.set("a", 1)
+        cache.clear()
+
+        assert len(cache) == 0 and cache.current_size == 0
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.benchmark
+def test_file_cache_10k_entries(tmp_path):
+    """Operations stay flat as the cache grows to 10k entries and starts evicting"""
+    entries = 10_000
+    value = "x" * 64
+    size = entry_size("key-00000", value)
+    cache = FileCache(str(tmp_path), size_limit=size * entries)
+
+    def timed(operation, keys):
+        start = time.perf_counter()
+        for key in keys:
+            operation(key)
+        return (time.perf_counter() - start) / len(keys)
+
+    first_sets = timed(lambda key: cache.set(key, value), [f"key-{i:05d}" for i in range(1000)])
+    cache_fill = timed(lambda key: cache.set(key, value), [f"key-{i:05d}" for i in range(1000, entries)])
+    evicting_sets = timed(lambda key: cache.set(key, value), [f"new-{i:05d}" for i in range(1000)])
+    gets = timed(cache.get, [f"key-{i:05d}" for i in range(5000, 6000)])
+
+    start = time.perf_counter()
+    reopened = FileCache(str(tmp_path), size_limit=size * entries)
+    assert len(reopened) == entries
+    reload_time = time.perf_counter() - start
+
+    print(
+        f"\nFileCache 10k: set {first_sets * 1e6:.0f}us (empty) / {cache_fill * 1e6:.0f}us (filling) / "
+        f"{evicting_sets * 1e6:.0f}us (evicting), get {gets * 1e6:.0f}us, reload {reload_time * 1e3:.0f}ms"
+    )
+    assert len(cache) == entries
+    assert "key-00999" not in cache and "new-00999" in cache
+    # No per-operation directory scans: a full cache is not meaningfully slower than an empty one
+    assert evicting_sets < max(first_sets * 5, 0.002)
@@ -0,0 +1,131 @@
+"""
+Tests for the file_editor plugin's FileHistoryManager
+
+The plugin runs inside the sandbox against the OpenHands tools package, so
+these tests are skipped when it is not installed.
+"""
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openhands.tools.file_editor.utils.file_cache")
+
+HISTORY_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "app/infrastructure/external/sandbox/plugins/file_editor/utils/history.py"
+)
+_spec = importlib.util.spec_from_file_location("file_editor_history", HISTORY_PATH)
+history = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(history)
+FileHistoryManager = history.FileHistoryManager
+
+
+def edit(content: str, rng: random.Random) -> str:
+    """Replace a short span somewhere in the content"""
+    start = rng.randrange(len(content))
+    return content[:start] + f"edit {rng.random()}\n" + content[start + rng.randrange(40):]
+
+
+def history_size(manager: FileHistoryManager) -> int:
+    return sum(path.stat().st_size for path in manager.cache.directory.glob("*.json"))
+
+
+class TestFileHistoryManager:
+    """Test undo history storage"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return FileHistoryManager(max_history_per_file=10, history_dir=tmp_path)
+
+    def test_undo_returns_versions_newest_first(self, manager):
+        path = Path("/workspace/a.py")
+        rng = random.Random(0)
+        versions = ["".join(f"line {i}\n" for i in range(200))]
+        for _ in range(12):
+            versions.append(edit(versions[-1], rng))
+        for version in versions:
+            manager.add_history(path, version)
+
+        # Only the last 10 versions are kept
+        assert manager.get_all_history(path) == versions[-10:]
+        for version in reversed(versions[-10:]):
+            assert manager.pop_last_history(path) == version
+        assert manager.pop_last_history(path) is None
+
+    def test_add_after_undo(self, manager):
+        path = Path("/workspace/a.py")
+        manager.add_history(path, "one\ntwo\n")
+        manager.add_history(path, "one\n2\n")
+        assert manager.pop_last_history(path) == "one\n2\n"
+        manager.add_history(path, "one\nthree\n")
+
+        assert manager.get_all_history(path) == ["one\ntwo\n", "one\nthree\n"]
+        assert manager.pop_last_history(path) == "one\nthree\n"
+        assert manager.pop_last_history(path) == "one\ntwo\n"
+
+    @pytest.mark.parametrize("old, new", [
+        ("", "abc"),
+        ("abc", ""),
+        ("aaaa", "aa"),
+        ("abcabc", "abc"),
+        ("same", "same"),
+        ("é中文\n" * 3, "é中\n" * 3),
+    ])
+    def test_delta_round_trip(self, old, new, monkeypatch):
+        monkeypatch.setattr(history, "COMPARE_BLOCK_SIZE", 2)
+        delta = FileHistoryManager._make_delta(old, new)
+        assert FileHistoryManager._restore(delta, new) == old
+
+    def test_reads_plain_entries(self, manager):
+        """Entries stored as plain content by older versions are still readable"""
+        path = Path("/workspace/a.py")
+        manager.cache.set(manager._get_history_key(path, 0), "legacy")
+        manager.cache.set(manager._get_metadata_key(path), {"entries": [0], "counter": 1})
+        manager.add_history(path, "new")
+
+        assert manager.get_all_history(path) == ["legacy", "new"]
+        assert manager.pop_last_history(path) == "new"
+        assert manager.pop_last_history(path) == "legacy"
+
+    def test_clear_history(self, manager):
+        path = Path("/workspace/a.py")
+        manager.add_history(path, "one")
+        manager.add_history(path, "two")
+        manager.clear_history(path)
+
+        assert manager.get_all_history(path) == []
+        assert manager.pop_last_history(path) is None
+
+
+@pytest.mark.benchmark
+def test_iterative_edits_of_large_file(tmp_path):
+    """Ten edits of a 5 MB file store about one compressed snapshot, not ten copies"""
+    rng = random.Random(1)
+    manager = FileHistoryManager(max_history_per_file=10, history_dir=tmp_path)
+    path = Path("/workspace/large.py")
+    content = "".join(f"def function_{i}(value):\n    return value * {i}\n\n" for i in range(110_000))
+    versions = []
+
+    start = time.perf_counter()
+    for _ in range(10):
+        versions.append(content)
+        manager.add_history(path, content)
+        content = edit(content, rng)
+    add_time = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    undone = manager.pop_last_history(path)
+    undo_time = time.perf_counter() - start
+
+    full_size = sum(len(version) for version in versions)
+    stored_size = history_size(manager)
+    print(
+        f"\nHistory of 10 edits on {len(content) / 2**20:.1f} MB: {stored_size / 2**20:.2f} MB stored "
+        f"vs {full_size / 2**20:.1f} MB as full copies, add {add_time * 1e3:.0f}ms, undo {undo_time * 1e3:.0f}ms"
+    )
+    assert undone == versions[-1]
+    assert manager.get_all_history(path) == versions[:-1]
+    assert stored_size * 10 < full_size
@@ -0,0 +1,147 @@
+"""
+Tests for the file_editor plugin's line index and windowed diff
+"""
+import importlib.util
+import os
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import pytest
+
+PLUGIN_UTILS = (
+    Path(__file__).resolve().parents[2]
+    / "app/infrastructure/external/sandbox/plugins/file_editor/utils"
+)
+
+
+def load_plugin_module(name):
+    spec = importlib.util.spec_from_file_location(f"file_editor_{name}", PLUGIN_UTILS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestLineIndex:
+    """Test LineIndex and LineIndexCache"""
+
+    @pytest.fixture(scope="class")
+    def line_index(self):
+        pytest.importorskip("cachetools")
+        return load_plugin_module("line_index")
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    @pytest.mark.parametrize("trailing", [True, False])
+    def test_read_range_matches_text_mode(self, line_index, tmp_path, newline, trailing):
+        path = tmp_path / "file.txt"
+        lines = [f"line {i} é" for i in range(1, 21)]
+        path.write_bytes((newline.join(lines) + (newline if trailing else "")).encode("utf-8"))
+        with open(path, encoding="utf-8") as f:
+            text_lines = list(f)
+
+        index = line_index.LineIndexCache().get(path, "utf-8")
+
+        assert index.num_lines == len(text_lines) == 20
+        for start, end in [(1, 1), (5, 9), (18, 20), (19, 25), (21, 30), (0, 2)]:
+            expected = "".join(text_lines[max(start, 1) - 1:end])
+            assert index.read_range(path, start, end, "utf-8") == expected
+
+    def test_unsupported_files_are_not_indexed(self, line_index, tmp_path):
+        bare_cr = tmp_path / "mac.txt"
+        bare_cr.write_bytes(b"a\rb\rc")
+        utf16 = tmp_path / "utf16.txt"
+        utf16.write_text("a\nb\n", encoding="utf-16")
+        cache = line_index.LineIndexCache()
+
+        assert cache.get(bare_cr, "utf-8") is None
+        assert cache.get(utf16, "utf-16") is None
+
+    def test_cache_is_keyed_by_mtime_and_size(self, line_index, tmp_path):
+        path = tmp_path / "file.txt"
+        path.write_text("a\nb\n")
+        cache = line_index.LineIndexCache()
+        index = cache.get(path, "utf-8")
+
+        assert cache.get(path, "utf-8") is index
+
+        path.write_text("a\nb\nc\n")
+        updated = cache.get(path, "utf-8")
+        assert updated is not index and updated.num_lines == 3
+
+        cache.invalidate(path)
+        assert cache.get(path, "utf-8") is not updated
+
+    @pytest.mark.benchmark
+    def test_range_view_of_large_file(self, line_index, tmp_path):
+        path = tmp_path / "large.txt"
+        with open(path, "w") as f:
+            for i in range(500_000):
+                f.write(f"line {i:07d} {'x' * 40}\n")
+        cache = line_index.LineIndexCache()
+        cache.get(path, "utf-8")
+
+        start = time.perf_counter()
+        for _ in range(100):
+            content = cache.get(path, "utf-8").read_range(path, 400_001, 400_050, "utf-8")
+        elapsed = (time.perf_counter() - start) / 100
+
+        print(f"\nRange view of {os.path.getsize(path) // 2**20} MB file: {elapsed * 1e6:.0f}us")
+        assert content.startswith("line 0400000 ")
+        assert content.count("\n") == 50
+        assert elapsed < 0.005
+
+
+class TestWindowedDiff:
+    """Test get_edit_groups on the changed window"""
+
+    @pytest.fixture(scope="class")
+    def diff(self):
+        return load_plugin_module("diff")
+
+    @staticmethod
+    def full_diff(diff, old_content, new_content, n_context_lines=2):
+        """get_edit_groups without the window, as it was before"""
+        original = diff._changed_window
+        diff._changed_window = lambda old, new, n: (0, len(old), len(new))
+        try:
+            return diff.get_edit_groups(old_content, new_content, n_context_lines)
+        finally:
+            diff._changed_window = original
+
+    @pytest.mark.parametrize("n_context_lines", [0, 2, 4])
+    @pytest.mark.parametrize("edit", [
+        lambda lines: lines.__setitem__(50, "changed"),
+        lambda lines: lines.insert(0, "inserted"),
+        lambda lines: lines.append("appended"),
+        lambda lines: lines.__delitem__(slice(10, 13)),
+        lambda lines: (lines.__setitem__(20, "one"), lines.__setitem__(80, "two")),
+        lambda lines: None,
+    ])
+    def test_matches_full_diff(self, diff, edit, n_context_lines):
+        lines = [f"line {i}" for i in range(100)]
+        old_content = "\n".join(lines)
+        edit(lines)
+        new_content = "\n".join(lines)
+
+        assert (
+            diff.get_edit_groups(old_content, new_content, n_context_lines)
+            == self.full_diff(diff, old_content, new_content, n_context_lines)
+        )
+
+    def test_only_changed_window_is_matched(self, diff, monkeypatch):
+        lines = [f"line {i}" for i in range(10_000)]
+        old_content = "\n".join(lines)
+        lines[5_000] = "changed"
+        compared = []
+
+        class RecordingMatcher(SequenceMatcher):
+            def __init__(self, isjunk, a, b):
+                compared.append((len(a), len(b)))
+                super().__init__(isjunk, a, b)
+
+        monkeypatch.setattr(diff, "SequenceMatcher", RecordingMatcher)
+        groups = diff.get_edit_groups(old_content, "\n".join(lines))
+
+        assert compared == [(5, 5)]
+        assert groups[0].before_edits[2] == "-5001|line 5000"
+        assert groups[0].after_edits[2] == "+5001|changed"
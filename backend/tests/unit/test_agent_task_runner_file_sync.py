@@ -0,0 +1,270 @@
+"""
+AgentTaskRunner File Sync Tests
+
+Tests content-addressed syncing of sandbox files to file storage and the
+release of session resources when the task ends or is destroyed.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from app.domain.models.event import MessageEvent, WaitEvent
+from app.domain.models.file import FileInfo
+from app.domain.models.tool_result import ToolResult
+from app.domain.services.agent_task_runner import AgentTaskRunner
+from app.infrastructure.external.task.redis_task import RedisStreamTask
+
+SHA256 = "a" * 64
+
+
+class TestSyncFileToStorage:
+    """Test _sync_file_to_storage"""
+
+    @pytest.fixture
+    def sandbox(self):
+        sandbox = Mock()
+        sandbox.file_hash = AsyncMock(return_value=ToolResult(success=True, data={"sha256": SHA256, "size": 3}))
+        sandbox.file_download_stream = Mock(return_value=Mock())
+        return sandbox
+
+    @pytest.fixture
+    def session_repository(self):
+        repository = Mock()
+        repository.get_file_by_path = AsyncMock(return_value=None)
+        repository.remove_file_by_path = AsyncMock()
+        repository.add_file = AsyncMock()
+        return repository
+
+    @pytest.fixture
+    def file_storage(self):
+        storage = Mock()
+        storage.find_file_by_hash = AsyncMock(return_value=None)
+        storage.share_file = AsyncMock(return_value=True)
+        storage.delete_file = AsyncMock(return_value=True)
+        storage.upload_file_stream = AsyncMock(
+            return_value=FileInfo(file_id="new", filename="out.txt", metadata={"sha256": SHA256})
+        )
+        return storage
+
+    @pytest.fixture
+    def runner(self, sandbox, session_repository, file_storage):
+        with patch("app.domain.services.agent_task_runner.PlanActFlow"):
+            return AgentTaskRunner(
+                session_id="session-1",
+                agent_id="agent-1",
+                user_id="user-1",
+                llm=Mock(),
+                sandbox=sandbox,
+                browser=Mock(),
+                agent_repository=Mock(),
+                session_repository=session_repository,
+                json_parser=Mock(),
+                file_storage=file_storage,
+                mcp_repository=Mock(),
+            )
+
+    async def test_unchanged_file_is_skipped(self, runner, session_repository, file_storage):
+        """Test that a file whose hash matches the session entry is not synced again"""
+        existing = FileInfo(file_id="old", file_path="/home/ubuntu/out.txt", metadata={"sha256": SHA256})
+        session_repository.get_file_by_path.return_value = existing
+
+        result = await runner._sync_file_to_storage("/home/ubuntu/out.txt")
+
+        assert result is existing
+        file_storage.find_file_by_hash.assert_not_awaited()
+        file_storage.upload_file_stream.assert_not_awaited()
+        session_repository.remove_file_by_path.assert_not_awaited()
+        session_repository.add_file.assert_not_awaited()
+
+    async def test_identical_blob_is_shared(self, runner, session_repository, file_storage):
+        """Test that content already stored for the user is reused without uploading"""
+        file_storage.find_file_by_hash.return_value = FileInfo(
+            file_id="shared", filename="out.txt", metadata={"sha256": SHA256}
+        )
+
+        result = await runner._sync_file_to_storage("/home/ubuntu/out.txt")
+
+        assert result.file_id == "shared"
+        assert result.filename == "out.txt"
+        assert result.file_path == "/home/ubuntu/out.txt"
+        file_storage.find_file_by_hash.assert_awaited_once_with(SHA256, "user-1", "out.txt")
+        file_storage.upload_file_stream.assert_not_awaited()
+        session_repository.add_file.assert_awaited_once_with("session-1", result)
+        file_storage.share_file.assert_awaited_once_with("shared", "user-1")
+
+    async def test_blob_deleted_meanwhile_is_uploaded(self, runner, file_storage):
+        """Test that a matching blob deleted before it could be shared is uploaded again"""
+        file_storage.find_file_by_hash.return_value = FileInfo(
+            file_id="shared", filename="out.txt", metadata={"sha256": SHA256}
+        )
+        file_storage.share_file.return_value = False
+
+        result = await runner._sync_file_to_storage("/home/ubuntu/out.txt")
+
+        assert result.file_id == "new"
+        file_storage.upload_file_stream.assert_awaited_once()
+
+    async def test_changed_file_is_uploaded(self, runner, sandbox, session_repository, file_storage):
+        """Test that new content is streamed to storage and replaces the session entry"""
+        session_repository.get_file_by_path.return_value = FileInfo(
+            file_id="old", file_path="/home/ubuntu/out.txt", metadata={"sha256": "b" * 64}
+        )
+
+        result = await runner._sync_file_to_storage("/home/ubuntu/out.txt")
+
+        assert result.file_id == "new"
+        sandbox.file_download_stream.assert_called_once_with("/home/ubuntu/out.txt")
+        session_repository.remove_file_by_path.assert_awaited_once_with("session-1", "/home/ubuntu/out.txt")
+        session_repository.add_file.assert_awaited_once()
+        file_storage.delete_file.assert_awaited_once_with("old", "user-1")
+
+    async def test_resharing_same_blob_keeps_one_reference(self, runner, session_repository, file_storage):
+        """Test that an entry synced without a hash and matched by it again holds one reference"""
+        session_repository.get_file_by_path.return_value = FileInfo(
+            file_id="shared", file_path="/home/ubuntu/out.txt", filename="out.txt", metadata={}
+        )
+        file_storage.find_file_by_hash.return_value = FileInfo(
+            file_id="shared", filename="out.txt", metadata={"sha256": SHA256}
+        )
+
+        await runner._sync_file_to_storage("/home/ubuntu/out.txt")
+
+        file_storage.share_file.assert_awaited_once_with("shared", "user-1")
+        file_storage.delete_file.assert_awaited_once_with("shared", "user-1")
+
+    async def test_attachment_synced_to_sandbox_takes_reference(
+        self, runner, sandbox, session_repository, file_storage
+    ):
+        """Test that the session entry of an uploaded attachment holds its own reference"""
+        file_info = FileInfo(file_id="upload", filename="in.txt")
+        file_storage.download_file_stream = AsyncMock(return_value=(Mock(), file_info))
+        sandbox.file_upload_stream = AsyncMock(return_value=ToolResult(success=True))
+        event = Mock(attachments=[FileInfo(file_id="upload")])
+
+        await runner._sync_message_attachments_to_sandbox(event)
+
+        file_storage.share_file.assert_awaited_once_with("upload", "user-1")
+        session_repository.add_file.assert_awaited_once_with("session-1", file_info)
+        assert file_info.file_path == "/home/ubuntu/upload/in.txt"
+
+    async def test_hash_failure_falls_back_to_upload(self, runner, sandbox, file_storage):
+        """Test that files are still synced when the sandbox cannot hash them"""
+        sandbox.file_hash.return_value = ToolResult(success=False, message="not found")
+
+        result = await runner._sync_file_to_storage("/home/ubuntu/out.txt")
+
+        assert result.file_id == "new"
+        file_storage.find_file_by_hash.assert_not_awaited()
+        file_storage.upload_file_stream.assert_awaited_once()
+
+
+class TestDestroy:
+    """Test destroy"""
+
+    async def test_browser_context_released_before_sandbox(self):
+        calls = Mock()
+        sandbox = Mock(destroy=AsyncMock())
+        browser = Mock(cleanup=AsyncMock())
+        calls.attach_mock(sandbox.destroy, "sandbox_destroy")
+        calls.attach_mock(browser.cleanup, "browser_cleanup")
+        with patch("app.domain.services.agent_task_runner.PlanActFlow"):
+            runner = AgentTaskRunner(
+                session_id="session-1",
+                agent_id="agent-1",
+                user_id="user-1",
+                llm=Mock(),
+                sandbox=sandbox,
+                browser=browser,
+                agent_repository=Mock(),
+                session_repository=Mock(),
+                json_parser=Mock(),
+                file_storage=Mock(),
+                mcp_repository=Mock(),
+            )
+        runner._mcp_tool = None
+
+        await runner.destroy()
+
+        assert [name for name, _, _ in calls.mock_calls] == ["browser_cleanup", "sandbox_destroy"]
+
+
+class MemoryQueue:
+    """Message queue keeping messages in a list"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def put(self, message):
+        self.messages.append(message)
+        return str(len(self.messages))
+
+    async def pop(self):
+        return str(len(self.messages)), self.messages.pop(0)
+
+    async def is_empty(self):
+        return not self.messages
+
+
+class TestTaskLifecycle:
+    """Test the release of session resources when a RedisStreamTask ends"""
+
+    @pytest.fixture
+    def browser(self):
+        return Mock(cleanup=AsyncMock())
+
+    @pytest.fixture
+    def screenshot_service(self):
+        return Mock(release=AsyncMock())
+
+    @pytest.fixture
+    def runner(self, browser, screenshot_service):
+        with patch("app.domain.services.agent_task_runner.PlanActFlow"):
+            runner = AgentTaskRunner(
+                session_id="session-1",
+                agent_id="agent-1",
+                user_id="user-1",
+                llm=Mock(),
+                sandbox=Mock(ensure_sandbox=AsyncMock(), destroy=AsyncMock()),
+                browser=browser,
+                agent_repository=Mock(),
+                session_repository=AsyncMock(),
+                json_parser=Mock(),
+                file_storage=Mock(),
+                mcp_repository=AsyncMock(),
+                screenshot_service=screenshot_service,
+            )
+        runner._mcp_tool = AsyncMock()
+        return runner
+
+    async def run_task(self, runner, *events):
+        async def run_flow(message):
+            for event in events:
+                yield event
+        runner._flow.run = run_flow
+
+        task = RedisStreamTask.create(runner)
+        task._input_stream = MemoryQueue()
+        task._output_stream = MemoryQueue()
+        await task.input_stream.put(MessageEvent(message="hi", role="user").model_dump_json())
+        await task.run()
+        while not task.done:
+            await asyncio.sleep(0.01)
+        # on_done runs in its own task
+        await asyncio.sleep(0.01)
+        return task
+
+    async def test_finished_task_releases_browser_context(self, runner, browser, screenshot_service):
+        task = await self.run_task(runner, MessageEvent(message="done"))
+
+        assert RedisStreamTask.get(task.id) is None
+        browser.cleanup.assert_awaited_once()
+        screenshot_service.release.assert_awaited_once_with("session-1")
+        runner._sandbox.destroy.assert_not_awaited()
+
+    async def test_waiting_task_keeps_browser_context(self, runner, browser, screenshot_service):
+        await self.run_task(runner, WaitEvent())
+
+        browser.cleanup.assert_not_awaited()
+        screenshot_service.release.assert_not_awaited()
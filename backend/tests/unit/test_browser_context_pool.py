@@ -0,0 +1,177 @@
+"""
+Browser Context Pool Tests
+
+Tests per-session contexts, spare context reuse, reset and reconnection of
+BrowserContextPool, and PlaywrightBrowser using the pool.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.browser import context_pool, playwright_browser
+from app.infrastructure.external.browser.context_pool import BrowserContextPool, blocked_url_patterns
+from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
+
+
+class FakeBrowser:
+    """CDP connection opening mock contexts"""
+
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+        self.cdp_sessions = []
+        self.close = AsyncMock()
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = Mock(browser=self, pages=[])
+        context.close = AsyncMock()
+
+        async def new_page():
+            page = Mock(url="about:blank")
+            context.pages.append(page)
+            return page
+
+        async def new_cdp_session(page):
+            session = Mock(send=AsyncMock())
+            self.cdp_sessions.append(session)
+            return session
+
+        context.new_page = AsyncMock(side_effect=new_page)
+        context.new_cdp_session = AsyncMock(side_effect=new_cdp_session)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def connections():
+    browsers = []
+
+    async def connect_over_cdp(cdp_url):
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    playwright = Mock(stop=AsyncMock())
+    playwright.chromium.connect_over_cdp = AsyncMock(side_effect=connect_over_cdp)
+    starter = Mock()
+    starter.start = AsyncMock(return_value=playwright)
+    with patch.object(context_pool, "async_playwright", return_value=starter):
+        yield browsers
+
+
+class TestBrowserContextPool:
+    """Test BrowserContextPool"""
+
+    async def test_sessions_get_isolated_contexts(self, connections):
+        pool = BrowserContextPool("http://sandbox:9222", size=0)
+
+        first = await pool.acquire("s1")
+        again = await pool.acquire("s1")
+        other = await pool.acquire("s2")
+
+        assert first is again
+        assert first is not other
+        # One CDP connection for every session
+        assert len(connections) == 1
+
+    async def test_spare_context_is_taken(self, connections):
+        pool = BrowserContextPool("http://sandbox:9222", size=1)
+        pool.warm()
+        await pool._refill_task
+
+        context = await pool.acquire("s1")
+
+        assert context is connections[0].contexts[0]
+        assert pool.stats()["hits"] == 1
+        await pool._refill_task
+        assert pool.stats()["spare"] == 1
+
+    async def test_reset_replaces_context(self, connections):
+        pool = BrowserContextPool("http://sandbox:9222", size=0)
+        old = await pool.acquire("s1")
+
+        new = await pool.reset("s1")
+
+        assert new is not old
+        old.close.assert_awaited_once()
+        assert len(connections) == 1
+
+    async def test_lost_connection_reconnects(self, connections):
+        pool = BrowserContextPool("http://sandbox:9222", size=0)
+        old = await pool.acquire("s1")
+        connections[0].connected = False
+
+        new = await pool.acquire("s1")
+
+        assert len(connections) == 2
+        assert new.browser is connections[1]
+        assert new is not old
+
+    async def test_resources_blocked_in_chrome(self, connections):
+        pool = BrowserContextPool("http://sandbox:9222", size=0, blocked_urls=["*.woff*"])
+
+        await pool.acquire("s1")
+
+        connections[0].cdp_sessions[0].send.assert_awaited_with("Network.setBlockedURLs", {"urls": ["*.woff*"]})
+
+    def test_blocked_url_patterns(self):
+        patterns = blocked_url_patterns("font, ads,unknown".split(","))
+
+        assert "*.woff*" in patterns
+        assert "*doubleclick.net/*" in patterns
+        assert blocked_url_patterns([""]) == []
+
+
+class TestPlaywrightBrowserContexts:
+    """Test PlaywrightBrowser on the context pool"""
+
+    @pytest.fixture
+    def pool(self, connections):
+        pool = BrowserContextPool("http://sandbox:9222", size=0)
+        with patch.object(playwright_browser, "OpenAILLM"), \
+                patch.object(playwright_browser.browser_context_pools, "get", return_value=pool):
+            yield pool
+
+    @pytest.fixture
+    def browser(self, pool):
+        return PlaywrightBrowser("http://sandbox:9222", session_id="s1")
+
+    async def test_tool_calls_reuse_session_context(self, browser, connections):
+        await browser._ensure_page()
+        page = browser.page
+
+        again = PlaywrightBrowser("http://sandbox:9222", session_id="s1")
+        await again._ensure_page()
+
+        assert again.page is page
+        assert len(connections) == 1
+
+    async def test_cleanup_releases_session_context(self, browser, pool, connections):
+        other = PlaywrightBrowser("http://sandbox:9222", session_id="s2")
+        await browser._ensure_page()
+        await other._ensure_page()
+        context = browser.context
+
+        await browser.cleanup()
+
+        context.close.assert_awaited_once()
+        assert pool.stats()["sessions"] == 1
+        assert not other.context.close.await_count
+        assert connections[0].connected
+
+    async def test_restart_resets_context(self, browser, connections):
+        await browser._ensure_page()
+        old_context = browser.context
+
+        with patch.object(browser, "navigate", AsyncMock(return_value=ToolResult(success=True))) as navigate:
+            await browser.restart("https://example.com")
+
+        assert browser.context is not old_context
+        old_context.close.assert_awaited_once()
+        navigate.assert_awaited_once_with("https://example.com")
+        assert len(connections) == 1
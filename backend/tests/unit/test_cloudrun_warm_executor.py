@@ -0,0 +1,237 @@
+"""
+Warm Executor Tests
+
+Tests CloudRunJobsSandbox in warm executor mode against the local stand-in
+backend, which runs sandbox-executor/executor.py as a subprocess, and the
+Cloud Run backend's job and queue handling against in-memory fakes.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.infrastructure.external.sandbox.cloudrun_executor import (
+    REQUESTS_KEY,
+    RESULT_KEY,
+    CloudRunExecutorBackend,
+    ExecutorError,
+    LocalExecutorBackend,
+    WarmExecutor,
+)
+from app.infrastructure.external.sandbox.cloudrun_jobs_sandbox import CloudRunJobsSandbox
+
+
+@pytest.fixture
+async def sandbox(tmp_path):
+    sandbox = CloudRunJobsSandbox(project_id="test-project", executor_mode="local")
+    sandbox.warm_executor = WarmExecutor(lambda: LocalExecutorBackend(workdir=str(tmp_path)))
+    yield sandbox
+    await sandbox.destroy()
+
+
+class TestLocalWarmExecutor:
+    """Test CloudRunJobsSandbox on a local warm executor"""
+
+    async def test_cwd_and_env_persist_between_commands(self, sandbox, tmp_path):
+        (tmp_path / "project").mkdir()
+
+        result = await sandbox.exec_command_stateful("cd project && export GREETING=hello")
+        assert result["exit_code"] == 0
+        assert result["cwd"] == str(tmp_path / "project")
+
+        result = await sandbox.exec_command_stateful("pwd; echo $GREETING")
+        assert result["stdout"] == f"{tmp_path / 'project'}\nhello\n"
+
+    async def test_sessions_are_isolated(self, sandbox, tmp_path):
+        await sandbox.exec_command_stateful("cd / && export SCOPE=one", session_id="one")
+
+        result = await sandbox.exec_command_stateful("pwd; echo ${SCOPE:-unset}", session_id="two")
+
+        assert result["stdout"] == f"{tmp_path}\nunset\n"
+        assert result["session_id"] == "two"
+
+    async def test_exit_code_and_stderr(self, sandbox):
+        result = await sandbox.exec_command_stateful("echo oops >&2; exit 3")
+
+        assert result["exit_code"] == 3
+        assert result["stderr"] == "oops\n"
+
+    async def test_timeout_keeps_executor_usable(self, sandbox):
+        result = await sandbox.exec_command_stateful("sleep 10", timeout=1)
+        assert result["exit_code"] == -1
+        assert "timed out" in result["stderr"]
+
+        result = await sandbox.exec_command_stateful("echo ready")
+        assert result["stdout"] == "ready\n"
+
+    async def test_file_operations(self, sandbox, tmp_path):
+        path = tmp_path / "notes.txt"
+
+        assert (await sandbox.file_write(str(path), "first line", trailing_newline=True)).success
+        read = await sandbox.file_read(str(path))
+        exists = await sandbox.file_exists(str(path))
+
+        assert read.data["content"] == "first line\n"
+        assert exists.data["exists"] is True
+
+    async def test_file_grep_quotes_arguments(self, sandbox, tmp_path):
+        folder = tmp_path / "my notes"
+        folder.mkdir()
+        (folder / "todo.txt").write_text("buy milk\n")
+        (folder / "it's.md").write_text("milk it's\n")
+
+        result = await sandbox.file_grep(str(folder), "milk", glob_pattern="it's.md")
+
+        assert result.success
+        assert [m["file"] for m in result.data["matches"]] == [str(folder / "it's.md")]
+        single = await sandbox.file_grep(str(folder / "todo.txt"), "milk")
+        assert single.success
+        assert single.data["matches"] == [{"file": str(folder / "todo.txt"), "line_number": 1, "line": "buy milk"}]
+        injected = await sandbox.file_grep(str(folder), "milk", glob_pattern="'; touch pwned; '")
+        assert injected.success and injected.data["matches"] == []
+        assert not (tmp_path / "pwned").exists()
+
+    async def test_file_grep_reports_errors(self, sandbox, tmp_path):
+        (tmp_path / "a.txt").write_text("line\n" * 10)
+
+        missing = await sandbox.file_grep(str(tmp_path / "missing"), "line")
+        no_match = await sandbox.file_grep(str(tmp_path), "absent")
+        truncated = await sandbox.file_grep(str(tmp_path), "line", max_results=3)
+
+        assert not missing.success
+        assert no_match.success and no_match.data["matches"] == []
+        assert truncated.success and truncated.data["truncated"]
+        assert len(truncated.data["matches"]) == 3
+
+    async def test_view_shell_reads_executor_state(self, sandbox, tmp_path):
+        await sandbox.exec_command_stateful("cd /")
+
+        result = await sandbox.view_shell("default")
+
+        assert result.data["cwd"] == "/"
+
+    async def test_commands_do_not_see_executor_settings(self, sandbox, monkeypatch):
+        monkeypatch.setenv("REDIS_URL", "redis://:secret@redis:6379/0")
+
+        result = await sandbox.exec_command_stateful("echo ${REDIS_URL:-unset} ${EXECUTOR_WORKDIR:-unset}; env")
+
+        assert result["stdout"].startswith("unset unset\n")
+        assert "secret" not in result["stdout"]
+
+    async def test_restarts_after_executor_exits(self, sandbox):
+        await sandbox.exec_command_stateful("export KEPT=1")
+        process = sandbox.warm_executor._backend._process
+        process.kill()
+        await process.wait()
+
+        failed = await sandbox.exec_command_stateful("echo hi")
+        assert failed["exit_code"] == -1
+
+        # A fresh executor starts with fresh session state
+        result = await sandbox.exec_command_stateful("echo ${KEPT:-gone}")
+        assert result["stdout"] == "gone\n"
+
+    async def test_get_returns_created_sandbox(self):
+        settings = Mock(
+            sandbox_gcp_project=None, sandbox_gcp_region="us-central1", sandbox_executor_image=None,
+            sandbox_gcs_bucket=None, sandbox_executor_mode="local"
+        )
+        with patch("app.infrastructure.external.sandbox.cloudrun_jobs_sandbox.get_settings", return_value=settings):
+            sandbox = await CloudRunJobsSandbox.create()
+            found = await CloudRunJobsSandbox.get(sandbox.id)
+
+            assert found is sandbox
+            assert found.warm_executor is sandbox.warm_executor
+
+            await CloudRunJobsSandbox.close_all()
+            assert sandbox.id not in CloudRunJobsSandbox._instances
+
+    async def test_destroy_stops_executor(self, sandbox):
+        await sandbox.exec_command_stateful("true")
+        process = sandbox.warm_executor._backend._process
+
+        assert await sandbox.destroy()
+
+        assert process.returncode is not None
+
+
+class FakeRedis:
+    """Redis lists with the BLPOP/RPUSH subset the backend uses"""
+
+    def __init__(self):
+        self.lists = {}
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def blpop(self, keys, timeout=0):
+        for key in keys:
+            if self.lists.get(key):
+                return key, self.lists[key].pop(0)
+        await asyncio.sleep(0)
+        return None
+
+    async def delete(self, key):
+        self.lists.pop(key, None)
+
+
+def make_job_manager():
+    job_manager = AsyncMock()
+    job_manager.create_executor_job.return_value = "projects/p/locations/r/jobs/executor-1"
+    job_manager.execute_job.return_value = "projects/p/locations/r/jobs/executor-1/executions/e-1"
+    return job_manager
+
+
+class TestCloudRunExecutorBackend:
+    """Test CloudRunExecutorBackend"""
+
+    async def test_start_runs_serve_mode_job(self):
+        job_manager = make_job_manager()
+        backend = CloudRunExecutorBackend(
+            job_manager, FakeRedis(), "redis://10.0.0.3:6379/0", lifetime=1800, idle_timeout=600
+        )
+
+        await backend.start()
+
+        job_manager.create_executor_job.assert_awaited_once()
+        _, kwargs = job_manager.create_executor_job.call_args
+        assert kwargs["timeout"] == 1800
+        assert kwargs["env"]["REDIS_URL"] == "redis://10.0.0.3:6379/0"
+        assert kwargs["env"]["EXECUTOR_IDLE_TIMEOUT"] == "600"
+        assert kwargs["env"]["EXECUTOR_QUEUE"] == backend._queue
+        job_manager.execute_job.assert_awaited_once_with("projects/p/locations/r/jobs/executor-1")
+
+    async def test_request_round_trip(self):
+        redis = FakeRedis()
+        backend = CloudRunExecutorBackend(make_job_manager(), redis, "redis://", 1800, 600)
+        # The executor's answer, already waiting
+        await redis.rpush(RESULT_KEY.format(queue=backend._queue, id="r1"), json.dumps({"id": "r1", "exit_code": 0}))
+
+        result = await backend.request({"id": "r1", "type": "exec", "command": "ls"}, timeout=5)
+
+        assert result == {"id": "r1", "exit_code": 0}
+        queued = redis.lists[REQUESTS_KEY.format(queue=backend._queue)]
+        assert json.loads(queued[0])["command"] == "ls"
+
+    async def test_request_times_out(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.external.sandbox.cloudrun_executor.STARTUP_TIMEOUT", 0)
+        backend = CloudRunExecutorBackend(make_job_manager(), FakeRedis(), "redis://", 1800, 600)
+
+        with pytest.raises(ExecutorError):
+            await backend.request({"id": "r1", "type": "get_state"}, timeout=0.01)
+
+    async def test_stop_shuts_down_and_removes_job(self):
+        job_manager = make_job_manager()
+        redis = FakeRedis()
+        backend = CloudRunExecutorBackend(job_manager, redis, "redis://", 1800, 600)
+        await backend.start()
+
+        await backend.stop()
+
+        job_manager.cancel_execution.assert_awaited_once_with(
+            "projects/p/locations/r/jobs/executor-1/executions/e-1"
+        )
+        job_manager.delete_job.assert_awaited_once_with("projects/p/locations/r/jobs/executor-1")
+        assert REQUESTS_KEY.format(queue=backend._queue) not in redis.lists
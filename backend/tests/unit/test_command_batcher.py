@@ -0,0 +1,200 @@
+"""
+Command Batcher Tests
+
+Tests coalescing of read-only commands into batched executions, on its own
+and through CloudRunJobsSandbox in job and local warm executor mode.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.sandbox.cloudrun_executor import LocalExecutorBackend, WarmExecutor
+from app.infrastructure.external.sandbox.cloudrun_jobs_sandbox import CloudRunJobsSandbox
+from app.infrastructure.external.sandbox.command_batcher import CommandBatcher
+
+
+class RecordingExecutor:
+    """Batch executor echoing each command, recording the batches it ran"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.batches = []
+
+    async def __call__(self, session_id, commands):
+        self.batches.append((session_id, [entry["command"] for entry in commands]))
+        await asyncio.sleep(self.delay)
+        return [{"exit_code": 0, "stdout": entry["command"]} for entry in commands]
+
+
+class TestCommandBatcher:
+    """Test CommandBatcher"""
+
+    async def test_coalesces_commands_within_window(self):
+        executor = RecordingExecutor()
+        batcher = CommandBatcher(executor)
+
+        results = await asyncio.gather(
+            batcher.submit("cat a", "s1"),
+            batcher.submit("cat b", "s1"),
+            batcher.submit("ls", "s2"),
+        )
+
+        assert [result["stdout"] for result in results] == ["cat a", "cat b", "ls"]
+        assert sorted(executor.batches) == [("s1", ["cat a", "cat b"]), ("s2", ["ls"])]
+
+    async def test_identical_commands_share_one_execution(self):
+        executor = RecordingExecutor()
+        batcher = CommandBatcher(executor)
+
+        first, second = await asyncio.gather(
+            batcher.submit("test -e a", "s1", timeout=10),
+            batcher.submit("test -e a", "s1", timeout=60),
+        )
+
+        assert first is second
+        assert executor.batches == [("s1", ["test -e a"])]
+
+    async def test_full_batch_is_sent_immediately(self):
+        executor = RecordingExecutor()
+        batcher = CommandBatcher(executor, window=60, max_size=2)
+
+        await asyncio.wait_for(
+            asyncio.gather(batcher.submit("cat a", "s1"), batcher.submit("cat b", "s1")),
+            timeout=1
+        )
+
+        assert executor.batches == [("s1", ["cat a", "cat b"])]
+
+    async def test_flush_waits_for_pending_and_inflight_batches(self):
+        executor = RecordingExecutor(delay=0.05)
+        batcher = CommandBatcher(executor, window=60)
+
+        read = asyncio.create_task(batcher.submit("cat a", "s1"))
+        await asyncio.sleep(0)
+        await batcher.flush("s1")
+
+        assert read.done()
+        assert (await read)["stdout"] == "cat a"
+
+    async def test_failure_reaches_every_caller(self):
+        batcher = CommandBatcher(AsyncMock(side_effect=RuntimeError("job failed")))
+
+        results = await asyncio.gather(
+            batcher.submit("cat a", "s1"), batcher.submit("cat b", "s1"), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class TestSandboxBatching:
+    """Test batched file operations of CloudRunJobsSandbox"""
+
+    @pytest.fixture
+    def sandbox(self):
+        with patch("app.infrastructure.external.sandbox.cloudrun_jobs_sandbox.storage.Client"), \
+                patch("app.infrastructure.external.sandbox.cloudrun_jobs_sandbox.run_v2"):
+            sandbox = CloudRunJobsSandbox(project_id="test-project", state_bucket="test-bucket")
+        sandbox.state_manager = AsyncMock()
+        sandbox.job_manager = AsyncMock()
+        sandbox.state_manager.load_state.return_value = {"cwd": "/workspace"}
+        sandbox.job_manager.create_batch_job.return_value = "jobs/sandbox-batch"
+        return sandbox
+
+    async def test_file_batch_reads_run_as_one_job(self, sandbox):
+        commands = []
+
+        async def create_batch_job(execution_id, session_id, batch):
+            commands.extend(batch)
+            sandbox.state_manager.load_execution_result.return_value = {
+                "exit_code": 0,
+                "results": [
+                    {"id": entry["id"], "exit_code": 0, "stdout": "exists\n", "stderr": "", "cwd": "/workspace"}
+                    for entry in batch
+                ],
+                "new_state": {"cwd": "/workspace"}
+            }
+            return "jobs/sandbox-batch"
+
+        sandbox.job_manager.create_batch_job.side_effect = create_batch_job
+
+        result = await sandbox.file_batch([
+            {"op": "exists", "path": "/workspace/a"},
+            {"op": "exists", "path": "/workspace/b"},
+            {"op": "list", "path": "/workspace"},
+        ])
+
+        assert result.data["succeeded"] == 3
+        sandbox.job_manager.create_batch_job.assert_awaited_once()
+        sandbox.job_manager.create_job.assert_not_called()
+        sandbox.job_manager.delete_job.assert_awaited_once_with("jobs/sandbox-batch")
+        # Each command's result is kept under its own execution id
+        saved = {call.args[0] for call in sandbox.state_manager.save_execution_result.await_args_list}
+        assert saved == {entry["id"] for entry in commands}
+
+    async def test_file_batch_orders_operations_on_one_path(self, sandbox):
+        events = []
+
+        async def file_write(path, content, append=False):
+            events.append(("write start", path))
+            await asyncio.sleep(0.05)
+            events.append(("write end", path))
+            return ToolResult(success=True)
+
+        async def file_read(path, start_line=None, end_line=None):
+            events.append(("read", path))
+            return ToolResult(success=True, data={"content": "new"})
+
+        sandbox.file_write = file_write
+        sandbox.file_read = file_read
+
+        result = await sandbox.file_batch([
+            {"op": "write", "path": "/workspace/a.txt", "content": "new"},
+            {"op": "read", "path": "/workspace/./a.txt"},
+            {"op": "read", "path": "/workspace/b.txt"},
+        ])
+
+        assert result.data["succeeded"] == 3
+        assert events == [
+            ("write start", "/workspace/a.txt"),
+            ("read", "/workspace/b.txt"),
+            ("write end", "/workspace/a.txt"),
+            ("read", "/workspace/./a.txt"),
+        ]
+
+    async def test_missing_batch_result_fails_each_command(self, sandbox):
+        sandbox.state_manager.load_execution_result.return_value = None
+
+        first, second = await asyncio.gather(sandbox.file_exists("/a"), sandbox.file_read("/b"))
+
+        assert first.data["exists"] is False
+        assert second.success is False
+
+    async def test_local_executor_batches_reads(self, tmp_path):
+        (tmp_path / "a.txt").write_text("alpha\n")
+        (tmp_path / "b.txt").write_text("beta\n")
+        sandbox = CloudRunJobsSandbox(project_id="test-project", executor_mode="local")
+        sandbox.warm_executor = WarmExecutor(lambda: LocalExecutorBackend(workdir=str(tmp_path)))
+        batches = []
+        execute_batch = sandbox.warm_executor.execute_batch
+
+        async def record(commands, session_id):
+            batches.append(len(commands))
+            return await execute_batch(commands, session_id)
+
+        sandbox.warm_executor.execute_batch = record
+        try:
+            first, second, missing = await asyncio.gather(
+                sandbox.file_read(str(tmp_path / "a.txt")),
+                sandbox.file_read(str(tmp_path / "b.txt")),
+                sandbox.file_exists(str(tmp_path / "c.txt")),
+            )
+        finally:
+            await sandbox.destroy()
+
+        assert batches == [3]
+        assert first.data["content"] == "alpha\n"
+        assert second.data["content"] == "beta\n"
+        assert missing.data["exists"] is False
@@ -0,0 +1,182 @@
+"""
+Async Docker Engine API Client Tests
+
+Tests container lifecycle calls against an in-process httpx transport
+standing in for the Docker daemon.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.infrastructure.external.sandbox import docker_sandbox
+from app.infrastructure.external.sandbox.docker_api import (
+    AsyncDockerClient,
+    DockerAPIError,
+    DockerNotFoundError,
+    build_container_config,
+    parse_image,
+)
+from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+from app.infrastructure.external.sandbox.scheduler import DockerHost, SandboxResources, SandboxScheduler
+
+
+class FakeDaemon:
+    """Records requests and serves a minimal Engine API"""
+
+    def __init__(self, image_present: bool = True):
+        self.image_present = image_present
+        self.requests = []
+        self.containers = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        path = request.url.path
+        if path == "/containers/create":
+            if not self.image_present:
+                return httpx.Response(404, json={"message": "No such image: sandbox:latest"})
+            name = request.url.params["name"]
+            self.containers[name] = json.loads(request.content)
+            return httpx.Response(201, json={"Id": name, "Warnings": []})
+        if path == "/info":
+            return httpx.Response(200, json={"NCPU": 4, "MemTotal": 8 * 2**30})
+        if path == "/containers/json":
+            return httpx.Response(200, json=[
+                {"Names": [f"/{name}"], "Labels": config.get("Labels") or {}}
+                for name, config in self.containers.items()
+            ])
+        if path == "/images/create":
+            self.image_present = True
+            body = '{"status":"Pulling"}\n{"status":"Downloaded newer image"}\n'
+            return httpx.Response(200, text=body)
+        name = path.split("/")[2]
+        if name not in self.containers:
+            return httpx.Response(404, json={"message": f"No such container: {name}"})
+        if path.endswith("/start"):
+            return httpx.Response(204)
+        if path.endswith("/json"):
+            return httpx.Response(200, json={
+                "Name": f"/{name}",
+                "Config": {"Labels": self.containers[name].get("Labels")},
+                "NetworkSettings": {"IPAddress": "", "Networks": {"sandbox-net": {"IPAddress": "172.18.0.5"}}}
+            })
+        if request.method == "DELETE":
+            del self.containers[name]
+            return httpx.Response(204)
+        return httpx.Response(500, json={"message": "unexpected request"})
+
+
+def make_client(daemon: FakeDaemon) -> AsyncDockerClient:
+    client = AsyncDockerClient("tcp://docker:2375")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(daemon), base_url="http://docker:2375")
+    return client
+
+
+class TestAsyncDockerClient:
+    """Test AsyncDockerClient"""
+
+    async def test_run_container(self):
+        daemon = FakeDaemon()
+        client = make_client(daemon)
+
+        attrs = await client.run_container(
+            image="sandbox:1.0",
+            name="sandbox-1",
+            environment={"A": 1, "B": None},
+            volumes={"/host/plugins": {"bind": "/openhands/tools", "mode": "ro"}},
+            network="sandbox-net",
+            remove=True,
+        )
+
+        assert attrs["Name"] == "/sandbox-1"
+        assert daemon.requests == [
+            ("POST", "/containers/create"),
+            ("POST", "/containers/sandbox-1/start"),
+            ("GET", "/containers/sandbox-1/json"),
+        ]
+        assert daemon.containers["sandbox-1"] == {
+            "Image": "sandbox:1.0",
+            "Env": ["A=1", "B"],
+            "HostConfig": {
+                "AutoRemove": True,
+                "Binds": ["/host/plugins:/openhands/tools:ro"],
+                "NetworkMode": "sandbox-net",
+            },
+        }
+
+    async def test_run_container_pulls_missing_image(self):
+        daemon = FakeDaemon(image_present=False)
+        client = make_client(daemon)
+
+        await client.run_container(image="sandbox", name="sandbox-1")
+
+        assert [path for _, path in daemon.requests[:3]] == [
+            "/containers/create", "/images/create", "/containers/create"
+        ]
+
+    async def test_pull_error_is_raised(self):
+        def handler(request):
+            return httpx.Response(200, text='{"status":"Pulling"}\n{"error":"pull access denied"}\n')
+
+        client = AsyncDockerClient("tcp://docker:2375")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://docker:2375")
+
+        with pytest.raises(DockerAPIError, match="pull access denied"):
+            await client.pull_image("private/sandbox")
+
+    async def test_missing_container(self):
+        client = make_client(FakeDaemon())
+
+        with pytest.raises(DockerNotFoundError) as exc_info:
+            await client.inspect_container("missing")
+        assert exc_info.value.status_code == 404
+
+    def test_unix_socket_host(self):
+        client = AsyncDockerClient("unix:///var/run/docker.sock")
+        assert client._client.base_url == httpx.URL("http://docker")
+
+    @pytest.mark.parametrize("image, expected", [
+        ("sandbox", ("sandbox", "latest")),
+        ("sandbox:1.0", ("sandbox", "1.0")),
+        ("registry:5000/team/sandbox", ("registry:5000/team/sandbox", "latest")),
+        ("registry:5000/team/sandbox:dev", ("registry:5000/team/sandbox", "dev")),
+        ("sandbox@sha256:abc", ("sandbox", "sha256:abc")),
+    ])
+    def test_parse_image(self, image, expected):
+        assert parse_image(image) == expected
+
+    def test_config_without_volumes_or_network(self):
+        assert build_container_config("sandbox") == {
+            "Image": "sandbox", "Env": [], "HostConfig": {"AutoRemove": False}
+        }
+
+
+class TestDockerSandboxLifecycle:
+    """Test DockerSandbox container lifecycle through the async client"""
+
+    async def test_create_and_destroy(self):
+        daemon = FakeDaemon()
+        DockerSandbox._instances.clear()
+        settings = MagicMock(
+            sandbox_address=None, sandbox_image="sandbox", sandbox_name_prefix="sandbox",
+            sandbox_network="sandbox-net"
+        )
+        scheduler = SandboxScheduler(
+            [DockerHost("local", make_client(daemon))],
+            SandboxResources(cpus=1.0, memory=2**30, pids=512)
+        )
+        with patch.object(docker_sandbox, "get_settings", return_value=settings), \
+                patch.object(docker_sandbox, "get_sandbox_scheduler", return_value=scheduler):
+            sandbox = await DockerSandbox.create()
+            assert sandbox.ip == "172.18.0.5"
+            assert await DockerSandbox.get(sandbox.id) is sandbox
+
+            assert await sandbox.destroy()
+            # Removing a container that is already gone still succeeds
+            assert await sandbox.destroy()
+
+        assert daemon.containers == {}
+        assert sandbox.id not in DockerSandbox._instances
+        assert scheduler.hosts[0].allocations == {}
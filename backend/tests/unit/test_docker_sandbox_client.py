@@ -0,0 +1,141 @@
+"""
+DockerSandbox HTTP Client Lifecycle Tests
+
+Tests the shared per-host HTTP clients, per-endpoint timeouts and the
+instance cache behind DockerSandbox.get.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.infrastructure.external.sandbox import docker_sandbox
+from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+
+
+@pytest.fixture(autouse=True)
+async def reset_clients():
+    await DockerSandbox.close_all()
+    yield
+    await DockerSandbox.close_all()
+
+
+def mock_docker(ips: dict):
+    """get_sandbox_scheduler() replacement whose containers have the given IPs"""
+    async def inspect_container(name):
+        return {"NetworkSettings": {"IPAddress": ips[name]}}
+    client = MagicMock()
+    client.inspect_container = AsyncMock(side_effect=inspect_container)
+    client.remove_container = AsyncMock()
+    return client
+
+
+class TestSharedClients:
+    """Test per-host client sharing"""
+
+    def test_instances_share_client_per_host(self):
+        first = DockerSandbox(ip="10.0.0.1")
+        second = DockerSandbox(ip="10.0.0.1")
+        other = DockerSandbox(ip="10.0.0.2")
+
+        assert first.client is second.client
+        assert first.client is not other.client
+        pool = first.client._transport._pool
+        assert pool._max_connections == docker_sandbox.HTTP_POOL_LIMITS.max_connections
+        assert pool._max_keepalive_connections == docker_sandbox.HTTP_POOL_LIMITS.max_keepalive_connections
+
+    async def test_closed_client_is_replaced(self):
+        sandbox = DockerSandbox(ip="10.0.0.1")
+        client = sandbox.client
+        await DockerSandbox.close_all()
+
+        assert client.is_closed
+        assert not sandbox.client.is_closed
+
+    async def test_endpoint_timeouts(self):
+        timeouts = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts[request.url.path] = request.extensions["timeout"]["read"]
+            return httpx.Response(200, json={"success": True, "data": {}})
+
+        sandbox = DockerSandbox(ip="127.0.0.1")
+        sandbox.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            timeout=docker_sandbox.LONG_TIMEOUT
+        )
+        await sandbox.file_exists("/tmp/a")
+        await sandbox.view_shell("s1")
+        await sandbox.file_editor("view", "/tmp/a")
+        await sandbox.exec_command_stateful("ls", timeout=45)
+
+        assert timeouts["/api/v1/file/exists"] == docker_sandbox.QUICK_TIMEOUT.read
+        assert timeouts["/api/v1/shell/view"] == docker_sandbox.QUICK_TIMEOUT.read
+        assert timeouts["/api/v1/file/editor"] == docker_sandbox.LONG_TIMEOUT.read
+        assert timeouts["/api/v1/shell/exec"] == 45
+
+
+class TestInstanceCache:
+    """Test DockerSandbox.get caching and eviction"""
+
+    @pytest.fixture
+    def settings(self):
+        settings = MagicMock(sandbox_address=None)
+        with patch.object(docker_sandbox, "get_settings", return_value=settings):
+            yield settings
+
+    async def test_get_returns_cached_instance(self, settings):
+        docker_client = mock_docker({"a": "10.0.0.1"})
+        with patch.object(docker_sandbox, "get_sandbox_scheduler", return_value=docker_client):
+            first = await DockerSandbox.get("a")
+            second = await DockerSandbox.get("a")
+
+        assert first is second
+        docker_client.inspect_container.assert_awaited_once_with("a")
+
+    async def test_eviction_keeps_client_open(self, settings):
+        docker_client = mock_docker({"a": "10.0.0.1", "b": "10.0.0.2", "c": "10.0.0.3"})
+        with patch.object(docker_sandbox, "get_sandbox_scheduler", return_value=docker_client), \
+                patch.object(docker_sandbox, "INSTANCE_CACHE_SIZE", 2):
+            a = await DockerSandbox.get("a")
+            client_a = a.client
+            await DockerSandbox.get("b")
+            await DockerSandbox.get("a")  # b becomes least recently used
+            b_client = DockerSandbox._instances["b"].client
+            await DockerSandbox.get("c")
+
+        assert list(DockerSandbox._instances) == ["a", "c"]
+        # b's task may still have requests in flight
+        assert not b_client.is_closed
+        assert not client_a.is_closed
+
+    async def test_destroy_removes_instance_and_closes_client(self, settings):
+        docker_client = mock_docker({"a": "10.0.0.1"})
+        with patch.object(docker_sandbox, "get_sandbox_scheduler", return_value=docker_client):
+            sandbox = await DockerSandbox.get("a")
+            client = sandbox.client
+            assert await sandbox.destroy()
+
+        docker_client.remove_container.assert_awaited_once_with("a")
+        assert "a" not in DockerSandbox._instances
+        assert client.is_closed
+
+    async def test_destroy_keeps_client_of_shared_host(self, settings):
+        settings.sandbox_address = "sandbox"
+        docker_client = mock_docker({})
+        with patch.object(docker_sandbox, "get_sandbox_scheduler", return_value=docker_client), \
+                patch.object(DockerSandbox, "_resolve_hostname_to_ip", AsyncMock(return_value="10.0.0.1")), \
+                patch.object(docker_sandbox.browser_context_pools, "close", AsyncMock()) as close_browser:
+            first = await DockerSandbox.get("a")
+            second = await DockerSandbox.get("b")
+            client = second.client
+            assert await first.destroy()
+
+            assert not client.is_closed
+            close_browser.assert_not_awaited()
+
+            assert await second.destroy()
+
+        assert client.is_closed
+        close_browser.assert_awaited_once_with(second.cdp_url)
@@ -0,0 +1,112 @@
+"""
+FileTool Tests
+
+Tests how FileTool routes agent calls to the sandbox.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from app.domain.services.tools.file import FileTool, MAX_SEARCH_RESULTS
+from app.domain.models.tool_result import ToolResult
+
+
+class TestFileFindInContent:
+    """Test file_find_in_content"""
+    
+    @pytest.fixture
+    def mock_sandbox(self):
+        """Create mock sandbox"""
+        sandbox = Mock()
+        sandbox.file_grep = AsyncMock(return_value=ToolResult(success=True, data={"matches": []}))
+        sandbox.file_search = AsyncMock(return_value=ToolResult(success=True, data={"matches": []}))
+        return sandbox
+    
+    @pytest.fixture
+    def file_tool(self, mock_sandbox):
+        """Create FileTool instance"""
+        return FileTool(sandbox=mock_sandbox)
+    
+    async def test_searches_directory_with_grep(self, file_tool, mock_sandbox):
+        """Test that content search goes through the directory-wide grep"""
+        result = await file_tool.invoke_function(
+            "file_find_in_content",
+            file="/workspace/repo",
+            regex="def main",
+            glob="*.py"
+        )
+        
+        assert result.success is True
+        mock_sandbox.file_grep.assert_awaited_once_with(
+            path="/workspace/repo",
+            regex="def main",
+            glob_pattern="*.py",
+            case_sensitive=True,
+            max_results=MAX_SEARCH_RESULTS
+        )
+        mock_sandbox.file_search.assert_not_awaited()
+    
+    async def test_sudo_uses_single_file_search(self, file_tool, mock_sandbox):
+        """Test that sudo searches keep using the privileged single file search"""
+        await file_tool.file_find_in_content(file="/etc/shadow", regex="root", sudo=True)
+        
+        mock_sandbox.file_search.assert_awaited_once_with(file="/etc/shadow", regex="root", sudo=True)
+        mock_sandbox.file_grep.assert_not_awaited()
+    
+    def test_schema_exposes_glob(self, file_tool):
+        """Test that the tool schema exposes the new parameters"""
+        schema = next(
+            t for t in file_tool.get_tools()
+            if t["function"]["name"] == "file_find_in_content"
+        )
+        properties = schema["function"]["parameters"]["properties"]
+        assert "glob" in properties
+        assert "case_sensitive" in properties
+
+
+class TestFileEditorCommands:
+    """Test file_view, file_create and file_str_replace"""
+    
+    @pytest.fixture
+    def mock_sandbox(self):
+        """Create mock sandbox"""
+        sandbox = Mock()
+        sandbox.file_editor = AsyncMock(return_value=ToolResult(success=True, data={"content": "hello"}))
+        sandbox.exec_command_stateful = AsyncMock()
+        return sandbox
+    
+    @pytest.fixture
+    def file_tool(self, mock_sandbox):
+        """Create FileTool instance"""
+        return FileTool(sandbox=mock_sandbox)
+    
+    async def test_view_uses_resident_editor(self, file_tool, mock_sandbox):
+        """Test that viewing goes through the sandbox's resident editor"""
+        result = await file_tool.file_view(path="/workspace/a.py", view_range=[1, 10])
+        
+        assert result.success is True
+        mock_sandbox.file_editor.assert_awaited_once_with(
+            command="view", path="/workspace/a.py", view_range=[1, 10]
+        )
+        mock_sandbox.exec_command_stateful.assert_not_awaited()
+    
+    async def test_create_and_str_replace(self, file_tool, mock_sandbox):
+        """Test that edits pass their arguments through unchanged"""
+        await file_tool.file_create(path="/workspace/a.py", file_text="it's\n")
+        await file_tool.file_str_replace(path="/workspace/a.py", old_str="it's", new_str="it is")
+        
+        assert mock_sandbox.file_editor.await_args_list[0].kwargs == {
+            "command": "create", "path": "/workspace/a.py", "file_text": "it's\n"
+        }
+        assert mock_sandbox.file_editor.await_args_list[1].kwargs == {
+            "command": "str_replace", "path": "/workspace/a.py", "old_str": "it's", "new_str": "it is"
+        }
+    
+    async def test_editor_errors_are_reported(self, file_tool, mock_sandbox):
+        """Test that transport errors become a failed ToolResult"""
+        mock_sandbox.file_editor.side_effect = RuntimeError("connection refused")
+        
+        result = await file_tool.file_view(path="/workspace/a.py")
+        
+        assert result.success is False
+        assert "connection refused" in result.message
@@ -0,0 +1,103 @@
+"""
+GridFS File Reference Tests
+
+Tests that files shared by several session entries keep their content in
+GridFS until the last reference is deleted.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+
+from app.infrastructure.external.file.gridfsfile import GridFSFileStorage
+
+
+class FakeFiles:
+    """GridFS files collection with the reference counting queries"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update):
+        doc = self.docs.get(query["_id"])
+        refs = doc["metadata"].get("ref_count", 1) if doc else 0
+        if isinstance(update, list):
+            # share_file: pipeline update of a file owned by the user
+            if not doc or doc["metadata"]["user_id"] != query["metadata.user_id"]:
+                return SimpleNamespace(matched_count=0, modified_count=0)
+            doc["metadata"]["ref_count"] = refs + 1
+            return SimpleNamespace(matched_count=1, modified_count=1)
+        if refs > 1:
+            doc["metadata"]["ref_count"] = refs - 1
+            return SimpleNamespace(matched_count=1, modified_count=1)
+        return SimpleNamespace(matched_count=0, modified_count=0)
+
+    async def delete_one(self, query):
+        doc = self.docs.get(query["_id"])
+        if doc and doc["metadata"].get("ref_count", 1) <= 1:
+            del self.docs[query["_id"]]
+            return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+
+@pytest.fixture
+def files():
+    return FakeFiles()
+
+
+@pytest.fixture
+def storage(files):
+    storage = GridFSFileStorage(MagicMock())
+    storage.chunks = MagicMock(delete_many=AsyncMock())
+    storage._get_files_collection = lambda: files
+    storage._get_chunks_collection = lambda: storage.chunks
+    return storage
+
+
+def add_file(files, user_id="user-1"):
+    file_id = ObjectId()
+    files.docs[file_id] = {"_id": file_id, "metadata": {"user_id": user_id}}
+    return str(file_id)
+
+
+class TestSharedFiles:
+    """Test GridFSFileStorage.share_file and delete_file"""
+
+    async def test_content_kept_until_last_reference_is_deleted(self, storage, files):
+        file_id = add_file(files)
+        assert await storage.share_file(file_id, "user-1")
+        assert await storage.share_file(file_id, "user-1")
+
+        assert await storage.delete_file(file_id, "user-1")
+        assert await storage.delete_file(file_id, "user-1")
+        storage.chunks.delete_many.assert_not_awaited()
+
+        assert await storage.delete_file(file_id, "user-1")
+        storage.chunks.delete_many.assert_awaited_once_with({"files_id": ObjectId(file_id)})
+        assert not await storage.delete_file(file_id, "user-1")
+
+    async def test_unshared_file_is_deleted(self, storage, files):
+        file_id = add_file(files)
+
+        assert await storage.delete_file(file_id, "user-1")
+
+        assert files.docs == {}
+        storage.chunks.delete_many.assert_awaited_once()
+
+    async def test_only_owner_shares_and_deletes(self, storage, files):
+        file_id = add_file(files, user_id="user-2")
+
+        assert not await storage.share_file(file_id, "user-1")
+        assert not await storage.delete_file(file_id, "user-1")
+        assert "ref_count" not in files.docs[ObjectId(file_id)]["metadata"]
+
+    async def test_deleted_file_cannot_be_shared(self, storage, files):
+        file_id = add_file(files)
+        await storage.delete_file(file_id, "user-1")
+
+        assert not await storage.share_file(file_id, "user-1")
@@ -0,0 +1,137 @@
+"""
+MCP Connection Pool Tests
+
+Tests concurrent server startup, connection sharing between sessions, failure
+backoff and tool catalog caching of MCPConnectionPool and MCPClientManager.
+"""
+
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from mcp.types import ListToolsResult, ServerNotification, Tool, ToolListChangedNotification
+
+from app.domain.models.mcp_config import MCPConfig, MCPServerConfig
+from app.domain.services.tools import mcp
+from app.domain.services.tools.mcp import MCPClientManager, MCPConnectionPool, MCPServerConnection
+
+SERVER = """
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("echo")
+
+@server.tool()
+def echo(message: str) -> str:
+    \"\"\"Echo back the message\"\"\"
+    return message
+
+server.run()
+"""
+
+
+def stdio(*args, **kwargs):
+    return MCPServerConfig(transport="stdio", command=sys.executable, args=list(args), **kwargs)
+
+
+@pytest.fixture
+def echo_server():
+    return stdio("-c", SERVER)
+
+
+@pytest.fixture
+def dead_server():
+    # Never answers initialize
+    return stdio("-c", "import time; time.sleep(60)")
+
+
+@pytest.fixture
+async def pool():
+    pool = MCPConnectionPool()
+    yield pool
+    await pool.close_all()
+
+
+class TestMCPClientManager:
+    """Test MCPClientManager on the shared connection pool"""
+
+    async def test_sessions_share_connection(self, pool, echo_server):
+        config = MCPConfig(mcpServers={"echo": echo_server})
+        first = MCPClientManager(config, pool)
+        second = MCPClientManager(config, pool)
+
+        await first.initialize()
+        await second.initialize()
+
+        assert first._clients["echo"] is second._clients["echo"]
+        assert [t["function"]["name"] for t in await second.get_all_tools()] == ["mcp_echo_echo"]
+        stats = pool.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        # The tool catalog was fetched once for both sessions
+        assert stats["connections"][0]["tools_fetches"] == 1
+
+        result = await second.call_tool("mcp_echo_echo", {"message": "hi"})
+        assert result.success and result.data == "hi"
+
+    async def test_dead_server_does_not_hold_up_others(self, pool, echo_server, dead_server):
+        other_dead_server = stdio("-c", "import time; time.sleep(59)")
+        config = MCPConfig(mcpServers={"dead": dead_server, "other": other_dead_server, "echo": echo_server})
+        manager = MCPClientManager(config, pool)
+
+        with patch.object(mcp, "CONNECT_TIMEOUT", 3):
+            start = time.monotonic()
+            await manager.initialize()
+            elapsed = time.monotonic() - start
+
+        # Servers time out together, not one after another
+        assert elapsed < 5.5
+        assert list(manager._clients) == ["echo"]
+
+        # Within the backoff a new session fails fast
+        await asyncio.sleep(0.5)
+        start = time.monotonic()
+        await MCPClientManager(config, pool).initialize()
+        assert time.monotonic() - start < 1
+        assert pool.stats()["failed_fast"] == 2
+
+    async def test_released_connection_closes_when_idle(self, pool, echo_server):
+        manager = MCPClientManager(MCPConfig(mcpServers={"echo": echo_server}), pool)
+        await manager.initialize()
+        connection = manager._clients["echo"]
+
+        with patch.object(mcp, "IDLE_TIMEOUT", 0):
+            await manager.cleanup()
+            await asyncio.wait_for(connection._task, timeout=5)
+
+        assert connection.closed
+        assert pool.stats()["connections"] == []
+
+
+class TestToolCatalogCache:
+    """Test the tool catalog cache of MCPServerConnection"""
+
+    @pytest.fixture
+    def connection(self, echo_server):
+        connection = MCPServerConnection("echo", echo_server)
+        tools = ListToolsResult(tools=[Tool(name="echo", inputSchema={"type": "object"})])
+        connection.session = Mock(list_tools=AsyncMock(return_value=tools))
+        return connection
+
+    async def test_cached_until_list_changed(self, connection):
+        await connection.list_tools()
+        await connection.list_tools()
+        assert connection.session.list_tools.await_count == 1
+
+        await connection._handle_message(ServerNotification(ToolListChangedNotification()))
+        await connection.list_tools()
+
+        assert connection.session.list_tools.await_count == 2
+
+    async def test_cache_expires(self, connection):
+        await connection.list_tools()
+
+        with patch.object(mcp, "TOOLS_CACHE_TTL", -1):
+            await connection.list_tools()
+
+        assert connection.session.list_tools.await_count == 2
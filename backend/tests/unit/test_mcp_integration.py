@@ -21,6 +21,8 @@ import asyncio
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from pathlib import Path
 
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external import mcp_client
 from app.infrastructure.external.mcp_client import (
     MCPClient,
     MCPConnection,
@@ -88,6 +90,73 @@ class TestMCPTool:
         assert "properties" in tool.input_schema
 
 
+class FakeBridge:
+    """Sandbox MCP bridge answering JSON-RPC requests with a handler"""
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.sent = []
+        self.closed = False
+        self.incoming = asyncio.Queue()
+    
+    async def send(self, raw):
+        message = json.loads(raw)
+        self.sent.append(message)
+        if "id" in message:
+            asyncio.create_task(self._answer(message))
+    
+    async def _answer(self, message):
+        result = await self.handler(message)
+        if result is not None:
+            await self.incoming.put(json.dumps({
+                'jsonrpc': '2.0',
+                'id': message['id'],
+                'result': result
+            }))
+    
+    async def close(self):
+        self.closed = True
+        await self.incoming.put(None)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        raw = await self.incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+
+async def echo_server(message):
+    """Echo MCP server answering initialize, tools/list and tools/call"""
+    if message['method'] == 'initialize':
+        return {
+            'protocolVersion': '2024-11-05',
+            'capabilities': {'tools': {}},
+            'serverInfo': {'name': 'echo', 'version': '1.0.0'}
+        }
+    if message['method'] == 'tools/list':
+        return {
+            'tools': [{
+                'name': 'echo',
+                'description': 'Echo tool',
+                'inputSchema': {
+                    'type': 'object',
+                    'properties': {
+                        'message': {'type': 'string'}
+                    }
+                }
+            }]
+        }
+    if message['method'] == 'tools/call':
+        text = message['params']['arguments']['message']
+        # Later calls are answered first
+        await asyncio.sleep(0.1 if text == 'first' else 0)
+        return {'content': [{'type': 'text', 'text': text}]}
+    return None
+
+
 class TestMCPConnection:
     """Test MCP connection to a single server"""
     
@@ -95,21 +164,12 @@ class TestMCPConnection:
     def mock_sandbox(self):
         """Create mock sandbox"""
         sandbox = Mock()
-        sandbox.run_in_background = AsyncMock(return_value={
-            'exit_code': 0,
-            'pid': 12345,
-            'stdout': '',
-            'stderr': ''
-        })
-        sandbox.execute_command = AsyncMock(return_value={
-            'exit_code': 0,
-            'stdout': json.dumps({
-                'jsonrpc': '2.0',
-                'id': 'test-id',
-                'result': {'protocolVersion': '2024-11-05'}
-            }),
-            'stderr': ''
-        })
+        sandbox.start_mcp_server = AsyncMock(return_value=ToolResult(
+            success=True,
+            data={'server_id': 'server-1', 'name': 'echo', 'pid': 12345}
+        ))
+        sandbox.mcp_server_url = Mock(return_value='ws://sandbox:8080/api/v1/mcp/server-1/ws')
+        sandbox.stop_mcp_server = AsyncMock(return_value=ToolResult(success=True))
         return sandbox
     
     @pytest.fixture
@@ -122,6 +182,13 @@ class TestMCPConnection:
             env={"PYTHONUNBUFFERED": "1"}
         )
     
+    @pytest.fixture
+    def bridge(self):
+        """Patch the WebSocket connection to the sandbox bridge"""
+        bridge = FakeBridge(echo_server)
+        with patch.object(mcp_client.websockets, 'connect', AsyncMock(return_value=bridge)):
+            yield bridge
+    
     def test_connection_creation(self, mock_sandbox, echo_config):
         """Test creating a connection"""
         connection = MCPConnection(
@@ -136,7 +203,7 @@ class TestMCPConnection:
         assert connection.process_id is None
     
     @pytest.mark.asyncio
-    async def test_connection_lifecycle(self, mock_sandbox, echo_config):
+    async def test_connection_lifecycle(self, mock_sandbox, echo_config, bridge):
         """Test connection connect/disconnect"""
         connection = MCPConnection(
             echo_config,
@@ -144,49 +211,6 @@ class TestMCPConnection:
             "test-session"
         )
         
-        # Mock successful initialization
-        mock_sandbox.execute_command = AsyncMock(side_effect=[
-            # First call: send initialize request (echo to stdin)
-            {'exit_code': 0, 'stdout': '', 'stderr': ''},
-            # Second call: read response
-            {
-                'exit_code': 0,
-                'stdout': json.dumps({
-                    'jsonrpc': '2.0',
-                    'id': 'init-id',
-                    'result': {
-                        'protocolVersion': '2024-11-05',
-                        'capabilities': {'tools': {}},
-                        'serverInfo': {'name': 'echo', 'version': '1.0.0'}
-                    }
-                }),
-                'stderr': ''
-            },
-            # Third call: send tools/list request
-            {'exit_code': 0, 'stdout': '', 'stderr': ''},
-            # Fourth call: read tools/list response
-            {
-                'exit_code': 0,
-                'stdout': json.dumps({
-                    'jsonrpc': '2.0',
-                    'id': 'tools-id',
-                    'result': {
-                        'tools': [{
-                            'name': 'echo',
-                            'description': 'Echo tool',
-                            'inputSchema': {
-                                'type': 'object',
-                                'properties': {
-                                    'message': {'type': 'string'}
-                                }
-                            }
-                        }]
-                    }
-                }),
-                'stderr': ''
-            }
-        ])
-        
         # Connect
         success = await connection.connect()
         
@@ -195,6 +219,61 @@ class TestMCPConnection:
         assert connection.process_id == 12345
         assert len(connection.tools) == 1
         assert connection.tools[0].name == "echo"
+        mock_sandbox.start_mcp_server.assert_awaited_once_with(
+            name="echo",
+            command="python3",
+            args=["-c", "print('echo')"],
+            env={"PYTHONUNBUFFERED": "1"}
+        )
+        assert [m['method'] for m in bridge.sent] == [
+            'initialize', 'notifications/initialized', 'tools/list'
+        ]
+        
+        # Disconnect
+        await connection.disconnect()
+        
+        assert connection.is_connected is False
+        assert bridge.closed is True
+        mock_sandbox.stop_mcp_server.assert_awaited_once_with("server-1")
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_tool_calls(self, mock_sandbox, echo_config, bridge):
+        """Test responses arriving out of order resolve the right calls"""
+        connection = MCPConnection(echo_config, mock_sandbox, "test-session")
+        await connection.connect()
+        
+        first, second = await asyncio.gather(
+            connection.call_tool("echo", {"message": "first"}),
+            connection.call_tool("echo", {"message": "second"})
+        )
+        
+        assert first['content'][0]['text'] == "first"
+        assert second['content'][0]['text'] == "second"
+        assert connection.pending_requests == {}
+    
+    @pytest.mark.asyncio
+    async def test_request_timeout(self, mock_sandbox, echo_config, bridge):
+        """Test unanswered requests time out and are cancelled"""
+        connection = MCPConnection(echo_config, mock_sandbox, "test-session")
+        await connection.connect()
+        
+        response = await connection._send_request("unknown/method", timeout=0.05)
+        
+        assert "timed out" in response["error"]
+        assert bridge.sent[-1]['method'] == 'notifications/cancelled'
+        assert connection.pending_requests == {}
+    
+    @pytest.mark.asyncio
+    async def test_start_failure(self, mock_sandbox, echo_config):
+        """Test a server that can't be started"""
+        mock_sandbox.start_mcp_server = AsyncMock(return_value=ToolResult(
+            success=False,
+            message="Command not found: python3"
+        ))
+        connection = MCPConnection(echo_config, mock_sandbox, "test-session")
+        
+        assert await connection.connect() is False
+        assert connection.is_connected is False
 
 
 class TestMCPClient:
@@ -204,17 +283,11 @@ class TestMCPClient:
     def mock_sandbox(self):
         """Create mock sandbox"""
         sandbox = Mock()
-        sandbox.run_in_background = AsyncMock(return_value={
-            'exit_code': 0,
-            'pid': 12345,
-            'stdout': '',
-            'stderr': ''
-        })
-        sandbox.execute_command = AsyncMock(return_value={
-            'exit_code': 0,
-            'stdout': '{}',
-            'stderr': ''
-        })
+        sandbox.start_mcp_server = AsyncMock(return_value=ToolResult(
+            success=True,
+            data={'server_id': 'server-1', 'pid': 12345}
+        ))
+        sandbox.stop_mcp_server = AsyncMock(return_value=ToolResult(success=True))
         return sandbox
     
     @pytest.fixture
@@ -254,15 +327,11 @@ class TestMcpConnectionManager:
     def mock_sandbox(self):
         """Create mock sandbox"""
         sandbox = Mock()
-        sandbox.run_in_background = AsyncMock(return_value={
-            'exit_code': 0,
-            'pid': 12345
-        })
-        sandbox.execute_command = AsyncMock(return_value={
-            'exit_code': 0,
-            'stdout': '{}',
-            'stderr': ''
-        })
+        sandbox.start_mcp_server = AsyncMock(return_value=ToolResult(
+            success=True,
+            data={'server_id': 'server-1', 'pid': 12345}
+        ))
+        sandbox.stop_mcp_server = AsyncMock(return_value=ToolResult(success=True))
         return sandbox
     
     @pytest.fixture
@@ -437,7 +506,7 @@ def test_mcp_test_suite_summary():
     test_stats = {
         'MCPServerConfig': 2,
         'MCPTool': 1,
-        'MCPConnection': 2,
+        'MCPConnection': 5,
         'MCPClient': 3,
         'McpConnectionManager': 4,
         'ToolConversion': 1,
@@ -456,7 +525,7 @@ def test_mcp_test_suite_summary():
     print(f"  {'TOTAL':.<40} {total_tests:>3} tests")
     print("="*70)
     
-    assert total_tests == 15, "Expected 15 tests in MCP suite"
+    assert total_tests == 18, "Expected 18 tests in MCP suite"
 
 
 if __name__ == "__main__":
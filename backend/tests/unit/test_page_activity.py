@@ -0,0 +1,133 @@
+"""
+Page Activity Tests
+
+Tests the network idle heuristic and load detection of PlaywrightBrowser
+and, when a Chromium build is installed for Playwright, DOM quiescence.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.infrastructure.external.browser import playwright_browser
+from app.infrastructure.external.browser.page_activity import NetworkActivity, wait_for_dom_quiet
+from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
+
+
+class FakePage:
+    """Page dispatching request events to registered handlers"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit(self, event, request):
+        self.handlers[event](request)
+
+
+class TestNetworkActivity:
+    """Test NetworkActivity"""
+
+    async def test_quiet_page_is_idle(self):
+        activity = NetworkActivity(FakePage())
+
+        assert await activity.wait_for_idle(timeout=1, quiet=0.01)
+
+    async def test_waits_for_requests_to_finish(self):
+        page = FakePage()
+        activity = NetworkActivity(page)
+        requests = [Mock() for _ in range(3)]
+        for request in requests:
+            page.emit("request", request)
+
+        async def finish():
+            await asyncio.sleep(0.05)
+            page.emit("requestfinished", requests[0])
+
+        start = time.monotonic()
+        finisher = asyncio.create_task(finish())
+        idle = await activity.wait_for_idle(timeout=2, quiet=0.05)
+        await finisher
+
+        assert idle
+        # Two long-lived requests remaining don't hold it up
+        assert activity.inflight == 2
+        assert 0.1 <= time.monotonic() - start < 1
+
+    async def test_busy_network_times_out(self):
+        page = FakePage()
+        activity = NetworkActivity(page)
+        for _ in range(3):
+            page.emit("request", Mock())
+
+        assert not await activity.wait_for_idle(timeout=0.05, quiet=0.01)
+
+    def test_failed_requests_count_as_finished(self):
+        page = FakePage()
+        activity = NetworkActivity(page)
+        request = Mock()
+        page.emit("request", request)
+        page.emit("requestfailed", request)
+
+        assert activity.inflight == 0
+
+
+class TestWaitForPageLoad:
+    """Test PlaywrightBrowser.wait_for_page_load"""
+
+    @pytest.fixture
+    def browser(self):
+        with patch.object(playwright_browser, "OpenAILLM"):
+            browser = PlaywrightBrowser("http://localhost:9222")
+        browser._ensure_page = AsyncMock()
+        browser.page = MagicMock()
+        return browser
+
+    async def test_loaded_page_settles(self, browser):
+        browser.page.wait_for_load_state = AsyncMock()
+        with patch.object(playwright_browser, "wait_for_settle", AsyncMock(return_value=True)) as settle:
+            assert await browser.wait_for_page_load(timeout=15)
+
+        browser.page.wait_for_load_state.assert_awaited_once_with("load", timeout=15000)
+        assert settle.await_args.args[1] <= playwright_browser.SETTLE_TIMEOUT
+
+    async def test_load_timeout(self, browser):
+        browser.page.wait_for_load_state = AsyncMock(side_effect=PlaywrightTimeoutError("Timeout"))
+        with patch.object(playwright_browser, "wait_for_settle", AsyncMock()) as settle:
+            assert not await browser.wait_for_page_load(timeout=1)
+
+        settle.assert_not_awaited()
+
+
+@pytest.fixture
+async def page():
+    from playwright.async_api import Error, async_playwright
+
+    async with async_playwright() as p:
+        try:
+            chromium = await p.chromium.launch()
+        except Error:
+            pytest.skip("Chromium is not installed for Playwright")
+        page = await chromium.new_page()
+        yield page
+        await chromium.close()
+
+
+class TestDomQuiet:
+    """Test DOM quiescence in Chromium"""
+
+    async def test_static_page_is_quiet(self, page):
+        await page.set_content("<p>Static</p>")
+
+        assert await wait_for_dom_quiet(page, timeout=2, quiet_ms=50)
+
+    async def test_changing_page_times_out(self, page):
+        await page.set_content("<p id='clock'></p>")
+        await page.evaluate("setInterval(() => { clock.textContent = Date.now(); }, 10)")
+
+        assert not await wait_for_dom_quiet(page, timeout=0.3, quiet_ms=100)
@@ -0,0 +1,188 @@
+"""
+Local Page Extraction Tests
+
+Tests the extraction mode switch of PlaywrightBrowser and, when a Chromium
+build is installed for Playwright, the in-page walk for Markdown content and
+interactive elements and its invalidation on DOM changes.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.external.browser import playwright_browser
+from app.infrastructure.external.browser.page_extraction import VIEW_PAGE_JS
+from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
+
+ARTICLE_PAGE = """<!DOCTYPE html>
+<html><head><title>Release notes</title></head>
+<body>
+  <header><a href="/">Home</a> <a href="/docs">Docs</a></header>
+  <nav><ul><li><a href="/a">Section A</a></li><li><a href="/b">Section B</a></li></ul></nav>
+  <div class="cookie-banner">We use cookies. <button>Accept</button></div>
+  <article>
+    <h1>Version 2.0</h1>
+    <p>This release rewrites the scheduler, adds <strong>batching</strong> and
+       <a href="/migration">a migration guide</a> for existing deployments, which
+       most users will want to read before upgrading their clusters.</p>
+    <ul><li>Faster startup</li><li>Lower memory use</li></ul>
+    <table>
+      <tr><th>Metric</th><th>1.0</th><th>2.0</th></tr>
+      <tr><td>Startup</td><td>12s</td><td>3s</td></tr>
+    </table>
+    <div style="display: none">Hidden text</div>
+    <pre>pip install tool==2.0</pre>
+  </article>
+  <aside>Related posts</aside>
+  <footer>Copyright</footer>
+</body></html>"""
+
+
+@pytest.fixture
+def browser():
+    with patch.object(playwright_browser, "OpenAILLM"):
+        browser = PlaywrightBrowser("http://localhost:9222")
+    browser.settings = MagicMock(
+        browser_extraction_mode="local",
+        browser_extraction_max_chars=1000,
+        browser_extraction_llm_fallback=False,
+    )
+    browser.llm.ask = AsyncMock(return_value={"content": "# From LLM"})
+    browser.page = MagicMock(url="https://example.com/")
+    return browser
+
+
+def local_result(content, truncated=False, elements=()):
+    return {
+        "title": "Page",
+        "url": "https://example.com/",
+        "content": content,
+        "truncated": truncated,
+        "elements": list(elements),
+        "cached": False,
+    }
+
+
+class TestExtractionMode:
+    """Test selection between local and LLM extraction"""
+
+    async def test_local_extraction_skips_llm(self, browser):
+        browser.page.evaluate = AsyncMock(return_value=local_result("# Page"))
+
+        assert await browser._extract_content() == "# Page"
+
+        browser.page.evaluate.assert_awaited_once_with(VIEW_PAGE_JS, 1000)
+        browser.llm.ask.assert_not_called()
+
+    async def test_truncation_is_noted(self, browser):
+        browser.page.evaluate = AsyncMock(return_value=local_result("x" * 1000, truncated=True))
+
+        content = await browser._extract_content()
+
+        assert content.startswith("x" * 1000)
+        assert "truncated at 1000 characters" in content
+
+    async def test_llm_fallback_for_empty_page(self, browser):
+        browser.settings.browser_extraction_llm_fallback = True
+        browser.page.evaluate = AsyncMock(side_effect=[local_result(""), "<div>canvas app</div>"])
+
+        assert await browser._extract_content() == "# From LLM"
+
+    async def test_empty_page_without_fallback(self, browser):
+        browser.page.evaluate = AsyncMock(return_value=local_result(""))
+
+        assert await browser._extract_content() == ""
+        browser.llm.ask.assert_not_called()
+
+    async def test_view_page_walks_page_once(self, browser):
+        element = {"index": 0, "tag": "button", "text": "Save", "selector": '[data-manus-id="manus-element-0"]'}
+        browser.page.evaluate = AsyncMock(return_value=local_result("# Page", elements=[element]))
+        browser._ensure_page = AsyncMock()
+        browser.wait_for_page_load = AsyncMock(return_value=True)
+
+        result = await browser.view_page()
+
+        assert result.data == {"interactive_elements": ["0:<button>Save</button>"], "content": "# Page"}
+        assert browser.page.interactive_elements_cache == [element]
+        browser.page.evaluate.assert_awaited_once()
+
+    async def test_llm_mode(self, browser):
+        browser.settings.browser_extraction_mode = "llm"
+        browser.page.evaluate = AsyncMock(return_value="<div><h1>Page</h1></div>")
+
+        assert await browser._extract_content() == "# From LLM"
+
+
+@pytest.fixture
+async def page():
+    from playwright.async_api import Error, async_playwright
+
+    async with async_playwright() as p:
+        try:
+            chromium = await p.chromium.launch()
+        except Error:
+            pytest.skip("Chromium is not installed for Playwright")
+        page = await chromium.new_page()
+        yield page
+        await chromium.close()
+
+
+INTERACTIVE_PAGE = """<!DOCTYPE html>
+<html><body style="margin: 0">
+  <button>Search</button>
+  <label for="q">Query</label><input id="q" placeholder="Type here">
+  <div style="display: none"><button>Hidden</button></div>
+  <a href="/far" style="position: absolute; top: 5000px">Far below</a>
+</body></html>"""
+
+
+class TestLocalExtraction:
+    """Test the in-page walk in Chromium"""
+
+    async def test_main_content_as_markdown(self, page):
+        await page.set_content(ARTICLE_PAGE)
+
+        result = await page.evaluate(VIEW_PAGE_JS, 5000)
+        content = result["content"]
+
+        assert result["title"] == "Release notes"
+        assert content.startswith("# Version 2.0")
+        assert "adds **batching** and" in content
+        assert "[a migration guide](" in content
+        assert "- Faster startup\n- Lower memory use" in content
+        assert "| Metric | 1.0 | 2.0 |\n| --- | --- | --- |\n| Startup | 12s | 3s |" in content
+        assert "```\npip install tool==2.0\n```" in content
+        for boilerplate in ("Section A", "cookies", "Related posts", "Copyright", "Hidden text"):
+            assert boilerplate not in content
+        assert result["truncated"] is False
+
+    async def test_character_budget(self, page):
+        await page.set_content(ARTICLE_PAGE)
+
+        result = await page.evaluate(VIEW_PAGE_JS, 40)
+
+        assert len(result["content"]) <= 40
+        assert result["truncated"] is True
+
+    async def test_interactive_elements_in_viewport(self, page):
+        await page.set_content(INTERACTIVE_PAGE)
+
+        result = await page.evaluate(VIEW_PAGE_JS, 5000)
+
+        assert [(el["tag"], el["text"]) for el in result["elements"]] == [
+            ("button", "Search"),
+            ("input", "[Placeholder: Type here]"),
+        ]
+        assert await page.get_attribute('[data-manus-id="manus-element-1"]', "id") == "q"
+
+    async def test_result_kept_until_page_changes(self, page):
+        await page.set_content(INTERACTIVE_PAGE)
+
+        first = await page.evaluate(VIEW_PAGE_JS, 5000)
+        second = await page.evaluate(VIEW_PAGE_JS, 5000)
+        await page.evaluate("document.body.prepend(Object.assign(document.createElement('button'), {textContent: 'New'}))")
+        third = await page.evaluate(VIEW_PAGE_JS, 5000)
+
+        assert (first["cached"], second["cached"], third["cached"]) == (False, True, False)
+        assert third["elements"][0]["text"] == "New"
+        assert len(third["elements"]) == 3
@@ -0,0 +1,92 @@
+"""
+Page Extraction Cache Tests
+
+Tests LRU/TTL eviction and hit accounting of PageExtractionCache, and that
+PlaywrightBrowser skips the LLM extraction for unchanged pages.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.external.browser import extraction_cache, playwright_browser
+from app.infrastructure.external.browser.extraction_cache import PageExtractionCache
+from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
+
+
+class TestPageExtractionCache:
+    """Test PageExtractionCache"""
+
+    def test_hit_and_miss_counts(self):
+        cache = PageExtractionCache()
+
+        assert cache.get("https://a", "# A") is None
+        cache.put("https://a", "# A", "extracted A")
+
+        assert cache.get("https://a", "# A") == "extracted A"
+        # Same URL with different visible content is a different entry
+        assert cache.get("https://a", "# A, scrolled") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, 1 / 3)
+
+    def test_evicts_least_recently_used(self):
+        cache = PageExtractionCache(max_entries=2)
+        cache.put("https://a", "a", "A")
+        cache.put("https://b", "b", "B")
+        cache.get("https://a", "a")
+        cache.put("https://c", "c", "C")
+
+        assert cache.get("https://b", "b") is None
+        assert cache.get("https://a", "a") == "A"
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        cache = PageExtractionCache(ttl_seconds=60)
+        with patch.object(extraction_cache.time, "monotonic", return_value=1000.0):
+            cache.put("https://a", "a", "A")
+        with patch.object(extraction_cache.time, "monotonic", return_value=1061.0):
+            assert cache.get("https://a", "a") is None
+
+        assert cache.stats()["size"] == 0
+
+
+class TestViewPageCaching:
+    """Test PlaywrightBrowser extraction through the cache"""
+
+    @pytest.fixture
+    def cache(self):
+        cache = PageExtractionCache()
+        with patch.object(playwright_browser, "get_page_extraction_cache", return_value=cache):
+            yield cache
+
+    @pytest.fixture
+    def browser(self):
+        with patch.object(playwright_browser, "OpenAILLM"):
+            browser = PlaywrightBrowser("http://localhost:9222")
+        browser.llm.ask = AsyncMock(return_value={"content": "# Extracted"})
+        browser.page = MagicMock(url="https://example.com/")
+        browser.page.evaluate = AsyncMock(return_value="<div><h1>Example</h1></div>")
+        return browser
+
+    async def test_unchanged_page_skips_llm(self, browser, cache):
+        first = await browser._extract_content_llm()
+        second = await browser._extract_content_llm()
+
+        assert first == second == "# Extracted"
+        browser.llm.ask.assert_awaited_once()
+        assert cache.stats()["hits"] == 1
+
+    async def test_changed_content_is_extracted_again(self, browser, cache):
+        await browser._extract_content_llm()
+        browser.page.evaluate.return_value = "<div><h1>Example</h1><p>More</p></div>"
+
+        await browser._extract_content_llm()
+
+        assert browser.llm.ask.await_count == 2
+
+    async def test_disabled_cache(self, browser):
+        with patch.object(playwright_browser, "get_page_extraction_cache", return_value=None):
+            await browser._extract_content_llm()
+            await browser._extract_content_llm()
+
+        assert browser.llm.ask.await_count == 2
@@ -0,0 +1,191 @@
+"""
+Parallel Tool Call Tests
+
+Tests that BaseAgent runs the concurrency-safe tool calls of one LLM turn
+together, keeps running other calls one at a time, and emits tool events
+in a stable order.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.domain.models.event import MessageEvent, ToolEvent, ToolStatus
+from app.domain.models.memory import Memory
+from app.domain.models.tool_result import ToolResult
+from app.domain.services.agents.base import BaseAgent
+from app.domain.services.tools.base import BaseTool, tool
+
+
+class ReadTool(BaseTool):
+    """Tool with a slow side-effect-free function and a plain one"""
+
+    name = "read"
+
+    @tool(name="read_file", description="Read", parameters={"path": {"type": "string"}}, required=["path"],
+          concurrency_safe=True)
+    async def read_file(self, path: str) -> ToolResult:
+        await asyncio.sleep(0.2)
+        return ToolResult(success=True, data=path)
+
+    @tool(name="write_file", description="Write", parameters={"path": {"type": "string"}}, required=["path"])
+    async def write_file(self, path: str) -> ToolResult:
+        await asyncio.sleep(0.2)
+        return ToolResult(success=True, data=path)
+
+
+class Agent(BaseAgent):
+    name = "test"
+
+
+class ScriptedLLM:
+    """LLM answering with the given messages in turn"""
+
+    def __init__(self, responses, parallel_tool_calls=True):
+        self.parallel_tool_calls = parallel_tool_calls
+        self.responses = list(responses)
+        self.ask = AsyncMock(side_effect=lambda *args, **kwargs: self.responses.pop(0))
+
+
+def tool_calls(*calls):
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {"id": f"call-{i}", "function": {"name": name, "arguments": json.dumps({"path": path})}}
+            for i, (name, path) in enumerate(calls)
+        ],
+    }
+
+
+DONE = {"role": "assistant", "content": "done"}
+
+
+def make_agent(llm):
+    repository = Mock()
+    repository.get_memory = AsyncMock(return_value=Memory(messages=[]))
+    repository.save_memory = AsyncMock()
+    json_parser = Mock()
+    json_parser.parse = AsyncMock(side_effect=lambda text: json.loads(text))
+    return Agent("agent-1", repository, llm, json_parser, tools=[ReadTool()])
+
+
+async def run(agent):
+    events = []
+    async for event in agent.execute("go"):
+        events.append(event)
+    return events
+
+
+class TestParallelToolCalls:
+    """Test BaseAgent.execute with parallel tool calls"""
+
+    async def test_safe_calls_run_together(self):
+        agent = make_agent(ScriptedLLM([tool_calls(("read_file", "a"), ("read_file", "b"), ("read_file", "c")), DONE]))
+
+        start = time.monotonic()
+        events = await run(agent)
+
+        assert time.monotonic() - start < 0.5
+        tool_events = [(e.status, e.tool_call_id) for e in events if isinstance(e, ToolEvent)]
+        assert tool_events == [
+            (ToolStatus.CALLING, "call-0"), (ToolStatus.CALLED, "call-0"),
+            (ToolStatus.CALLING, "call-1"), (ToolStatus.CALLED, "call-1"),
+            (ToolStatus.CALLING, "call-2"), (ToolStatus.CALLED, "call-2"),
+        ]
+        tool_responses = [m for m in agent.memory.get_messages() if m["role"] == "tool"]
+        assert [m["tool_call_id"] for m in tool_responses] == ["call-0", "call-1", "call-2"]
+        assert isinstance(events[-1], MessageEvent)
+
+    async def test_events_merge_into_the_last_tool(self):
+        agent = make_agent(ScriptedLLM([tool_calls(("read_file", "a"), ("read_file", "b")), DONE]))
+
+        events = await run(agent)
+
+        # The chat page updates the last tool entry when the call id matches, else adds one
+        tools = []
+        for event in events:
+            if not isinstance(event, ToolEvent):
+                continue
+            if tools and tools[-1]["tool_call_id"] == event.tool_call_id:
+                tools[-1]["status"] = event.status
+            else:
+                tools.append({"tool_call_id": event.tool_call_id, "status": event.status})
+        assert tools == [
+            {"tool_call_id": "call-0", "status": ToolStatus.CALLED},
+            {"tool_call_id": "call-1", "status": ToolStatus.CALLED},
+        ]
+
+    async def test_closing_early_cancels_running_calls(self):
+        agent = make_agent(ScriptedLLM([tool_calls(("read_file", "a"), ("read_file", "b")), DONE]))
+        started = []
+        cancelled = []
+
+        async def invoke_tool(tool, function_name, arguments):
+            path = arguments["path"]
+            started.append(path)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(path)
+                raise
+
+        agent.invoke_tool = invoke_tool
+        events = agent.execute("go")
+        async for event in events:
+            if isinstance(event, ToolEvent):
+                break
+        # Both calls are running while the first one is reported
+        await asyncio.sleep(0.01)
+        await events.aclose()
+        await asyncio.sleep(0)
+
+        assert started == ["a", "b"]
+        assert cancelled == ["a", "b"]
+
+    async def test_calls_after_unsafe_call_are_dropped(self):
+        llm = ScriptedLLM([tool_calls(("read_file", "a"), ("write_file", "b"), ("read_file", "c")), DONE])
+        agent = make_agent(llm)
+
+        events = await run(agent)
+
+        called = [e.function_name for e in events if isinstance(e, ToolEvent) and e.status == ToolStatus.CALLED]
+        assert called == ["read_file"]
+        assert len(agent.memory.get_messages()[2]["tool_calls"]) == 1
+
+    async def test_unsafe_first_call_runs_alone(self):
+        agent = make_agent(ScriptedLLM([tool_calls(("write_file", "a"), ("read_file", "b")), DONE]))
+
+        events = await run(agent)
+
+        called = [e.function_name for e in events if isinstance(e, ToolEvent) and e.status == ToolStatus.CALLED]
+        assert called == ["write_file"]
+
+    async def test_disabled_keeps_first_call(self):
+        llm = ScriptedLLM([tool_calls(("read_file", "a"), ("read_file", "b")), DONE], parallel_tool_calls=False)
+        agent = make_agent(llm)
+
+        events = await run(agent)
+
+        called = [e.tool_call_id for e in events if isinstance(e, ToolEvent) and e.status == ToolStatus.CALLED]
+        assert called == ["call-0"]
+
+    def test_tools_declare_concurrency_safety(self):
+        read_tool = ReadTool()
+
+        assert read_tool.is_concurrency_safe("read_file")
+        assert not read_tool.is_concurrency_safe("write_file")
+        assert not read_tool.is_concurrency_safe("unknown")
+
+    @pytest.mark.parametrize("function_name", ["file_view", "file_find_in_content", "file_find_by_name", "shell_view"])
+    def test_read_only_sandbox_tools_are_safe(self, function_name):
+        from app.domain.services.tools.file import FileTool
+        from app.domain.services.tools.shell import ShellTool
+
+        tool = FileTool(Mock()) if function_name.startswith("file") else ShellTool(Mock())
+
+        assert tool.is_concurrency_safe(function_name)
+        assert not tool.is_concurrency_safe("file_create" if function_name.startswith("file") else "shell_exec")
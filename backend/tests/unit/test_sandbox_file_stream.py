@@ -0,0 +1,102 @@
+"""
+DockerSandbox File Streaming Tests
+
+Tests chunked upload and download between the backend and the sandbox API
+using an in-process httpx transport.
+"""
+
+import email
+import email.policy
+
+import httpx
+import pytest
+
+from app.infrastructure.external.sandbox import docker_sandbox
+from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+
+
+async def iter_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict:
+    """Parse a multipart/form-data body into {field: (filename, payload)}"""
+    message = email.message_from_bytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body,
+        policy=email.policy.HTTP
+    )
+    return {
+        part.get_param("name", header="content-disposition"): (part.get_filename(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    }
+
+
+def make_sandbox(handler) -> DockerSandbox:
+    sandbox = DockerSandbox(ip="127.0.0.1")
+    sandbox.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return sandbox
+
+
+class TestFileUploadStream:
+    """Test file_upload_stream"""
+
+    async def test_sends_chunks_as_multipart(self):
+        """Test that streamed chunks arrive as a regular multipart upload"""
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            body = await request.aread()
+            received.update(parse_multipart(request.headers["content-type"], body))
+            return httpx.Response(200, json={"success": True, "data": {"file_size": 11}})
+
+        sandbox = make_sandbox(handler)
+        result = await sandbox.file_upload_stream(
+            iter_chunks(b"hello ", b"", b"world"),
+            "/home/ubuntu/upload/a.txt",
+            filename="a.txt"
+        )
+
+        assert result.success is True
+        assert received["path"] == (None, b"/home/ubuntu/upload/a.txt")
+        assert received["file"] == ("a.txt", b"hello world")
+
+    async def test_reports_failure(self):
+        """Test that HTTP errors are returned as a failed ToolResult"""
+        sandbox = make_sandbox(lambda request: httpx.Response(500))
+
+        result = await sandbox.file_upload_stream(iter_chunks(b"data"), "/tmp/a.txt")
+
+        assert result.success is False
+        assert "Upload failed" in result.message
+
+
+class TestFileDownloadStream:
+    """Test file_download_stream"""
+
+    async def test_yields_chunks(self):
+        """Test that the download is yielded in bounded chunks"""
+        content = bytes(range(256)) * 64
+        sandbox = make_sandbox(lambda request: httpx.Response(200, content=content))
+
+        chunks = [chunk async for chunk in sandbox.file_download_stream("/tmp/a.bin", chunk_size=1024)]
+
+        assert b"".join(chunks) == content
+        assert max(len(chunk) for chunk in chunks) <= 1024
+
+    async def test_rejects_oversized_file(self, monkeypatch):
+        """Test that the size limit is enforced while streaming"""
+        monkeypatch.setattr(docker_sandbox, "MAX_FILE_SIZE", 10)
+        sandbox = make_sandbox(lambda request: httpx.Response(200, content=b"x" * 100))
+
+        with pytest.raises(Exception, match="too large|exceeded"):
+            async for _ in sandbox.file_download_stream("/tmp/a.bin"):
+                pass
+
+    async def test_file_download_buffers_stream(self):
+        """Test that file_download still returns the whole file"""
+        sandbox = make_sandbox(lambda request: httpx.Response(200, content=b"abc" * 1000))
+
+        file_data = await sandbox.file_download("/tmp/a.bin")
+
+        assert file_data.read() == b"abc" * 1000
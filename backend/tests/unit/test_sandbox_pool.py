@@ -0,0 +1,177 @@
+"""
+Warm Sandbox Pool Tests
+
+Tests claiming, replenishing, expiry and shutdown of WarmSandboxPool using
+an in-memory sandbox class.
+"""
+
+import asyncio
+import itertools
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.domain.models.session import Session
+from app.domain.services.agent_domain_service import AgentDomainService
+from app.infrastructure.external.sandbox import pool as pool_module
+from app.infrastructure.external.sandbox.pool import WarmSandboxPool
+
+
+class FakeSandbox:
+    """Sandbox whose startup takes a configurable time"""
+
+    ids = itertools.count()
+    startup_delay = 0.0
+    fail = False
+    created = []
+
+    def __init__(self):
+        self.id = f"sandbox-{next(self.ids)}"
+        self.ready = False
+        self.destroyed = False
+
+    @classmethod
+    async def create(cls):
+        sandbox = cls()
+        cls.created.append(sandbox)
+        return sandbox
+
+    async def ensure_sandbox(self):
+        await asyncio.sleep(self.startup_delay)
+        if self.fail:
+            raise Exception("services failed to start")
+        self.ready = True
+
+    async def destroy(self):
+        self.destroyed = True
+        return True
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_sandbox():
+    FakeSandbox.startup_delay = 0.0
+    FakeSandbox.fail = False
+    FakeSandbox.created = []
+
+
+async def wait_until(condition, timeout=1.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.001)
+
+
+class TestWarmSandboxPool:
+    """Test WarmSandboxPool"""
+
+    async def test_warms_to_target_size(self):
+        pool = WarmSandboxPool(FakeSandbox, target_size=2, max_size=4, idle_ttl_seconds=60)
+        await pool.start()
+        await wait_until(lambda: pool.stats()["idle"] == 2)
+
+        sandbox = await pool.claim()
+
+        assert sandbox.ready
+        # The claimed sandbox is replaced in the background
+        await wait_until(lambda: pool.stats()["idle"] == 2)
+        assert len(FakeSandbox.created) == 3
+        stats = pool.stats()
+        assert stats["hits"] == 1 and stats["hit_rate"] == 1.0
+        assert stats["claim_latency_avg_ms"] < 10
+        await pool.stop()
+
+    async def test_miss_grows_pool_up_to_max_size(self):
+        FakeSandbox.startup_delay = 0.05
+        pool = WarmSandboxPool(FakeSandbox, target_size=1, max_size=2, idle_ttl_seconds=60)
+        await pool.start()
+
+        assert await pool.claim() is None
+        assert await pool.claim() is None
+
+        stats = pool.stats()
+        assert stats["misses"] == 2 and stats["hit_rate"] == 0.0
+        assert stats["desired_size"] == 2
+        await wait_until(lambda: pool.stats()["idle"] == 2)
+        await pool.stop()
+
+    async def test_expired_sandboxes_are_replaced(self):
+        pool = WarmSandboxPool(FakeSandbox, target_size=1, max_size=1, idle_ttl_seconds=0.01)
+        with patch.object(pool_module, "REPLENISH_INTERVAL", 0.005):
+            await pool.start()
+            await wait_until(lambda: len(FakeSandbox.created) >= 3)
+            await pool.stop()
+
+        assert FakeSandbox.created[0].destroyed
+        assert pool.stats()["expired"] >= 1
+        assert all(sandbox.destroyed for sandbox in FakeSandbox.created)
+
+    async def test_failed_warm_up_is_destroyed(self):
+        FakeSandbox.fail = True
+        pool = WarmSandboxPool(FakeSandbox, target_size=1, max_size=1, idle_ttl_seconds=60)
+        await pool.start()
+        await wait_until(lambda: pool.stats()["warm_failures"] == 1)
+
+        assert FakeSandbox.created[0].destroyed
+        assert await pool.claim() is None
+        await pool.stop()
+
+    async def test_stop_destroys_idle_and_warming_sandboxes(self):
+        pool = WarmSandboxPool(FakeSandbox, target_size=1, max_size=2, idle_ttl_seconds=60)
+        await pool.start()
+        await wait_until(lambda: pool.stats()["idle"] == 1)
+        FakeSandbox.startup_delay = 0.05
+        await pool.claim()
+        await wait_until(lambda: pool.stats()["warming"] == 1)
+        await pool.stop()
+
+        claimed, warming = FakeSandbox.created
+        assert not claimed.destroyed
+        assert warming.destroyed
+        assert pool.stats()["idle"] == 0
+
+
+class TestAgentDomainServiceSandboxPool:
+    """Test that new sessions take sandboxes from the pool"""
+
+    def make_service(self, sandbox_pool):
+        sandbox_cls = Mock()
+        sandbox_cls.create = AsyncMock(return_value=Mock(id="created", supports_browser=Mock(return_value=False)))
+        task_cls = Mock()
+        task_cls.create.return_value = Mock(id="task-1")
+        service = AgentDomainService(
+            agent_repository=AsyncMock(),
+            session_repository=AsyncMock(),
+            llm=Mock(),
+            sandbox_cls=sandbox_cls,
+            task_cls=task_cls,
+            json_parser=Mock(),
+            file_storage=Mock(),
+            mcp_repository=Mock(),
+            sandbox_pool=sandbox_pool,
+        )
+        return service, sandbox_cls
+
+    async def test_claims_from_pool(self):
+        sandbox_pool = Mock()
+        sandbox_pool.claim = AsyncMock(return_value=Mock(id="warm", supports_browser=Mock(return_value=False)))
+        service, sandbox_cls = self.make_service(sandbox_pool)
+        session = Session(agent_id="agent-1", user_id="user-1")
+
+        with patch("app.domain.services.agent_domain_service.AgentTaskRunner"):
+            await service._create_task(session)
+
+        assert session.sandbox_id == "warm"
+        sandbox_cls.create.assert_not_called()
+
+    async def test_creates_sandbox_on_pool_miss(self):
+        sandbox_pool = Mock()
+        sandbox_pool.claim = AsyncMock(return_value=None)
+        service, sandbox_cls = self.make_service(sandbox_pool)
+        session = Session(agent_id="agent-1", user_id="user-1")
+
+        with patch("app.domain.services.agent_domain_service.AgentTaskRunner"):
+            await service._create_task(session)
+
+        assert session.sandbox_id == "created"
+        sandbox_cls.create.assert_awaited_once()
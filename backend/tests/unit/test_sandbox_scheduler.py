@@ -0,0 +1,176 @@
+"""
+Sandbox Scheduler Tests
+
+Tests placement, resource limits and allocation tracking of
+SandboxScheduler against in-memory Docker hosts.
+"""
+
+import httpx
+import pytest
+
+from app.infrastructure.external.sandbox.docker_api import DockerAPIError, DockerNotFoundError
+from app.infrastructure.external.sandbox.scheduler import (
+    DockerHost,
+    SandboxCapacityError,
+    SandboxResources,
+    SandboxScheduler,
+)
+
+GB = 2**30
+RESOURCES = SandboxResources(cpus=1.0, memory=2 * GB, pids=512)
+
+
+class FakeDockerBackend:
+    """Single Docker host with the AsyncDockerClient interface"""
+
+    def __init__(self, cpus: int = 4, memory: int = 8 * GB, reachable: bool = True):
+        self.cpus = cpus
+        self.memory = memory
+        self.reachable = reachable
+        self.fail_run = False
+        # name -> run_container kwargs
+        self.containers = {}
+
+    def _check(self):
+        if not self.reachable:
+            raise httpx.ConnectError("connection refused")
+
+    async def info(self):
+        self._check()
+        return {"NCPU": self.cpus, "MemTotal": self.memory}
+
+    async def list_containers(self, label=None):
+        self._check()
+        return [
+            {"Names": [f"/{name}"], "Labels": kwargs.get("labels") or {}}
+            for name, kwargs in self.containers.items()
+            if label is None or label in (kwargs.get("labels") or {})
+        ]
+
+    async def run_container(self, name, **kwargs):
+        self._check()
+        if self.fail_run:
+            raise DockerAPIError(500, "failed to start")
+        self.containers[name] = kwargs
+        return await self.inspect_container(name)
+
+    async def inspect_container(self, name):
+        self._check()
+        if name not in self.containers:
+            raise DockerNotFoundError(404, f"No such container: {name}")
+        return {"Name": f"/{name}", "Config": {"Labels": self.containers[name].get("labels")}}
+
+    async def remove_container(self, name, force=True):
+        self._check()
+        if name not in self.containers:
+            raise DockerNotFoundError(404, f"No such container: {name}")
+        del self.containers[name]
+
+    async def close(self):
+        pass
+
+
+def make_scheduler(*backends: FakeDockerBackend, cpu_overcommit: float = 1.0) -> SandboxScheduler:
+    hosts = [DockerHost(f"host-{i}", backend) for i, backend in enumerate(backends)]
+    return SandboxScheduler(hosts, RESOURCES, cpu_overcommit=cpu_overcommit)
+
+
+class TestSandboxScheduler:
+    """Test SandboxScheduler"""
+
+    async def test_applies_resource_limits(self):
+        backend = FakeDockerBackend()
+        scheduler = make_scheduler(backend)
+
+        await scheduler.run_container(name="sandbox-1", image="sandbox", remove=True)
+
+        kwargs = backend.containers["sandbox-1"]
+        assert kwargs["nano_cpus"] == 1_000_000_000
+        assert kwargs["mem_limit"] == 2 * GB
+        assert kwargs["pids_limit"] == 512
+        assert kwargs["remove"] is True
+        assert kwargs["labels"]["manus.sandbox"] == "true"
+
+    async def test_best_fit_fills_busiest_host_first(self):
+        busy, idle = FakeDockerBackend(), FakeDockerBackend()
+        scheduler = make_scheduler(idle, busy)
+        busy.containers["existing"] = {"labels": RESOURCES.labels()}
+
+        for i in range(3):
+            await scheduler.run_container(name=f"sandbox-{i}", image="sandbox")
+
+        # busy had room for 3 more (4 CPUs, 8 GB at 1 CPU / 2 GB each)
+        assert sorted(busy.containers) == ["existing", "sandbox-0", "sandbox-1", "sandbox-2"]
+        assert idle.containers == {}
+
+        await scheduler.run_container(name="sandbox-3", image="sandbox")
+        assert list(idle.containers) == ["sandbox-3"]
+
+    async def test_memory_bound_host(self):
+        backend = FakeDockerBackend(cpus=16, memory=4 * GB)
+        scheduler = make_scheduler(backend, cpu_overcommit=2.0)
+
+        await scheduler.run_container(name="sandbox-0", image="sandbox")
+        await scheduler.run_container(name="sandbox-1", image="sandbox")
+
+        with pytest.raises(SandboxCapacityError):
+            await scheduler.run_container(name="sandbox-2", image="sandbox")
+
+    async def test_full_host_resyncs_before_failing(self):
+        backend = FakeDockerBackend(cpus=1)
+        scheduler = make_scheduler(backend)
+        await scheduler.run_container(name="sandbox-0", image="sandbox")
+
+        # The container auto-removed itself after its timeout
+        backend.containers.clear()
+        await scheduler.run_container(name="sandbox-1", image="sandbox")
+
+        assert list(backend.containers) == ["sandbox-1"]
+
+    async def test_failed_start_releases_reservation(self):
+        backend = FakeDockerBackend(cpus=1)
+        scheduler = make_scheduler(backend)
+        backend.fail_run = True
+
+        with pytest.raises(DockerAPIError):
+            await scheduler.run_container(name="sandbox-0", image="sandbox")
+
+        assert scheduler.hosts[0].allocations == {}
+
+    async def test_allocations_rebuilt_from_labels(self):
+        backend = FakeDockerBackend()
+        await make_scheduler(backend).run_container(name="sandbox-0", image="sandbox")
+        backend.containers["unrelated"] = {"labels": {}}
+
+        utilization = await make_scheduler(backend).utilization()
+
+        host = utilization["hosts"][0]
+        assert host["sandboxes"] == 1
+        assert host["cpu_utilization"] == 0.25
+        assert host["memory_allocated"] == 2 * GB
+
+    async def test_unreachable_host_is_skipped(self):
+        down, up = FakeDockerBackend(reachable=False), FakeDockerBackend()
+        scheduler = make_scheduler(down, up)
+
+        await scheduler.run_container(name="sandbox-0", image="sandbox")
+
+        assert "sandbox-0" in up.containers
+        utilization = await scheduler.utilization()
+        assert [host["available"] for host in utilization["hosts"]] == [False, True]
+
+    async def test_locate_and_remove_across_hosts(self):
+        first, second = FakeDockerBackend(), FakeDockerBackend()
+        await make_scheduler(second).run_container(name="sandbox-0", image="sandbox")
+        # A fresh scheduler doesn't know where the container runs yet
+        scheduler = make_scheduler(first, second)
+
+        attrs = await scheduler.inspect_container("sandbox-0")
+        assert attrs["Name"] == "/sandbox-0"
+        assert "sandbox-0" in scheduler.hosts[1].allocations
+
+        await scheduler.remove_container("sandbox-0")
+        assert second.containers == {}
+        assert scheduler.hosts[1].allocations == {}
+        with pytest.raises(DockerNotFoundError):
+            await scheduler.remove_container("sandbox-0")
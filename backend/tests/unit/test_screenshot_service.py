@@ -0,0 +1,184 @@
+"""
+Screenshot Service Tests
+
+Tests encoding, perceptual dedup and retention of PillowScreenshotService, and
+that AgentTaskRunner emits browser tool events before their screenshot is
+uploaded.
+"""
+
+import asyncio
+import io
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.domain.models.event import BrowserToolContent, ToolEvent, ToolStatus
+from app.domain.models.file import FileInfo
+from app.domain.services.agent_task_runner import AgentTaskRunner
+from app.infrastructure.external.browser.screenshot_service import PillowScreenshotService
+
+
+def png(width=1600, height=900, text=""):
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width, 80), fill="navy")
+    if text:
+        draw.rectangle((100, 200, 900, 600), fill="gray")
+        draw.text((120, 220), text, fill="black")
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def file_storage():
+    storage = Mock()
+    uploads = []
+
+    async def upload_file(file_data, filename, user_id, content_type=None, metadata=None):
+        uploads.append((file_data.read(), filename, content_type))
+        return FileInfo(file_id=f"file-{len(uploads)}", filename=filename)
+
+    storage.uploads = uploads
+    storage.upload_file = AsyncMock(side_effect=upload_file)
+    storage.delete_file = AsyncMock(return_value=True)
+    return storage
+
+
+class TestPillowScreenshotService:
+    """Test PillowScreenshotService"""
+
+    async def test_downscaled_and_reencoded(self, file_storage):
+        service = PillowScreenshotService(file_storage, format="webp", quality=60, max_width=800)
+
+        file_id = await service.save("s1", "u1", png(text="Hello"))
+
+        data, filename, content_type = file_storage.uploads[0]
+        assert file_id == "file-1"
+        assert (filename, content_type) == ("screenshot.webp", "image/webp")
+        with Image.open(io.BytesIO(data)) as stored:
+            assert (stored.format, stored.size) == ("WEBP", (800, 450))
+        assert service.stats()["compression_ratio"] < 1
+
+    async def test_identical_frame_reuses_file(self, file_storage):
+        service = PillowScreenshotService(file_storage)
+
+        first = await service.save("s1", "u1", png(text="Hello"))
+        second = await service.save("s1", "u1", png(text="Hello"))
+        changed = await service.save("s1", "u1", png())
+
+        assert first == second != changed
+        assert file_storage.upload_file.await_count == 2
+        assert service.stats()["deduplicated"] == 1
+
+    async def test_sessions_are_deduplicated_separately(self, file_storage):
+        service = PillowScreenshotService(file_storage)
+
+        await service.save("s1", "u1", png())
+        await service.save("s2", "u1", png())
+
+        assert file_storage.upload_file.await_count == 2
+
+    async def test_retention_deletes_oldest(self, file_storage):
+        service = PillowScreenshotService(file_storage, retention=2, dedup_distance=-1)
+
+        for _ in range(3):
+            await service.save("s1", "u1", png())
+
+        file_storage.delete_file.assert_awaited_once_with("file-1", "u1")
+        assert service.stats()["deleted"] == 1
+
+    def test_unsupported_format(self, file_storage):
+        with pytest.raises(ValueError):
+            PillowScreenshotService(file_storage, format="gif")
+
+
+class TestBackgroundScreenshotUpload:
+    """Test screenshot upload after the browser tool event is emitted"""
+
+    @pytest.fixture
+    def runner(self, file_storage):
+        browser = Mock()
+        browser.screenshot = AsyncMock(return_value=png())
+        session_repository = Mock()
+        session_repository.add_event = AsyncMock()
+        session_repository.update_event = AsyncMock()
+        with patch("app.domain.services.agent_task_runner.PlanActFlow"):
+            return AgentTaskRunner(
+                session_id="session-1",
+                agent_id="agent-1",
+                user_id="user-1",
+                llm=Mock(),
+                sandbox=Mock(),
+                browser=browser,
+                agent_repository=Mock(),
+                session_repository=session_repository,
+                json_parser=Mock(),
+                file_storage=file_storage,
+                mcp_repository=Mock(),
+                screenshot_service=PillowScreenshotService(file_storage),
+            )
+
+    @pytest.fixture
+    def task(self):
+        task = Mock()
+        emitted = []
+
+        async def put(event_json):
+            emitted.append(event_json)
+            return f"{len(emitted)}-0"
+
+        task.emitted = emitted
+        task.output_stream.put = AsyncMock(side_effect=put)
+        return task
+
+    def tool_event(self):
+        return ToolEvent(
+            tool_call_id="call-1",
+            tool_name="browser",
+            function_name="browser_view",
+            function_args={},
+            status=ToolStatus.CALLED,
+        )
+
+    async def test_event_emitted_before_upload(self, runner, task, file_storage):
+        event = self.tool_event()
+        upload_started = asyncio.Event()
+        release_upload = asyncio.Event()
+        upload_file = file_storage.upload_file.side_effect
+
+        async def slow_upload(*args, **kwargs):
+            upload_started.set()
+            await release_upload.wait()
+            return await upload_file(*args, **kwargs)
+
+        file_storage.upload_file.side_effect = slow_upload
+
+        await runner._handle_tool_event(event)
+        await runner._put_and_add_event(task, event)
+
+        assert event.tool_content is None
+        assert len(task.emitted) == 1
+        await asyncio.wait_for(upload_started.wait(), timeout=5)
+        release_upload.set()
+        await runner._flush_screenshot_uploads()
+
+        assert event.tool_content == BrowserToolContent(screenshot="file-1")
+        runner._session_repository.update_event.assert_awaited_once_with("session-1", event)
+        assert '"screenshot":"file-1"' in task.emitted[1]
+
+    async def test_update_goes_out_before_next_event(self, runner, task):
+        event = self.tool_event()
+        await runner._handle_tool_event(event)
+        await runner._put_and_add_event(task, event)
+
+        await runner._put_and_add_event(task, ToolEvent(
+            tool_call_id="call-2",
+            tool_name="shell",
+            function_name="shell_exec",
+            function_args={},
+            status=ToolStatus.CALLING,
+        ))
+
+        assert ['"call-1"' in e for e in task.emitted] == [True, True, False]
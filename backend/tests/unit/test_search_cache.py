@@ -0,0 +1,211 @@
+"""
+Search Cache Tests
+
+Tests that CachedSearchEngine answers repeated searches from the cache and
+that the Bing and Baidu engines share one HTTP client between searches and
+parse result pages off the event loop.
+"""
+
+import threading
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.domain.models.search import SearchResultItem, SearchResults
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.search.baidu_search import BaiduSearchEngine
+from app.infrastructure.external.search.bing_search import BingSearchEngine
+from app.infrastructure.external.search.search_cache import CachedSearchEngine, normalize_query
+
+
+class MemoryCache:
+    """Cache keeping JSON values in a dict"""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+
+def search_result(query, success=True, empty=False):
+    items = [] if empty else [
+        SearchResultItem(title="Python", link="https://python.org", snippet="Python language")
+    ]
+    results = SearchResults(query=query, total_results=len(items), results=items)
+    return ToolResult(success=success, message=None if success else "Blocked", data=results)
+
+
+class TestCachedSearchEngine:
+    """Test CachedSearchEngine"""
+
+    @pytest.fixture
+    def engine(self):
+        engine = AsyncMock()
+        engine.search.side_effect = lambda query, date_range=None: search_result(query)
+        return engine
+
+    async def test_repeated_search_is_cached(self, engine):
+        cache = MemoryCache()
+        cached = CachedSearchEngine(engine, name="bing", cache=cache, ttl_seconds=60)
+
+        first = await cached.search("Python  Programming")
+        second = await cached.search("python programming")
+
+        engine.search.assert_awaited_once()
+        assert second.success
+        assert second.data.query == "python programming"
+        assert second.data.results == first.data.results
+        assert list(cache.ttls.values()) == [60]
+        assert cached.stats()["hits"] == 1
+
+    async def test_key_includes_engine_and_date_range(self, engine):
+        cache = MemoryCache()
+        bing = CachedSearchEngine(engine, name="bing", cache=cache)
+        baidu = CachedSearchEngine(engine, name="baidu", cache=cache)
+
+        await bing.search("python")
+        await bing.search("python", date_range="past_week")
+        await baidu.search("python")
+
+        assert engine.search.await_count == 3
+        assert bing.key("python") == bing.key("python", date_range="all")
+
+    async def test_failed_search_is_not_cached(self, engine):
+        engine.search.side_effect = lambda query, date_range=None: search_result(query, success=False)
+        cache = MemoryCache()
+        cached = CachedSearchEngine(engine, name="bing", cache=cache)
+
+        await cached.search("python")
+        await cached.search("python")
+
+        assert engine.search.await_count == 2
+        assert cache.values == {}
+
+    async def test_empty_search_is_not_cached(self, engine):
+        # What the scrapers return for a captcha or consent page
+        engine.search.side_effect = lambda query, date_range=None: search_result(query, empty=True)
+        cache = MemoryCache()
+        cached = CachedSearchEngine(engine, name="bing", cache=cache)
+
+        result = await cached.search("python")
+        await cached.search("python")
+
+        assert result.success
+        assert engine.search.await_count == 2
+        assert cache.values == {}
+
+    async def test_invalid_cache_entry_is_a_miss(self, engine):
+        cache = MemoryCache()
+        cached = CachedSearchEngine(engine, name="bing", cache=cache)
+        cache.values[cached.key("python")] = {"unexpected": True}
+
+        result = await cached.search("python")
+
+        engine.search.assert_awaited_once()
+        assert result.success
+
+    def test_normalize_query(self):
+        assert normalize_query("  Python\tAsync  IO ") == "python async io"
+
+
+BING_PAGE = """
+<html><body>
+<span class="sb_count">About 1,230 results</span>
+<ol>
+<li class="b_algo"><h2><a href="https://python.org">Welcome to Python.org</a></h2>
+<p class="b_lineclamp2">The official home of the Python Programming Language</p></li>
+</ol>
+</body></html>
+"""
+
+BAIDU_PAGE = """
+<html><body>
+<span>百度为您找到相关结果约1,000个结果</span>
+<div class="result"><h3><a href="https://python.org">Python 官网</a></h3>
+<div class="c-abstract">Python 是一种广泛使用的编程语言，官方网站提供下载和文档</div></div>
+</body></html>
+"""
+
+
+class TestScrapingEngines:
+    """Test the Bing and Baidu engines against a mock transport"""
+
+    @pytest.fixture
+    def pages(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            page = BING_PAGE if request.url.host == "www.bing.com" else BAIDU_PAGE
+            return httpx.Response(200, text=page, headers={"Set-Cookie": "session=abc"})
+
+        return requests, httpx.MockTransport(handler)
+
+    def use_transport(self, engine, transport):
+        engine._client = httpx.AsyncClient(transport=transport, cookies=engine.cookies)
+        return engine
+
+    async def test_bing_parses_results(self, pages):
+        requests, transport = pages
+        engine = self.use_transport(BingSearchEngine(), transport)
+
+        result = await engine.search("python", date_range="past_week")
+
+        assert result.success
+        assert result.data.total_results == 1230
+        assert result.data.results[0].link == "https://python.org"
+        assert requests[0].url.params["filters"] == 'interval%3d%22Week%22'
+
+    async def test_baidu_parses_results(self, pages):
+        _, transport = pages
+        engine = self.use_transport(BaiduSearchEngine(), transport)
+
+        result = await engine.search("python")
+
+        assert result.success
+        assert result.data.total_results == 1000
+        assert result.data.results[0].title == "Python 官网"
+
+    async def test_client_and_cookies_are_shared(self, pages):
+        requests, transport = pages
+        engine = self.use_transport(BingSearchEngine(), transport)
+        client = engine.client
+
+        await engine.search("python")
+        await engine.search("rust")
+
+        assert engine.client is client
+        assert requests[1].headers["Cookie"] == "session=abc"
+
+    async def test_parsing_runs_in_a_thread(self, pages):
+        _, transport = pages
+        engine = self.use_transport(BingSearchEngine(), transport)
+        threads = []
+        parse = engine._parse_results
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return parse(*args)
+
+        with patch.object(engine, "_parse_results", record_thread):
+            await engine.search("python")
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    async def test_close_releases_client(self):
+        engine = BingSearchEngine()
+        client = engine.client
+
+        await engine.close()
+
+        assert client.is_closed
+        assert engine.client is not client
+        await engine.close()
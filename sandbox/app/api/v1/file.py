@@ -5,10 +5,12 @@ from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import FileResponse
 from app.schemas.file import (
     FileReadRequest, FileWriteRequest, FileReplaceRequest,
-    FileSearchRequest, FileFindRequest
+    FileSearchRequest, FileGrepRequest, FileFindRequest,
+    FilePathRequest, FileBatchRequest, FileEditorRequest
 )
 from app.schemas.response import Response
 from app.services.file import file_service
+from app.services.file_editor import file_editor_service
 
 router = APIRouter()
 
@@ -90,6 +92,28 @@ async def search_in_file(request: FileSearchRequest):
         data=result.model_dump()
     )
 
+@router.post("/grep", response_model=Response)
+async def grep_files(request: FileGrepRequest):
+    """
+    Search file contents across a directory tree
+    """
+    result = await file_service.grep(
+        path=request.path,
+        regex=request.regex,
+        glob_pattern=request.glob,
+        case_sensitive=request.case_sensitive,
+        max_results=request.max_results,
+        max_file_size=request.max_file_size,
+        respect_gitignore=request.respect_gitignore
+    )
+    
+    # Construct response
+    return Response(
+        success=True,
+        message=f"Search completed, found {len(result.matches)} matches in {result.files_matched} files",
+        data=result.model_dump()
+    )
+
 @router.post("/find", response_model=Response)
 async def find_files(request: FileFindRequest):
     """
@@ -107,6 +131,87 @@ async def find_files(request: FileFindRequest):
         data=result.model_dump()
     )
 
+@router.post("/exists", response_model=Response)
+async def file_exists(request: FilePathRequest):
+    """
+    Check whether a file or directory exists
+    """
+    result = await file_service.exists(request.path)
+    
+    return Response(
+        success=True,
+        message="File exists" if result.exists else "File does not exist",
+        data=result.model_dump()
+    )
+
+@router.post("/hash", response_model=Response)
+async def file_hash(request: FilePathRequest):
+    """
+    Compute the SHA-256 of a file's content
+    """
+    result = await file_service.hash(request.path)
+    
+    return Response(
+        success=True,
+        message="File hashed successfully",
+        data=result.model_dump()
+    )
+
+@router.post("/list", response_model=Response)
+async def list_directory(request: FilePathRequest):
+    """
+    List directory entries
+    """
+    result = await file_service.list_dir(request.path)
+    
+    return Response(
+        success=True,
+        message=f"Directory listed, found {len(result.entries)} entries",
+        data=result.model_dump()
+    )
+
+@router.post("/delete", response_model=Response)
+async def delete_file(request: FilePathRequest):
+    """
+    Delete a file or directory
+    """
+    result = await file_service.delete(request.path)
+    
+    return Response(
+        success=True,
+        message="File deleted" if result.deleted else "Nothing to delete",
+        data=result.model_dump()
+    )
+
+@router.post("/batch", response_model=Response)
+async def batch_operations(request: FileBatchRequest):
+    """
+    Run multiple file operations concurrently in one request
+    """
+    result = await file_service.batch(
+        operations=request.operations,
+        max_concurrency=request.max_concurrency
+    )
+    
+    return Response(
+        success=True,
+        message=f"Batch completed, {result.succeeded} succeeded and {result.failed} failed",
+        data=result.model_dump()
+    )
+
+@router.post("/editor", response_model=Response)
+async def file_editor(request: FileEditorRequest):
+    """
+    Run a file_editor command in the resident editor
+    """
+    result = await file_editor_service.execute(request)
+    
+    return Response(
+        success=result.success,
+        message=result.message,
+        data=result.model_dump()
+    )
+
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, WebSocket
+from app.schemas.mcp import McpStartRequest, McpStopRequest
+from app.schemas.response import Response
+from app.services.mcp import mcp_service
+
+router = APIRouter()
+
+@router.post("/start", response_model=Response)
+async def start_server(request: McpStartRequest):
+    """
+    Start an MCP server as a stdio subprocess
+    """
+    result = await mcp_service.start_server(
+        name=request.name,
+        command=request.command,
+        args=request.args,
+        env=request.env,
+        cwd=request.cwd
+    )
+
+    return Response(
+        success=True,
+        message="MCP server started",
+        data=result.model_dump()
+    )
+
+@router.post("/stop", response_model=Response)
+async def stop_server(request: McpStopRequest):
+    """
+    Stop an MCP server
+    """
+    result = await mcp_service.stop_server(request.id)
+
+    return Response(
+        success=True,
+        message="MCP server stopped",
+        data=result.model_dump()
+    )
+
+@router.websocket("/{server_id}/ws")
+async def bridge_server(websocket: WebSocket, server_id: str):
+    """
+    Exchange JSON-RPC messages with an MCP server, one message per line of
+    its stdio
+    """
+    await mcp_service.bridge(server_id, websocket)
@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     # Log configuration
     LOG_LEVEL: str = "INFO"
     
+    # Directory of the mounted file_editor plugin (file_editor_cli.py)
+    FILE_EDITOR_TOOLS_PATH: str = "/openhands/tools"
+    
     @field_validator("ORIGINS", mode="before")
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
@@ -2,7 +2,7 @@
 File operation related models
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, List, Optional
 
 
 class FileReadResult(BaseModel):
@@ -21,6 +21,7 @@ class FileReplaceResult(BaseModel):
     """File content replacement result"""
     file: str = Field(..., description="Path of the operated file")
     replaced_count: int = Field(0, description="Number of replacements")
+    line_numbers: List[int] = Field([], description="Line numbers (0-based) of replaced occurrences")
 
 
 class FileSearchResult(BaseModel):
@@ -30,6 +31,22 @@ class FileSearchResult(BaseModel):
     line_numbers: List[int] = Field([], description="List of matched line numbers")
 
 
+class FileGrepMatch(BaseModel):
+    """Single content match of a directory search"""
+    file: str = Field(..., description="Path of the matched file")
+    line_number: int = Field(..., description="Matched line number (1-based)")
+    line: str = Field(..., description="Content of the matched line")
+
+
+class FileGrepResult(BaseModel):
+    """Directory content search result"""
+    path: str = Field(..., description="Path of the searched file or directory")
+    matches: List[FileGrepMatch] = Field([], description="List of matches")
+    files_matched: int = Field(0, description="Number of files with at least one match")
+    truncated: bool = Field(False, description="Whether the search stopped at max_results")
+    engine: str = Field(..., description="Search engine used (ripgrep or python)")
+
+
 class FileFindResult(BaseModel):
     """File find result"""
     path: str = Field(..., description="Path of the search directory")
@@ -41,3 +58,62 @@ class FileUploadResult(BaseModel):
     file_path: str = Field(..., description="Path of the uploaded file")
     file_size: int = Field(..., description="Size of the uploaded file in bytes")
     success: bool = Field(..., description="Whether upload was successful")
+
+
+
+class FileExistsResult(BaseModel):
+    """File existence check result"""
+    path: str = Field(..., description="Checked path")
+    exists: bool = Field(..., description="Whether the path exists")
+
+
+class FileHashResult(BaseModel):
+    """File content hash result"""
+    file: str = Field(..., description="Hashed file path")
+    sha256: str = Field(..., description="Hex encoded SHA-256 of the file content")
+    size: int = Field(..., description="File size in bytes")
+
+
+class FileListEntry(BaseModel):
+    """Directory listing entry"""
+    name: str = Field(..., description="Entry name")
+    path: str = Field(..., description="Absolute entry path")
+    is_dir: bool = Field(..., description="Whether the entry is a directory")
+    size: int = Field(0, description="Size in bytes (0 for directories)")
+
+
+class FileListResult(BaseModel):
+    """Directory listing result"""
+    path: str = Field(..., description="Listed directory path")
+    entries: List[FileListEntry] = Field([], description="Directory entries")
+
+
+class FileDeleteResult(BaseModel):
+    """File delete result"""
+    path: str = Field(..., description="Deleted path")
+    deleted: bool = Field(..., description="Whether anything was deleted")
+
+
+class FileBatchItemResult(BaseModel):
+    """Result of a single batch operation"""
+    op: str = Field(..., description="Operation type")
+    path: str = Field(..., description="Operated path")
+    success: bool = Field(..., description="Whether the operation succeeded")
+    message: Optional[str] = Field(None, description="Error message if the operation failed")
+    data: Optional[Any] = Field(None, description="Operation result data")
+
+
+class FileBatchResult(BaseModel):
+    """Batch file operations result"""
+    results: List[FileBatchItemResult] = Field([], description="Results in request order")
+    succeeded: int = Field(0, description="Number of successful operations")
+    failed: int = Field(0, description="Number of failed operations")
+
+
+class FileEditorResult(BaseModel):
+    """File editor command result"""
+    success: bool = Field(..., description="Whether the command succeeded")
+    message: str = Field(..., description="Editor output shown to the agent")
+    command: Optional[str] = Field(None, description="Executed command")
+    path: Optional[str] = Field(None, description="Target path")
+    content: Optional[str] = Field(None, description="Resulting file content or view output")
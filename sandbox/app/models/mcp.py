@@ -0,0 +1,18 @@
+"""
+MCP server business model definitions
+"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class McpServerResult(BaseModel):
+    """MCP server start result model"""
+    server_id: str = Field(..., description="MCP server unique identifier")
+    name: str = Field(..., description="MCP server name")
+    pid: int = Field(..., description="MCP server process ID")
+
+
+class McpStopResult(BaseModel):
+    """MCP server stop result model"""
+    status: str = Field(..., description="Server status")
+    returncode: Optional[int] = Field(None, description="Process return code")
@@ -2,7 +2,7 @@
 File operation request models
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class FileReadRequest(BaseModel):
@@ -38,7 +38,52 @@ class FileSearchRequest(BaseModel):
     sudo: Optional[bool] = Field(False, description="Whether to use sudo privileges")
 
 
+class FileGrepRequest(BaseModel):
+    """Directory content search request"""
+    path: str = Field(..., description="Absolute path of the file or directory to search")
+    regex: str = Field(..., description="Regular expression pattern")
+    glob: Optional[str] = Field(None, description="Only search files matching this glob (e.g. *.py)")
+    case_sensitive: Optional[bool] = Field(True, description="Whether matching is case sensitive")
+    max_results: Optional[int] = Field(200, description="Maximum number of matches to return")
+    max_file_size: Optional[int] = Field(10 * 1024 * 1024, description="Skip files larger than this many bytes")
+    respect_gitignore: Optional[bool] = Field(True, description="Whether to skip files ignored by .gitignore")
+
+
 class FileFindRequest(BaseModel):
     """File find request"""
     path: str = Field(..., description="Directory path to search")
     glob: str = Field(..., description="Filename pattern (glob syntax)")
+
+
+
+class FilePathRequest(BaseModel):
+    """Request targeting a single path"""
+    path: str = Field(..., description="Absolute file or directory path")
+
+
+class FileBatchOperation(BaseModel):
+    """Single operation of a batch request"""
+    op: Literal["read", "write", "exists", "list", "delete"] = Field(..., description="Operation type")
+    path: str = Field(..., description="Absolute file or directory path")
+    content: Optional[str] = Field(None, description="Content to write (write only)")
+    append: Optional[bool] = Field(False, description="Whether to use append mode (write only)")
+    start_line: Optional[int] = Field(None, description="Start line, 0-based (read only)")
+    end_line: Optional[int] = Field(None, description="End line, not inclusive (read only)")
+    max_length: Optional[int] = Field(10000, description="Maximum length of the content to return (read only)")
+
+
+class FileBatchRequest(BaseModel):
+    """Batch file operations request"""
+    operations: List[FileBatchOperation] = Field(..., description="Operations to run, results keep this order")
+    max_concurrency: Optional[int] = Field(16, description="Maximum operations running at the same time")
+
+
+class FileEditorRequest(BaseModel):
+    """File editor command request"""
+    command: Literal["view", "create", "str_replace", "insert", "undo_edit"] = Field(..., description="Editor command")
+    path: str = Field(..., description="Absolute file or directory path")
+    file_text: Optional[str] = Field(None, description="Content of the file to create")
+    view_range: Optional[List[int]] = Field(None, description="Line range [start, end] to view")
+    old_str: Optional[str] = Field(None, description="String to replace")
+    new_str: Optional[str] = Field(None, description="Replacement or inserted string")
+    insert_line: Optional[int] = Field(None, description="Line after which new_str is inserted")
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+class McpStartRequest(BaseModel):
+    """MCP server start request model"""
+    name: str = Field(..., description="MCP server name")
+    command: str = Field(..., description="Executable starting the MCP server")
+    args: List[str] = Field(default_factory=list, description="Command arguments")
+    env: Optional[Dict[str, str]] = Field(None, description="Extra environment variables")
+    cwd: Optional[str] = Field(None, description="Working directory (must use absolute path)")
+
+
+class McpStopRequest(BaseModel):
+    """MCP server stop request model"""
+    id: str = Field(..., description="Unique identifier of the target MCP server")
@@ -4,17 +4,51 @@ File Operation Service Implementation - Async Version
 import os
 import re
 import glob
+import hashlib
+import json
+import mmap
+import uuid
+import shutil
 import asyncio
+import fnmatch
+import tempfile
+import threading
 import subprocess
 import mimetypes
-from typing import Optional, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, BinaryIO, List, Tuple, Iterator
 from fastapi import UploadFile
 from app.models.file import (
     FileReadResult, FileWriteResult, FileReplaceResult,
-    FileSearchResult, FileFindResult, FileUploadResult
+    FileSearchResult, FileGrepMatch, FileGrepResult,
+    FileFindResult, FileUploadResult, FileExistsResult, FileHashResult,
+    FileListEntry, FileListResult, FileDeleteResult,
+    FileBatchItemResult, FileBatchResult
 )
+from app.schemas.file import FileBatchOperation
 from app.core.exceptions import AppException, ResourceNotFoundException, BadRequestException
 
+# Characters read per chunk when streaming file content
+CHUNK_SIZE = 1024 * 1024
+
+# Upper bound on line numbers reported for a single operation
+MAX_REPORTED_LINE_NUMBERS = 1000
+
+# Bytes inspected for NUL to detect binary files, same heuristic as grep/ripgrep
+BINARY_SNIFF_SIZE = 8192
+
+# Matched lines longer than this are cut in search results
+MAX_LINE_LENGTH = 500
+
+# Threads used to search files in parallel
+GREP_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+# Upper bound on operations accepted in a single batch request
+MAX_BATCH_OPERATIONS = 100
+
+# (base directory, pattern, negated, directory only)
+GitIgnoreRule = Tuple[str, str, bool, bool]
+
 
 class FileService:
     """File Operation Service"""
@@ -154,39 +188,152 @@ class FileService:
                 raise e
             raise AppException(message=f"Failed to write file: {str(e)}")
 
+    def _stream_replace(self, source: str, target: str, old_str: str,
+                        new_str: str) -> Tuple[int, List[int]]:
+        """
+        Stream replace old_str with new_str from source into target
+
+        Only CHUNK_SIZE characters plus len(old_str) of carry-over are held in
+        memory at a time, so the cost does not depend on the file size.
+
+        Returns:
+            Tuple of (replaced_count, line_numbers of the replaced occurrences)
+        """
+        keep = len(old_str) - 1
+        old_lines = old_str.count('\n')
+        replaced_count = 0
+        line_numbers: List[int] = []
+        # Newlines consumed so far, only tracked while line numbers are collected
+        line = 0
+
+        with open(source, 'r', encoding='utf-8', newline='') as src, \
+                open(target, 'w', encoding='utf-8', newline='') as dst:
+            carry = ""
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                eof = not chunk
+
+                # split() matches leftmost non-overlapping occurrences like str.replace()
+                pieces = (carry + chunk).split(old_str)
+                tail = pieces.pop()
+                if pieces:
+                    replaced_count += len(pieces)
+                    for piece in pieces:
+                        if len(line_numbers) >= MAX_REPORTED_LINE_NUMBERS:
+                            break
+                        line += piece.count('\n')
+                        line_numbers.append(line)
+                        line += old_lines
+                    dst.write(new_str.join(pieces))
+                    dst.write(new_str)
+
+                # Hold back the tail that may be the start of a match split across chunks
+                cut = len(tail) if eof else len(tail) - keep
+                if cut > 0:
+                    dst.write(tail[:cut])
+                    if len(line_numbers) < MAX_REPORTED_LINE_NUMBERS:
+                        line += tail.count('\n', 0, cut)
+                    carry = tail[cut:]
+                else:
+                    carry = tail
+
+                if eof:
+                    break
+
+        return replaced_count, line_numbers
+
     async def str_replace(self, file: str, old_str: str, new_str: str, 
                    sudo: bool = False) -> FileReplaceResult:
         """
         Asynchronously replace string in file
         
+        The file is streamed into a temporary file in the same directory which
+        then atomically replaces the original, so files of any size are handled
+        without truncation and with bounded memory.
+        
         Args:
             file: Absolute file path
             old_str: Original string to be replaced
             new_str: New replacement string
             sudo: Whether to use sudo privileges
         """
-        # First read file content
-        file_result = await self.read_file(file, sudo=sudo)
-        content = file_result.content
-        
-        # Calculate replacement count
-        replaced_count = content.count(old_str)
-        if replaced_count == 0:
+        if not old_str:
+            raise BadRequestException("old_str must not be empty")
+        if not os.path.exists(file) and not sudo:
+            raise ResourceNotFoundException(f"File does not exist: {file}")
+
+        try:
+            if sudo:
+                replaced_count, line_numbers = await self._sudo_str_replace(file, old_str, new_str)
+            else:
+                def replace_atomic():
+                    fd, temp_file = tempfile.mkstemp(
+                        dir=os.path.dirname(file) or '.',
+                        prefix=f".{os.path.basename(file)}.",
+                        suffix=".tmp"
+                    )
+                    os.close(fd)
+                    try:
+                        result = self._stream_replace(file, temp_file, old_str, new_str)
+                        if result[0] > 0:
+                            shutil.copymode(file, temp_file)
+                            os.replace(temp_file, file)
+                        return result
+                    finally:
+                        if os.path.exists(temp_file):
+                            os.unlink(temp_file)
+
+                replaced_count, line_numbers = await asyncio.to_thread(replace_atomic)
+
             return FileReplaceResult(
                 file=file,
-                replaced_count=0
+                replaced_count=replaced_count,
+                line_numbers=line_numbers
             )
-        
-        # Perform replacement
-        new_content = content.replace(old_str, new_str)
-        
-        # Write back to file
-        await self.write_file(file, new_content, sudo=sudo)
-        
-        return FileReplaceResult(
-            file=file,
-            replaced_count=replaced_count
-        )
+        except Exception as e:
+            if isinstance(e, (BadRequestException, ResourceNotFoundException)):
+                raise e
+            raise AppException(message=f"Failed to replace in file: {str(e)}")
+
+    async def _sudo_str_replace(self, file: str, old_str: str,
+                                new_str: str) -> Tuple[int, List[int]]:
+        """
+        Replace string in a file that is only accessible with sudo
+
+        The file is copied out with sudo, stream replaced as the current user,
+        and the result is moved back next to the original with its mode and
+        ownership before an atomic rename.
+        """
+        temp_dir = tempfile.mkdtemp(prefix="file_replace_")
+        source = os.path.join(temp_dir, "source")
+        target = os.path.join(temp_dir, "target")
+        staged = f"{file}.{uuid.uuid4().hex[:8]}.tmp"
+
+        async def run(command: str) -> None:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise BadRequestException(f"Failed to replace in file: {stderr.decode()}")
+
+        try:
+            await run(f"sudo cat '{file}' > '{source}'")
+            replaced_count, line_numbers = await asyncio.to_thread(
+                self._stream_replace, source, target, old_str, new_str
+            )
+            if replaced_count > 0:
+                await run(
+                    f"sudo bash -c \"cp '{target}' '{staged}' && "
+                    f"chmod --reference='{file}' '{staged}' && "
+                    f"chown --reference='{file}' '{staged}' && "
+                    f"mv -f '{staged}' '{file}'\""
+                )
+            return replaced_count, line_numbers
+        finally:
+            await asyncio.to_thread(shutil.rmtree, temp_dir, True)
 
     async def find_in_content(self, file: str, regex: str, 
                        sudo: bool = False) -> FileSearchResult:
@@ -198,8 +345,8 @@ class FileService:
             regex: Regular expression pattern
             sudo: Whether to use sudo privileges
         """
-        # Read file
-        file_result = await self.read_file(file, sudo=sudo)
+        # Read file without truncation so matches past max_length are found
+        file_result = await self.read_file(file, sudo=sudo, max_length=None)
         content = file_result.content
         
         # Process line by line
@@ -229,6 +376,274 @@ class FileService:
             line_numbers=line_numbers
         )
 
+    def _load_gitignore(self, directory: str) -> List[GitIgnoreRule]:
+        """
+        Parse the .gitignore of a directory into rules relative to it
+        """
+        rules: List[GitIgnoreRule] = []
+        try:
+            with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                for raw in f:
+                    pattern = raw.rstrip('\n').rstrip()
+                    if not pattern or pattern.startswith('#'):
+                        continue
+                    negated = pattern.startswith('!')
+                    if negated:
+                        pattern = pattern[1:]
+                    dir_only = pattern.endswith('/')
+                    pattern = pattern.rstrip('/')
+                    if pattern:
+                        rules.append((directory, pattern, negated, dir_only))
+        except OSError:
+            pass
+        return rules
+
+    def _is_ignored(self, path: str, is_dir: bool, rules: List[GitIgnoreRule]) -> bool:
+        """
+        Check a path against gitignore rules, the last matching rule wins
+        """
+        ignored = False
+        name = os.path.basename(path)
+        for base, pattern, negated, dir_only in rules:
+            if dir_only and not is_dir:
+                continue
+            if pattern.startswith('**/'):
+                pattern = pattern[3:]
+            if '/' in pattern:
+                matched = fnmatch.fnmatch(os.path.relpath(path, base), pattern.lstrip('/'))
+            else:
+                matched = fnmatch.fnmatch(name, pattern)
+            if matched:
+                ignored = not negated
+        return ignored
+
+    def _iter_search_files(self, root: str, glob_pattern: Optional[str], max_file_size: int,
+                           respect_gitignore: bool) -> Iterator[str]:
+        """
+        Walk a directory tree yielding files to search in a stable order
+
+        Hidden entries and .gitignore'd paths are pruned like ripgrep does.
+        """
+        if os.path.isfile(root):
+            yield root
+            return
+
+        rules_by_dir = {root: self._load_gitignore(root) if respect_gitignore else []}
+        for dirpath, dirnames, filenames in os.walk(root):
+            rules = rules_by_dir.pop(dirpath, [])
+
+            kept = []
+            for name in sorted(dirnames):
+                child = os.path.join(dirpath, name)
+                if name.startswith('.') or self._is_ignored(child, True, rules):
+                    continue
+                kept.append(name)
+                rules_by_dir[child] = rules + self._load_gitignore(child) if respect_gitignore else []
+            dirnames[:] = kept
+
+            for name in sorted(filenames):
+                file = os.path.join(dirpath, name)
+                if name.startswith('.') or self._is_ignored(file, False, rules):
+                    continue
+                if glob_pattern:
+                    target = os.path.relpath(file, root) if '/' in glob_pattern else name
+                    if not fnmatch.fnmatch(target, glob_pattern):
+                        continue
+                try:
+                    if not os.path.isfile(file) or os.path.getsize(file) > max_file_size:
+                        continue
+                except OSError:
+                    continue
+                yield file
+
+    def _grep_file(self, file: str, pattern: re.Pattern, limit: int,
+                   stop: threading.Event) -> List[FileGrepMatch]:
+        """
+        Search a single file through mmap, reporting at most one match per line
+        """
+        matches: List[FileGrepMatch] = []
+        if stop.is_set():
+            return matches
+        try:
+            with open(file, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return matches
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(b'\0', 0, BINARY_SNIFF_SIZE) != -1:
+                        return matches
+
+                    line_number = 1
+                    counted = 0
+                    pos = 0
+                    while pos <= size and len(matches) < limit and not stop.is_set():
+                        match = pattern.search(mm, pos)
+                        if not match:
+                            break
+                        start = mm.rfind(b'\n', 0, match.start()) + 1
+                        end = mm.find(b'\n', match.start())
+                        if end == -1:
+                            end = size
+                        line_number += mm[counted:start].count(b'\n')
+                        counted = start
+                        line = mm[start:end].decode('utf-8', errors='replace').rstrip('\r')
+                        matches.append(FileGrepMatch(
+                            file=file,
+                            line_number=line_number,
+                            line=line[:MAX_LINE_LENGTH]
+                        ))
+                        pos = end + 1
+        except (OSError, ValueError):
+            # Unreadable files and files that vanish mid-walk are skipped
+            pass
+        return matches
+
+    def _grep_with_python(self, path: str, pattern: re.Pattern, glob_pattern: Optional[str],
+                          max_results: int, max_file_size: int,
+                          respect_gitignore: bool) -> FileGrepResult:
+        """
+        Fan out per-file mmap searches over a thread pool
+        """
+        stop = threading.Event()
+        matches: List[FileGrepMatch] = []
+        files_matched = 0
+        truncated = False
+
+        files = self._iter_search_files(path, glob_pattern, max_file_size, respect_gitignore)
+        with ThreadPoolExecutor(max_workers=GREP_WORKERS) as executor:
+            # map() yields in walk order, which keeps results deterministic
+            for file_matches in executor.map(
+                lambda file: self._grep_file(file, pattern, max_results, stop), files
+            ):
+                if not file_matches:
+                    continue
+                files_matched += 1
+                matches.extend(file_matches[:max_results - len(matches)])
+                if len(matches) >= max_results:
+                    truncated = True
+                    stop.set()
+                    break
+
+        return FileGrepResult(
+            path=path,
+            matches=matches,
+            files_matched=files_matched,
+            truncated=truncated,
+            engine="python"
+        )
+
+    async def _grep_with_ripgrep(self, rg: str, path: str, regex: str, glob_pattern: Optional[str],
+                                 case_sensitive: bool, max_results: int, max_file_size: int,
+                                 respect_gitignore: bool) -> Optional[FileGrepResult]:
+        """
+        Search with an installed ripgrep, streaming its JSON output
+
+        Returns None when ripgrep rejects the pattern so the caller can fall
+        back to Python regex syntax.
+        """
+        args = [rg, '--json', '--no-require-git', '--max-filesize', str(max_file_size)]
+        if not case_sensitive:
+            args.append('--ignore-case')
+        if not respect_gitignore:
+            args.append('--no-ignore')
+        if glob_pattern:
+            args.extend(['--glob', glob_pattern])
+        args.extend(['--regexp', regex, '--', path])
+
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=16 * 1024 * 1024
+        )
+
+        matches: List[FileGrepMatch] = []
+        files = set()
+        truncated = False
+        try:
+            async for raw in process.stdout:
+                event = json.loads(raw)
+                if event.get('type') != 'match':
+                    continue
+                data = event['data']
+                file = data['path'].get('text')
+                if file is None:
+                    continue
+                line = data['lines'].get('text', '').rstrip('\n').rstrip('\r')
+                matches.append(FileGrepMatch(
+                    file=file,
+                    line_number=data['line_number'],
+                    line=line[:MAX_LINE_LENGTH]
+                ))
+                files.add(file)
+                if len(matches) >= max_results:
+                    truncated = True
+                    break
+        finally:
+            if process.returncode is None and truncated:
+                process.kill()
+            await process.communicate()
+
+        # Exit code 2 with no output means an error such as unsupported regex syntax
+        if process.returncode == 2 and not matches:
+            return None
+
+        return FileGrepResult(
+            path=path,
+            matches=matches,
+            files_matched=len(files),
+            truncated=truncated,
+            engine="ripgrep"
+        )
+
+    async def grep(self, path: str, regex: str, glob_pattern: Optional[str] = None,
+                   case_sensitive: bool = True, max_results: int = 200,
+                   max_file_size: int = 10 * 1024 * 1024,
+                   respect_gitignore: bool = True) -> FileGrepResult:
+        """
+        Search file contents across a directory tree
+        
+        Uses ripgrep when it is installed and otherwise a .gitignore aware
+        walker that searches files through mmap on a thread pool. Binary and
+        hidden files are skipped and the search stops at max_results.
+        
+        Args:
+            path: Absolute path of the file or directory to search
+            regex: Regular expression pattern
+            glob_pattern: Only search files matching this glob
+            case_sensitive: Whether matching is case sensitive
+            max_results: Maximum number of matches to return
+            max_file_size: Skip files larger than this many bytes
+            respect_gitignore: Whether to skip files ignored by .gitignore
+        """
+        if not os.path.exists(path):
+            raise ResourceNotFoundException(f"Path does not exist: {path}")
+        if max_results is None or max_results <= 0:
+            raise BadRequestException("max_results must be positive")
+
+        flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+        try:
+            pattern = re.compile(regex.encode('utf-8'), flags)
+        except re.error as e:
+            raise BadRequestException(f"Invalid regular expression: {str(e)}")
+
+        try:
+            rg = shutil.which('rg')
+            if rg:
+                result = await self._grep_with_ripgrep(
+                    rg, path, regex, glob_pattern, case_sensitive,
+                    max_results, max_file_size, respect_gitignore
+                )
+                if result is not None:
+                    return result
+
+            return await asyncio.to_thread(
+                self._grep_with_python, path, pattern, glob_pattern,
+                max_results, max_file_size, respect_gitignore
+            )
+        except Exception as e:
+            raise AppException(message=f"Failed to search files: {str(e)}")
+
     async def find_by_name(self, path: str, glob_pattern: str) -> FileFindResult:
         """
         Asynchronously find files by name pattern
@@ -289,6 +704,173 @@ class FileService:
         except Exception as e:
             raise AppException(message=f"Failed to upload file: {str(e)}")
 
+    async def exists(self, path: str) -> FileExistsResult:
+        """
+        Check whether a file or directory exists
+        
+        Args:
+            path: Absolute path to check
+        """
+        exists = await asyncio.to_thread(os.path.exists, path)
+        return FileExistsResult(path=path, exists=exists)
+
+    async def hash(self, path: str) -> FileHashResult:
+        """
+        Compute the SHA-256 of a file's content without loading it into memory
+        
+        Args:
+            path: Absolute file path
+        """
+        if not os.path.isfile(path):
+            raise ResourceNotFoundException(f"File does not exist: {path}")
+
+        def digest():
+            sha256 = hashlib.sha256()
+            size = 0
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+                    size += len(chunk)
+            return sha256.hexdigest(), size
+
+        try:
+            sha256, size = await asyncio.to_thread(digest)
+        except OSError as e:
+            raise AppException(message=f"Failed to hash file: {str(e)}")
+        return FileHashResult(file=path, sha256=sha256, size=size)
+
+    async def list_dir(self, path: str) -> FileListResult:
+        """
+        List directory entries
+        
+        Args:
+            path: Absolute directory path
+        """
+        if not os.path.isdir(path):
+            raise ResourceNotFoundException(f"Directory does not exist: {path}")
+
+        def scan():
+            entries = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                        size = 0 if is_dir else entry.stat().st_size
+                    except OSError:
+                        is_dir, size = False, 0
+                    entries.append(FileListEntry(
+                        name=entry.name,
+                        path=entry.path,
+                        is_dir=is_dir,
+                        size=size
+                    ))
+            return sorted(entries, key=lambda e: e.name)
+
+        try:
+            entries = await asyncio.to_thread(scan)
+        except Exception as e:
+            raise AppException(message=f"Failed to list directory: {str(e)}")
+        return FileListResult(path=path, entries=entries)
+
+    async def delete(self, path: str) -> FileDeleteResult:
+        """
+        Delete a file or directory tree
+        
+        Args:
+            path: Absolute path to delete
+        """
+        def remove():
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+                return True
+            if os.path.lexists(path):
+                os.unlink(path)
+                return True
+            return False
+
+        try:
+            deleted = await asyncio.to_thread(remove)
+        except Exception as e:
+            raise AppException(message=f"Failed to delete file: {str(e)}")
+        return FileDeleteResult(path=path, deleted=deleted)
+
+    async def _run_batch_operation(self, operation: FileBatchOperation) -> FileBatchItemResult:
+        """
+        Run a single batch operation, capturing its error instead of raising
+        """
+        try:
+            if operation.op == "read":
+                result = await self.read_file(
+                    file=operation.path,
+                    start_line=operation.start_line,
+                    end_line=operation.end_line,
+                    max_length=operation.max_length
+                )
+            elif operation.op == "write":
+                if operation.content is None:
+                    raise BadRequestException("content is required for write")
+                result = await self.write_file(
+                    file=operation.path,
+                    content=operation.content,
+                    append=operation.append
+                )
+            elif operation.op == "exists":
+                result = await self.exists(operation.path)
+            elif operation.op == "list":
+                result = await self.list_dir(operation.path)
+            else:
+                result = await self.delete(operation.path)
+            return FileBatchItemResult(
+                op=operation.op,
+                path=operation.path,
+                success=True,
+                data=result.model_dump()
+            )
+        except AppException as e:
+            return FileBatchItemResult(op=operation.op, path=operation.path, success=False, message=e.message)
+        except Exception as e:
+            return FileBatchItemResult(op=operation.op, path=operation.path, success=False, message=str(e))
+
+    async def batch(self, operations: List[FileBatchOperation],
+                    max_concurrency: int = 16) -> FileBatchResult:
+        """
+        Run several file operations concurrently in one request
+        
+        Operations on different paths run concurrently. Operations on the same
+        path run in request order, so a write followed by a read of the same
+        file sees the written content. A failed operation does not stop the
+        others.
+        
+        Args:
+            operations: Operations to run
+            max_concurrency: Maximum operations running at the same time
+        """
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise BadRequestException(f"Too many operations in batch (max {MAX_BATCH_OPERATIONS})")
+        if max_concurrency is None or max_concurrency <= 0:
+            raise BadRequestException("max_concurrency must be positive")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        path_locks = {}
+
+        async def run(operation: FileBatchOperation) -> FileBatchItemResult:
+            # Locks are FIFO and tasks start in request order
+            lock = path_locks.setdefault(os.path.normpath(operation.path), asyncio.Lock())
+            async with lock:
+                async with semaphore:
+                    return await self._run_batch_operation(operation)
+
+        results = await asyncio.gather(*(run(operation) for operation in operations))
+        succeeded = sum(1 for result in results if result.success)
+        return FileBatchResult(
+            results=list(results),
+            succeeded=succeeded,
+            failed=len(results) - succeeded
+        )
+
     def ensure_file(self, path: str) -> None:
         """
         Ensure file exists
@@ -0,0 +1,72 @@
+"""
+Resident file editor service
+"""
+import sys
+import asyncio
+import importlib
+import logging
+import threading
+from types import ModuleType
+from typing import Optional
+
+from app.core.config import settings
+from app.core.exceptions import AppException
+from app.models.file import FileEditorResult
+from app.schemas.file import FileEditorRequest
+
+logger = logging.getLogger(__name__)
+
+
+class FileEditorService:
+    """
+    Runs file_editor commands inside the API process.
+
+    The plugin is imported once and its global FileEditor, together with the
+    encoding cache and undo history, stays warm between calls instead of
+    starting a python3 process per command.
+    """
+
+    def __init__(self, tools_path: Optional[str] = None):
+        self._tools_path = tools_path or settings.FILE_EDITOR_TOOLS_PATH
+        self._module: Optional[ModuleType] = None
+        # FileEditor is not thread safe, so commands run one at a time
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        """Import the file_editor plugin on first use"""
+        if self._module is None:
+            if self._tools_path not in sys.path:
+                sys.path.insert(0, self._tools_path)
+            try:
+                self._module = importlib.import_module("file_editor_cli")
+            except Exception as e:
+                raise AppException(
+                    message=f"File editor is not available: {str(e)}",
+                    status_code=503
+                )
+            logger.info("Loaded file editor from %s", self._tools_path)
+        return self._module
+
+    def _run(self, args: dict) -> dict:
+        with self._lock:
+            return self._load().run_file_editor(args)
+
+    async def execute(self, request: FileEditorRequest) -> FileEditorResult:
+        """
+        Execute a file_editor command
+
+        Args:
+            request: Editor command and its parameters
+        """
+        response = await asyncio.to_thread(self._run, request.model_dump(exclude_none=True))
+        data = response.get("data") or {}
+        return FileEditorResult(
+            success=response.get("success", False),
+            message=response.get("message", ""),
+            command=data.get("command", request.command),
+            path=data.get("path", request.path),
+            content=data.get("content")
+        )
+
+
+file_editor_service = FileEditorService()
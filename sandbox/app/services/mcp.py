@@ -0,0 +1,183 @@
+"""
+MCP Server Service Implementation
+
+Runs MCP servers as stdio subprocesses and bridges their JSON-RPC stream to
+a WebSocket: every message received is written to the server's stdin as one
+line, every line the server writes to stdout is sent back as one message.
+Request ids are left untouched, so the client matches responses to its
+requests and can keep several in flight.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.models.mcp import McpServerResult, McpStopResult
+from app.core.exceptions import AppException, ResourceNotFoundException, BadRequestException
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Largest JSON-RPC line read from a server, tool results can be big
+STREAM_LIMIT = 16 * 1024 * 1024
+STOP_TIMEOUT = 5
+
+
+@dataclass
+class McpServer:
+    """A running MCP server process"""
+    id: str
+    name: str
+    process: asyncio.subprocess.Process
+    stderr_task: asyncio.Task
+    client: Optional[WebSocket] = None
+
+
+class McpService:
+    # Running MCP servers by ID
+    servers: Dict[str, McpServer] = {}
+
+    async def start_server(
+        self,
+        name: str,
+        command: str,
+        args: list,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None
+    ) -> McpServerResult:
+        """
+        Start an MCP server with its stdin and stdout connected to pipes
+        """
+        if cwd and not os.path.isdir(cwd):
+            raise BadRequestException(f"Directory does not exist: {cwd}")
+        logger.info(f"Starting MCP server {name}: {command} {' '.join(args)}")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                command,
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env={**os.environ, **(env or {})},
+                cwd=cwd,
+                limit=STREAM_LIMIT
+            )
+        except FileNotFoundError:
+            raise BadRequestException(f"Command not found: {command}")
+        except Exception as e:
+            logger.error(f"Failed to start MCP server {name}: {str(e)}", exc_info=True)
+            raise AppException(message=f"Failed to start MCP server: {str(e)}")
+
+        server_id = str(uuid.uuid4())
+        self.servers[server_id] = McpServer(
+            id=server_id,
+            name=name,
+            process=process,
+            stderr_task=asyncio.create_task(self._log_stderr(name, process))
+        )
+        logger.info(f"MCP server {name} started with PID {process.pid}")
+        return McpServerResult(server_id=server_id, name=name, pid=process.pid)
+
+    async def _log_stderr(self, name: str, process: asyncio.subprocess.Process):
+        """Drain the server's stderr so it never blocks on a full pipe"""
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            logger.debug(f"[{name}] {line.decode('utf-8', errors='replace').rstrip()}")
+
+    def _get_server(self, server_id: str) -> McpServer:
+        server = self.servers.get(server_id)
+        if server is None:
+            raise ResourceNotFoundException(f"MCP server not found: {server_id}")
+        return server
+
+    async def stop_server(self, server_id: str) -> McpStopResult:
+        """
+        Stop an MCP server, killing it if it doesn't exit in time
+        """
+        server = self._get_server(server_id)
+        del self.servers[server_id]
+        process = server.process
+        if server.client is not None:
+            await self._close(server.client, 1001, "MCP server stopped")
+        if process.returncode is not None:
+            return McpStopResult(status="already_terminated", returncode=process.returncode)
+
+        # Closing stdin is how stdio MCP servers are asked to exit
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"MCP server {server.name} did not exit, killing it")
+            process.kill()
+            await process.wait()
+        logger.info(f"MCP server {server.name} terminated with return code: {process.returncode}")
+        return McpStopResult(status="terminated", returncode=process.returncode)
+
+    async def bridge(self, server_id: str, websocket: WebSocket):
+        """
+        Relay JSON-RPC messages between a WebSocket and the server's stdio
+        until either side closes
+        """
+        server = self.servers.get(server_id)
+        if server is None:
+            await websocket.close(code=4404, reason="MCP server not found")
+            return
+        if server.client is not None:
+            await websocket.close(code=4409, reason="MCP server already has a client")
+            return
+
+        await websocket.accept()
+        server.client = websocket
+        relays = [
+            asyncio.create_task(self._relay_requests(server, websocket)),
+            asyncio.create_task(self._relay_responses(server, websocket)),
+        ]
+        try:
+            await asyncio.wait(relays, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for relay in relays:
+                relay.cancel()
+            await asyncio.gather(*relays, return_exceptions=True)
+            server.client = None
+        if server.process.returncode is not None:
+            await self._close(websocket, 1011, f"MCP server exited with code {server.process.returncode}")
+
+    async def _close(self, websocket: WebSocket, code: int, reason: str):
+        try:
+            await websocket.close(code=code, reason=reason)
+        except RuntimeError:
+            # Already closed by the client
+            pass
+
+    async def _relay_requests(self, server: McpServer, websocket: WebSocket):
+        stdin = server.process.stdin
+        try:
+            while True:
+                message = await websocket.receive_text()
+                stdin.write(message.replace("\n", " ").encode("utf-8") + b"\n")
+                await stdin.drain()
+        except WebSocketDisconnect:
+            logger.info(f"Client of MCP server {server.name} disconnected")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning(f"MCP server {server.name} closed its stdin")
+
+    async def _relay_responses(self, server: McpServer, websocket: WebSocket):
+        stdout = server.process.stdout
+        while True:
+            line = await stdout.readline()
+            if not line:
+                await server.process.wait()
+                logger.warning(f"MCP server {server.name} exited with code {server.process.returncode}")
+                return
+            line = line.strip()
+            if line:
+                await websocket.send_text(line.decode("utf-8", errors="replace"))
+
+
+mcp_service = McpService()
@@ -0,0 +1,68 @@
+"""
+Unit tests for the resident FileEditorService
+"""
+import sys
+import asyncio
+import pytest
+
+from app.services.file_editor import FileEditorService
+from app.schemas.file import FileEditorRequest
+from app.core.exceptions import AppException
+
+
+PLUGIN_SOURCE = '''
+CALLS = []
+
+def run_file_editor(args):
+    CALLS.append(args)
+    if args["command"] == "view":
+        return {"success": True, "message": "1\\thello", "data": {"command": "view", "path": args["path"], "content": "hello"}}
+    return {"success": False, "message": "No replacement was performed"}
+'''
+
+
+@pytest.fixture
+def tools_path(tmp_path, monkeypatch):
+    (tmp_path / "file_editor_cli.py").write_text(PLUGIN_SOURCE)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.delitem(sys.modules, "file_editor_cli", raising=False)
+    yield str(tmp_path)
+    sys.modules.pop("file_editor_cli", None)
+
+
+@pytest.mark.file_api
+def test_editor_is_loaded_once_and_reused(tools_path):
+    service = FileEditorService(tools_path=tools_path)
+
+    for _ in range(3):
+        result = asyncio.run(service.execute(FileEditorRequest(command="view", path="/tmp/a.txt", view_range=[1, 2])))
+        assert result.success is True
+        assert result.content == "hello"
+
+    # All calls went to the same imported module
+    plugin = sys.modules["file_editor_cli"]
+    assert len(plugin.CALLS) == 3
+    assert plugin.CALLS[0] == {"command": "view", "path": "/tmp/a.txt", "view_range": [1, 2]}
+
+
+@pytest.mark.file_api
+def test_editor_errors_are_returned(tools_path):
+    service = FileEditorService(tools_path=tools_path)
+
+    result = asyncio.run(service.execute(FileEditorRequest(command="str_replace", path="/tmp/a.txt", old_str="x", new_str="y")))
+
+    assert result.success is False
+    assert result.message == "No replacement was performed"
+    assert result.command == "str_replace"
+    assert result.path == "/tmp/a.txt"
+
+
+@pytest.mark.file_api
+def test_missing_plugin_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.delitem(sys.modules, "file_editor_cli", raising=False)
+    service = FileEditorService(tools_path=str(tmp_path / "missing"))
+
+    with pytest.raises(AppException) as exc_info:
+        asyncio.run(service.execute(FileEditorRequest(command="view", path="/tmp")))
+    assert exc_info.value.status_code == 503
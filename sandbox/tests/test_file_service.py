@@ -0,0 +1,253 @@
+"""
+Unit tests for FileService running directly against the local filesystem
+"""
+import os
+import time
+import shutil
+import hashlib
+import asyncio
+import tracemalloc
+import logging
+import pytest
+
+from app.services import file as file_module
+from app.services.file import FileService
+from app.core.exceptions import BadRequestException, ResourceNotFoundException
+from app.schemas.file import FileBatchOperation
+
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def service():
+    return FileService()
+
+
+@pytest.mark.file_api
+def test_str_replace_large_file_is_not_truncated(service, tmp_path):
+    """Files longer than read_file's max_length are replaced in full"""
+    path = tmp_path / "big.txt"
+    lines = [f"line {i} value=old" for i in range(5000)]
+    path.write_text("\n".join(lines))
+
+    result = asyncio.run(service.str_replace(str(path), "value=old", "value=new"))
+
+    assert result.replaced_count == 5000
+    assert result.line_numbers[:3] == [0, 1, 2]
+    content = path.read_text()
+    assert "value=old" not in content
+    assert content == "\n".join(lines).replace("value=old", "value=new")
+
+
+@pytest.mark.file_api
+def test_str_replace_match_across_chunk_boundary(service, tmp_path, monkeypatch):
+    """Occurrences split between two read chunks are still replaced"""
+    monkeypatch.setattr(file_module, "CHUNK_SIZE", 7)
+    path = tmp_path / "chunks.txt"
+    original = "abc\nNEEDLE\nxyzNEEDLENEEDLE\r\nend NEEDL"
+    path.write_text(original, newline="")
+
+    result = asyncio.run(service.str_replace(str(path), "NEEDLE", "pin"))
+
+    assert result.replaced_count == 3
+    assert result.line_numbers == [1, 2, 2]
+    with open(path, newline="") as f:
+        assert f.read() == original.replace("NEEDLE", "pin")
+
+
+@pytest.mark.file_api
+def test_str_replace_no_match_keeps_file(service, tmp_path):
+    """A replacement without matches leaves the file and its directory untouched"""
+    path = tmp_path / "keep.txt"
+    path.write_text("nothing here")
+    os.chmod(path, 0o640)
+    inode = path.stat().st_ino
+
+    result = asyncio.run(service.str_replace(str(path), "missing", "x"))
+
+    assert result.replaced_count == 0
+    assert path.stat().st_ino == inode
+    assert os.listdir(tmp_path) == ["keep.txt"]
+
+
+@pytest.mark.file_api
+def test_str_replace_preserves_mode(service, tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("echo old")
+    os.chmod(path, 0o755)
+
+    asyncio.run(service.str_replace(str(path), "old", "new"))
+
+    assert path.read_text() == "echo new"
+    assert path.stat().st_mode & 0o777 == 0o755
+
+
+@pytest.mark.file_api
+def test_str_replace_errors(service, tmp_path):
+    with pytest.raises(ResourceNotFoundException):
+        asyncio.run(service.str_replace(str(tmp_path / "missing.txt"), "a", "b"))
+
+    path = tmp_path / "empty_old.txt"
+    path.write_text("abc")
+    with pytest.raises(BadRequestException):
+        asyncio.run(service.str_replace(str(path), "", "b"))
+
+
+@pytest.fixture
+def repo_tree(tmp_path):
+    """Small repository-like tree with ignored, hidden and binary files"""
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n!keep.log\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("import os\n\ndef main():\n    return TODO_marker\n")
+    (tmp_path / "src" / "util.py").write_text("# TODO_marker one\nx = 1\n# todo_marker two\n")
+    (tmp_path / "src" / ".gitignore").write_text("generated.py\n")
+    (tmp_path / "src" / "generated.py").write_text("TODO_marker\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("TODO_marker\n")
+    (tmp_path / "debug.log").write_text("TODO_marker\n")
+    (tmp_path / "keep.log").write_text("TODO_marker\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "secret.py").write_text("TODO_marker\n")
+    (tmp_path / "image.bin").write_bytes(b"\x00\x01TODO_marker\x00")
+    return tmp_path
+
+
+@pytest.fixture(params=["python", "ripgrep"])
+def grep_engine(request, monkeypatch):
+    """Run grep tests against both the Python walker and ripgrep"""
+    if request.param == "python":
+        monkeypatch.setattr(file_module.shutil, "which", lambda name: None)
+    elif shutil.which("rg") is None:
+        pytest.skip("ripgrep is not installed")
+    return request.param
+
+
+@pytest.mark.file_api
+def test_grep_respects_gitignore_hidden_and_binary(service, repo_tree, grep_engine):
+    result = asyncio.run(service.grep(str(repo_tree), "TODO_marker"))
+
+    assert result.engine == grep_engine
+    found = sorted((os.path.relpath(m.file, repo_tree), m.line_number) for m in result.matches)
+    assert found == [("keep.log", 1), ("src/main.py", 4), ("src/util.py", 1)]
+    assert result.files_matched == 3
+    assert result.truncated is False
+
+
+@pytest.mark.file_api
+def test_grep_options(service, repo_tree, grep_engine):
+    insensitive = asyncio.run(service.grep(
+        str(repo_tree / "src"), "todo_marker", glob_pattern="util.py", case_sensitive=False
+    ))
+    assert [m.line for m in insensitive.matches] == ["# TODO_marker one", "# todo_marker two"]
+
+    everything = asyncio.run(service.grep(str(repo_tree), "TODO_marker", respect_gitignore=False))
+    files = {os.path.relpath(m.file, repo_tree) for m in everything.matches}
+    assert {"build/out.py", "debug.log", "src/generated.py"} <= files
+    assert ".hidden/secret.py" not in files
+
+    limited = asyncio.run(service.grep(str(repo_tree), "TODO_marker", max_results=2))
+    assert len(limited.matches) == 2
+    assert limited.truncated is True
+
+
+@pytest.mark.file_api
+def test_grep_single_file_and_errors(service, repo_tree):
+    result = asyncio.run(service.grep(str(repo_tree / "src" / "main.py"), r"^def \w+"))
+    assert [(m.line_number, m.line) for m in result.matches] == [(3, "def main():")]
+
+    with pytest.raises(BadRequestException):
+        asyncio.run(service.grep(str(repo_tree), "("))
+    with pytest.raises(ResourceNotFoundException):
+        asyncio.run(service.grep(str(repo_tree / "missing"), "x"))
+
+
+@pytest.mark.file_api
+def test_find_in_content_beyond_read_limit(service, tmp_path):
+    path = tmp_path / "long.txt"
+    path.write_text("filler line\n" * 2000 + "needle\n")
+
+    result = asyncio.run(service.find_in_content(str(path), "needle"))
+
+    assert result.line_numbers == [2000]
+
+
+@pytest.mark.file_api
+def test_batch_mixed_operations(service, tmp_path):
+    """Batch keeps request order and per-path ordering, failures stay isolated"""
+    target = str(tmp_path / "pkg" / "module.py")
+    operations = [
+        FileBatchOperation(op="write", path=target, content="x = 1\n"),
+        FileBatchOperation(op="read", path=target),
+        FileBatchOperation(op="exists", path=target),
+        FileBatchOperation(op="read", path=str(tmp_path / "missing.txt")),
+        FileBatchOperation(op="write", path=str(tmp_path / "pkg" / "other.py"), content="y = 2\n"),
+        FileBatchOperation(op="list", path=str(tmp_path / "pkg")),
+        FileBatchOperation(op="delete", path=target),
+        FileBatchOperation(op="exists", path=target),
+        FileBatchOperation(op="write", path=target),
+    ]
+
+    result = asyncio.run(service.batch(operations, max_concurrency=4))
+
+    assert [r.op for r in result.results] == [o.op for o in operations]
+    assert result.results[1].data["content"] == "x = 1\n"
+    assert result.results[2].data["exists"] is True
+    assert result.results[3].success is False
+    assert result.results[7].data["exists"] is False
+    assert result.results[8].success is False
+    assert result.succeeded == 7
+    assert result.failed == 2
+    assert not os.path.exists(target)
+
+
+@pytest.mark.file_api
+def test_batch_limits(service, tmp_path):
+    operations = [FileBatchOperation(op="exists", path=str(tmp_path))] * (file_module.MAX_BATCH_OPERATIONS + 1)
+    with pytest.raises(BadRequestException):
+        asyncio.run(service.batch(operations))
+
+
+@pytest.mark.file_api
+def test_hash_streams_file(service, tmp_path, monkeypatch):
+    monkeypatch.setattr(file_module, "CHUNK_SIZE", 7)
+    target = tmp_path / "blob.bin"
+    content = os.urandom(1000)
+    target.write_bytes(content)
+
+    result = asyncio.run(service.hash(str(target)))
+
+    assert result.sha256 == hashlib.sha256(content).hexdigest()
+    assert result.size == 1000
+    with pytest.raises(ResourceNotFoundException):
+        asyncio.run(service.hash(str(tmp_path / "missing")))
+
+
+@pytest.mark.benchmark
+def test_str_replace_100mb_bounded_memory(service, tmp_path):
+    """Replacing across a 100 MB file keeps peak Python memory near the chunk size"""
+    path = tmp_path / "large.log"
+    line = "2024-01-01 INFO request handled status=200 path=/api/v1/items\n"
+    repeat = (100 * 1024 * 1024) // len(line)
+    with open(path, "w") as f:
+        block = line * 10000
+        for _ in range(repeat // 10000):
+            f.write(block)
+    size = path.stat().st_size
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = asyncio.run(service.str_replace(str(path), "status=200", "status=OK"))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    logger.info(
+        f"Replaced {result.replaced_count} occurrences in {size / 1024 / 1024:.0f} MB "
+        f"in {elapsed:.2f}s, peak traced memory {peak / 1024 / 1024:.1f} MB"
+    )
+    assert result.replaced_count == (repeat // 10000) * 10000
+    assert len(result.line_numbers) == file_module.MAX_REPORTED_LINE_NUMBERS
+    # Bounded by a few chunks, not by the file size
+    assert peak < 16 * 1024 * 1024
+    assert path.stat().st_size == size - result.replaced_count
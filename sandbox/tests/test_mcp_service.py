@@ -0,0 +1,65 @@
+"""
+Unit tests for McpService bridging a local stdio MCP server to a WebSocket
+"""
+import sys
+import json
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import mcp
+from app.services.mcp import McpService
+from app.core.exceptions import BadRequestException
+
+
+# Answers every request with its method, the second one first
+SERVER = """
+import sys, json
+held = None
+for line in sys.stdin:
+    message = json.loads(line)
+    response = {"jsonrpc": "2.0", "id": message["id"], "result": {"method": message["method"]}}
+    if held is None and message["method"] == "slow":
+        held = response
+        continue
+    print(json.dumps(response), flush=True)
+    if held:
+        print(json.dumps(held), flush=True)
+        held = None
+"""
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(mcp.router, prefix="/api/v1/mcp")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_bridge_relays_requests_by_id(client):
+    """Responses come back as the server writes them, matched by request id"""
+    started = client.post("/api/v1/mcp/start", json={
+        "name": "test",
+        "command": sys.executable,
+        "args": ["-c", SERVER]
+    }).json()
+    server_id = started["data"]["server_id"]
+
+    with client.websocket_connect(f"/api/v1/mcp/{server_id}/ws") as websocket:
+        websocket.send_text(json.dumps({"jsonrpc": "2.0", "id": "1", "method": "slow"}))
+        websocket.send_text(json.dumps({"jsonrpc": "2.0", "id": "2", "method": "fast"}))
+        responses = [json.loads(websocket.receive_text()) for _ in range(2)]
+
+        stopped = client.post("/api/v1/mcp/stop", json={"id": server_id}).json()
+        assert websocket.receive()["type"] == "websocket.close"
+
+    assert [r["id"] for r in responses] == ["2", "1"]
+    assert responses[1]["result"] == {"method": "slow"}
+    assert stopped["data"]["status"] == "terminated"
+
+
+def test_unknown_command():
+    with pytest.raises(BadRequestException):
+        asyncio.run(McpService().start_server("test", "no-such-mcp-server", []))